@@ -0,0 +1,11 @@
+"""
+Celery configuration for Coaching OS periodic tasks.
+"""
+from celery.schedules import crontab
+
+COACHING_BEAT_SCHEDULE = {
+    'recompute-habit-streaks': {
+        'task': 'coaching.recompute_habit_streaks',
+        'schedule': crontab(hour=0, minute=15),  # Nightly, after the day rolls over
+    },
+}
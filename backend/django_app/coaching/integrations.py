@@ -171,10 +171,6 @@ def sync_mission_to_coaching(user, mission_id, mission_title, score):
         }
     )
     
-    # Update streak
-    from .services import update_habit_streak
-    update_habit_streak(practice_habit.id)
-    
     # Boost relevant goals (missions-related)
     goals = Goal.objects.filter(
         user=user,
@@ -0,0 +1,26 @@
+"""
+Rebuild maintained habit streaks from coaching_habit_logs.
+
+Runs the same gaps-and-islands statement as the nightly coaching.recompute_habit_streaks
+task. Use after bulk imports or raw-SQL fixes to HabitLog rows.
+"""
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from coaching.streaks import recompute_habit_streaks
+
+
+class Command(BaseCommand):
+    help = 'Recompute Habit.streak / longest_streak for all habits (or the given habit ids)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--habit-id', action='append', dest='habit_ids', help='Limit to a habit id (repeatable)')
+        parser.add_argument('--today', type=date.fromisoformat, help='Evaluate streaks as of this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        updated = recompute_habit_streaks(habit_ids=options['habit_ids'], today=options['today'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Updated {updated} habits in {elapsed:.2f} s'))
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_streaks(apps, schema_editor):
+    # streak_through must be set before incremental updates can extend existing runs.
+    # A frozen copy of coaching.streaks.recompute_habit_streaks at the time of this
+    # migration, over every habit: completed/skipped days form gaps-and-islands runs.
+    Habit = apps.get_model('coaching', 'Habit')
+    HabitLog = apps.get_model('coaching', 'HabitLog')
+    connection = schema_editor.connection
+    cutoff = timezone.localdate() - timedelta(days=1)
+
+    if connection.vendor == 'postgresql':
+        day_number = "(l.date - DATE '2000-01-01')"
+        greatest = 'GREATEST'
+    else:
+        day_number = 'CAST(julianday(l.date) AS INTEGER)'
+        greatest = 'MAX'
+    habits = Habit._meta.db_table
+    logs = HabitLog._meta.db_table
+
+    sql = f"""
+        UPDATE {habits}
+        SET streak = computed.streak,
+            longest_streak = {greatest}({habits}.longest_streak, computed.longest),
+            streak_through = computed.last_logged
+        FROM (
+            WITH qualifying AS (
+                SELECT l.habit_id, l.date, l.status,
+                       {day_number} - ROW_NUMBER() OVER (PARTITION BY l.habit_id ORDER BY l.date) AS island
+                FROM {logs} l
+                WHERE l.status IN ('completed', 'skipped')
+            ),
+            islands AS (
+                SELECT habit_id, MAX(date) AS ended_on,
+                       SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS length
+                FROM qualifying
+                GROUP BY habit_id, island
+            ),
+            ranked AS (
+                SELECT habit_id, ended_on, length,
+                       MAX(length) OVER (PARTITION BY habit_id) AS longest,
+                       ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY ended_on DESC) AS recency
+                FROM islands
+            ),
+            last_logs AS (
+                SELECT l.habit_id, MAX(l.date) AS last_logged
+                FROM {logs} l
+                GROUP BY l.habit_id
+            )
+            SELECT h.id AS habit_id,
+                   ll.last_logged,
+                   COALESCE(r.longest, 0) AS longest,
+                   CASE WHEN r.ended_on = ll.last_logged AND ll.last_logged >= %s
+                        THEN r.length ELSE 0 END AS streak
+            FROM {habits} h
+            LEFT JOIN last_logs ll ON ll.habit_id = h.id
+            LEFT JOIN ranked r ON r.habit_id = h.id AND r.recency = 1
+        ) AS computed
+        WHERE {habits}.id = computed.habit_id
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [cutoff])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('coaching', '0003_studentanalytics_communityactivitysummary_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='habit',
+            name='streak_through',
+            field=models.DateField(blank=True, help_text='Latest log date folded into streak (see coaching/streaks.py)', null=True),
+        ),
+        migrations.RunPython(backfill_streaks, migrations.RunPython.noop),
+    ]
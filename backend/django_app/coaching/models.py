@@ -51,6 +51,11 @@ class Habit(models.Model):
         validators=[MinValueValidator(0)],
         help_text='Longest streak achieved'
     )
+    streak_through = models.DateField(
+        null=True,
+        blank=True,
+        help_text='Latest log date folded into streak (see coaching/streaks.py)'
+    )
     is_active = models.BooleanField(default=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
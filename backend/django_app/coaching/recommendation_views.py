@@ -2,9 +2,10 @@
 AI Coach recommendation generation.
 """
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from .throttles import AICoachGenerationThrottle
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,6 +13,7 @@ logger = logging.getLogger(__name__)
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([AICoachGenerationThrottle])
 def generate_recommendation(request):
     """
     POST /api/v1/coaching/ai-coach/recommendation
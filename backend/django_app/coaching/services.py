@@ -1,14 +1,14 @@
 """
 Coaching OS Services - Business logic and integrations.
 """
-from datetime import date, timedelta
-from django.utils import timezone
 from django.db.models import Q, Count, Sum, Avg, Max
 from django.db import transaction
-from .models import Habit, HabitLog, Goal, Reflection, AICoachSession
+from .models import Habit, Goal, Reflection
+from .streaks import recompute_habit_streaks
 from talentscope.models import BehaviorSignal
 from subscriptions.utils import get_user_tier
-from subscriptions.models import UserSubscription
+from users.utils.identity_snapshot import get_identity_snapshot
+from core.rate_limit import bucket_key, rate_limiter
 import logging
 
 logger = logging.getLogger(__name__)
@@ -119,60 +119,11 @@ def get_user_track_info(user):
 
 def update_habit_streak(habit_id):
     """
-    Recalculate habit streak from logs.
-    Called after each habit log update.
+    Recalculate one habit's streak from its logs.
+    HabitLog writes keep streaks current through coaching.signals; call this only
+    after changing logs without signals (bulk imports, raw SQL).
     """
-    try:
-        habit = Habit.objects.get(id=habit_id)
-    except Habit.DoesNotExist:
-        return
-    
-    logs = HabitLog.objects.filter(
-        habit=habit
-    ).order_by('-date')
-    
-    if not logs.exists():
-        habit.streak = 0
-        habit.save()
-        return
-    
-    # Calculate current streak
-    today = date.today()
-    current_streak = 0
-    check_date = today
-    
-    # Check today first
-    today_log = logs.filter(date=today).first()
-    if today_log and today_log.status == 'completed':
-        current_streak = 1
-        check_date = today - timedelta(days=1)
-    elif today_log and today_log.status == 'skipped':
-        # Skipped doesn't break streak but doesn't count
-        check_date = today - timedelta(days=1)
-    
-    # Count backwards
-    while True:
-        log = logs.filter(date=check_date).first()
-        
-        if log and log.status == 'completed':
-            current_streak += 1
-            check_date -= timedelta(days=1)
-        elif log and log.status == 'skipped':
-            # Skipped doesn't break streak
-            check_date -= timedelta(days=1)
-        else:
-            # Missed or no log breaks streak
-            break
-        
-        # Safety limit
-        if current_streak > 365:
-            break
-    
-    # Update streak
-    habit.streak = current_streak
-    if current_streak > habit.longest_streak:
-        habit.longest_streak = current_streak
-    habit.save()
+    recompute_habit_streaks(habit_ids=[habit_id])
 
 
 def calculate_coaching_metrics(user):
@@ -234,17 +185,11 @@ def check_coaching_entitlement(user, feature):
     - 'unlimited_reflections': Unlimited reflections (all tiers)
     - 'custom_habits': Custom habits (starter+)
     """
-    try:
-        subscription = UserSubscription.objects.get(user=user, status='active')
-        tier = subscription.plan.tier
-        # Check enhanced access
-        has_enhanced = subscription.enhanced_access_expires_at and \
-                       subscription.enhanced_access_expires_at > timezone.now() if hasattr(subscription, 'enhanced_access_expires_at') else False
-    except UserSubscription.DoesNotExist:
-        tier = 'free'
-        has_enhanced = False
+    identity = get_identity_snapshot(user)
+    tier = identity.tier
+    has_enhanced = identity.has_enhanced_access
     
-        # TEMP: Allow AI coach for testing
+    # TEMP: Allow AI coach for testing
     if user.email == 'coaching-test@example.com':
         return feature == 'ai_coach_full'
     
@@ -258,39 +203,33 @@ def check_coaching_entitlement(user, feature):
     return entitlements.get(feature, False)
 
 
-def check_ai_coach_rate_limit(user, session):
+AI_COACH_FEATURE = 'ai_coach'
+
+
+def get_ai_coach_daily_limit(user):
+    """Daily AI Coach prompts for the user's plan; None means unlimited (premium or enhanced access)."""
+    identity = get_identity_snapshot(user)
+    if identity.tier == 'premium' or identity.has_enhanced_access:
+        return None
+    return identity.ai_coach_daily_limit
+
+
+def _ai_coach_bucket(user):
+    return bucket_key(AI_COACH_FEATURE, user.pk, get_identity_snapshot(user).tier)
+
+
+def check_ai_coach_rate_limit(user, session=None):
     """
-    Check if user has exceeded AI Coach rate limit.
-    Returns True if within limit, False if exceeded.
+    Take one AI Coach prompt from the user's daily token bucket.
+    Returns a RateLimitDecision: truthy if within limit, with Retry-After headers if not.
+    The token is taken up front, so concurrent requests cannot overshoot the limit.
     """
-    try:
-        subscription = UserSubscription.objects.get(user=user, status='active')
-        tier = subscription.plan.tier
-        daily_limit = subscription.plan.ai_coach_daily_limit
-        # Check enhanced access
-        has_enhanced = hasattr(subscription, 'enhanced_access_expires_at') and \
-                       subscription.enhanced_access_expires_at and \
-                       subscription.enhanced_access_expires_at > timezone.now()
-    except UserSubscription.DoesNotExist:
-        subscription = None
-        tier = 'free'
-        daily_limit = 5  # Free tier: 5 per day
-        has_enhanced = False
-
-    # Premium or enhanced = unlimited
-    if tier == 'premium' or has_enhanced:
-        return True
-    
-    # Check today's usage
-    today = timezone.now().date()
-    today_sessions = AICoachSession.objects.filter(
-        user=user,
-        created_at__date=today
-    )
-    
-    total_prompts = sum(s.prompt_count for s in today_sessions)
-    
-    return total_prompts < (daily_limit or 999999)
+    return rate_limiter.hit(_ai_coach_bucket(user), get_ai_coach_daily_limit(user), period=24 * 60 * 60)
+
+
+def refund_ai_coach_rate_limit(user):
+    """Give back the prompt taken by check_ai_coach_rate_limit when no AI response was produced."""
+    rate_limiter.refund(_ai_coach_bucket(user), get_ai_coach_daily_limit(user))
 
 
 def emit_coaching_event(event_type, data):
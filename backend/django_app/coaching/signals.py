@@ -4,7 +4,8 @@ Coaching OS Django Signals - Platform integrations.
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import Habit, HabitLog, Goal, Reflection
-from .services import update_habit_streak, emit_coaching_event
+from .services import emit_coaching_event
+from .streaks import apply_habit_log, recompute_habit_streaks
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,8 +13,14 @@ logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=HabitLog)
 def on_habit_log_saved(sender, instance, created, **kwargs):
-    """Update streak when habit log is saved."""
-    update_habit_streak(instance.habit.id)
+    """Fold the log into the habit's maintained streak."""
+    apply_habit_log(instance)
+
+
+@receiver(post_delete, sender=HabitLog)
+def on_habit_log_deleted(sender, instance, **kwargs):
+    """Rebuild the habit's streak without the deleted day."""
+    recompute_habit_streaks(habit_ids=[instance.habit_id])
 
 
 @receiver(post_save, sender=Goal)
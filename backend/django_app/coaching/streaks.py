@@ -0,0 +1,157 @@
+"""
+Habit streak engine.
+
+Habit.streak / Habit.longest_streak are maintained values, not something readers
+recompute. Two paths keep them right:
+
+- apply_habit_log(): called for every HabitLog write. A log for a date after
+  Habit.streak_through extends, restarts or resets the run with a constant amount of
+  work (one locked row read and one UPDATE). Edits and back-filled dates at or before
+  streak_through fall back to recompute_habit_streaks() for that single habit.
+- recompute_habit_streaks(): set-based rebuild from coaching_habit_logs using a
+  gaps-and-islands window query. Run nightly (coaching.recompute_habit_streaks) so
+  streaks whose owner stopped logging drop to zero, and after imports/backfills.
+
+Counting rules match the old backward scan: a completed day counts, a skipped day
+neither counts nor breaks the run, a missed day or a day without a log breaks it.
+A run stays current while its last log is from today or yesterday, so a streak does
+not read as zero every morning before the day's log is written.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, timedelta
+from typing import Iterable, Optional
+
+from django.db import connection, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from .models import Habit, HabitLog
+
+logger = logging.getLogger(__name__)
+
+# Statuses that keep a run alive; only 'completed' adds to its length.
+RUN_STATUSES = ('completed', 'skipped')
+
+
+def apply_habit_log(log: HabitLog) -> None:
+    """Fold one HabitLog write into its habit's streak."""
+    with transaction.atomic():
+        habit = (
+            Habit.objects.select_for_update()
+            .only('id', 'streak', 'streak_through')
+            .filter(id=log.habit_id)
+            .first()
+        )
+        if habit is None:
+            return
+
+        through = habit.streak_through
+        if through is not None and log.date <= through:
+            # Edit of an already-counted day or a back-filled gap: rebuild this habit only.
+            recompute_habit_streaks(habit_ids=[habit.id])
+            return
+
+        continues = through is not None and log.date == through + timedelta(days=1)
+        if log.status == 'completed':
+            streak = (habit.streak if continues else 0) + 1
+        elif log.status == 'skipped':
+            streak = habit.streak if continues else 0
+        else:
+            streak = 0
+
+        Habit.objects.filter(id=habit.id).update(
+            streak=streak,
+            longest_streak=Greatest(F('longest_streak'), streak),
+            streak_through=log.date,
+        )
+
+
+def recompute_habit_streaks(habit_ids: Optional[Iterable] = None, today: Optional[date] = None) -> int:
+    """
+    Rebuild streak, longest_streak and streak_through from the logs in one statement.
+
+    Consecutive completed/skipped days form an island: day number minus
+    ROW_NUMBER() over the habit's qualifying dates is constant inside one. The current
+    streak is the completed count of the island that ends on the habit's latest log,
+    provided that log is from today or yesterday; longest_streak never decreases.
+    Returns the number of habits updated.
+    """
+    today = today or timezone.localdate()
+    cutoff = today - timedelta(days=1)
+
+    if connection.vendor == 'postgresql':
+        day_number = "(l.date - DATE '2000-01-01')"
+        greatest = 'GREATEST'
+    else:
+        day_number = 'CAST(julianday(l.date) AS INTEGER)'
+        greatest = 'MAX'
+
+    scope_logs, scope_habits, ids = '', '', []
+    if habit_ids is not None:
+        habit_field = Habit._meta.pk
+        ids = [habit_field.get_db_prep_value(habit_id, connection) for habit_id in habit_ids]
+        if not ids:
+            return 0
+        placeholders = ', '.join(['%s'] * len(ids))
+        scope_logs = f'AND l.habit_id IN ({placeholders})'
+        scope_habits = f'WHERE h.id IN ({placeholders})'
+
+    habits = Habit._meta.db_table
+    logs = HabitLog._meta.db_table
+    run_statuses = ', '.join(f"'{status}'" for status in RUN_STATUSES)
+
+    sql = f"""
+        UPDATE {habits}
+        SET streak = computed.streak,
+            longest_streak = {greatest}({habits}.longest_streak, computed.longest),
+            streak_through = computed.last_logged
+        FROM (
+            WITH qualifying AS (
+                SELECT l.habit_id, l.date, l.status,
+                       {day_number} - ROW_NUMBER() OVER (PARTITION BY l.habit_id ORDER BY l.date) AS island
+                FROM {logs} l
+                WHERE l.status IN ({run_statuses}) {scope_logs}
+            ),
+            islands AS (
+                SELECT habit_id, MAX(date) AS ended_on,
+                       SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS length
+                FROM qualifying
+                GROUP BY habit_id, island
+            ),
+            ranked AS (
+                SELECT habit_id, ended_on, length,
+                       MAX(length) OVER (PARTITION BY habit_id) AS longest,
+                       ROW_NUMBER() OVER (PARTITION BY habit_id ORDER BY ended_on DESC) AS recency
+                FROM islands
+            ),
+            last_logs AS (
+                SELECT l.habit_id, MAX(l.date) AS last_logged
+                FROM {logs} l
+                WHERE 1 = 1 {scope_logs}
+                GROUP BY l.habit_id
+            )
+            SELECT h.id AS habit_id,
+                   ll.last_logged,
+                   COALESCE(r.longest, 0) AS longest,
+                   CASE WHEN r.ended_on = ll.last_logged AND ll.last_logged >= %s
+                        THEN r.length ELSE 0 END AS streak
+            FROM {habits} h
+            LEFT JOIN last_logs ll ON ll.habit_id = h.id
+            LEFT JOIN ranked r ON r.habit_id = h.id AND r.recency = 1
+            {scope_habits}
+        ) AS computed
+        WHERE {habits}.id = computed.habit_id
+          AND ({habits}.streak <> computed.streak
+               OR {habits}.longest_streak < computed.longest
+               OR {habits}.streak_through IS DISTINCT FROM computed.last_logged)
+    """
+    # Placeholders in statement order: qualifying, last_logs, cutoff, computed scope.
+    statement_params = ids + ids + [cutoff] + ids
+    with connection.cursor() as cursor:
+        cursor.execute(sql, statement_params)
+        updated = cursor.rowcount
+    logger.info(f"Recomputed habit streaks: {updated} habits updated")
+    return updated
@@ -117,3 +117,11 @@ Your goal is to help the mentee build consistent habits, achieve goals, and prog
         base_prompt += "\nFocus: Connect habits/goals to mission completion, suggest relevant missions."
     
     return base_prompt
+
+
+@shared_task(name='coaching.recompute_habit_streaks')
+def recompute_habit_streaks_task():
+    """Nightly set-based streak rebuild; zeroes streaks whose owners stopped logging."""
+    from .streaks import recompute_habit_streaks
+    updated = recompute_habit_streaks()
+    return {'status': 'success', 'updated': updated}
@@ -0,0 +1,13 @@
+"""
+DRF throttles for LLM-backed Coaching OS endpoints.
+"""
+from core.rate_limit import FeatureRateThrottle
+from .services import get_ai_coach_daily_limit
+
+
+class AICoachGenerationThrottle(FeatureRateThrottle):
+    """Daily budget for one-shot AI generations (welcome, recommendation), sized by the user's plan."""
+    feature = 'ai_coach_generation'
+
+    def get_limit(self, request):
+        return get_ai_coach_daily_limit(request.user)
@@ -4,7 +4,7 @@ Habits, Goals, Reflections, AI Coach with platform integrations.
 """
 from datetime import date, timedelta
 from django.utils import timezone
-from django.db.models import Q, Count, Sum, Avg
+from django.db.models import F, Q, Count, Sum, Avg
 from django.db import transaction
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -25,7 +25,7 @@ from .serializers import (
     MentorshipSessionSerializer, CoachingSessionSerializer
 )
 from .services import (
-    update_habit_streak, calculate_coaching_metrics,
+    calculate_coaching_metrics,
     check_coaching_entitlement, emit_coaching_event
 )
 from subscriptions.utils import get_user_tier
@@ -144,8 +144,7 @@ def log_habit(request):
             }
         )
         
-        # Update streak
-        update_habit_streak(habit.id)
+        # Streak is maintained by the HabitLog post_save signal
         habit.refresh_from_db()
         
         # Emit event for platform integrations
@@ -382,12 +381,14 @@ def ai_coach_message(request):
         defaults={'prompt_count': 0}
     )
     
-    # Check rate limiting
+    # Check rate limiting (takes a token from the user's daily bucket)
     from .services import check_ai_coach_rate_limit
-    if not check_ai_coach_rate_limit(user, session):
+    rate_limit = check_ai_coach_rate_limit(user, session)
+    if not rate_limit:
         return Response(
             {'error': 'Rate limit exceeded. Please upgrade for unlimited access.'},
-            status=status.HTTP_429_TOO_MANY_REQUESTS
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers=rate_limit.headers()
         )
     
     # Create user message
@@ -427,8 +428,7 @@ def ai_coach_message(request):
             logger.error(f"Failed to create fallback response: {fallback_error}")
     
     # Increment prompt count
-    session.prompt_count += 1
-    session.save()
+    AICoachSession.objects.filter(pk=session.pk).update(prompt_count=F('prompt_count') + 1)
     
     # Emit event
     emit_coaching_event('ai_coach.session', {
@@ -442,7 +442,7 @@ def ai_coach_message(request):
         'user_message_id': str(user_msg.id),
         'task_id': str(ai_response_task.id),
         'status': 'processing'
-    }, status=status.HTTP_202_ACCEPTED)
+    }, status=status.HTTP_202_ACCEPTED, headers=rate_limit.headers())
 
 
 @api_view(['POST'])
@@ -471,12 +471,14 @@ def ai_coach_chat(request):
         defaults={'prompt_count': 0}
     )
     
-    # Check rate limiting
+    # Check rate limiting (takes a token from the user's daily bucket)
     from .services import check_ai_coach_rate_limit
-    if not check_ai_coach_rate_limit(user, session):
+    rate_limit = check_ai_coach_rate_limit(user, session)
+    if not rate_limit:
         return Response(
             {'error': 'Rate limit exceeded. Please upgrade for unlimited access.'},
-            status=status.HTTP_429_TOO_MANY_REQUESTS
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers=rate_limit.headers()
         )
     
     # Create user message
@@ -596,8 +598,7 @@ Remember: You are their personal coach who knows everything about their journey
         )
         
         # Increment prompt count
-        session.prompt_count += 1
-        session.save()
+        AICoachSession.objects.filter(pk=session.pk).update(prompt_count=F('prompt_count') + 1)
         
         # Emit event
         emit_coaching_event('ai_coach.chat', {
@@ -609,10 +610,13 @@ Remember: You are their personal coach who knows everything about their journey
         return Response({
             'response': ai_response,
             'session_id': str(session.id),
-        }, status=status.HTTP_200_OK)
+        }, status=status.HTTP_200_OK, headers=rate_limit.headers())
         
     except Exception as e:
         logger.error(f'AI Coach error: {e}')
+        # No answer was produced; don't charge the prompt against the daily limit
+        from .services import refund_ai_coach_rate_limit
+        refund_ai_coach_rate_limit(user)
         return Response(
             {'error': f'Failed to generate response: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -3,15 +3,38 @@ Community Feed Caching Layer
 
 Implements aggressive caching for feed queries to achieve <500ms response times.
 Uses Django's cache framework with Redis as the backend for production.
+
+Invalidation is by namespace generation rather than key deletion. Every cached entry
+belongs to one or more namespaces (feed:global, feed:university:<id>, post:<id>,
+leaderboard:<scope>, ...), each with a generation counter in the cache; an entry
+records the generations it was computed under, and invalidating a namespace is a
+single INCR of its counter. The entry and its generations are read in one get_many.
+
+Recomputation is single-flight: the caller that wins a short cache.add() lock
+recomputes while everyone else is served the previous value (stale-while-revalidate,
+for up to stale_ttl past expiry or invalidation) or, on a cold miss, waits briefly for
+the winner's result. Fresh entries are refreshed early with probability rising as
+expiry nears, scaled by how long the last recompute took (XFetch), so hot keys are
+usually recomputed before they expire at all.
+
+community_cache.stats counts hits, stale serves, misses, refreshes and recompute
+latency per cache kind; FeedCacheManager.get_cache_stats() reports them.
+`manage.py benchmark_community_cache` compares this against pattern deletes.
 """
 
 from django.core.cache import cache
-from django.conf import settings
 from functools import wraps
 import hashlib
 import json
 import logging
-from typing import Any, Callable, Optional, List
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Any, Callable, Iterable, Optional, List
+
+from core.versioned_cache import bump_version, current_versions
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +44,8 @@ POST_CACHE_PREFIX = 'community:post:'
 LEADERBOARD_CACHE_PREFIX = 'community:leaderboard:'
 USER_STATS_CACHE_PREFIX = 'community:user_stats:'
 UNIVERSITY_CACHE_PREFIX = 'community:university:'
+GENERATION_PREFIX = 'community:gen:'
+LOCK_PREFIX = 'community:lock:'
 
 # Default TTLs (in seconds)
 FEED_CACHE_TTL = 60  # 1 minute for feeds (balance freshness vs performance)
@@ -29,6 +54,16 @@ LEADERBOARD_CACHE_TTL = 3600  # 1 hour for leaderboards
 USER_STATS_CACHE_TTL = 600  # 10 minutes for user stats
 UNIVERSITY_CACHE_TTL = 3600  # 1 hour for university data
 
+# How long past expiry/invalidation an entry may still be served while it is recomputed
+FEED_STALE_TTL = 300
+POST_STALE_TTL = 600
+LEADERBOARD_STALE_TTL = 3600
+
+RECOMPUTE_LOCK_TTL = 10  # seconds; bounds how long a crashed recompute blocks others
+LOCK_WAIT = 0.5  # seconds a cold-miss caller waits for another caller's recompute
+LOCK_POLL = 0.02
+EARLY_REFRESH_BETA = 1.0  # > 1 refreshes earlier, < 1 later
+
 
 def generate_cache_key(prefix: str, *args, **kwargs) -> str:
     """Generate a unique cache key based on prefix and arguments."""
@@ -37,83 +72,238 @@ def generate_cache_key(prefix: str, *args, **kwargs) -> str:
     return f"{prefix}{key_hash}"
 
 
-def cached_feed(ttl: int = FEED_CACHE_TTL):
+class CacheStats:
+    """Thread-safe per-kind lookup outcome and recompute latency counters."""
+
+    OUTCOMES = ('hit', 'stale', 'wait_hit', 'early_refresh', 'refresh', 'miss')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._outcomes = defaultdict(Counter)
+            self._recompute_ms = defaultdict(list)
+            self._invalidations = Counter()
+
+    def record(self, kind: str, outcome: str):
+        with self._lock:
+            self._outcomes[kind][outcome] += 1
+
+    def record_recompute(self, kind: str, ms: float):
+        with self._lock:
+            self._recompute_ms[kind].append(ms)
+
+    def record_invalidation(self, namespace: str):
+        with self._lock:
+            self._invalidations[namespace.split(':', 1)[0]] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            kinds = {}
+            for kind in set(self._outcomes) | set(self._recompute_ms):
+                outcomes = self._outcomes[kind]
+                lookups = sum(outcomes.values())
+                served = outcomes['hit'] + outcomes['stale'] + outcomes['wait_hit']
+                times = sorted(self._recompute_ms[kind])
+                kinds[kind] = {
+                    **{outcome: outcomes[outcome] for outcome in self.OUTCOMES},
+                    'lookups': lookups,
+                    'hit_ratio': round(served / lookups, 4) if lookups else 0.0,
+                    'recomputes': len(times),
+                    'recompute_ms_avg': round(sum(times) / len(times), 3) if times else 0.0,
+                    'recompute_ms_p95': round(times[int(0.95 * (len(times) - 1))], 3) if times else 0.0,
+                    'recompute_ms_max': round(times[-1], 3) if times else 0.0,
+                }
+            return {'kinds': kinds, 'invalidations': dict(self._invalidations)}
+
+
+class GenerationalCache:
     """
-    Decorator for caching feed queries.
-    
-    Usage:
-        @cached_feed()
-        def get_university_feed(university_id, page, ...):
-            ...
+    Read-through cache with namespace generations, single-flight recompute,
+    probabilistic early refresh and stale-while-revalidate.
     """
+
+    def __init__(self, backend=None, lock_ttl: int = RECOMPUTE_LOCK_TTL, lock_wait: float = LOCK_WAIT,
+                 beta: float = EARLY_REFRESH_BETA):
+        self._backend = backend
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.beta = beta
+        self.stats = CacheStats()
+
+    @property
+    def backend(self):
+        return self._backend if self._backend is not None else cache
+
+    # Generations ----------------------------------------------------------
+
+    @staticmethod
+    def generation_key(namespace: str) -> str:
+        return f'{GENERATION_PREFIX}{namespace}'
+
+    # Generation counters are core.versioned_cache counters
+
+    def generations(self, namespaces: Iterable[str]) -> tuple:
+        return tuple(current_versions([self.generation_key(ns) for ns in namespaces], self.backend))
+
+    def bump(self, *namespaces: str) -> None:
+        """Invalidate every entry computed under any of these namespaces."""
+        for namespace in namespaces:
+            bump_version(self.generation_key(namespace), self.backend)
+            self.stats.record_invalidation(namespace)
+
+    # Reads ----------------------------------------------------------------
+
+    def _acquire(self, key: str) -> bool:
+        return self.backend.add(f'{LOCK_PREFIX}{key}', 1, self.lock_ttl)
+
+    def _release(self, key: str) -> None:
+        self.backend.delete(f'{LOCK_PREFIX}{key}')
+
+    def _refresh_early(self, entry: dict, now: float) -> bool:
+        """XFetch: recompute before expiry with probability growing as expiry nears."""
+        return now - entry['delta'] * self.beta * math.log(1.0 - random.random()) >= entry['expires']
+
+    def _recompute(self, key, compute, ttl, stale_ttl, generations, kind, locked=True):
+        started = time.perf_counter()
+        try:
+            value = compute()
+            delta = time.perf_counter() - started
+            self.backend.set(
+                key,
+                {'value': value, 'gen': generations, 'expires': time.time() + ttl, 'delta': delta},
+                ttl + stale_ttl,
+            )
+            self.stats.record_recompute(kind, delta * 1000)
+            return value
+        finally:
+            if locked:
+                self._release(key)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], ttl: int, namespaces: Iterable[str] = (),
+                       stale_ttl: int = 0, kind: str = 'default') -> Any:
+        namespaces = list(namespaces)
+        gen_keys = [self.generation_key(ns) for ns in namespaces]
+        found = self.backend.get_many([key, *gen_keys])
+        generations = tuple(current_versions(gen_keys, self.backend, found))
+        entry = found.get(key)
+        now = time.time()
+
+        if entry is not None:
+            current = tuple(entry['gen']) == generations
+            if current and now < entry['expires']:
+                if self._refresh_early(entry, now) and self._acquire(key):
+                    self.stats.record(kind, 'early_refresh')
+                    return self._recompute(key, compute, ttl, stale_ttl, generations, kind)
+                self.stats.record(kind, 'hit')
+                return entry['value']
+            # Expired or invalidated: one caller recomputes, the rest get the previous value
+            if self._acquire(key):
+                self.stats.record(kind, 'refresh')
+                return self._recompute(key, compute, ttl, stale_ttl, generations, kind)
+            self.stats.record(kind, 'stale')
+            return entry['value']
+
+        if self._acquire(key):
+            self.stats.record(kind, 'miss')
+            return self._recompute(key, compute, ttl, stale_ttl, generations, kind)
+
+        # Cold miss while another caller recomputes: wait briefly for its result
+        deadline = time.monotonic() + self.lock_wait
+        while time.monotonic() < deadline:
+            time.sleep(LOCK_POLL)
+            entry = self.backend.get(key)
+            if entry is not None and tuple(entry['gen']) == generations:
+                self.stats.record(kind, 'wait_hit')
+                return entry['value']
+        self.stats.record(kind, 'miss')
+        return self._recompute(key, compute, ttl, stale_ttl, generations, kind, locked=False)
+
+
+community_cache = GenerationalCache()
+
+
+def _feed_namespaces(args, kwargs) -> List[str]:
+    namespaces = []
+    if kwargs.get('university_id'):
+        namespaces.append(f"feed:university:{kwargs['university_id']}")
+    if kwargs.get('user_id'):
+        namespaces.append(f"feed:user:{kwargs['user_id']}")
+    return namespaces or ['feed:global']
+
+
+def _post_namespaces(args, kwargs) -> List[str]:
+    post_id = kwargs.get('post_id') or (args[0] if args else None)
+    return [f'post:{post_id}'] if post_id else []
+
+
+def _leaderboard_namespaces(args, kwargs) -> List[str]:
+    scope = kwargs.get('scope') or (args[0] if args else 'global')
+    namespaces = [f'leaderboard:{scope}']
+    if kwargs.get('university_id'):
+        namespaces.append(f"leaderboard:{scope}:{kwargs['university_id']}")
+    return namespaces
+
+
+def _cached(prefix: str, kind: str, ttl: int, stale_ttl: int, namespaces: Callable):
     def decorator(func: Callable) -> Callable:
+        def key_for(args, kwargs):
+            return generate_cache_key(prefix, func.__name__, *args, **kwargs)
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Skip cache if explicitly requested
-            skip_cache = kwargs.pop('skip_cache', False)
-            
-            if skip_cache:
+            if kwargs.pop('skip_cache', False):
                 return func(*args, **kwargs)
-            
-            cache_key = generate_cache_key(FEED_CACHE_PREFIX, func.__name__, *args, **kwargs)
-            
-            # Try to get from cache
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                logger.debug(f"Cache hit for feed: {cache_key}")
-                return cached_result
-            
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            logger.debug(f"Cache miss for feed: {cache_key}, cached for {ttl}s")
-            
-            return result
-        return wrapper
-    return decorator
+            return community_cache.get_or_compute(
+                key_for(args, kwargs),
+                lambda: func(*args, **kwargs),
+                ttl,
+                namespaces(args, kwargs),
+                stale_ttl=stale_ttl,
+                kind=kind,
+            )
 
+        def refresh(*args, **kwargs):
+            """Recompute and store now (cache warming)."""
+            generations = community_cache.generations(namespaces(args, kwargs))
+            return community_cache._recompute(
+                key_for(args, kwargs), lambda: func(*args, **kwargs), ttl, stale_ttl, generations, kind,
+                locked=False,
+            )
 
-def cached_post(ttl: int = POST_CACHE_TTL):
-    """Decorator for caching individual post lookups."""
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            skip_cache = kwargs.pop('skip_cache', False)
-            
-            if skip_cache:
-                return func(*args, **kwargs)
-            
-            cache_key = generate_cache_key(POST_CACHE_PREFIX, func.__name__, *args, **kwargs)
-            
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            
-            return result
+        wrapper.refresh = refresh
         return wrapper
     return decorator
 
 
-def cached_leaderboard(ttl: int = LEADERBOARD_CACHE_TTL):
-    """Decorator for caching leaderboard queries."""
-    def decorator(func: Callable) -> Callable:
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            cache_key = generate_cache_key(LEADERBOARD_CACHE_PREFIX, func.__name__, *args, **kwargs)
-            
-            cached_result = cache.get(cache_key)
-            if cached_result is not None:
-                return cached_result
-            
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl)
-            
-            return result
-        return wrapper
-    return decorator
+def cached_feed(ttl: int = FEED_CACHE_TTL, stale_ttl: int = FEED_STALE_TTL, namespaces: Callable = None):
+    """
+    Decorator for caching feed queries.
+
+    Entries are invalidated through feed:university:<university_id>, feed:user:<user_id>
+    or, for calls with neither keyword, feed:global; pass namespaces(args, kwargs) to
+    choose others.
+
+    Usage:
+        @cached_feed()
+        def get_university_feed(university_id, page, ...):
+            ...
+    """
+    return _cached(FEED_CACHE_PREFIX, 'feed', ttl, stale_ttl, namespaces or _feed_namespaces)
+
+
+def cached_post(ttl: int = POST_CACHE_TTL, stale_ttl: int = POST_STALE_TTL, namespaces: Callable = None):
+    """Decorator for caching individual post lookups (namespace post:<post_id>)."""
+    return _cached(POST_CACHE_PREFIX, 'post', ttl, stale_ttl, namespaces or _post_namespaces)
+
+
+def cached_leaderboard(ttl: int = LEADERBOARD_CACHE_TTL, stale_ttl: int = LEADERBOARD_STALE_TTL,
+                       namespaces: Callable = None):
+    """Decorator for caching leaderboard queries (namespaces leaderboard:<scope>[:<university_id>])."""
+    return _cached(LEADERBOARD_CACHE_PREFIX, 'leaderboard', ttl, stale_ttl, namespaces or _leaderboard_namespaces)
 
 
 class FeedCacheManager:
@@ -125,39 +315,34 @@ class FeedCacheManager:
     @staticmethod
     def invalidate_university_feed(university_id: str) -> None:
         """Invalidate all cached feeds for a university."""
-        pattern = f"{FEED_CACHE_PREFIX}*university*{university_id}*"
-        _invalidate_by_pattern(pattern)
+        community_cache.bump(f'feed:university:{university_id}')
         logger.info(f"Invalidated university feed cache: {university_id}")
     
     @staticmethod
     def invalidate_global_feed() -> None:
         """Invalidate the global feed cache."""
-        pattern = f"{FEED_CACHE_PREFIX}*global*"
-        _invalidate_by_pattern(pattern)
+        community_cache.bump('feed:global')
         logger.info("Invalidated global feed cache")
     
     @staticmethod
     def invalidate_user_feed(user_id: str) -> None:
         """Invalidate feeds related to a specific user."""
-        pattern = f"{FEED_CACHE_PREFIX}*user*{user_id}*"
-        _invalidate_by_pattern(pattern)
+        community_cache.bump(f'feed:user:{user_id}')
         logger.info(f"Invalidated user feed cache: {user_id}")
     
     @staticmethod
     def invalidate_post(post_id: str) -> None:
         """Invalidate cache for a specific post."""
-        cache_key = f"{POST_CACHE_PREFIX}{post_id}"
-        cache.delete(cache_key)
+        community_cache.bump(f'post:{post_id}')
         logger.debug(f"Invalidated post cache: {post_id}")
     
     @staticmethod
     def invalidate_leaderboard(scope: str, university_id: Optional[str] = None) -> None:
         """Invalidate leaderboard cache."""
         if university_id:
-            pattern = f"{LEADERBOARD_CACHE_PREFIX}*{scope}*{university_id}*"
+            community_cache.bump(f'leaderboard:{scope}:{university_id}')
         else:
-            pattern = f"{LEADERBOARD_CACHE_PREFIX}*{scope}*"
-        _invalidate_by_pattern(pattern)
+            community_cache.bump(f'leaderboard:{scope}')
         logger.info(f"Invalidated leaderboard cache: {scope}")
     
     @staticmethod
@@ -168,27 +353,15 @@ class FeedCacheManager:
         """
         try:
             # Warm first page
-            result = feed_func(university_id=university_id, page=1, skip_cache=True)
-            cache_key = generate_cache_key(
-                FEED_CACHE_PREFIX, 
-                feed_func.__name__, 
-                university_id=university_id, 
-                page=1
-            )
-            cache.set(cache_key, result, FEED_CACHE_TTL)
+            feed_func.refresh(university_id=university_id, page=1)
             logger.info(f"Warmed university feed cache: {university_id}")
         except Exception as e:
             logger.error(f"Failed to warm university feed cache: {e}")
     
     @staticmethod
     def get_cache_stats() -> dict:
-        """Get cache statistics (if supported by backend)."""
-        try:
-            if hasattr(cache, 'get_stats'):
-                return cache.get_stats()
-            return {'status': 'stats_not_available'}
-        except Exception:
-            return {'status': 'error'}
+        """Hit ratio, stale serves and recompute latency per cache kind, plus invalidation counts."""
+        return community_cache.stats.snapshot()
 
 
 class QueryOptimizer:
@@ -257,25 +430,6 @@ class QueryOptimizer:
         } for u in users}
 
 
-def _invalidate_by_pattern(pattern: str) -> None:
-    """
-    Invalidate cache keys matching a pattern.
-    Implementation depends on cache backend.
-    """
-    try:
-        # For Redis backend
-        if hasattr(cache, '_client'):
-            keys = cache._client.keys(pattern)
-            if keys:
-                cache._client.delete(*keys)
-        else:
-            # For other backends, we can't do pattern matching
-            # Just log that full invalidation is needed
-            logger.warning(f"Pattern-based cache invalidation not supported: {pattern}")
-    except Exception as e:
-        logger.error(f"Cache invalidation error: {e}")
-
-
 # Post-save signal handlers for cache invalidation
 def invalidate_on_post_save(sender, instance, **kwargs):
     """Signal handler to invalidate cache when a post is saved."""
@@ -0,0 +1,22 @@
+"""
+Celery configuration for community periodic tasks.
+"""
+from celery.schedules import crontab
+
+COMMUNITY_BEAT_SCHEDULE = {
+    'flush-community-view-counts': {
+        'task': 'community.flush_view_counts',
+        'schedule': 30.0,  # Drains the shared Redis tally; web workers also flush their own
+        'options': {'expires': 30},
+    },
+    'community-trending-tick': {
+        'task': 'community.trending_tick',
+        'schedule': 10 * 60.0,
+        'options': {'expires': 10 * 60},
+    },
+    'reconcile-community-counters': {
+        'task': 'community.reconcile_counters',
+        'schedule': crontab(minute=15, hour=3),
+        'options': {'expires': 60 * 60},
+    },
+}
@@ -0,0 +1,266 @@
+"""
+Engagement counters for community posts and comments.
+
+Post.reaction_count / comment_count and Comment.reaction_count / reply_count were
+recomputed with a COUNT over the related rows after every reaction or comment and
+written back with save(): a scan that grows with the post's popularity, and a lost
+update whenever two writers raced between the count and the save. Now:
+
+  - adjust_post() / adjust_comment() move a counter by a delta with one
+    UPDATE ... SET n = GREATEST(n + delta, 0), inside the transaction that inserts or
+    deletes the row being counted, with the delta taken from the rows actually
+    affected;
+  - views are tallied in a ViewCounter (a Redis hash shared by every worker when
+    COMMUNITY_VIEW_BUFFER_BACKEND is 'redis', a per-process dict otherwise) and
+    folded into Post.view_count (and the trending weights, community/trending.py)
+    every COMMUNITY_VIEW_FLUSH_INTERVAL seconds, one UPDATE per batch of posts;
+  - reconcile_counters() recounts from the source rows in keyset chunks and repairs
+    any drift (raw SQL edits, cascaded deletes, a lost view buffer). It runs as the
+    community.reconcile_counters beat task and the reconcile_community_counters
+    command.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from core.buffered_flush import BufferedFlusher, ProcessSingleton
+
+from . import trending
+
+logger = logging.getLogger(__name__)
+
+REDIS_VIEWS_KEY = 'community:views'
+FLUSH_BATCH_SIZE = 500
+RECONCILE_CHUNK_SIZE = 1000
+
+
+def _apply_deltas(queryset, deltas: Dict[str, int]) -> int:
+    changes = {field: Greatest(F(field) + delta, 0) for field, delta in deltas.items() if delta}
+    if not changes:
+        return 0
+    return queryset.update(**changes)
+
+
+def _invalidate_post_cache(post_id) -> None:
+    from .cache import FeedCacheManager
+    try:
+        FeedCacheManager.invalidate_post(str(post_id))
+    except Exception as e:
+        logger.warning(f"Cache invalidation failed for post {post_id}: {e}")
+
+
+def adjust_post(post_id, *, reactions: int = 0, comments: int = 0) -> None:
+    """Move a post's reaction/comment counters, and its trending weight, by the given deltas."""
+    from .models import Post
+    if _apply_deltas(Post.objects.filter(pk=post_id), {'reaction_count': reactions, 'comment_count': comments}):
+        trending.adjust_weight(post_id, trending.REACTION_WEIGHT * reactions + trending.COMMENT_WEIGHT * comments)
+        transaction.on_commit(lambda: _invalidate_post_cache(post_id))
+
+
+def adjust_comment(comment_id, *, reactions: int = 0, replies: int = 0) -> None:
+    """Move a comment's reaction/reply counters by the given deltas."""
+    from .models import Comment
+    _apply_deltas(Comment.objects.filter(pk=comment_id), {'reaction_count': reactions, 'reply_count': replies})
+
+
+# Views ------------------------------------------------------------------------
+
+def write_view_counts(counts: Dict[str, int]) -> int:
+    """
+    Add buffered view tallies to Post.view_count and the posts' trending weights; one
+    UPDATE of each per FLUSH_BATCH_SIZE posts.
+    """
+    from .models import Post
+    post_ids = [post_id for post_id, n in counts.items() if n]
+    updated = 0
+    for start in range(0, len(post_ids), FLUSH_BATCH_SIZE):
+        batch = post_ids[start:start + FLUSH_BATCH_SIZE]
+        added = Case(
+            *[When(pk=post_id, then=Value(counts[post_id])) for post_id in batch],
+            default=Value(0), output_field=IntegerField(),
+        )
+        updated += Post.objects.filter(pk__in=batch).update(view_count=F('view_count') + added)
+    trending.adjust_weights({post_id: trending.VIEW_WEIGHT * counts[post_id] for post_id in post_ids})
+    return updated
+
+
+class ViewCounter(BufferedFlusher):
+    """Post view tallies with periodic bulk flushing; Redis-backed when a client is given."""
+
+    thread_name = 'community-view-flusher'
+
+    def __init__(self, flush_interval: float = 10.0, redis_client=None):
+        super().__init__(flush_interval)
+        self.redis = redis_client
+        self._counts: Counter = Counter()
+
+    def record(self, post_id, n: int = 1) -> None:
+        post_id = str(post_id)
+        if self.redis is not None:
+            try:
+                self.redis.hincrby(REDIS_VIEWS_KEY, post_id, n)
+                self._ensure_flusher()
+                return
+            except Exception as e:
+                logger.warning(f"View counter Redis increment failed, counting in-process: {e}")
+        with self._lock:
+            self._counts[post_id] += n
+        self._ensure_flusher()
+
+    def pending(self, post_id=None) -> int:
+        """Views not yet written, for one post or in total."""
+        with self._lock:
+            local = self._counts.get(str(post_id), 0) if post_id is not None else sum(self._counts.values())
+        if self.redis is None:
+            return local
+        try:
+            if post_id is not None:
+                return local + int(self.redis.hget(REDIS_VIEWS_KEY, str(post_id)) or 0)
+            return local + sum(int(n) for n in self.redis.hvals(REDIS_VIEWS_KEY))
+        except Exception:
+            return local
+
+    def _drain(self) -> Counter:
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if self.redis is not None:
+            # RENAME is atomic: increments after it land in a fresh hash for the next flush
+            claimed = f'{REDIS_VIEWS_KEY}:flushing:{uuid.uuid4().hex}'
+            try:
+                self.redis.rename(REDIS_VIEWS_KEY, claimed)
+            except Exception:
+                claimed = None  # no pending views (or Redis unavailable)
+            if claimed:
+                pipe = self.redis.pipeline()
+                pipe.hgetall(claimed)
+                pipe.delete(claimed)
+                raw, _ = pipe.execute()
+                for post_id, n in raw.items():
+                    counts[post_id.decode() if isinstance(post_id, bytes) else post_id] += int(n)
+        return counts
+
+    def _requeue(self, counts: Counter) -> None:
+        with self._lock:
+            self._counts.update(counts)
+
+    def flush(self) -> int:
+        """Write every pending tally; returns the number of posts updated."""
+        with self._flush_lock:
+            counts = self._drain()
+            if not counts:
+                return 0
+            try:
+                return write_view_counts(counts)
+            except Exception as e:
+                # Tallies are additive, so a failed batch is simply kept for the next flush
+                logger.warning(f"View count flush failed for {len(counts)} posts: {e}")
+                self._requeue(counts)
+                return 0
+
+
+def _build_view_counter() -> ViewCounter:
+    redis_client = None
+    if getattr(settings, 'COMMUNITY_VIEW_BUFFER_BACKEND', 'memory') == 'redis':
+        from core.redis_utils import get_redis_client
+        redis_client = get_redis_client()
+    return ViewCounter(
+        flush_interval=getattr(settings, 'COMMUNITY_VIEW_FLUSH_INTERVAL', 10.0),
+        redis_client=redis_client,
+    )
+
+
+_view_counter = ProcessSingleton(_build_view_counter)
+
+
+def get_view_counter() -> ViewCounter:
+    """Return the process-wide view counter, creating it from settings on first use."""
+    return _view_counter.get()
+
+
+def record_view(post_id) -> None:
+    """Count one view of a post, buffered unless COMMUNITY_VIEW_BUFFER_ENABLED is off."""
+    if not getattr(settings, 'COMMUNITY_VIEW_BUFFER_ENABLED', True):
+        write_view_counts({str(post_id): 1})
+        return
+    get_view_counter().record(post_id)
+
+
+def flush_views() -> int:
+    counter = _view_counter.instance
+    if counter is None:
+        return 0
+    return counter.flush()
+
+
+# Reconciliation ---------------------------------------------------------------
+
+def _count_subquery(model, filters: Q, outer_field: str):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(filters, **{outer_field: OuterRef('pk')})
+            .order_by().values(outer_field).annotate(n=Count('pk')).values('n')[:1],
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+def _reconcile(queryset, expected: Dict[str, object], chunk_size: int) -> int:
+    """Compare each row's counters with recounts; update the rows that drifted."""
+    repaired = 0
+    last_pk = None
+    fields = list(expected)
+    while True:
+        chunk = queryset.order_by('pk')
+        if last_pk is not None:
+            chunk = chunk.filter(pk__gt=last_pk)
+        rows = list(chunk.annotate(**{f'_actual_{f}': e for f, e in expected.items()}).values(
+            'pk', *fields, *[f'_actual_{f}' for f in fields],
+        )[:chunk_size])
+        if not rows:
+            break
+        last_pk = rows[-1]['pk']
+        for row in rows:
+            drift = {f: row[f'_actual_{f}'] for f in fields if row[f] != row[f'_actual_{f}']}
+            if drift:
+                # Only if the counters still hold what was read: a delta committed since
+                # the recount would otherwise be overwritten. Skipped rows wait for the next run.
+                repaired += queryset.model.objects.filter(
+                    pk=row['pk'], **{f: row[f] for f in drift},
+                ).update(**drift)
+    return repaired
+
+
+def reconcile_counters(post_ids: Optional[Iterable] = None, chunk_size: int = RECONCILE_CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Recount reactions, comments and replies for posts (all, or the given ones) and
+    their comments; returns the number of posts and comments repaired.
+    """
+    from .models import Comment, Post, Reaction
+
+    posts = Post.objects.all()
+    comments = Comment.objects.all()
+    if post_ids is not None:
+        post_ids = list(post_ids)
+        posts = posts.filter(pk__in=post_ids)
+        comments = comments.filter(post_id__in=post_ids)
+
+    return {
+        'posts': _reconcile(posts, {
+            'reaction_count': _count_subquery(Reaction, Q(), 'post'),
+            'comment_count': _count_subquery(Comment, Q(is_deleted=False), 'post'),
+        }, chunk_size),
+        'comments': _reconcile(comments, {
+            'reaction_count': _count_subquery(Reaction, Q(), 'comment'),
+            'reply_count': _count_subquery(Comment, Q(is_deleted=False), 'parent'),
+        }, chunk_size),
+    }
@@ -0,0 +1,260 @@
+"""
+Batched viewer-state hydration for community serializers.
+
+Serializing a feed page used to cost several queries per post (reaction counts, the
+viewer's reaction, poll votes, top comments, and the author's university and badge
+count), plus the same again for every nested comment and reply.
+
+ViewerStateLoader is a DataLoader-style per-request store. Serializers register the
+objects they are about to render (HydratingListSerializer does it for a whole page);
+the first lookup of a kind of data loads it for every registered object in one grouped
+query, and later lookups are dict reads. Objects that were never registered return
+MISSING so the serializer can fall back to its per-object query.
+
+The loader lives in the serializer context under 'viewer_state' and is shared by the
+root serializer and everything nested under it.
+"""
+
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+from rest_framework import serializers
+
+MISSING = object()
+
+CONTEXT_KEY = 'viewer_state'
+TOP_COMMENTS_PER_POST = 3
+REPLIES_PER_COMMENT = 5
+
+
+class ViewerStateLoader:
+    def __init__(self, user=None):
+        self.user = user if user is not None and user.is_authenticated else None
+        self._registered = {'post': set(), 'comment': set(), 'user': set()}
+        self._batches = {}
+
+    # Registration ---------------------------------------------------------
+
+    def add_posts(self, posts):
+        for post in posts:
+            self._registered['post'].add(post.pk)
+            self._registered['user'].add(post.author_id)
+            if post.pinned_by_id:
+                self._registered['user'].add(post.pinned_by_id)
+
+    def add_comments(self, comments):
+        for comment in comments:
+            self._registered['comment'].add(comment.pk)
+            self._registered['user'].add(comment.author_id)
+
+    def add_users(self, users):
+        self._registered['user'].update(user.pk for user in users)
+
+    # Post lookups ----------------------------------------------------------
+
+    def post_reaction_counts(self, post):
+        return self._lookup('post_reaction_counts', 'post', post.pk, list, self._fetch_post_reaction_counts)
+
+    def post_user_reaction(self, post):
+        return self._lookup('post_user_reaction', 'post', post.pk, lambda: None, self._fetch_post_user_reaction)
+
+    def poll_vote(self, post):
+        return self._lookup('poll_vote', 'post', post.pk, list, self._fetch_poll_votes)
+
+    def top_comments(self, post):
+        return self._lookup('top_comments', 'post', post.pk, list, self._fetch_top_comments)
+
+    # Comment lookups -------------------------------------------------------
+
+    def replies(self, comment):
+        return self._lookup('replies', 'comment', comment.pk, list, self._fetch_replies)
+
+    def comment_reaction_counts(self, comment):
+        return self._lookup('comment_reaction_counts', 'comment', comment.pk, list, self._fetch_comment_reaction_counts)
+
+    def comment_user_reaction(self, comment):
+        return self._lookup('comment_user_reaction', 'comment', comment.pk, lambda: None, self._fetch_comment_user_reaction)
+
+    # User lookups ----------------------------------------------------------
+
+    def university_name(self, user):
+        return self._lookup('university_name', 'user', user.pk, lambda: None, self._fetch_university_names)
+
+    def badge_count(self, user):
+        return self._lookup('badge_count', 'user', user.pk, int, self._fetch_badge_counts)
+
+    # Batching --------------------------------------------------------------
+
+    def _lookup(self, name, kind, key, default, fetch):
+        if key not in self._registered[kind]:
+            return MISSING
+        batch = self._batches.setdefault(name, {})
+        if key not in batch:
+            pending = [k for k in self._registered[kind] if k not in batch]
+            for k in pending:
+                batch[k] = default()
+            fetch(pending, batch)
+        return batch[key]
+
+    def _fetch_post_reaction_counts(self, post_ids, batch):
+        from .models import Reaction
+        rows = (
+            Reaction.objects.filter(post_id__in=post_ids)
+            .values('post_id', 'reaction_type')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        for row in rows:
+            batch[row['post_id']].append({'reaction_type': row['reaction_type'], 'count': row['count']})
+
+    def _fetch_post_user_reaction(self, post_ids, batch):
+        if self.user is None:
+            return
+        from .models import Reaction
+        rows = (
+            Reaction.objects.filter(post_id__in=post_ids, user=self.user)
+            .order_by('pk')
+            .values_list('post_id', 'reaction_type')
+        )
+        for post_id, reaction_type in rows:
+            if batch[post_id] is None:
+                batch[post_id] = reaction_type
+
+    def _fetch_poll_votes(self, post_ids, batch):
+        if self.user is None:
+            return
+        from .models import PollVote
+        rows = (
+            PollVote.objects.filter(post_id__in=post_ids, user=self.user)
+            .order_by('pk')
+            .values_list('post_id', 'option_id')
+        )
+        for post_id, option_id in rows:
+            batch[post_id].append(option_id)
+
+    def _fetch_top_comments(self, post_ids, batch):
+        from .models import Comment
+        comments = list(
+            Comment.objects.filter(post_id__in=post_ids, parent__isnull=True, is_deleted=False)
+            .select_related('author')
+            .annotate(rank=Window(
+                RowNumber(),
+                partition_by=[F('post_id')],
+                order_by=[F('reaction_count').desc(), F('created_at').asc()],
+            ))
+            .filter(rank__lte=TOP_COMMENTS_PER_POST)
+            .order_by('post_id', 'rank')
+        )
+        self.add_comments(comments)
+        for comment in comments:
+            batch[comment.post_id].append(comment)
+
+    def _fetch_replies(self, comment_ids, batch):
+        from .models import Comment
+        replies = list(
+            Comment.objects.filter(parent_id__in=comment_ids, is_deleted=False)
+            .select_related('author')
+            .annotate(rank=Window(
+                RowNumber(),
+                partition_by=[F('parent_id')],
+                order_by=[F('created_at').asc()],
+            ))
+            .filter(rank__lte=REPLIES_PER_COMMENT)
+            .order_by('parent_id', 'rank')
+        )
+        self.add_comments(replies)
+        for reply in replies:
+            batch[reply.parent_id].append(reply)
+
+    def _fetch_comment_reaction_counts(self, comment_ids, batch):
+        from .models import Reaction
+        rows = (
+            Reaction.objects.filter(comment_id__in=comment_ids)
+            .values('comment_id', 'reaction_type')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        for row in rows:
+            batch[row['comment_id']].append({'reaction_type': row['reaction_type'], 'count': row['count']})
+
+    def _fetch_comment_user_reaction(self, comment_ids, batch):
+        if self.user is None:
+            return
+        from .models import Reaction
+        rows = (
+            Reaction.objects.filter(comment_id__in=comment_ids, user=self.user)
+            .order_by('pk')
+            .values_list('comment_id', 'reaction_type')
+        )
+        for comment_id, reaction_type in rows:
+            if batch[comment_id] is None:
+                batch[comment_id] = reaction_type
+
+    def _fetch_university_names(self, user_ids, batch):
+        from .models import UniversityMembership
+        rows = (
+            UniversityMembership.objects.filter(user_id__in=user_ids, is_primary=True)
+            .order_by('pk')
+            .values_list('user_id', 'university__name')
+        )
+        for user_id, name in rows:
+            if batch[user_id] is None:
+                batch[user_id] = name
+
+    def _fetch_badge_counts(self, user_ids, batch):
+        from .models import UserBadge
+        rows = (
+            UserBadge.objects.filter(user_id__in=user_ids)
+            .values('user_id')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        for row in rows:
+            batch[row['user_id']] = row['count']
+
+
+def get_viewer_state(context):
+    """Return the request's loader, creating it in the serializer context on first use."""
+    loader = context.get(CONTEXT_KEY)
+    if loader is None:
+        request = context.get('request')
+        loader = ViewerStateLoader(getattr(request, 'user', None))
+        context[CONTEXT_KEY] = loader
+    return loader
+
+
+class HydratingListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer that registers the whole page with the viewer-state loader before
+    rendering, so each child's lookups are served from one batch per kind of data.
+    """
+
+    def to_representation(self, data):
+        iterable = data.all() if hasattr(data, 'all') else data
+        items = list(iterable)
+        self.child.register_viewer_state(get_viewer_state(self.context), items)
+        return [self.child.to_representation(item) for item in items]
+
+
+class ViewerStateMixin:
+    """
+    Serializer mixin: register single instances too (detail views), and read hydrated
+    values with `self.hydrated(<loader method>, obj)`, which returns MISSING when the
+    loader has nothing for the object.
+    """
+
+    def register_viewer_state(self, loader, instances):
+        """
+        Register what this serializer will look up for `instances` with the loader.
+        The default registers nothing, so hydrated() returns MISSING and fields fall
+        back to their own per-object lookups; serializers override it to batch them.
+        """
+
+    def to_representation(self, instance):
+        self.register_viewer_state(get_viewer_state(self.context), [instance])
+        return super().to_representation(instance)
+
+    def hydrated(self, accessor, obj):
+        loader = self.context.get(CONTEXT_KEY)
+        if loader is None:
+            return MISSING
+        return getattr(loader, accessor)(obj)
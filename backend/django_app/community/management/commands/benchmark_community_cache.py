@@ -0,0 +1,200 @@
+"""
+Benchmark for the community cache layer (community/cache.py).
+
+Compares generation-counter invalidation, single-flight recompute and
+stale-while-revalidate against the previous approach (pattern deletes and an
+unlocked recompute on every miss):
+
+  1. invalidation: cost of invalidating one university's feeds while `--entries`
+     cached feeds exist, pattern scan + delete vs one generation bump;
+  2. stampede: `--threads` concurrent readers hit a hot feed right after it is
+     invalidated; counts recomputes and reports reader latency.
+
+Runs against Redis when it is reachable (--backend redis, or auto with
+USE_REDIS_CACHE=true), otherwise against a private in-memory cache. No database access.
+"""
+import fnmatch
+import os
+import statistics
+import threading
+import time
+
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+
+from community.cache import FEED_CACHE_PREFIX, FEED_STALE_TTL, GenerationalCache
+
+
+class _PatternStore:
+    """The previous invalidation path: find keys matching a glob, then delete them."""
+
+    def __init__(self, backend, redis_client=None):
+        self.backend = backend
+        self.redis = redis_client
+
+    def invalidate(self, pattern):
+        if self.redis is not None:
+            keys = self.redis.keys(f'*{pattern}')
+            if keys:
+                self.redis.delete(*keys)
+            return len(keys)
+        # LocMemCache has no KEYS; scan its key space the same way
+        matched = [k.split(':', 2)[2] for k in list(self.backend._cache) if fnmatch.fnmatch(k, f'*{pattern}')]
+        self.backend.delete_many(matched)
+        return len(matched)
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+class Command(BaseCommand):
+    help = 'Benchmark generation-based community caching against pattern-delete invalidation'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', choices=['auto', 'memory', 'redis'], default='auto')
+        parser.add_argument('--entries', type=int, default=20000, help='Cached feed entries')
+        parser.add_argument('--universities', type=int, default=200, help='Feed namespaces the entries spread over')
+        parser.add_argument('--invalidations', type=int, default=200)
+        parser.add_argument('--threads', type=int, default=32, help='Concurrent readers in the stampede test')
+        parser.add_argument('--rounds', type=int, default=5, help='Stampede rounds')
+        parser.add_argument('--compute-ms', type=float, default=50.0, help='Simulated feed query time')
+
+    def _backend(self, choice):
+        from core.redis_utils import get_redis_client
+        client = get_redis_client() if choice != 'memory' else None
+        if choice == 'redis' and client is None:
+            raise CommandError('Redis is not reachable (set USE_REDIS_CACHE=true and REDIS_HOST/REDIS_PORT)')
+        if client is None:
+            return 'memory', LocMemCache('community-cache-benchmark', {'OPTIONS': {'MAX_ENTRIES': 10 ** 7}}), None
+
+        from django.conf import settings
+        from django.core.cache.backends.redis import RedisCache
+        prefix = f'cachebench{os.getpid()}'
+        location = f"redis://{settings.REDIS_HOST}:{settings.REDIS_PORT}/{getattr(settings, 'REDIS_DB', 1)}"
+        return 'redis', RedisCache(location, {'KEY_PREFIX': prefix}), client
+
+    def handle(self, *args, **options):
+        name, backend, redis_client = self._backend(options['backend'])
+        self.stdout.write(f'Backend: {name}')
+        try:
+            self._invalidation(backend, redis_client, options)
+            self._stampede(backend, redis_client, options)
+        finally:
+            if redis_client is not None:
+                keys = redis_client.keys(f'*{backend.key_prefix}*')
+                if keys:
+                    redis_client.delete(*keys)
+            else:
+                backend.clear()
+
+    # 1. Invalidation cost ---------------------------------------------------
+
+    def _invalidation(self, backend, redis_client, options):
+        entries, universities = options['entries'], options['universities']
+        generational = GenerationalCache(backend=backend)
+        legacy = _PatternStore(backend, redis_client)
+
+        payload = {'results': list(range(20))}
+        legacy_entries = {
+            f'{FEED_CACHE_PREFIX}university:{i % universities}:page{i}': payload for i in range(entries)
+        }
+        for start in range(0, entries, 1000):
+            backend.set_many(dict(list(legacy_entries.items())[start:start + 1000]), 600)
+
+        count = options['invalidations']
+        started = time.perf_counter()
+        deleted = 0
+        for i in range(count):
+            deleted += legacy.invalidate(f'{FEED_CACHE_PREFIX}*university*:{i % universities}:*')
+        legacy_ms = (time.perf_counter() - started) * 1000 / count
+
+        started = time.perf_counter()
+        for i in range(count):
+            generational.bump(f'feed:university:{i % universities}')
+        generation_ms = (time.perf_counter() - started) * 1000 / count
+
+        self.stdout.write(f'\nInvalidation ({entries} cached feeds, {count} invalidations)')
+        self.stdout.write(f'  pattern delete:   {legacy_ms:9.3f} ms each ({deleted} keys deleted)')
+        self.stdout.write(f'  generation bump:  {generation_ms:9.3f} ms each')
+        if generation_ms:
+            self.stdout.write(self.style.SUCCESS(f'  speedup: {legacy_ms / generation_ms:.0f}x'))
+
+    # 2. Stampede ------------------------------------------------------------
+
+    def _stampede(self, backend, redis_client, options):
+        threads, rounds = options['threads'], options['rounds']
+        compute_s = options['compute_ms'] / 1000.0
+        results = {}
+
+        for strategy in ('unlocked', 'single-flight'):
+            generational = GenerationalCache(backend=backend)
+            legacy = _PatternStore(backend, redis_client)
+            recomputes = []
+            latencies = []
+            lock = threading.Lock()
+            key = f'{FEED_CACHE_PREFIX}bench:hot:{strategy}'
+
+            def compute():
+                with lock:
+                    recomputes[-1] += 1
+                time.sleep(compute_s)
+                return {'results': list(range(20))}
+
+            def read():
+                if strategy == 'single-flight':
+                    return generational.get_or_compute(
+                        key, compute, 60, ['feed:bench'], stale_ttl=FEED_STALE_TTL, kind='feed',
+                    )
+                value = backend.get(key)
+                if value is None:
+                    value = compute()
+                    backend.set(key, value, 60)
+                return value
+
+            # Warm once, then each round invalidates and releases every reader at the same moment
+            recomputes.append(0)
+            read()
+            for _ in range(rounds):
+                if strategy == 'single-flight':
+                    generational.bump('feed:bench')
+                else:
+                    legacy.invalidate(key)
+                recomputes.append(0)
+                barrier = threading.Barrier(threads)
+
+                def reader():
+                    barrier.wait()
+                    started = time.perf_counter()
+                    read()
+                    with lock:
+                        latencies.append((time.perf_counter() - started) * 1000)
+
+                workers = [threading.Thread(target=reader) for _ in range(threads)]
+                for worker in workers:
+                    worker.start()
+                for worker in workers:
+                    worker.join()
+
+            results[strategy] = {
+                'recomputes': statistics.mean(recomputes[1:]),
+                'p50': _percentile(latencies, 50),
+                'p99': _percentile(latencies, 99),
+                'stats': generational.stats.snapshot()['kinds'].get('feed'),
+            }
+
+        self.stdout.write(f'\nStampede ({threads} readers per invalidation, {rounds} rounds, '
+                          f"{options['compute_ms']:.0f} ms recompute)")
+        for strategy, result in results.items():
+            self.stdout.write(
+                f"  {strategy:<14} recomputes/invalidation {result['recomputes']:6.1f}   "
+                f"p50 {result['p50']:8.2f} ms   p99 {result['p99']:8.2f} ms"
+            )
+        stats = results['single-flight']['stats']
+        if stats:
+            self.stdout.write(
+                f"  single-flight hit ratio {stats['hit_ratio']:.2%} "
+                f"(stale {stats['stale']}, refresh {stats['refresh']}, miss {stats['miss']}), "
+                f"recompute avg {stats['recompute_ms_avg']:.1f} ms"
+            )
@@ -0,0 +1,187 @@
+"""
+Benchmark for the community trending index (community/trending.py).
+
+Creates `--posts` synthetic posts (default 1,000,000) across `--universities`
+universities and `--authors` authors, with skewed engagement counts and ages spread
+over `--days` days, builds the index with trending.rebuild(), then compares for the
+global and a university feed:
+
+  1. page 1: the query-time ranking FeedView used (annotate + sort the candidate set)
+     vs one keyset read of the index;
+  2. page `--depth`: OFFSET into the query-time ranking vs the index cursor;
+  3. total_count: COUNT over the candidate posts vs over the index range.
+
+Also times a reaction's weight update and one tick(). Everything is rolled back.
+Run against PostgreSQL; SQLite works for small --posts.
+"""
+import random
+import time
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from community import trending
+from community.models import Post, University
+from community.views import FeedView
+
+User = get_user_model()
+
+BULK_BATCH_SIZE = 5000
+POST_TYPES = ['text'] * 14 + ['media'] * 3 + ['event', 'achievement', 'poll']
+TRACKS = ['defender', 'offensive', 'grc', 'innovation', 'leadership']
+
+
+class Rollback(Exception):
+    pass
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+class Command(BaseCommand):
+    help = 'Compare community feed pages from the trending index against query-time ranking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=1000000)
+        parser.add_argument('--universities', type=int, default=50)
+        parser.add_argument('--authors', type=int, default=2000)
+        parser.add_argument('--days', type=int, default=120, help='Posts are spread over this many days')
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--depth', type=int, default=50, help='Page number for the deep-page comparison')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed reads per measurement')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Synthetic data rolled back')
+
+    def _populate(self, options, rng):
+        run_id = uuid.uuid4().hex[:8]
+        universities = University.objects.bulk_create([
+            University(name=f'Bench {run_id} {i}', slug=f'bench-{run_id}-{i}', code=f'B{run_id}{i}'[:20])
+            for i in range(options['universities'])
+        ])
+        User.objects.bulk_create(
+            [
+                User(username=f'bench-{run_id}-{i}', email=f'bench-{run_id}-{i}@bench.local', track_key=rng.choice(TRACKS))
+                for i in range(options['authors'])
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        authors = list(User.objects.filter(username__startswith=f'bench-{run_id}-').values_list('id', flat=True))
+
+        now = timezone.now()
+        span = options['days'] * 86400
+        created_at = Post._meta.get_field('created_at')
+        created_at.auto_now_add = False  # keep the synthetic ages
+        try:
+            batch = []
+            for i in range(options['posts']):
+                engaged = rng.random() < 0.3
+                batch.append(Post(
+                    author_id=rng.choice(authors),
+                    university=rng.choice(universities),
+                    post_type=rng.choice(POST_TYPES),
+                    content=f'Synthetic post {i}',
+                    visibility='global' if rng.random() < 0.8 else 'university',
+                    status='published',
+                    is_featured=rng.random() < 0.001,
+                    reaction_count=int(rng.paretovariate(1.5)) - 1 if engaged else 0,
+                    comment_count=int(rng.paretovariate(2.0)) - 1 if engaged else 0,
+                    view_count=int(rng.paretovariate(1.2) * 10) if engaged else rng.randint(0, 5),
+                    created_at=now - timedelta(seconds=rng.random() * span),
+                ))
+                if len(batch) == BULK_BATCH_SIZE:
+                    Post.objects.bulk_create(batch)
+                    batch = []
+            if batch:
+                Post.objects.bulk_create(batch)
+        finally:
+            created_at.auto_now_add = True
+        return universities
+
+    def _compare(self, label, legacy_queryset, ranges, options):
+        size, depth, repeat = options['page_size'], options['depth'], options['repeat']
+
+        legacy_first = _timed(lambda: list(legacy_queryset[:size]), repeat)
+        index_first = _timed(lambda: trending.page(ranges, page_size=size), repeat)
+
+        offset = (depth - 1) * size
+        legacy_deep = _timed(lambda: list(legacy_queryset[offset:offset + size]), repeat)
+        cursor = None
+        for _ in range(depth - 1):
+            _, cursor = trending.page(ranges, cursor=cursor, page_size=size)
+        index_deep = _timed(lambda: trending.page(ranges, cursor=cursor, page_size=size), repeat)
+
+        legacy_count = _timed(legacy_queryset.count, max(3, repeat // 4))
+        index_count = _timed(lambda: trending.count(ranges), max(3, repeat // 4))
+
+        self.stdout.write(f'\n{label} ({size} posts per page, {index_count and trending.count(ranges)} posts)')
+        for name, legacy, index in (
+            ('page 1', legacy_first, index_first),
+            (f'page {depth}', legacy_deep, index_deep),
+            ('total_count', legacy_count, index_count),
+        ):
+            self.stdout.write(
+                f'  {name:12s} query-time p50 {_percentile(legacy, 50):8.1f} ms  p95 {_percentile(legacy, 95):8.1f} ms'
+                f'   index p50 {_percentile(index, 50):7.2f} ms  p95 {_percentile(index, 95):7.2f} ms'
+                f'   {_percentile(legacy, 50) / max(_percentile(index, 50), 0.001):7.1f}x'
+            )
+
+    def _run(self, options):
+        rng = random.Random(options['seed'])
+
+        started = time.perf_counter()
+        universities = self._populate(options, rng)
+        self.stdout.write(f"Created {options['posts']} posts in {time.perf_counter() - started:.1f} s")
+
+        started = time.perf_counter()
+        entries = trending.rebuild()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'Indexed {entries} entries in {elapsed:.1f} s ({entries / elapsed:,.0f}/sec)')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE community_posts')
+                cursor.execute('ANALYZE community_trending_entries')
+
+        feed = FeedView()
+        base = Post.objects.filter(status='published').select_related('author', 'university', 'pinned_by')
+        self._compare('Global feed', feed._get_global_feed(base), trending.feed_ranges('global', None, None), options)
+
+        university = universities[0]
+        membership = SimpleNamespace(university=university, university_id=university.id)
+        self._compare(
+            f'University feed ({university.name})', feed._get_university_feed(base, membership),
+            trending.feed_ranges('university', None, membership), options,
+        )
+
+        post_id = trending.page(trending.feed_ranges('global', None, None), page_size=1)[0][0].id
+        react = _timed(lambda: trending.adjust_weight(post_id, trending.REACTION_WEIGHT), options['repeat'])
+        self.stdout.write(f'\nReaction weight update p50 {_percentile(react, 50):.2f} ms')
+
+        started = time.perf_counter()
+        result = trending.tick()
+        self.stdout.write(self.style.SUCCESS(
+            f"Tick: {result['scanned']} posts in the window, {result['repaired']} entries repaired "
+            f'in {time.perf_counter() - started:.2f} s'
+        ))
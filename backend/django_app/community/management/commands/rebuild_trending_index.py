@@ -0,0 +1,35 @@
+"""
+Management command to (re)build the community trending index.
+
+Writes the TrendingEntry rows of every published post from its current fields and
+counters (see community/trending.py). Run once after deploying the index, and after
+bulk imports or edits that bypass Post.save():
+    python manage.py rebuild_trending_index
+    python manage.py rebuild_trending_index --post <uuid> --post <uuid>
+    python manage.py rebuild_trending_index --tick
+"""
+from django.core.management.base import BaseCommand
+
+from community.trending import REBUILD_CHUNK_SIZE, rebuild, tick
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the community trending feed index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--post', action='append', dest='post_ids', help='Only this post (repeatable)')
+        parser.add_argument('--chunk-size', type=int, default=REBUILD_CHUNK_SIZE)
+        parser.add_argument('--tick', action='store_true', help='Run the periodic weight refresh instead')
+
+    def handle(self, *args, **options):
+        if options['tick']:
+            result = tick()
+            if result['rebased']:
+                self.stdout.write(f"Half-life changed, rebuilt {result['rebased']} entries")
+            self.stdout.write(self.style.SUCCESS(
+                f"Scanned {result['scanned']} posts, repaired {result['repaired']} entries, "
+                f"unpinned {result['unpinned']} posts"
+            ))
+            return
+        written = rebuild(post_ids=options['post_ids'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Wrote {written} trending entries"))
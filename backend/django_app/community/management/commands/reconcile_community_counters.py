@@ -0,0 +1,29 @@
+"""
+Management command to repair drift in community engagement counters.
+
+Recounts Post.reaction_count / comment_count and Comment.reaction_count /
+reply_count from the reaction and comment rows and rewrites the ones that differ
+(see community/counters.py). Runs nightly as the community.reconcile_counters beat
+task; run by hand after bulk edits:
+    python manage.py reconcile_community_counters
+    python manage.py reconcile_community_counters --post <uuid> --post <uuid>
+"""
+from django.core.management.base import BaseCommand
+
+from community.counters import RECONCILE_CHUNK_SIZE, flush_views, reconcile_counters
+
+
+class Command(BaseCommand):
+    help = 'Recount community reaction, comment and reply counters and repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--post', action='append', dest='post_ids', help='Only this post (repeatable)')
+        parser.add_argument('--chunk-size', type=int, default=RECONCILE_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        flushed = flush_views()
+        repaired = reconcile_counters(post_ids=options['post_ids'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Repaired {repaired['posts']} posts and {repaired['comments']} comments"
+            f" ({flushed} posts' buffered views flushed)"
+        ))
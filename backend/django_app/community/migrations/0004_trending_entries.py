@@ -0,0 +1,35 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0003_add_discord_style_community'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingEntry',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('scope', models.CharField(choices=[('global', 'Global'), ('university', 'University'), ('track', 'Track')], max_length=20)),
+                ('scope_key', models.CharField(blank=True, default='', help_text='University id or track key', max_length=100)),
+                ('tier', models.SmallIntegerField(default=0, help_text='2 pinned, 1 featured, 0 other')),
+                ('weight', models.FloatField(default=1.0, help_text='Undecayed engagement weight')),
+                ('anchor', models.FloatField(default=0.0, help_text='Type boost and creation time, in log space')),
+                ('rank', models.FloatField(default=0.0, help_text='Sort key: tier offset + anchor + ln(weight)')),
+                ('created_at', models.DateTimeField(help_text='Copy of Post.created_at, the tie-break')),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trending_entries', to='community.post')),
+            ],
+            options={
+                'db_table': 'community_trending_entries',
+                'unique_together': {('post', 'scope')},
+                'indexes': [
+                    models.Index(fields=['scope', 'scope_key', '-rank', '-created_at', '-post'], name='community_trending_rank_idx'),
+                    models.Index(fields=['created_at'], name='community_trending_created_idx'),
+                    models.Index(condition=models.Q(('tier', 2)), fields=['tier'], name='community_trending_tier_idx'),
+                ],
+            },
+        ),
+    ]
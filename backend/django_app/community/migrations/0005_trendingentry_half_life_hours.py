@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('community', '0004_trending_entries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trendingentry',
+            name='half_life_hours',
+            field=models.FloatField(default=24.0, help_text='Half-life the anchor was computed with'),
+        ),
+    ]
@@ -510,6 +510,41 @@ class Reaction(models.Model):
         return f"{self.user.email} reacted {self.reaction_type} on {target}"
 
 
+class TrendingEntry(models.Model):
+    """
+    A published post's place in one trending feed (global, its university, its
+    author's track). Maintained by community/trending.py; feeds page by `rank`.
+    """
+    SCOPES = [
+        ('global', 'Global'),
+        ('university', 'University'),
+        ('track', 'Track'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='trending_entries')
+    scope = models.CharField(max_length=20, choices=SCOPES)
+    scope_key = models.CharField(max_length=100, blank=True, default='', help_text='University id or track key')
+    tier = models.SmallIntegerField(default=0, help_text='2 pinned, 1 featured, 0 other')
+    weight = models.FloatField(default=1.0, help_text='Undecayed engagement weight')
+    anchor = models.FloatField(default=0.0, help_text='Type boost and creation time, in log space')
+    half_life_hours = models.FloatField(default=24.0, help_text='Half-life the anchor was computed with')
+    rank = models.FloatField(default=0.0, help_text='Sort key: tier offset + anchor + ln(weight)')
+    created_at = models.DateTimeField(help_text='Copy of Post.created_at, the tie-break')
+
+    class Meta:
+        db_table = 'community_trending_entries'
+        unique_together = [['post', 'scope']]
+        indexes = [
+            models.Index(fields=['scope', 'scope_key', '-rank', '-created_at', '-post'], name='community_trending_rank_idx'),
+            models.Index(fields=['created_at'], name='community_trending_created_idx'),
+            models.Index(fields=['tier'], name='community_trending_tier_idx', condition=models.Q(tier=2)),
+        ]
+
+    def __str__(self):
+        return f"{self.post_id} in {self.scope}:{self.scope_key} ({self.rank:.3f})"
+
+
 class CommunityEvent(models.Model):
     """
     Events, competitions, hackathons, webinars.
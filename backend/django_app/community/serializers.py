@@ -12,11 +12,12 @@ from .models import (
     CommunityReputation, AISummary, CollabRoom, CollabRoomParticipant,
     CommunityContribution, EnterpriseCohort
 )
+from .hydration import MISSING, HydratingListSerializer, ViewerStateMixin
 
 User = get_user_model()
 
 
-class UserMiniSerializer(serializers.ModelSerializer):
+class UserMiniSerializer(ViewerStateMixin, serializers.ModelSerializer):
     """Minimal user info for posts/comments."""
     university_name = serializers.SerializerMethodField()
     current_circle = serializers.SerializerMethodField()
@@ -26,8 +27,15 @@ class UserMiniSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'first_name', 'last_name', 'email', 'avatar_url', 
                   'university_name', 'current_circle', 'badge_count']
+        list_serializer_class = HydratingListSerializer
+    
+    def register_viewer_state(self, loader, instances):
+        loader.add_users(instances)
     
     def get_university_name(self, obj):
+        name = self.hydrated('university_name', obj)
+        if name is not MISSING:
+            return name
         membership = obj.university_memberships.filter(is_primary=True).first()
         return membership.university.name if membership else None
     
@@ -36,6 +44,9 @@ class UserMiniSerializer(serializers.ModelSerializer):
         return None
     
     def get_badge_count(self, obj):
+        count = self.hydrated('badge_count', obj)
+        if count is not MISSING:
+            return count
         return obj.earned_badges.count()
 
 
@@ -114,7 +125,7 @@ class ReactionCountSerializer(serializers.Serializer):
     user_reacted = serializers.BooleanField()
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ViewerStateMixin, serializers.ModelSerializer):
     """Comment on post."""
     author = UserMiniSerializer(read_only=True)
     replies = serializers.SerializerMethodField()
@@ -131,14 +142,23 @@ class CommentSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'author', 'is_edited', 'is_deleted', 
                            'reaction_count', 'reply_count', 'created_at', 'updated_at']
+        list_serializer_class = HydratingListSerializer
+    
+    def register_viewer_state(self, loader, instances):
+        loader.add_comments(instances)
     
     def get_replies(self, obj):
-        if obj.parent is None:  # Only get replies for top-level comments
-            replies = obj.replies.filter(is_deleted=False)[:5]
+        if obj.parent_id is None:  # Only get replies for top-level comments
+            replies = self.hydrated('replies', obj)
+            if replies is MISSING:
+                replies = obj.replies.filter(is_deleted=False)[:5]
             return CommentSerializer(replies, many=True, context=self.context).data
         return []
     
     def get_reaction_counts(self, obj):
+        counts = self.hydrated('comment_reaction_counts', obj)
+        if counts is not MISSING:
+            return counts
         from django.db.models import Count
         counts = obj.reactions.values('reaction_type').annotate(count=Count('id'))
         return list(counts)
@@ -146,6 +166,9 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_user_reaction(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            reaction_type = self.hydrated('comment_user_reaction', obj)
+            if reaction_type is not MISSING:
+                return reaction_type
             reaction = obj.reactions.filter(user=request.user).first()
             return reaction.reaction_type if reaction else None
         return None
@@ -158,7 +181,7 @@ class CommentCreateSerializer(serializers.ModelSerializer):
         fields = ['post', 'parent', 'content', 'mentions']
 
 
-class PostSerializer(serializers.ModelSerializer):
+class PostSerializer(ViewerStateMixin, serializers.ModelSerializer):
     """Full post details."""
     author = UserMiniSerializer(read_only=True)
     university = UniversityListSerializer(read_only=True)
@@ -194,8 +217,15 @@ class PostSerializer(serializers.ModelSerializer):
             'view_count', 'trending_score', 'poll_total_votes',
             'pinned_by_user', 'pinned_at', 'created_at', 'updated_at'
         ]
+        list_serializer_class = HydratingListSerializer
+    
+    def register_viewer_state(self, loader, instances):
+        loader.add_posts(instances)
     
     def get_reaction_counts(self, obj):
+        counts = self.hydrated('post_reaction_counts', obj)
+        if counts is not MISSING:
+            return counts
         from django.db.models import Count
         counts = obj.reactions.values('reaction_type').annotate(count=Count('id'))
         return list(counts)
@@ -203,6 +233,9 @@ class PostSerializer(serializers.ModelSerializer):
     def get_user_reaction(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            reaction_type = self.hydrated('post_user_reaction', obj)
+            if reaction_type is not MISSING:
+                return reaction_type
             reaction = obj.reactions.filter(user=request.user).first()
             return reaction.reaction_type if reaction else None
         return None
@@ -213,12 +246,17 @@ class PostSerializer(serializers.ModelSerializer):
             return None
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            option_ids = self.hydrated('poll_vote', obj)
+            if option_ids is not MISSING:
+                return option_ids
             votes = PollVote.objects.filter(post=obj, user=request.user)
             return [v.option_id for v in votes]
         return None
     
     def get_top_comments(self, obj):
-        comments = obj.comments.filter(parent=None, is_deleted=False).order_by('-reaction_count')[:3]
+        comments = self.hydrated('top_comments', obj)
+        if comments is MISSING:
+            comments = obj.comments.filter(parent=None, is_deleted=False).order_by('-reaction_count')[:3]
         return CommentSerializer(comments, many=True, context=self.context).data
 
 
@@ -265,7 +303,7 @@ class PostCreateSerializer(serializers.ModelSerializer):
         return data
 
 
-class PostListSerializer(serializers.ModelSerializer):
+class PostListSerializer(ViewerStateMixin, serializers.ModelSerializer):
     """Compact post for feed lists."""
     author = UserMiniSerializer(read_only=True)
     university_name = serializers.CharField(source='university.name', read_only=True, allow_null=True)
@@ -292,10 +330,17 @@ class PostListSerializer(serializers.ModelSerializer):
             'reaction_count', 'comment_count', 'view_count',
             'user_reaction', 'created_at'
         ]
+        list_serializer_class = HydratingListSerializer
+    
+    def register_viewer_state(self, loader, instances):
+        loader.add_posts(instances)
     
     def get_user_reaction(self, obj):
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            reaction_type = self.hydrated('post_user_reaction', obj)
+            if reaction_type is not MISSING:
+                return reaction_type
             # Use prefetched reactions if available
             if hasattr(obj, '_prefetched_objects_cache') and 'reactions' in obj._prefetched_objects_cache:
                 for reaction in obj.reactions.all():
@@ -312,6 +357,9 @@ class PostListSerializer(serializers.ModelSerializer):
             return None
         request = self.context.get('request')
         if request and request.user.is_authenticated:
+            option_ids = self.hydrated('poll_vote', obj)
+            if option_ids is not MISSING:
+                return option_ids
             votes = PollVote.objects.filter(post=obj, user=request.user)
             return [v.option_id for v in votes]
         return None
@@ -477,6 +525,7 @@ class FeedQuerySerializer(serializers.Serializer):
         choices=[
             'my-university', 'university',  # Home university feed (primary)
             'global',                        # Trending global feed
+            'track',                         # Trending posts from the viewer's track
             'following',                     # From followed users/tags
             'competitions',                  # Events and competitions only
             'achievements',                  # Achievement posts only
@@ -499,9 +548,10 @@ class FeedQuerySerializer(serializers.Serializer):
     )
     # Time-based filtering
     since = serializers.DateTimeField(required=False, allow_null=True)
-    # Pagination
+    # Pagination; trending feeds also take the next_cursor of the previous page
     page = serializers.IntegerField(default=1, min_value=1)
     page_size = serializers.IntegerField(default=20, min_value=1, max_value=50)
+    cursor = serializers.CharField(required=False, allow_blank=True)
 
 
 class SearchQuerySerializer(serializers.Serializer):
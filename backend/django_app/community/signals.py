@@ -15,6 +15,7 @@ from .models import (
 )
 from users.models import User
 from .cache import FeedCacheManager
+from . import trending
 
 logger = logging.getLogger(__name__)
 
@@ -204,6 +205,12 @@ def update_post_stats(sender, instance, created, **kwargs):
         logger.warning(f"Cache invalidation failed for post {instance.id}: {e}")
 
 
+@receiver(post_save, sender=Post)
+def index_trending_post(sender, instance, **kwargs):
+    """Keep the post's trending feed entries in step with its status, visibility, pin and feature flags."""
+    trending.index_post(instance)
+
+
 @receiver(post_save, sender=Comment)
 def update_comment_stats(sender, instance, created, **kwargs):
     """Update user stats when comment is created."""
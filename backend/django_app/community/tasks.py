@@ -0,0 +1,52 @@
+"""
+Background tasks for the community module.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@shared_task(name='community.flush_view_counts')
+def flush_view_counts_task():
+    """Add buffered post views to Post.view_count (community/counters.py)."""
+    from .counters import get_view_counter
+
+    return {'status': 'success', 'posts': get_view_counter().flush()}
+
+
+@shared_task(name='community.reconcile_counters')
+def reconcile_counters_task():
+    """Recount reaction, comment and reply counters and repair drift; one worker at a time."""
+    from core.locks import leader_lock
+    from .counters import reconcile_counters
+
+    with leader_lock('community.reconcile_counters') as leader:
+        if not leader:
+            logger.info("Counter reconciliation already running on another worker; skipping")
+            return {'status': 'skipped'}
+        repaired = reconcile_counters()
+    logger.info(f"Reconciled community counters: {repaired}")
+    return {'status': 'success', **repaired}
+
+
+@shared_task(name='community.trending_tick')
+def trending_tick_task():
+    """Refresh recent trending weights from post counters and drop expired pins; one worker at a time."""
+    from core.locks import leader_lock
+    from .trending import tick
+
+    with leader_lock('community.trending_tick') as leader:
+        if not leader:
+            logger.info("Trending tick already running on another worker; skipping")
+            return {'status': 'skipped'}
+        result = tick()
+    logger.info(f"Trending tick: {result}")
+    return {'status': 'success', **result}
@@ -0,0 +1,377 @@
+"""
+Trending index for the community feeds.
+
+FeedView ranked the global and university feeds at query time, annotating every
+candidate post with an engagement and recency score and sorting the whole set for each
+page. Here the ranking is kept in TrendingEntry, one row per published post per feed it
+belongs to (global, its university, its author's track), and a page is a keyset walk
+of the (scope, scope_key, rank) index - the database equivalent of a sorted set per
+scope.
+
+Score. A post's weight is 1 + 2 x reactions + 3 x comments + views / 100, times a type
+boost (events 2x, achievements 1.5x), halved every COMMUNITY_TRENDING_HALF_LIFE_HOURS
+of the post's age. Every post decays at the same rate, so the decay is applied forward
+instead of by rewriting scores: an entry stores
+
+    anchor = ln(boost) + ln 2 x (created_at - EPOCH) / half_life
+    rank   = tier x TIER_GAP + anchor + ln(weight)
+
+and ordering by rank at any moment is ordering by the current decayed score
+(current_score() converts back). Pinned (2) and featured (1) tiers sort above the rest.
+Each entry records the half-life its anchor was computed with; anchors from different
+half-lives do not compare, so when the setting changes tick() rebuilds the index.
+
+Updates:
+- index_post() syncs a post's entries when it is saved (community/signals.py);
+- counters.adjust_post() moves the weight in the same transaction as the reaction or
+  comment, and counters.write_view_counts() adds flushed views;
+- tick() (community.trending_tick, every 10 minutes) recomputes weights for posts from
+  the last COMMUNITY_TRENDING_WINDOW_DAYS from their counters, repairing drift, drops
+  expired pins, and rebuilds every entry if any was indexed under another half-life.
+
+`manage.py rebuild_trending_index` (re)builds every entry; `manage.py
+benchmark_trending_feed` compares feed pages against the query-time sort.
+"""
+
+import base64
+import json
+import logging
+import math
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Case, ExpressionWrapper, F, FloatField, Max, Min, Q, Value, When
+from django.db.models.functions import Greatest, Ln
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SCOPE_GLOBAL = 'global'
+SCOPE_UNIVERSITY = 'university'
+SCOPE_TRACK = 'track'
+
+TIER_PINNED = 2
+TIER_FEATURED = 1
+TIER_DEFAULT = 0
+TIER_GAP = 1e6  # rank units per tier; anchors grow by ~250 a year at a one-day half-life
+
+BASE_WEIGHT = 1.0
+REACTION_WEIGHT = 2.0
+COMMENT_WEIGHT = 3.0
+VIEW_WEIGHT = 0.01
+TYPE_BOOSTS = {'event': 2.0, 'achievement': 1.5}
+
+EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+LN2 = math.log(2)
+
+UPDATE_BATCH_SIZE = 500
+TICK_CHUNK_SIZE = 1000
+REBUILD_CHUNK_SIZE = 2000
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+# Scores -------------------------------------------------------------------------
+
+def _half_life_hours() -> float:
+    return float(getattr(settings, 'COMMUNITY_TRENDING_HALF_LIFE_HOURS', 24))
+
+
+def _half_life_seconds() -> float:
+    return _half_life_hours() * 3600
+
+
+def engagement_weight(reactions: int, comments: int, views: int) -> float:
+    return BASE_WEIGHT + REACTION_WEIGHT * reactions + COMMENT_WEIGHT * comments + VIEW_WEIGHT * views
+
+
+def post_anchor(post_type: str, created_at: datetime) -> float:
+    age = (created_at - EPOCH).total_seconds()
+    return math.log(TYPE_BOOSTS.get(post_type, 1.0)) + LN2 * age / _half_life_seconds()
+
+
+def entry_rank(tier: int, anchor: float, weight: float) -> float:
+    return tier * TIER_GAP + anchor + math.log(weight)
+
+
+def current_score(entry, now: Optional[datetime] = None) -> float:
+    """The entry's decayed score now: weight x boost x 2^(-age / half-life)."""
+    now = now or timezone.now()
+    return math.exp(entry.rank - entry.tier * TIER_GAP - LN2 * (now - EPOCH).total_seconds() / _half_life_seconds())
+
+
+def _rank_expression(weight):
+    return ExpressionWrapper(F('tier') * TIER_GAP + F('anchor') + Ln(weight), output_field=FloatField())
+
+
+# Index maintenance ---------------------------------------------------------------
+
+def post_scopes(post, track_key: Optional[str], now: Optional[datetime] = None) -> Dict[Tuple[str, str], int]:
+    """The feeds a post belongs to, {(scope, scope_key): tier}; empty unless published."""
+    if post.status != 'published':
+        return {}
+    now = now or timezone.now()
+    featured = TIER_FEATURED if post.is_featured else TIER_DEFAULT
+    scopes = {}
+    if post.visibility == 'global' or post.is_featured:
+        scopes[(SCOPE_GLOBAL, '')] = featured
+    if post.university_id:
+        pinned = post.is_pinned and (post.pin_expires_at is None or post.pin_expires_at > now)
+        scopes[(SCOPE_UNIVERSITY, str(post.university_id))] = TIER_PINNED if pinned else featured
+    if track_key:
+        scopes[(SCOPE_TRACK, track_key)] = featured
+    return scopes
+
+
+def index_post(post, now: Optional[datetime] = None) -> None:
+    """Create, update or remove a post's entries to match its current fields."""
+    from .models import TrendingEntry
+
+    wanted = post_scopes(post, post.author.track_key, now)
+    existing = {(e.scope, e.scope_key): e for e in TrendingEntry.objects.filter(post_id=post.pk)}
+    stale = [e.pk for key, e in existing.items() if key not in wanted]
+    if stale:
+        TrendingEntry.objects.filter(pk__in=stale).delete()
+    if not wanted:
+        return
+
+    anchor = post_anchor(post.post_type, post.created_at)
+    half_life = _half_life_hours()
+    # Weights already indexed are kept: they track committed deltas, the instance may not
+    current = [e for key, e in existing.items() if key in wanted]
+    weight = current[0].weight if current else engagement_weight(
+        post.reaction_count, post.comment_count, post.view_count,
+    )
+    new = []
+    for (scope, scope_key), tier in wanted.items():
+        entry = existing.get((scope, scope_key))
+        if entry is None:
+            new.append(TrendingEntry(
+                post_id=post.pk, scope=scope, scope_key=scope_key, tier=tier, weight=weight,
+                anchor=anchor, half_life_hours=half_life, rank=entry_rank(tier, anchor, weight),
+                created_at=post.created_at,
+            ))
+        elif (entry.tier, entry.anchor, entry.created_at) != (tier, anchor, post.created_at):
+            TrendingEntry.objects.filter(pk=entry.pk).update(
+                tier=tier, anchor=anchor, half_life_hours=half_life, created_at=post.created_at,
+                rank=ExpressionWrapper(tier * TIER_GAP + anchor + Ln(F('weight')), output_field=FloatField()),
+            )
+    if new:
+        TrendingEntry.objects.bulk_create(new, ignore_conflicts=True)
+
+
+def adjust_weight(post_id, delta: float) -> int:
+    """Move a post's weight by delta in every feed it is in; one UPDATE."""
+    from .models import TrendingEntry
+    if not delta:
+        return 0
+    weight = Greatest(F('weight') + delta, Value(BASE_WEIGHT))
+    return TrendingEntry.objects.filter(post_id=post_id).update(weight=weight, rank=_rank_expression(weight))
+
+
+def adjust_weights(deltas: Dict[str, float]) -> int:
+    """Move many posts' weights; one UPDATE per UPDATE_BATCH_SIZE posts."""
+    from .models import TrendingEntry
+    post_ids = [post_id for post_id, delta in deltas.items() if delta]
+    updated = 0
+    for start in range(0, len(post_ids), UPDATE_BATCH_SIZE):
+        batch = post_ids[start:start + UPDATE_BATCH_SIZE]
+        added = Case(
+            *[When(post_id=post_id, then=Value(float(deltas[post_id]))) for post_id in batch],
+            default=Value(0.0), output_field=FloatField(),
+        )
+        weight = Greatest(F('weight') + added, Value(BASE_WEIGHT))
+        updated += TrendingEntry.objects.filter(post_id__in=batch).update(weight=weight, rank=_rank_expression(weight))
+    return updated
+
+
+def _expire_pins(now: datetime) -> int:
+    from .models import Post
+    expired = Post.objects.filter(
+        Q(is_pinned=False) | Q(pin_expires_at__lte=now),
+        trending_entries__tier=TIER_PINNED,
+    ).select_related('author').distinct()
+    count = 0
+    for post in expired:
+        index_post(post, now)
+        count += 1
+    return count
+
+
+def tick(now: Optional[datetime] = None, chunk_size: int = TICK_CHUNK_SIZE) -> Dict[str, int]:
+    """
+    Periodic maintenance: rebuild the index if the half-life setting changed, then
+    recompute weights from the post counters for posts created in the last
+    COMMUNITY_TRENDING_WINDOW_DAYS and drop expired pins.
+    """
+    from .models import Post, TrendingEntry
+
+    now = now or timezone.now()
+    rebased = 0
+    if TrendingEntry.objects.exclude(half_life_hours=_half_life_hours()).exists():
+        logger.info("Trending half-life changed, rebuilding the index")
+        rebased = rebuild()
+    cutoff = now - timedelta(days=getattr(settings, 'COMMUNITY_TRENDING_WINDOW_DAYS', 7))
+    scanned = repaired = 0
+    last = None
+    while True:
+        entries = TrendingEntry.objects.filter(created_at__gte=cutoff)
+        if last is not None:
+            entries = entries.filter(Q(created_at__gt=last[0]) | Q(created_at=last[0], post_id__gt=last[1]))
+        rows = list(
+            entries.values('created_at', 'post_id').annotate(low=Min('weight'), high=Max('weight'))
+            .order_by('created_at', 'post_id')[:chunk_size]
+        )
+        if not rows:
+            break
+        last = (rows[-1]['created_at'], rows[-1]['post_id'])
+        scanned += len(rows)
+
+        counts = {
+            post_id: engagement_weight(reactions, comments, views)
+            for post_id, reactions, comments, views in Post.objects.filter(
+                pk__in=[row['post_id'] for row in rows],
+            ).values_list('id', 'reaction_count', 'comment_count', 'view_count')
+        }
+        drifted = []
+        for row in rows:
+            weight = counts.get(row['post_id'])
+            if weight is not None and not (math.isclose(row['low'], weight) and math.isclose(row['high'], weight)):
+                drifted.append((row, weight))
+        if drifted:
+            # Only rows still holding the weight read above: a delta committed since the
+            # counters were read would otherwise be lost. The next tick retries the rest.
+            weight = Case(
+                *[When(post_id=row['post_id'], weight__gte=row['low'], weight__lte=row['high'], then=Value(w))
+                  for row, w in drifted],
+                default=F('weight'), output_field=FloatField(),
+            )
+            repaired += TrendingEntry.objects.filter(
+                post_id__in=[row['post_id'] for row, _ in drifted],
+            ).update(weight=weight, rank=_rank_expression(weight))
+    return {'rebased': rebased, 'scanned': scanned, 'repaired': repaired, 'unpinned': _expire_pins(now)}
+
+
+def rebuild(post_ids: Optional[Iterable] = None, chunk_size: int = REBUILD_CHUNK_SIZE) -> int:
+    """Replace the entries of every published post (or the given posts) in keyset chunks."""
+    from django.db import transaction
+    from .models import Post, TrendingEntry
+
+    posts = Post.objects.all()
+    if post_ids is not None:
+        posts = posts.filter(pk__in=list(post_ids))
+    posts = posts.select_related('author').only(
+        'id', 'status', 'visibility', 'is_featured', 'is_pinned', 'pin_expires_at', 'university_id',
+        'post_type', 'created_at', 'reaction_count', 'comment_count', 'view_count', 'author__track_key',
+    ).order_by('pk')
+    now = timezone.now()
+    half_life = _half_life_hours()
+    written = 0
+    last_pk = None
+    while True:
+        chunk = list((posts.filter(pk__gt=last_pk) if last_pk is not None else posts)[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        entries = []
+        for post in chunk:
+            anchor = post_anchor(post.post_type, post.created_at)
+            weight = engagement_weight(post.reaction_count, post.comment_count, post.view_count)
+            for (scope, scope_key), tier in post_scopes(post, post.author.track_key, now).items():
+                entries.append(TrendingEntry(
+                    post_id=post.pk, scope=scope, scope_key=scope_key, tier=tier, weight=weight,
+                    anchor=anchor, half_life_hours=half_life, rank=entry_rank(tier, anchor, weight),
+                    created_at=post.created_at,
+                ))
+        with transaction.atomic():
+            TrendingEntry.objects.filter(post_id__in=[post.pk for post in chunk]).delete()
+            TrendingEntry.objects.bulk_create(entries, batch_size=UPDATE_BATCH_SIZE)
+        written += len(entries)
+    return written
+
+
+# Reading -------------------------------------------------------------------------
+
+def _tier_bounds(tier: int) -> Q:
+    return Q(rank__gt=(tier - 0.5) * TIER_GAP, rank__lt=(tier + 0.5) * TIER_GAP)
+
+
+def feed_ranges(feed_type: str, user, membership) -> Optional[List[Q]]:
+    """TrendingEntry filters whose merged order is the feed, or None for unindexed feeds."""
+    global_range = [Q(scope=SCOPE_GLOBAL, scope_key='')]
+    if feed_type == 'global':
+        return global_range
+    if feed_type in ('university', 'my-university'):
+        if membership is None:
+            return global_range
+        university_id = membership.university_id
+        return [
+            Q(scope=SCOPE_UNIVERSITY, scope_key=str(university_id)),
+            # Featured global posts from other universities; the rank bounds keep the
+            # scan inside the featured tier of the global range
+            Q(scope=SCOPE_GLOBAL, scope_key='', tier=TIER_FEATURED, post__visibility='global')
+            & _tier_bounds(TIER_FEATURED) & ~Q(post__university_id=university_id),
+        ]
+    if feed_type == 'track':
+        track_key = getattr(user, 'track_key', None)
+        return [Q(scope=SCOPE_TRACK, scope_key=track_key)] if track_key else global_range
+    return None
+
+
+def encode_cursor(entry) -> str:
+    raw = json.dumps([entry.rank, entry.created_at.isoformat(), str(entry.post_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        rank, created_at, post_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return float(rank), datetime.fromisoformat(created_at), post_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e))
+
+
+def _post_filter(post_filters: Optional[Dict]) -> Q:
+    return Q(**{f'post__{lookup}': value for lookup, value in (post_filters or {}).items()})
+
+
+def page(ranges: List[Q], post_filters: Optional[Dict] = None, cursor: Optional[str] = None,
+         page_size: int = 20, offset: int = 0):
+    """
+    One feed page from the index: (posts, next_cursor). Each range is read in rank
+    order after the cursor and the ranges are merged. post_filters are Post lookups.
+    Raises InvalidCursor for a malformed cursor.
+    """
+    from .models import TrendingEntry
+
+    after = decode_cursor(cursor) if cursor else None
+    limit = offset + page_size + 1
+    entries = []
+    for scope_filter in ranges:
+        queryset = TrendingEntry.objects.filter(scope_filter, _post_filter(post_filters), post__status='published')
+        if after is not None:
+            rank, created_at, post_id = after
+            queryset = queryset.filter(
+                Q(rank__lt=rank) | Q(rank=rank, created_at__lt=created_at) |
+                Q(rank=rank, created_at=created_at, post_id__lt=post_id),
+                rank__lte=rank,
+            )
+        entries.extend(queryset.select_related(
+            'post__author', 'post__university', 'post__pinned_by',
+        ).order_by('-rank', '-created_at', '-post_id')[:limit])
+
+    entries.sort(key=lambda e: (e.rank, e.created_at, e.post_id), reverse=True)
+    rows = entries[offset:limit]
+    next_cursor = encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return [entry.post for entry in rows[:page_size]], next_cursor
+
+
+def count(ranges: List[Q], post_filters: Optional[Dict] = None) -> int:
+    from .models import TrendingEntry
+    return sum(
+        TrendingEntry.objects.filter(scope_filter, _post_filter(post_filters)).count()
+        for scope_filter in ranges
+    )
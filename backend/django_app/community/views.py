@@ -6,12 +6,14 @@ from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Count, F, Case, When, Value, IntegerField, DecimalField
 from django.utils import timezone
 from django.db import transaction
 from datetime import timedelta
 
+from . import counters, trending
 from .models import (
     University, UniversityMembership, Post, Comment, Reaction,
     CommunityEvent, EventParticipant, Badge, UserBadge,
@@ -117,7 +119,7 @@ class UniversityViewSet(viewsets.ModelViewSet):
         posts = Post.objects.filter(
             university=university,
             status='published'
-        ).select_related('author').order_by('-is_pinned', '-created_at')[:50]
+        ).select_related('author', 'university').order_by('-is_pinned', '-created_at')[:50]
         
         serializer = PostListSerializer(posts, many=True, context={'request': request})
         return Response(serializer.data)
@@ -200,6 +202,7 @@ class FeedView(APIView):
     Feed types:
     - my-university: Home university posts with pinned boost
     - global: Trending posts across all universities
+    - track: Trending posts by authors on the viewer's track
     - following: Posts from followed users/tags
     - competitions: Event/competition posts only
     """
@@ -218,13 +221,6 @@ class FeedView(APIView):
         page = params.get('page', 1)
         page_size = params.get('page_size', 20)
         
-        # Base queryset with prefetching for performance
-        posts = Post.objects.filter(
-            status='published'
-        ).select_related(
-            'author', 'university', 'pinned_by'
-        ).prefetch_related('reactions')
-        
         # Get user's primary university membership
         user_membership = UniversityMembership.objects.filter(
             user=request.user,
@@ -232,41 +228,68 @@ class FeedView(APIView):
             status='active'
         ).select_related('university').first()
         
-        # Filter by feed type
-        if feed_type in ['university', 'my-university']:
-            posts = self._get_university_feed(posts, user_membership)
-        elif feed_type == 'global':
-            posts = self._get_global_feed(posts)
-        elif feed_type == 'following':
-            posts = self._get_following_feed(posts, request.user)
-        elif feed_type == 'competitions':
-            posts = self._get_competitions_feed(posts, user_membership)
-        elif feed_type == 'achievements':
-            posts = posts.filter(post_type='achievement')
-        
-        # Filter by post type
+        # Post filters shared by the trending index and the queryset feeds
+        post_filters = {}
         if post_type and post_type != 'all':
-            posts = posts.filter(post_type=post_type)
-        
+            post_filters['post_type'] = post_type
         # Filter by Circle/Phase (for students at similar stage)
         if circle:
-            posts = posts.filter(
-                achievement_data__circle_level=circle
-            )
+            post_filters['achievement_data__circle_level'] = circle
         if phase:
-            posts = posts.filter(
-                achievement_data__phase=phase
-            )
-        
+            post_filters['achievement_data__phase'] = phase
         # Filter by tags
         tags = params.get('tags', [])
         if tags:
-            posts = posts.filter(tags__overlap=tags)
+            post_filters['tags__overlap'] = tags
         
-        # Pagination
         offset = (page - 1) * page_size
-        total_count = posts.count()
-        posts = posts[offset:offset + page_size]
+        cursor = params.get('cursor')
+        next_cursor = None
+        
+        # Trending feeds (global, university, track) are read in rank order from the
+        # precomputed index (community/trending.py)
+        ranges = None
+        if getattr(settings, 'COMMUNITY_TRENDING_INDEX_ENABLED', True):
+            ranges = trending.feed_ranges(feed_type, request.user, user_membership)
+        
+        if ranges is not None:
+            try:
+                posts, next_cursor = trending.page(
+                    ranges, post_filters, cursor=cursor, page_size=page_size, offset=0 if cursor else offset,
+                )
+            except trending.InvalidCursor:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            total_count = trending.count(ranges, post_filters)
+            has_more = next_cursor is not None
+        else:
+            # Base queryset; viewer state (reactions, poll votes) is batch-loaded per page
+            # by the serializer (community/hydration.py)
+            posts = Post.objects.filter(
+                status='published'
+            ).select_related(
+                'author', 'university', 'pinned_by'
+            )
+            
+            # Filter by feed type
+            if feed_type in ['university', 'my-university']:
+                posts = self._get_university_feed(posts, user_membership)
+            elif feed_type == 'global':
+                posts = self._get_global_feed(posts)
+            elif feed_type == 'track':
+                posts = self._get_track_feed(posts, request.user)
+            elif feed_type == 'following':
+                posts = self._get_following_feed(posts, request.user)
+            elif feed_type == 'competitions':
+                posts = self._get_competitions_feed(posts, user_membership)
+            elif feed_type == 'achievements':
+                posts = posts.filter(post_type='achievement')
+            
+            posts = posts.filter(**post_filters)
+            
+            # Pagination
+            total_count = posts.count()
+            posts = posts[offset:offset + page_size]
+            has_more = (page * page_size) < total_count
         
         serializer = PostListSerializer(posts, many=True, context={'request': request})
         
@@ -276,7 +299,8 @@ class FeedView(APIView):
             'page': page,
             'page_size': page_size,
             'total_count': total_count,
-            'has_more': (page * page_size) < total_count,
+            'has_more': has_more,
+            'next_cursor': next_cursor,
             'user_university': {
                 'id': str(user_membership.university.id) if user_membership else None,
                 'name': user_membership.university.name if user_membership else None,
@@ -286,7 +310,8 @@ class FeedView(APIView):
     
     def _get_university_feed(self, posts, membership):
         """
-        My University feed with pinned posts boost.
+        My University feed with pinned posts boost, ranked at query time (the trending
+        index serves it unless COMMUNITY_TRENDING_INDEX_ENABLED is off).
         
         Order:
         1. Pinned posts (sorted by pinned_at desc)
@@ -348,7 +373,8 @@ class FeedView(APIView):
     
     def _get_global_feed(self, posts):
         """
-        Global feed with trending algorithm.
+        Global feed with trending algorithm, ranked at query time (the trending index
+        serves it unless COMMUNITY_TRENDING_INDEX_ENABLED is off).
         
         Trending score based on:
         - Recency (exponential decay)
@@ -396,6 +422,12 @@ class FeedView(APIView):
         
         return posts
     
+    def _get_track_feed(self, posts, user):
+        """Posts by authors on the viewer's track; the global feed if they have none."""
+        if not getattr(user, 'track_key', None):
+            return self._get_global_feed(posts)
+        return posts.filter(author__track_key=user.track_key).order_by('-created_at')
+    
     def _get_following_feed(self, posts, user):
         """Feed from followed users, universities, and tags."""
         followed_users = Follow.objects.filter(
@@ -462,7 +494,13 @@ class PostViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         return Post.objects.filter(
             status__in=['published', 'draft']
-        ).select_related('author', 'university')
+        ).select_related('author', 'university', 'pinned_by')
+    
+    def retrieve(self, request, *args, **kwargs):
+        """Get post detail; the view is tallied in the buffered view counter."""
+        post = self.get_object()
+        counters.record_view(post.id)
+        return Response(self.get_serializer(post).data)
     
     def perform_create(self, serializer):
         post = serializer.save(
@@ -495,29 +533,29 @@ class PostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Remove existing reaction of same type or create new
-        existing = Reaction.objects.filter(
-            user=request.user,
-            post=post,
-            reaction_type=reaction_type
-        ).first()
-        
-        if existing:
-            existing.delete()
-            created = False
-        else:
-            # Remove any other reaction types first
-            Reaction.objects.filter(user=request.user, post=post).delete()
-            Reaction.objects.create(
+        # Remove existing reaction of same type or create new; the counter moves by
+        # the rows actually deleted/created, in the same transaction
+        with transaction.atomic():
+            removed, _ = Reaction.objects.filter(
                 user=request.user,
                 post=post,
                 reaction_type=reaction_type
-            )
-            created = True
-        
-        # Update post reaction count
-        post.reaction_count = post.reactions.count()
-        post.save(update_fields=['reaction_count'])
+            ).delete()
+            
+            if removed:
+                created = False
+            else:
+                # Remove any other reaction types first
+                removed, _ = Reaction.objects.filter(user=request.user, post=post).delete()
+                Reaction.objects.create(
+                    user=request.user,
+                    post=post,
+                    reaction_type=reaction_type
+                )
+                created = True
+            
+            counters.adjust_post(post.id, reactions=int(created) - removed)
+        post.refresh_from_db(fields=['reaction_count'])
         
         return Response({
             'action': 'created' if created else 'removed',
@@ -542,22 +580,19 @@ class PostViewSet(viewsets.ModelViewSet):
         serializer = CommentCreateSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        comment = Comment.objects.create(
-            post=post,
-            author=request.user,
-            content=serializer.validated_data['content'],
-            parent=serializer.validated_data.get('parent'),
-            mentions=serializer.validated_data.get('mentions', [])
-        )
-        
-        # Update post comment count
-        post.comment_count = post.comments.filter(is_deleted=False).count()
-        post.save(update_fields=['comment_count'])
-        
-        # Update parent reply count if this is a reply
-        if comment.parent:
-            comment.parent.reply_count = comment.parent.replies.filter(is_deleted=False).count()
-            comment.parent.save(update_fields=['reply_count'])
+        with transaction.atomic():
+            comment = Comment.objects.create(
+                post=post,
+                author=request.user,
+                content=serializer.validated_data['content'],
+                parent=serializer.validated_data.get('parent'),
+                mentions=serializer.validated_data.get('mentions', [])
+            )
+            
+            # Update post comment count, and the parent's reply count if this is a reply
+            counters.adjust_post(post.id, comments=1)
+            if comment.parent_id:
+                counters.adjust_comment(comment.parent_id, replies=1)
         
         # Update user stats
         stats, _ = UserCommunityStats.objects.get_or_create(user=request.user)
@@ -645,26 +680,26 @@ class CommentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        existing = Reaction.objects.filter(
-            user=request.user,
-            comment=comment,
-            reaction_type=reaction_type
-        ).first()
-        
-        if existing:
-            existing.delete()
-            created = False
-        else:
-            Reaction.objects.filter(user=request.user, comment=comment).delete()
-            Reaction.objects.create(
+        with transaction.atomic():
+            removed, _ = Reaction.objects.filter(
                 user=request.user,
                 comment=comment,
                 reaction_type=reaction_type
-            )
-            created = True
-        
-        comment.reaction_count = comment.reactions.count()
-        comment.save(update_fields=['reaction_count'])
+            ).delete()
+            
+            if removed:
+                created = False
+            else:
+                removed, _ = Reaction.objects.filter(user=request.user, comment=comment).delete()
+                Reaction.objects.create(
+                    user=request.user,
+                    comment=comment,
+                    reaction_type=reaction_type
+                )
+                created = True
+            
+            counters.adjust_comment(comment.id, reactions=int(created) - removed)
+        comment.refresh_from_db(fields=['reaction_count'])
         
         return Response({
             'action': 'created' if created else 'removed',
@@ -674,13 +709,15 @@ class CommentViewSet(viewsets.ModelViewSet):
     
     def perform_destroy(self, instance):
         """Soft delete comment."""
-        instance.is_deleted = True
-        instance.content = '[deleted]'
-        instance.save(update_fields=['is_deleted', 'content'])
-        
-        # Update post comment count
-        instance.post.comment_count = instance.post.comments.filter(is_deleted=False).count()
-        instance.post.save(update_fields=['comment_count'])
+        with transaction.atomic():
+            # Counted once even if two deletes race
+            deleted = Comment.objects.filter(pk=instance.pk, is_deleted=False).update(
+                is_deleted=True, content='[deleted]', updated_at=timezone.now(),
+            )
+            if deleted:
+                counters.adjust_post(instance.post_id, comments=-1)
+                if instance.parent_id:
+                    counters.adjust_comment(instance.parent_id, replies=-1)
 
 
 class EventViewSet(viewsets.ModelViewSet):
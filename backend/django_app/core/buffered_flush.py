@@ -0,0 +1,95 @@
+"""
+Base for in-process write buffers flushed in the background.
+
+A BufferedFlusher subclass queues writes in memory (or Redis) and implements flush();
+the base runs a daemon thread that calls flush() every `flush_interval` seconds or
+when woken early (wake_or_flush(), e.g. on reaching a size threshold), and a final
+flush at shutdown. With flush_interval <= 0 there is no thread and callers flush
+explicitly. ProcessSingleton holds the process-wide instance, built from settings on
+first use and shut down at interpreter exit.
+
+Used by the audit log buffer, Foundations progress heartbeats and community view
+counters.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Generic, Optional, TypeVar
+
+from django.db import close_old_connections
+
+
+class BufferedFlusher(ABC):
+    """Daemon-thread flushing for a write buffer; subclasses implement flush()."""
+
+    thread_name = 'buffer-flusher'
+
+    def __init__(self, flush_interval: float):
+        self.flush_interval = float(flush_interval)
+        self._lock = threading.Lock()  # guards the subclass's queue and the thread handle
+        self._flush_lock = threading.Lock()  # held by subclasses for the length of a flush
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @abstractmethod
+    def flush(self) -> int:
+        """Write everything queued so far; returns how many entries were written."""
+
+    def _ensure_flusher(self) -> bool:
+        """Start the background flush thread on first use; False if disabled."""
+        if self.flush_interval <= 0 or self._stopped.is_set():
+            return False
+        if self._thread is not None and self._thread.is_alive():
+            return True
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+        return True
+
+    def _wake_or_flush(self) -> None:
+        """Flush now: in the background if there is a flusher, otherwise in the caller."""
+        if self._ensure_flusher():
+            self._wakeup.set()
+        else:
+            self.flush()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+    def shutdown(self) -> None:
+        """Stop the flusher and write whatever is left (registered with atexit)."""
+        self._stopped.set()
+        self._wakeup.set()
+        self.flush()
+
+
+T = TypeVar('T', bound=BufferedFlusher)
+
+
+class ProcessSingleton(Generic[T]):
+    """Process-wide buffer built by `factory` on first get(); `instance` is None until then."""
+
+    def __init__(self, factory: Callable[[], T]):
+        self.factory = factory
+        self.instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    def get(self) -> T:
+        if self.instance is not None:
+            return self.instance
+        with self._lock:
+            if self.instance is None:
+                self.instance = self.factory()
+                atexit.register(self.instance.shutdown)
+        return self.instance
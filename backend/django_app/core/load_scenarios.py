@@ -0,0 +1,162 @@
+"""
+Scripted load scenarios for the hottest API endpoints.
+
+Each Scenario is one endpoint as a given kind of user hits it: community feeds and
+post detail, the student dashboard and mission lists, recipes, the mentor
+TalentScope view of a mentee and the director dashboard. run() replays every
+scenario against a dataset from core/synthetic_data.py, picking a fresh actor and
+target per request from the seed's users and posts, and reports per scenario:
+
+  - latency p50/p95/p99/max in milliseconds, wall time through the full middleware
+    stack (in-process APIClient, so no network or server worker noise);
+  - queries per request (p50 and max), from CaptureQueriesContext;
+  - status codes, counting anything outside 2xx as an error.
+
+Warm-up requests are excluded from the numbers. Run against the database the
+dataset was generated into; see `manage.py run_load_scenarios`.
+"""
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.synthetic_data import prefix_for
+
+User = get_user_model()
+
+DEFAULT_REQUESTS = 50
+DEFAULT_WARMUP = 3
+SAMPLE_SIZE = 200
+
+
+@dataclass
+class LoadContext:
+    """Actors and targets sampled from one seed's dataset."""
+    students: List = field(default_factory=list)
+    mentors: List = field(default_factory=list)
+    director: Optional[object] = None
+    post_ids: List = field(default_factory=list)
+    mentees: Dict[int, List[int]] = field(default_factory=dict)
+
+
+@dataclass
+class Scenario:
+    name: str
+    actor: str  # 'student', 'mentor' or 'director'
+    path: Callable[[LoadContext, object, random.Random], Optional[str]]
+
+
+def _mentee_talentscope(context, mentor, rng):
+    mentees = context.mentees.get(mentor.id)
+    return f'/api/v1/mentors/{mentor.id}/mentees/{rng.choice(mentees)}/talentscope' if mentees else None
+
+
+SCENARIOS = [
+    Scenario('community_feed_global', 'student', lambda c, u, r: '/api/v1/community/feed/?feed_type=global'),
+    Scenario('community_feed_university', 'student', lambda c, u, r: '/api/v1/community/feed/?feed_type=my-university'),
+    Scenario('community_post_detail', 'student',
+             lambda c, u, r: f'/api/v1/community/posts/{r.choice(c.post_ids)}/' if c.post_ids else None),
+    Scenario('student_dashboard', 'student', lambda c, u, r: '/api/v1/student/dashboard'),
+    Scenario('student_missions', 'student', lambda c, u, r: '/api/v1/student/missions/'),
+    Scenario('student_mission_funnel', 'student', lambda c, u, r: '/api/v1/student/missions/funnel/'),
+    Scenario('recipes_list', 'student', lambda c, u, r: '/api/v1/recipes/'),
+    Scenario('mentee_talentscope', 'mentor', _mentee_talentscope),
+    Scenario('director_dashboard', 'director', lambda c, u, r: '/api/v1/programs/director/dashboard/'),
+]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def load_context(seed: int, sample: int = SAMPLE_SIZE) -> LoadContext:
+    """Sample actors and targets from the dataset generated with `seed`."""
+    from community.models import Post
+    from mentorship_coordination.models import MenteeMentorAssignment
+
+    prefix = prefix_for(seed)
+    users = User.objects.filter(username__startswith=f'{prefix}-')
+    director = users.filter(username=f'{prefix}-0').first()
+    if director is None:
+        raise ValueError(f'No synthetic data for seed {seed}; run generate_synthetic_data first')
+    context = LoadContext(
+        students=list(users.filter(is_mentor=False).exclude(pk=director.pk).order_by('pk')[:sample]),
+        mentors=list(users.filter(is_mentor=True).order_by('pk')[:sample]),
+        director=director,
+        post_ids=list(Post.objects.filter(author__username__startswith=f'{prefix}-').order_by('-created_at')
+                      .values_list('id', flat=True)[:sample]),
+    )
+    for mentor_id, mentee_id in MenteeMentorAssignment.objects.filter(
+        mentor__in=context.mentors, status='active',
+    ).values_list('mentor_id', 'mentee_id')[:sample * 10]:
+        context.mentees.setdefault(mentor_id, []).append(mentee_id)
+    return context
+
+
+def _actors(context: LoadContext, actor: str) -> list:
+    if actor == 'director':
+        return [context.director]
+    if actor == 'mentor':
+        return [mentor for mentor in context.mentors if context.mentees.get(mentor.id)]
+    return context.students
+
+
+def run_scenario(scenario: Scenario, context: LoadContext, requests: int = DEFAULT_REQUESTS,
+                 warmup: int = DEFAULT_WARMUP, seed: int = 0) -> Dict:
+    """Replay one scenario and summarize latency, query counts and statuses."""
+    from rest_framework.test import APIClient
+
+    rng = random.Random(f'{seed}:{scenario.name}')
+    actors = _actors(context, scenario.actor)
+    report = {'scenario': scenario.name, 'requests': 0, 'errors': 0, 'statuses': {}, 'skipped': not actors}
+    latencies, queries = [], []
+    client = APIClient()
+    for n in range(warmup + requests if actors else 0):
+        user = rng.choice(actors)
+        path = scenario.path(context, user, rng)
+        if path is None:
+            report['skipped'] = True
+            break
+        client.force_authenticate(user=user)
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = client.get(path)
+            elapsed = (time.perf_counter() - started) * 1000
+        if n < warmup:
+            continue
+        report['requests'] += 1
+        report['statuses'][response.status_code] = report['statuses'].get(response.status_code, 0) + 1
+        report['errors'] += not 200 <= response.status_code < 300
+        latencies.append(elapsed)
+        queries.append(len(captured.captured_queries))
+    report.update({
+        'p50_ms': round(percentile(latencies, 50), 2),
+        'p95_ms': round(percentile(latencies, 95), 2),
+        'p99_ms': round(percentile(latencies, 99), 2),
+        'max_ms': round(max(latencies, default=0.0), 2),
+        'queries_p50': percentile(queries, 50),
+        'queries_max': max(queries, default=0),
+    })
+    return report
+
+
+def run(seed: int, names: Optional[Iterable[str]] = None, requests: int = DEFAULT_REQUESTS,
+        warmup: int = DEFAULT_WARMUP, sample: int = SAMPLE_SIZE) -> List[Dict]:
+    """Run the named scenarios (default: all) against the seed's dataset; returns one report each."""
+    names = set(names or [])
+    unknown = names - {scenario.name for scenario in SCENARIOS}
+    if unknown:
+        raise ValueError(f"Unknown scenarios: {', '.join(sorted(unknown))}")
+    context = load_context(seed, sample)
+    # The in-process client sends Host: testserver
+    with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+        return [
+            run_scenario(scenario, context, requests=requests, warmup=warmup, seed=seed)
+            for scenario in SCENARIOS if not names or scenario.name in names
+        ]
@@ -0,0 +1,62 @@
+"""
+Cross-process locks for scheduled jobs.
+
+On PostgreSQL these are advisory locks keyed by a stable 64-bit hash of the lock
+name: leader_lock() holds a session lock for the length of a job so only one worker
+runs it, and xact_lock() serializes a single transaction (released at commit or
+rollback). Other databases fall back to a cache lock for leadership (shared only
+when the cache is) and rely on the database's own write serialization for
+transactions.
+"""
+
+import hashlib
+import uuid
+from contextlib import contextmanager
+
+from django.core.cache import cache
+from django.db import connection
+
+LEADER_LOCK_TTL = 60 * 60
+
+
+def lock_key(name: str) -> int:
+    """Signed 64-bit advisory lock key for a lock name."""
+    digest = hashlib.blake2b(name.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+@contextmanager
+def leader_lock(name: str, ttl: int = LEADER_LOCK_TTL):
+    """
+    Try to become the single runner for `name`; yields True if acquired.
+
+    Never blocks: a worker that loses the race gets False and should skip its run.
+    """
+    if connection.vendor == 'postgresql':
+        key = lock_key(name)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_lock(%s)', [key])
+            acquired = cursor.fetchone()[0]
+        try:
+            yield acquired
+        finally:
+            if acquired:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_advisory_unlock(%s)', [key])
+        return
+
+    cache_key = f'lock:leader:{name}'
+    token = uuid.uuid4().hex
+    acquired = cache.add(cache_key, token, ttl)
+    try:
+        yield acquired
+    finally:
+        if acquired and cache.get(cache_key) == token:
+            cache.delete(cache_key)
+
+
+def xact_lock(name: str) -> None:
+    """Block until the transaction-scoped lock for `name` is held. Call inside atomic()."""
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [lock_key(name)])
@@ -0,0 +1,81 @@
+"""
+Generate a deterministic synthetic dataset (see core/synthetic_data.py).
+Usage:
+    python manage.py generate_synthetic_data --scale small
+    python manage.py generate_synthetic_data --scale large --seed 7 --reactions 10000000
+    python manage.py generate_synthetic_data --scale tiny --anchor 2026-01-01 --no-trending --password <pw>
+
+Replaces the hand-written seed scripts for volume work; the demo accounts those
+scripts create are unaffected. Run against a scratch database: the command refuses
+to run unless DEBUG is on or --i-know-this-is-not-prod is given, and synthetic users
+can only log in when --password is passed.
+"""
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.synthetic_data import BULK_BATCH_SIZE, ENTITIES, HISTORY_DAYS, SCALES, SyntheticDataGenerator, \
+    resolve_counts
+
+
+class Command(BaseCommand):
+    help = 'Fill the database with a seedable synthetic dataset at a configurable scale'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--anchor', default=None,
+                            help='ISO date or datetime that synthetic timestamps count back from (default: today UTC)')
+        parser.add_argument('--days', type=int, default=HISTORY_DAYS, help='History window for timestamps')
+        parser.add_argument('--batch-size', type=int, default=BULK_BATCH_SIZE)
+        parser.add_argument('--no-trending', action='store_true', help='Skip the trending index rebuild')
+        parser.add_argument('--password', default=None,
+                            help='Password for every synthetic user (default: unusable, no logins)')
+        parser.add_argument('--i-know-this-is-not-prod', dest='not_prod', action='store_true',
+                            help='Run even though DEBUG is off')
+        for entity in ENTITIES:
+            parser.add_argument(f"--{entity.replace('_', '-')}", dest=entity, type=int, default=None,
+                                help=f'Override the scale count of {entity}')
+
+    def handle(self, *args, **options):
+        if not (settings.DEBUG or options['not_prod']):
+            raise CommandError(
+                'Refusing to generate synthetic data with DEBUG off; pass --i-know-this-is-not-prod '
+                'if this really is a scratch database'
+            )
+        counts = resolve_counts(options['scale'], **{entity: options[entity] for entity in ENTITIES})
+        anchor = None
+        if options['anchor']:
+            try:
+                anchor = datetime.fromisoformat(options['anchor'])
+            except ValueError:
+                raise CommandError(f"Invalid --anchor: {options['anchor']}")
+            if anchor.tzinfo is None:
+                anchor = anchor.replace(tzinfo=dt_timezone.utc)
+
+        self.stdout.write(f"Generating seed {options['seed']} at scale {options['scale']}: " + ', '.join(
+            f'{entity}={counts[entity]}' for entity in ENTITIES
+        ))
+        generator = SyntheticDataGenerator(
+            counts, seed=options['seed'], anchor=anchor, batch_size=options['batch_size'],
+            history_days=options['days'], progress=self.stdout.write, rebuild_trending=not options['no_trending'],
+            password=options['password'],
+        )
+        started = time.perf_counter()
+        try:
+            written = generator.run()
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Wrote {sum(written.values())} rows in {time.perf_counter() - started:.1f} s'
+        ))
+        for entity, count in written.items():
+            self.stdout.write(f'  {entity:<24} {count:>10}')
+        if options['password']:
+            self.stdout.write(f'Users log in as {generator.prefix}-<n>@synthetic.local with the --password given; '
+                              f'{generator.prefix}-0 directs every track, {generator.prefix}-1.. are mentors')
+        else:
+            self.stdout.write('Synthetic users have unusable passwords; pass --password to log in as them')
@@ -0,0 +1,55 @@
+"""
+Summarize per-request query profiles recorded by QueryProfilerMiddleware.
+Usage: python manage.py query_profile [--log PATH] [--json REPORT] [--sort queries|time|n_plus_one] [--top N]
+"""
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.query_profiler import aggregate_profiles, read_profile_log
+
+SORT_KEYS = {
+    'queries': lambda item: item[1]['queries_max'],
+    'time': lambda item: item[1]['db_time_ms_max'],
+    'n_plus_one': lambda item: (len(item[1]['n_plus_one']), item[1]['queries_max']),
+}
+
+
+class Command(BaseCommand):
+    help = 'Aggregate the query profiler log per endpoint and report query counts, DB time and N+1 suspects'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--log', default=None, help='Profile log to read (default: QUERY_PROFILER_LOG)')
+        parser.add_argument('--json', dest='json_path', default=None, help='Also write the full report as JSON here')
+        parser.add_argument('--sort', choices=sorted(SORT_KEYS), default='queries')
+        parser.add_argument('--top', type=int, default=20, help='Endpoints to print')
+
+    def handle(self, *args, **options):
+        path = options['log'] or getattr(settings, 'QUERY_PROFILER_LOG', None)
+        if not path:
+            raise CommandError('No profile log: pass --log or set QUERY_PROFILER_LOG')
+        if not os.path.exists(path):
+            raise CommandError(f'Profile log not found: {path}')
+
+        endpoints = aggregate_profiles(read_profile_log(path))
+        ranked = sorted(endpoints.items(), key=SORT_KEYS[options['sort']], reverse=True)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as report:
+                json.dump({'source': path, 'endpoints': dict(ranked)}, report, indent=2)
+            self.stdout.write(f"Wrote report for {len(ranked)} endpoints to {options['json_path']}")
+
+        self.stdout.write(
+            f"{'endpoint':<60} {'reqs':>5} {'avg q':>7} {'p95 q':>6} {'max q':>6} {'avg ms':>8} {'N+1':>4}"
+        )
+        for endpoint, stats in ranked[:options['top']]:
+            self.stdout.write(
+                f"{endpoint[:60]:<60} {stats['requests']:>5} {stats['queries_avg']:>7} {stats['queries_p95']:>6} "
+                f"{stats['queries_max']:>6} {stats['db_time_ms_avg']:>8.1f} {len(stats['n_plus_one']):>4}"
+            )
+            for suspect in stats['n_plus_one'][:3]:
+                self.stdout.write(self.style.WARNING(
+                    f"    N+1 x{suspect['max_count']} at {suspect['origin']}: {suspect['fingerprint'][:120]}"
+                ))
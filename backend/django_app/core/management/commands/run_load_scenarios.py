@@ -0,0 +1,53 @@
+"""
+Replay the load scenarios in core/load_scenarios.py against a synthetic dataset.
+Usage:
+    python manage.py generate_synthetic_data --scale medium --seed 42
+    python manage.py run_load_scenarios --seed 42 [--requests 200] [--scenario community_feed_global] [--json REPORT]
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.load_scenarios import DEFAULT_REQUESTS, DEFAULT_WARMUP, SAMPLE_SIZE, SCENARIOS, run
+
+
+class Command(BaseCommand):
+    help = 'Report p50/p95/p99 latency and query counts for the hottest endpoints on a synthetic dataset'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=42, help='Seed the dataset was generated with')
+        parser.add_argument('--scenario', dest='scenarios', action='append', default=None,
+                            choices=[scenario.name for scenario in SCENARIOS], help='Repeatable; default: all')
+        parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='Timed requests per scenario')
+        parser.add_argument('--warmup', type=int, default=DEFAULT_WARMUP, help='Untimed requests per scenario')
+        parser.add_argument('--sample', type=int, default=SAMPLE_SIZE, help='Users and posts to draw requests from')
+        parser.add_argument('--json', dest='json_path', default=None, help='Also write the reports as JSON here')
+
+    def handle(self, *args, **options):
+        try:
+            reports = run(
+                options['seed'], options['scenarios'], requests=options['requests'], warmup=options['warmup'],
+                sample=options['sample'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(
+            f"{'scenario':<28} {'reqs':>5} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'max ms':>8} {'q p50':>6} {'q max':>6}"
+        )
+        for report in reports:
+            if report['skipped']:
+                self.stdout.write(f"{report['scenario']:<28} skipped (no actors or targets in the dataset)")
+                continue
+            line = (
+                f"{report['scenario']:<28} {report['requests']:>5} {report['errors']:>4} {report['p50_ms']:>8.1f} "
+                f"{report['p95_ms']:>8.1f} {report['p99_ms']:>8.1f} {report['max_ms']:>8.1f} "
+                f"{report['queries_p50']:>6} {report['queries_max']:>6}"
+            )
+            self.stdout.write(self.style.WARNING(line) if report['errors'] else line)
+
+        if options['json_path']:
+            with open(options['json_path'], 'w') as output:
+                json.dump({'seed': options['seed'], 'scenarios': reports}, output, indent=2)
+            self.stdout.write(f"Wrote {len(reports)} scenario reports to {options['json_path']}")
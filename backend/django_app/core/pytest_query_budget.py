@@ -0,0 +1,115 @@
+"""
+Pytest plugin enforcing per-endpoint ORM query budgets (loaded with -p core.pytest_query_budget).
+
+Declare budgets with a marker; every request the test makes through the Django test
+client is profiled by QueryProfilerMiddleware and the test fails if one exceeds the
+budget, with the offending query fingerprints and N+1 call sites in the message:
+
+    @pytest.mark.query_budget(12)                              # any request in the test
+    @pytest.mark.query_budget(4, path='/api/v1/community/')   # requests under this path
+
+or check a block directly with the query_budget fixture:
+
+    def test_feed(query_budget, api_client):
+        with query_budget(6):
+            api_client.get('/api/v1/community/feed/')
+
+`pytest --query-budget-report=queries.json` profiles every request in the run and
+writes the per-endpoint aggregates (the same shape as `manage.py query_profile --json`).
+Works against SQLite and PostgreSQL alike.
+"""
+import json
+from contextlib import contextmanager
+
+import pytest
+
+PROFILER_MIDDLEWARE = 'core.query_profiler.QueryProfilerMiddleware'
+
+_session_profiles = []
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--query-budget-report', action='store', default=None, metavar='PATH',
+        help='Profile every request and write per-endpoint query aggregates to PATH as JSON',
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'query_budget(max_queries, path=None): fail if a request (optionally under path) exceeds max_queries',
+    )
+
+
+def _budgets(item):
+    return [(mark.args[0] if mark.args else mark.kwargs['max_queries'], mark.kwargs.get('path'))
+            for mark in item.iter_markers('query_budget')]
+
+
+@pytest.fixture(autouse=True)
+def _query_budget_profiling(request):
+    """Turn the profiler middleware on for tests that declare budgets (or for the whole run when reporting)."""
+    reporting = request.config.getoption('--query-budget-report')
+    if not (_budgets(request.node) or reporting):
+        yield
+        return
+
+    from core.query_profiler import add_listener, remove_listener
+    settings = request.getfixturevalue('settings')
+    settings.QUERY_PROFILER_ENABLED = True
+    settings.QUERY_PROFILER_LOG = None
+    if PROFILER_MIDDLEWARE not in settings.MIDDLEWARE:
+        settings.MIDDLEWARE = [PROFILER_MIDDLEWARE, *settings.MIDDLEWARE]
+
+    profiles = request.node._query_profiles = []
+    add_listener(profiles.append)
+    try:
+        yield
+    finally:
+        remove_listener(profiles.append)
+        if reporting:
+            _session_profiles.extend(profile.as_dict() for profile in profiles)
+
+
+def _over_budget(item):
+    failures = []
+    budgets = _budgets(item)
+    for profile in getattr(item, '_query_profiles', []):
+        applicable = [limit for limit, path in budgets if path is None or profile.path.startswith(path)]
+        if applicable and profile.count > min(applicable):
+            failures.append(f'budget {min(applicable)} exceeded by {profile.describe()}')
+    return failures
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    outcome = yield
+    if outcome.excinfo is not None:
+        return  # The test's own failure is the one to report
+    failures = _over_budget(item)
+    if failures:
+        pytest.fail('Query budget exceeded:\n' + '\n'.join(failures), pytrace=False)
+
+
+@pytest.fixture
+def query_budget():
+    """Context manager failing the test if the block runs more than max_queries queries."""
+    from core.query_profiler import record_queries
+
+    @contextmanager
+    def check(max_queries, label=''):
+        with record_queries(endpoint=label) as profile:
+            yield profile
+        if profile.count > max_queries:
+            pytest.fail(f'Query budget {max_queries} exceeded:\n{profile.describe()}', pytrace=False)
+
+    return check
+
+
+def pytest_sessionfinish(session):
+    path = session.config.getoption('--query-budget-report')
+    if not path or not _session_profiles:
+        return
+    from core.query_profiler import aggregate_profiles
+    with open(path, 'w') as report:
+        json.dump({'endpoints': aggregate_profiles(_session_profiles)}, report, indent=2)
@@ -0,0 +1,297 @@
+"""
+Per-request ORM query profiling and N+1 detection.
+
+record_queries() hooks every database connection through connection.execute_wrapper
+and collects, for each query: its SQL and parameters, a fingerprint (the SQL with
+literals and IN-lists collapsed), the time spent and the innermost project frame
+that issued it. The resulting QueryProfile reports
+
+  - the query count and total DB time;
+  - exact duplicates (same SQL and parameters run more than once);
+  - N+1 suspects: one fingerprint run at least QUERY_PROFILER_N_PLUS_ONE_THRESHOLD
+    times from the same line of code, i.e. a query issued per row of a loop.
+
+QueryProfilerMiddleware is opt-in (QUERY_PROFILER_ENABLED). It profiles each request,
+logs N+1 suspects, adds X-Query-Count / X-Query-Time-Ms headers, appends one JSON line
+per request to QUERY_PROFILER_LOG when set, and hands the profile to any registered
+listeners. `manage.py query_profile` aggregates that log per endpoint;
+core/pytest_query_budget.py uses the same profiles to enforce query budgets in tests.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+MAX_SQL_LENGTH = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+# Frames from these paths never count as a query's origin
+_SKIP_PATHS = (os.path.dirname(os.path.abspath(__file__)) + os.sep + 'query_profiler',)
+
+_listeners: List[Callable[['QueryProfile'], None]] = []
+
+
+def fingerprint(sql: str) -> str:
+    """SQL with literal values and parameter lists collapsed, so per-row variants match."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def _project_root() -> str:
+    return str(getattr(settings, 'BASE_DIR', os.getcwd()))
+
+
+def query_origin(root: str = None) -> str:
+    """'path/to/module.py:123 in func' for the innermost project frame on the stack."""
+    root = root or _project_root()
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(root)
+            and 'site-packages' not in filename
+            and not filename.startswith(_SKIP_PATHS)
+        ):
+            return f'{os.path.relpath(filename, root)}:{frame.f_lineno} in {frame.f_code.co_name}'
+        frame = frame.f_back
+    return 'unknown'
+
+
+@dataclass
+class RecordedQuery:
+    sql: str
+    params: str
+    fingerprint: str
+    duration_ms: float
+    origin: str
+    alias: str
+
+
+@dataclass
+class QueryProfile:
+    """Queries issued while a record_queries() block (usually one request) was active."""
+    endpoint: str = ''
+    path: str = ''
+    queries: List[RecordedQuery] = field(default_factory=list)
+    n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD
+    status_code: Optional[int] = None
+    duration_ms: float = 0.0
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def db_time_ms(self) -> float:
+        return sum(q.duration_ms for q in self.queries)
+
+    def duplicates(self) -> Dict[str, int]:
+        """Identical SQL and parameters run more than once -> times run."""
+        counts = Counter((q.sql, q.params) for q in self.queries)
+        return {sql: count for (sql, _), count in counts.items() if count > 1}
+
+    def n_plus_one(self) -> List[dict]:
+        """Fingerprints repeated from one call site at least n_plus_one_threshold times."""
+        groups = defaultdict(list)
+        for q in self.queries:
+            groups[(q.fingerprint, q.origin)].append(q)
+        suspects = [
+            {
+                'fingerprint': fp[:MAX_SQL_LENGTH],
+                'origin': origin,
+                'count': len(group),
+                'db_time_ms': round(sum(q.duration_ms for q in group), 3),
+            }
+            for (fp, origin), group in groups.items()
+            if len(group) >= self.n_plus_one_threshold
+        ]
+        return sorted(suspects, key=lambda s: -s['count'])
+
+    def as_dict(self) -> dict:
+        return {
+            'endpoint': self.endpoint,
+            'path': self.path,
+            'status_code': self.status_code,
+            'query_count': self.count,
+            'db_time_ms': round(self.db_time_ms, 3),
+            'duration_ms': round(self.duration_ms, 3),
+            'duplicate_queries': sum(count - 1 for count in self.duplicates().values()),
+            'n_plus_one': self.n_plus_one(),
+            'fingerprints': dict(Counter(q.fingerprint[:MAX_SQL_LENGTH] for q in self.queries).most_common(20)),
+        }
+
+    def describe(self) -> str:
+        """Human-readable summary for logs and test failures."""
+        lines = [f'{self.endpoint or "block"}: {self.count} queries, {self.db_time_ms:.1f}ms in the database']
+        for suspect in self.n_plus_one():
+            lines.append(f"  N+1 x{suspect['count']} at {suspect['origin']}: {suspect['fingerprint'][:200]}")
+        for fp, count in Counter(q.fingerprint for q in self.queries).most_common(5):
+            lines.append(f'  x{count} {fp[:200]}')
+        return '\n'.join(lines)
+
+
+class _Recorder:
+    def __init__(self, profile: QueryProfile, alias: str, root: str):
+        self.profile = profile
+        self.alias = alias
+        self.root = root
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = (time.perf_counter() - start) * 1000
+            self.profile.queries.append(RecordedQuery(
+                sql=sql,
+                params=repr(params),
+                fingerprint=fingerprint(sql),
+                duration_ms=duration,
+                origin=query_origin(self.root),
+                alias=self.alias,
+            ))
+
+
+@contextmanager
+def record_queries(endpoint: str = '', n_plus_one_threshold: int = None):
+    """Collect every query run on any configured database inside the block."""
+    profile = QueryProfile(
+        endpoint=endpoint,
+        n_plus_one_threshold=n_plus_one_threshold or getattr(
+            settings, 'QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', DEFAULT_N_PLUS_ONE_THRESHOLD,
+        ),
+    )
+    root = _project_root()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(_Recorder(profile, alias, root)))
+        yield profile
+
+
+def add_listener(listener: Callable[[QueryProfile], None]):
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[QueryProfile], None]):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def endpoint_name(request) -> str:
+    """'GET api/v1/things/<uuid:pk>' for routed requests, the raw path otherwise."""
+    match = getattr(request, 'resolver_match', None)
+    route = getattr(match, 'route', None) if match else None
+    return f'{request.method} {route or request.path}'
+
+
+class QueryProfilerMiddleware:
+    """
+    Opt-in per-request query profiler; enable with QUERY_PROFILER_ENABLED=true and
+    place it first in MIDDLEWARE so queries made by other middleware are counted too.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_PROFILER_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.log_path = getattr(settings, 'QUERY_PROFILER_LOG', None)
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with record_queries() as profile:
+            response = self.get_response(request)
+        profile.duration_ms = (time.perf_counter() - start) * 1000
+        profile.endpoint = endpoint_name(request)
+        profile.path = request.path
+        profile.status_code = response.status_code
+
+        response['X-Query-Count'] = str(profile.count)
+        response['X-Query-Time-Ms'] = f'{profile.db_time_ms:.1f}'
+        if profile.n_plus_one():
+            logger.warning(f'[query_profiler] Possible N+1 queries\n{profile.describe()}')
+        if self.log_path:
+            self._write(profile)
+        for listener in list(_listeners):
+            listener(profile)
+        return response
+
+    def _write(self, profile: QueryProfile):
+        try:
+            with open(self.log_path, 'a') as log:
+                log.write(json.dumps(profile.as_dict()) + '\n')
+        except OSError as e:
+            logger.error(f'[query_profiler] Could not write {self.log_path}: {e}')
+
+
+# Reports --------------------------------------------------------------------
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def aggregate_profiles(profiles) -> dict:
+    """Per-endpoint totals for an iterable of QueryProfile.as_dict() records."""
+    by_endpoint = defaultdict(list)
+    for record in profiles:
+        by_endpoint[record['endpoint']].append(record)
+
+    endpoints = {}
+    for endpoint, records in by_endpoint.items():
+        counts = [r['query_count'] for r in records]
+        db_times = [r['db_time_ms'] for r in records]
+        suspects = {}
+        for record in records:
+            for suspect in record.get('n_plus_one', []):
+                key = (suspect['fingerprint'], suspect['origin'])
+                entry = suspects.setdefault(key, {**suspect, 'requests': 0, 'max_count': 0})
+                entry['requests'] += 1
+                entry['max_count'] = max(entry['max_count'], suspect['count'])
+        endpoints[endpoint] = {
+            'requests': len(records),
+            'queries_avg': round(sum(counts) / len(counts), 1),
+            'queries_p95': _percentile(counts, 95),
+            'queries_max': max(counts),
+            'db_time_ms_avg': round(sum(db_times) / len(db_times), 3),
+            'db_time_ms_max': round(max(db_times), 3),
+            'duplicate_queries_max': max(r.get('duplicate_queries', 0) for r in records),
+            'n_plus_one': [
+                {k: v for k, v in s.items() if k not in ('count', 'db_time_ms')}
+                for s in sorted(suspects.values(), key=lambda s: -s['max_count'])
+            ],
+        }
+    return endpoints
+
+
+def read_profile_log(path: str):
+    """Records from a QUERY_PROFILER_LOG file, skipping lines that are not JSON."""
+    with open(path) as log:
+        for line in log:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
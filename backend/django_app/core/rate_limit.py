@@ -0,0 +1,210 @@
+"""
+Token-bucket rate limiting shared by every worker.
+
+A bucket holds up to `capacity` tokens and refills continuously at capacity/period
+tokens per second; each request takes `cost` tokens. With Redis available the
+read-refill-take step runs as one Lua script against the server clock, so
+concurrent requests from any number of workers can never overdraw a bucket.
+Without Redis each process keeps its own buckets behind a lock.
+
+Keys are ratelimit:<feature>:<tier>:<user_id>. The FastAPI service loads the same
+script (backend/shared/token_bucket.lua) and uses the same key layout
+(fastapi_app/utils/rate_limit.py), so both share one budget when they point at the
+same Redis.
+
+Use RateLimiter.hit() directly, or FeatureRateThrottle for DRF views; both report
+Retry-After through RateLimitDecision.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'ratelimit'
+
+# backend/shared locally, /shared in the images (next to the /app code directory)
+TOKEN_BUCKET_SCRIPT_PATH = Path(__file__).resolve().parents[1].parent / 'shared' / 'token_bucket.lua'
+TOKEN_BUCKET_SCRIPT = TOKEN_BUCKET_SCRIPT_PATH.read_text()
+
+# KEYS[1] bucket; ARGV: capacity, tokens to return. A missing bucket is already full.
+REFUND_SCRIPT = """
+local tokens = tonumber(redis.call('HGET', KEYS[1], 'tokens'))
+if tokens == nil then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(math.min(tonumber(ARGV[1]), tokens + tonumber(ARGV[2]))))
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: Optional[int] = None
+    remaining: Optional[int] = None
+    retry_after: float = 0.0
+
+    def __bool__(self) -> bool:
+        return self.allowed
+
+    @property
+    def unlimited(self) -> bool:
+        return self.limit is None
+
+    def headers(self) -> Dict[str, str]:
+        """Response headers for this decision (Retry-After only when denied)."""
+        if self.unlimited:
+            return {}
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(self.remaining),
+        }
+        if not self.allowed:
+            headers['Retry-After'] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+UNLIMITED = RateLimitDecision(allowed=True)
+
+
+def bucket_key(feature: str, user_id, tier: str = 'any') -> str:
+    return f'{KEY_PREFIX}:{feature}:{tier}:{user_id}'
+
+
+class LocalTokenBuckets:
+    """In-process buckets for when Redis is unavailable (limits apply per worker)."""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key: str, capacity: int, rate: float, cost: int) -> Tuple[bool, float, float]:
+        with self._lock:
+            now = time.monotonic()
+            tokens, ts = self._buckets.get(key, (float(capacity), now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return True, tokens - cost, 0.0
+            self._buckets[key] = (tokens, now)
+            return False, tokens, (cost - tokens) / rate
+
+    def give_back(self, key: str, capacity: int, cost: int) -> None:
+        with self._lock:
+            if key in self._buckets:
+                tokens, ts = self._buckets[key]
+                self._buckets[key] = (min(capacity, tokens + cost), ts)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class RateLimiter:
+    def __init__(self):
+        self.local = LocalTokenBuckets()
+        self._scripts = {}
+
+    def hit(self, key: str, capacity: Optional[int], period: float, cost: int = 1) -> RateLimitDecision:
+        """
+        Take `cost` tokens from the bucket at `key`.
+
+        capacity=None means unlimited. `period` is the seconds a full bucket takes
+        to refill, e.g. 86400 for a daily allowance.
+        """
+        if capacity is None:
+            return UNLIMITED
+        if capacity <= 0:
+            return RateLimitDecision(allowed=False, limit=0, remaining=0, retry_after=period)
+
+        rate = capacity / period
+        redis_client = _redis()
+        if redis_client is not None:
+            try:
+                allowed, tokens, retry_after = self._redis_take(redis_client, key, capacity, rate, cost)
+                return _decision(allowed, capacity, tokens, retry_after)
+            except Exception as e:
+                logger.warning(f"Redis rate limiter unavailable, using in-process buckets: {e}")
+
+        allowed, tokens, retry_after = self.local.take(key, capacity, rate, cost)
+        return _decision(allowed, capacity, tokens, retry_after)
+
+    def refund(self, key: str, capacity: Optional[int], cost: int = 1) -> None:
+        """Return tokens taken for a request that failed before doing the limited work."""
+        if not capacity:
+            return
+        redis_client = _redis()
+        if redis_client is not None:
+            try:
+                self._run_script(redis_client, REFUND_SCRIPT, key, capacity, cost)
+                return
+            except Exception as e:
+                logger.warning(f"Rate limit refund not applied: {e}")
+        self.local.give_back(key, capacity, cost)
+
+    def _redis_take(self, redis_client, key, capacity, rate, cost):
+        allowed, tokens, retry_after = self._run_script(redis_client, TOKEN_BUCKET_SCRIPT, key, capacity, rate, cost)
+        return bool(int(allowed)), float(tokens), float(retry_after)
+
+    def _run_script(self, redis_client, source, key, *args):
+        script = self._scripts.get(source)
+        if script is None:
+            script = self._scripts[source] = redis_client.register_script(source)
+        return script(keys=[key], args=list(args), client=redis_client)
+
+
+def _decision(allowed: bool, capacity: int, tokens: float, retry_after: float) -> RateLimitDecision:
+    return RateLimitDecision(
+        allowed=allowed,
+        limit=capacity,
+        remaining=int(tokens),
+        retry_after=retry_after,
+    )
+
+
+def _redis():
+    from core.redis_utils import get_redis_client
+    return get_redis_client()
+
+
+rate_limiter = RateLimiter()
+
+
+class FeatureRateThrottle(BaseThrottle):
+    """
+    DRF throttle over a per-user token bucket.
+
+    Subclasses set `feature` and `period`. The bucket capacity defaults to the daily
+    AI limit of the user's plan (SubscriptionPlan.ai_coach_daily_limit, None = unlimited);
+    override get_limit(request) to size it differently. DRF turns a denial into 429
+    with Retry-After.
+    """
+    feature = 'default'
+    period = 24 * 60 * 60
+
+    def get_limit(self, request) -> Optional[int]:
+        return request.user.identity.ai_coach_daily_limit
+
+    def get_tier(self, request) -> str:
+        return request.user.identity.tier
+
+    def allow_request(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return True
+        key = bucket_key(self.feature, request.user.pk, self.get_tier(request))
+        self.decision = rate_limiter.hit(key, self.get_limit(request), self.period)
+        return self.decision.allowed
+
+    def wait(self):
+        decision = getattr(self, 'decision', None)
+        return decision.retry_after if decision is not None else None
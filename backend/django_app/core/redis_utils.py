@@ -0,0 +1,60 @@
+"""
+Shared raw Redis client.
+
+Used by subsystems that need Redis primitives the Django cache API does not expose
+(lists, Lua scripts, pub/sub). Returns None when Redis is disabled
+(USE_REDIS_CACHE=false) or unreachable, so callers can fall back to an in-process
+implementation.
+"""
+import logging
+import threading
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_checked = False
+_lock = threading.Lock()
+
+
+def get_redis_client():
+    """Return a process-wide Redis client, or None if Redis is not available."""
+    global _client, _client_checked
+    if _client_checked:
+        return _client
+
+    with _lock:
+        if _client_checked:
+            return _client
+        _client_checked = True
+
+        if not getattr(settings, 'USE_REDIS_CACHE', False):
+            return None
+
+        try:
+            import redis
+
+            client = redis.Redis(
+                host=getattr(settings, 'REDIS_HOST', 'localhost'),
+                port=int(getattr(settings, 'REDIS_PORT', 6379)),
+                password=getattr(settings, 'REDIS_PASSWORD', None) or None,
+                db=int(getattr(settings, 'REDIS_DB', 1)),
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+            client.ping()
+            _client = client
+        except Exception as e:
+            logger.warning(f"Redis unavailable, using in-process fallbacks: {e}")
+            _client = None
+
+    return _client
+
+
+def reset_redis_client():
+    """Forget the cached client (tests and settings overrides)."""
+    global _client, _client_checked
+    with _lock:
+        _client = None
+        _client_checked = False
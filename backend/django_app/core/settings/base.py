@@ -57,6 +57,7 @@ INSTALLED_APPS = [
     'corsheaders',
     
     # Local apps (order matters - users before organizations)
+    'core',  # No models; management commands (create_db, query_profile)
     'users',
     'organizations',
     'progress',
@@ -97,6 +98,14 @@ MIDDLEWARE = [
     'users.middleware.consent_middleware.ConsentMiddleware',
 ]
 
+# Per-request ORM query profiling and N+1 detection (see core/query_profiler.py).
+# Opt-in: it wraps every query, so leave it off in production.
+QUERY_PROFILER_ENABLED = os.environ.get('QUERY_PROFILER_ENABLED', 'false').lower() == 'true'
+QUERY_PROFILER_LOG = os.environ.get('QUERY_PROFILER_LOG') or None  # JSON lines, read by `manage.py query_profile`
+QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', '5'))
+if QUERY_PROFILER_ENABLED:
+    MIDDLEWARE.insert(0, 'core.query_profiler.QueryProfilerMiddleware')
+
 ROOT_URLCONF = 'core.urls'
 
 TEMPLATES = [
@@ -268,6 +277,32 @@ else:
         }
     }
 
+# Audit logging: buffered bulk writes and monthly partition retention (see users/utils/audit_buffer.py)
+AUDIT_BUFFER_ENABLED = os.environ.get('AUDIT_BUFFER_ENABLED', 'true').lower() == 'true'
+AUDIT_BUFFER_BACKEND = os.environ.get('AUDIT_BUFFER_BACKEND', 'memory')  # 'memory' or 'redis'
+AUDIT_BUFFER_MAX_SIZE = int(os.environ.get('AUDIT_BUFFER_MAX_SIZE', '200'))
+AUDIT_BUFFER_FLUSH_INTERVAL = float(os.environ.get('AUDIT_BUFFER_FLUSH_INTERVAL', '2.0'))
+AUDIT_LOG_RETENTION_MONTHS = int(os.environ.get('AUDIT_LOG_RETENTION_MONTHS', '24'))
+
+# Foundations progress heartbeats: buffered, merged batch writes (see foundations/heartbeats.py)
+FOUNDATIONS_HEARTBEAT_BUFFER_ENABLED = os.environ.get('FOUNDATIONS_HEARTBEAT_BUFFER_ENABLED', 'true').lower() == 'true'
+FOUNDATIONS_HEARTBEAT_MAX_SIZE = int(os.environ.get('FOUNDATIONS_HEARTBEAT_MAX_SIZE', '500'))
+FOUNDATIONS_HEARTBEAT_FLUSH_INTERVAL = float(os.environ.get('FOUNDATIONS_HEARTBEAT_FLUSH_INTERVAL', '5.0'))
+FOUNDATIONS_HEARTBEAT_COMPLETE_PERCENTAGE = float(os.environ.get('FOUNDATIONS_HEARTBEAT_COMPLETE_PERCENTAGE', '100'))
+
+# Community post views: tallied in a buffer and added to Post.view_count in bulk (see community/counters.py)
+COMMUNITY_VIEW_BUFFER_ENABLED = os.environ.get('COMMUNITY_VIEW_BUFFER_ENABLED', 'true').lower() == 'true'
+COMMUNITY_VIEW_BUFFER_BACKEND = os.environ.get('COMMUNITY_VIEW_BUFFER_BACKEND', 'memory')  # 'memory' or 'redis'
+COMMUNITY_VIEW_FLUSH_INTERVAL = float(os.environ.get('COMMUNITY_VIEW_FLUSH_INTERVAL', '10.0'))
+
+# Community trending feeds: served from the precomputed TrendingEntry index (see community/trending.py)
+COMMUNITY_TRENDING_INDEX_ENABLED = os.environ.get('COMMUNITY_TRENDING_INDEX_ENABLED', 'true').lower() == 'true'
+COMMUNITY_TRENDING_HALF_LIFE_HOURS = float(os.environ.get('COMMUNITY_TRENDING_HALF_LIFE_HOURS', '24'))
+COMMUNITY_TRENDING_WINDOW_DAYS = int(os.environ.get('COMMUNITY_TRENDING_WINDOW_DAYS', '7'))  # tick() weight refresh
+
+# ABAC: seconds a compiled policy index may live when Redis pub/sub invalidation is unavailable
+POLICY_INDEX_TTL = int(os.environ.get('POLICY_INDEX_TTL', '30'))
+
 # Celery Configuration (if using Celery)
 CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', f'redis://{REDIS_HOST}:{REDIS_PORT}/0')
 CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', f'redis://{REDIS_HOST}:{REDIS_PORT}/0')
@@ -279,12 +314,30 @@ CELERY_TIMEZONE = TIME_ZONE
 # Celery Beat Schedule (periodic tasks)
 try:
     from director_dashboard.celery_config import DIRECTOR_DASHBOARD_BEAT_SCHEDULE
+    from coaching.celery_config import COACHING_BEAT_SCHEDULE
+    from subscriptions.celery_config import SUBSCRIPTIONS_BEAT_SCHEDULE
+    from talentscope.celery_config import TALENTSCOPE_BEAT_SCHEDULE
+    from community.celery_config import COMMUNITY_BEAT_SCHEDULE
+    from mentors.celery_config import MENTORS_BEAT_SCHEDULE
+    from sponsors.celery_config import SPONSORS_BEAT_SCHEDULE
     CELERY_BEAT_SCHEDULE = {
         **DIRECTOR_DASHBOARD_BEAT_SCHEDULE,
+        **COACHING_BEAT_SCHEDULE,
+        **SUBSCRIPTIONS_BEAT_SCHEDULE,
+        **TALENTSCOPE_BEAT_SCHEDULE,
+        **COMMUNITY_BEAT_SCHEDULE,
+        **MENTORS_BEAT_SCHEDULE,
+        **SPONSORS_BEAT_SCHEDULE,
     }
 except ImportError:
     CELERY_BEAT_SCHEDULE = {}
 
+# TalentScope readiness engine: seconds its watermark sweep trails behind now,
+# so rows stamped by still-open transactions are not skipped
+READINESS_WATERMARK_LAG = int(os.environ.get('READINESS_WATERMARK_LAG', '120'))
+# Readiness snapshots older than this are deleted (each mentee's latest is always kept)
+READINESS_SNAPSHOT_RETENTION_DAYS = int(os.environ.get('READINESS_SNAPSHOT_RETENTION_DAYS', '180'))
+
 # Monitoring & Metrics
 ENABLE_METRICS = os.environ.get('ENABLE_METRICS', 'False').lower() == 'true'
 
@@ -0,0 +1,38 @@
+"""
+Helpers shared by signal receivers that maintain denormalized data.
+
+is_cascade() tells a delete of the row itself from one cascaded from its parent,
+which usually removes the denormalized data too. remember_previous() and previous()
+are the two halves of a diff: a pre_save receiver records the stored state of the
+row, and the post_save receiver applies only the difference between it and the
+saved instance.
+"""
+
+from django.db.models import QuerySet
+
+
+def is_cascade(sender, origin) -> bool:
+    """True when a delete of some other model cascaded to this row."""
+    if origin is None:
+        return False
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is not sender
+
+
+def remember_previous(sender, instance, attr: str, load, raw: bool = False) -> None:
+    """
+    pre_save half: store `load(rows)` on `instance.<attr>`, where `rows` is the
+    queryset of the stored row. New and raw (fixture) saves store None.
+    """
+    setattr(instance, attr, None)
+    if raw or instance._state.adding:
+        return
+    setattr(instance, attr, load(sender.objects.filter(pk=instance.pk)))
+
+
+def previous(instance, attr: str, key=None):
+    """post_save half: what remember_previous stored, passed through `key` unless None."""
+    stored = getattr(instance, attr, None)
+    if stored is None or key is None:
+        return stored
+    return key(stored)
@@ -0,0 +1,544 @@
+"""
+Deterministic synthetic data at production-like volumes.
+
+SyntheticDataGenerator fills users (students, mentors, one program director) with
+roles and student subscriptions, universities and memberships, a program with a track per TRACK_KEYS entry, cohorts
+and enrollments, mentor assignments, missions with assignments and submissions,
+community posts and reactions, TalentScope behavior and skill signals, and recipes.
+Volumes come from a named scale in SCALES, each count overridable:
+
+  - every entity draws from its own random.Random seeded with (seed, entity), and
+    row ids are drawn from the same stream, so a seed always yields the same rows
+    in the same order, whatever else is generated alongside;
+  - timestamps are offsets from `anchor` (default: today 00:00 UTC), so two runs
+    with the same seed and anchor produce identical data;
+  - rows are built in chunks of `batch_size` and written with bulk_create, so
+    memory stays flat at 10M reactions;
+  - bulk_create sends no signals, so the state those signals maintain is written
+    directly: Post.reaction_count, University member/post counts, TalentScope
+    rollups (rollups.apply_*_signals) and the community trending index.
+
+Readiness snapshots and mentee 360 profiles are left to their engines: the
+readiness watermark sweep picks up the new inputs, profiles build on first read.
+
+Synthetic users get an unusable password unless `password` is given, so a dataset
+generated by mistake outside a scratch database opens no accounts. The management
+command also refuses to run unless DEBUG is on or --i-know-this-is-not-prod is passed.
+
+Synthetic rows are namespaced by seed (usernames, emails, slugs and codes start
+with `synth<seed>`); generating into a database that already holds a seed's rows
+is refused. See `manage.py generate_synthetic_data` and core/load_scenarios.py.
+"""
+import logging
+import random
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+BULK_BATCH_SIZE = 5000
+HISTORY_DAYS = 180
+
+TRACK_KEYS = ['defender', 'offensive', 'grc', 'innovation', 'leadership']
+FIRST_NAMES = ['Amani', 'Baraka', 'Chao', 'Dalia', 'Eitan', 'Fatuma', 'Goran', 'Hana', 'Imani', 'Jomo',
+               'Kofi', 'Lina', 'Malik', 'Nia', 'Omar', 'Pendo', 'Ravi', 'Sana', 'Tariq', 'Wanjiru']
+LAST_NAMES = ['Achieng', 'Bello', 'Chen', 'Diallo', 'Enoch', 'Farah', 'Gitau', 'Haddad', 'Ibrahim', 'Juma',
+              'Kamau', 'Lopez', 'Mensah', 'Njoroge', 'Otieno', 'Patel', 'Rossi', 'Said', 'Tanaka', 'Wekesa']
+SKILLS = {
+    'technical': ['SIEM', 'Log Analysis', 'Threat Hunting', 'DFIR', 'Network Forensics', 'Web Exploitation',
+                  'Malware Triage', 'Cloud Security', 'Scripting'],
+    'governance': ['Risk Assessment', 'ISO 27001', 'Policy Writing', 'Audit Readiness'],
+    'leadership': ['Incident Command', 'Stakeholder Briefing', 'Team Coaching'],
+}
+BEHAVIOR_TYPES = [('study_consistency', 'system', 40), ('mission_completion', 'mission', 15),
+                  ('reflection_frequency', 'reflection', 15), ('engagement_level', 'habit_log', 20),
+                  ('help_seeking', 'session', 5), ('collaboration', 'system', 5)]
+POST_TYPES = [('text', 70), ('media', 15), ('event', 5), ('achievement', 7), ('poll', 3)]
+REACTION_TYPES = [('like', 50), ('love', 12), ('celebrate', 10), ('insightful', 12), ('curious', 4),
+                  ('fire', 7), ('clap', 5)]
+SUBMISSION_STATUSES = [('approved', 40), ('submitted', 20), ('under_review', 10), ('needs_revision', 15),
+                       ('rejected', 5), ('draft', 10)]
+SUBSCRIPTION_TIERS = [('premium', 40), ('starter', 60)]
+MISSION_TIERS = ['beginner', 'intermediate', 'advanced', 'mastery']
+RECIPE_TYPES = ['technical', 'analysis', 'documentation', 'leadership', 'decision', 'innovation']
+
+ENTITIES = (
+    'users', 'mentors', 'universities', 'cohorts', 'missions', 'submissions', 'posts', 'reactions',
+    'behavior_signals', 'skill_signals', 'recipes',
+)
+SCALES: Dict[str, Dict[str, int]] = {
+    'tiny': {
+        'users': 60, 'mentors': 4, 'universities': 3, 'cohorts': 5, 'missions': 10, 'submissions': 120,
+        'posts': 150, 'reactions': 900, 'behavior_signals': 600, 'skill_signals': 180, 'recipes': 10,
+    },
+    'small': {
+        'users': 2000, 'mentors': 40, 'universities': 10, 'cohorts': 20, 'missions': 100, 'submissions': 10000,
+        'posts': 10000, 'reactions': 100000, 'behavior_signals': 40000, 'skill_signals': 10000, 'recipes': 100,
+    },
+    'medium': {
+        'users': 20000, 'mentors': 400, 'universities': 50, 'cohorts': 100, 'missions': 500,
+        'submissions': 100000, 'posts': 100000, 'reactions': 1000000, 'behavior_signals': 400000,
+        'skill_signals': 100000, 'recipes': 500,
+    },
+    'large': {
+        'users': 100000, 'mentors': 2000, 'universities': 200, 'cohorts': 500, 'missions': 2000,
+        'submissions': 500000, 'posts': 1000000, 'reactions': 10000000, 'behavior_signals': 2000000,
+        'skill_signals': 500000, 'recipes': 1000,
+    },
+}
+
+
+def prefix_for(seed: int) -> str:
+    """Namespace for one seed's usernames, emails, slugs and codes."""
+    return f'synth{seed}'
+
+
+def resolve_counts(scale: str, **overrides) -> Dict[str, int]:
+    """SCALES[scale] with any non-None overrides applied."""
+    counts = dict(SCALES[scale])
+    counts.update({name: value for name, value in overrides.items() if value is not None and name in counts})
+    counts['mentors'] = min(counts['mentors'], max(counts['users'] - 2, 0))
+    return counts
+
+
+def _weighted(rng: random.Random, choices):
+    return rng.choices([value for value, _ in choices], weights=[weight for _, weight in choices])[0]
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _chunks(total: int, size: int):
+    for start in range(0, total, size):
+        yield start, min(total, start + size)
+
+
+@contextmanager
+def keep_timestamps(model, *field_names):
+    """Let bulk_create write the given auto_now / auto_now_add fields instead of stamping now()."""
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+class SyntheticDataGenerator:
+    """Writes one seed's dataset; run() returns rows written per entity."""
+
+    def __init__(self, counts: Dict[str, int], seed: int = 42, anchor: Optional[datetime] = None,
+                 batch_size: int = BULK_BATCH_SIZE, history_days: int = HISTORY_DAYS,
+                 progress: Optional[Callable[[str], None]] = None, rebuild_trending: bool = True,
+                 password: Optional[str] = None):
+        self.counts = counts
+        self.seed = seed
+        self.prefix = prefix_for(seed)
+        self.anchor = anchor or datetime.combine(timezone.now().date(), time.min, tzinfo=dt_timezone.utc)
+        self.batch_size = batch_size
+        self.history = timedelta(days=history_days)
+        self.progress = progress or logger.info
+        self.rebuild_trending = rebuild_trending
+        self.password = password  # None: every synthetic user gets an unusable password
+        self.written: Dict[str, int] = {}
+
+        # Filled as the run goes: list positions are the synthetic user index
+        self.user_ids: List[int] = []
+        self.user_uuids: List[uuid.UUID] = []
+        self.user_tracks: List[str] = []
+        self.user_universities: List[Optional[int]] = []
+        self.user_cohorts: List[Optional[int]] = []
+        self.universities: list = []
+        self.cohorts: list = []
+        self.mission_ids: list = []
+        self.university_posts: List[int] = []
+
+    # Helpers ----------------------------------------------------------------
+
+    def _rng(self, entity: str) -> random.Random:
+        return random.Random(f'{self.seed}:{entity}')
+
+    def _ago(self, rng: random.Random, span: Optional[timedelta] = None) -> datetime:
+        """A time within `span` (default: the history window) before the anchor, skewed recent."""
+        span = span or self.history
+        return self.anchor - span * (rng.random() ** 2)
+
+    def _bulk(self, model, objects, entity: str):
+        model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.written[entity] = self.written.get(entity, 0) + len(objects)
+
+    def _log(self, entity: str):
+        self.progress(f"{entity}: {self.written.get(entity, 0)}")
+
+    @property
+    def students(self) -> range:
+        """Synthetic user indexes of the students; 0 is the director, then the mentors."""
+        return range(1 + self.counts['mentors'], len(self.user_ids))
+
+    @property
+    def mentors(self) -> range:
+        return range(1, 1 + self.counts['mentors'])
+
+    def exists(self) -> bool:
+        return User.objects.filter(username__startswith=f'{self.prefix}-').exists()
+
+    # Run --------------------------------------------------------------------
+
+    def run(self) -> Dict[str, int]:
+        if self.exists():
+            raise ValueError(f'Synthetic data for seed {self.seed} already exists; use another seed or database')
+        for step in (self._universities, self._users, self._roles, self._programs, self._enrollments,
+                     self._mentorships, self._missions, self._submissions, self._posts_and_reactions,
+                     self._behavior_signals, self._skill_signals, self._recipes, self._derived):
+            step()
+        return self.written
+
+    # Steps ------------------------------------------------------------------
+
+    def _universities(self):
+        from community.models import University
+        rng = self._rng('universities')
+        self.universities = [
+            University(
+                id=_uuid(rng), name=f'{self.prefix} University {i}', slug=f'{self.prefix}-university-{i}',
+                code=f'{self.prefix.upper()}U{i}'[:20], short_name=f'SU{i}', country=rng.choice(['KE', 'NG', 'GH', 'ZA']),
+                is_verified=True,
+            )
+            for i in range(self.counts['universities'])
+        ]
+        self._bulk(University, self.universities, 'universities')
+        self._log('universities')
+
+    def _users(self):
+        rng = self._rng('users')
+        password = make_password(self.password)
+        universities = len(self.universities)
+        for start, end in _chunks(self.counts['users'], self.batch_size):
+            batch = []
+            for i in range(start, end):
+                is_mentor = 1 <= i <= self.counts['mentors']
+                joined = self._ago(rng)
+                user = User(
+                    uuid_id=_uuid(rng), username=f'{self.prefix}-{i}', email=f'{self.prefix}-{i}@synthetic.local',
+                    password=password, first_name=rng.choice(FIRST_NAMES), last_name=rng.choice(LAST_NAMES),
+                    track_key=rng.choice(TRACK_KEYS), is_mentor=is_mentor, account_status='active',
+                    email_verified=True, profile_complete=True, onboarding_complete=True,
+                    profiling_complete=rng.random() < 0.8, foundations_complete=rng.random() < 0.6,
+                    date_joined=joined, created_at=joined,
+                )
+                batch.append(user)
+                self.user_uuids.append(user.uuid_id)
+                self.user_tracks.append(user.track_key)
+                student = i > self.counts['mentors']
+                self.user_universities.append(rng.randrange(universities) if student and universities else None)
+            with keep_timestamps(User, 'created_at'):
+                self._bulk(User, batch, 'users')
+            ids = dict(User.objects.filter(uuid_id__in=[u.uuid_id for u in batch]).values_list('uuid_id', 'id'))
+            self.user_ids.extend(ids[u.uuid_id] for u in batch)
+            self._log('users')
+
+    def _roles(self):
+        from community.models import UniversityMembership
+        from subscriptions.models import SubscriptionPlan, UserSubscription
+        from users.models import Role, UserRole
+        rng = self._rng('subscriptions')
+        roles = {
+            name: Role.objects.get_or_create(name=name, defaults={'display_name': name.replace('_', ' ').title()})[0]
+            for name in ('program_director', 'mentor', 'student')
+        }
+        plans = {
+            tier: SubscriptionPlan.objects.get_or_create(name=tier, defaults={'tier': tier})[0]
+            for tier in ('starter', 'premium')
+        }
+        for start, end in _chunks(len(self.user_ids), self.batch_size):
+            user_roles, memberships, subscriptions = [], [], []
+            for i in range(start, end):
+                role = 'program_director' if i == 0 else 'mentor' if i in self.mentors else 'student'
+                user_roles.append(UserRole(user_id=self.user_ids[i], role=roles[role], scope='global'))
+                if role == 'student':
+                    period_start = self._ago(rng, timedelta(days=30))
+                    subscriptions.append(UserSubscription(
+                        id=_uuid(rng), user_id=self.user_ids[i], plan=plans[_weighted(rng, SUBSCRIPTION_TIERS)],
+                        status='active', current_period_start=period_start,
+                        current_period_end=period_start + timedelta(days=30),
+                    ))
+                university = self.user_universities[i]
+                if university is not None:
+                    memberships.append(UniversityMembership(
+                        user_id=self.user_ids[i], university=self.universities[university], mapped_method='import',
+                    ))
+            self._bulk(UserRole, user_roles, 'user_roles')
+            self._bulk(UniversityMembership, memberships, 'university_memberships')
+            self._bulk(UserSubscription, subscriptions, 'subscriptions')
+        self._log('university_memberships')
+
+    def _programs(self):
+        from programs.models import Cohort, Program, Track
+        rng = self._rng('programs')
+        program = Program.objects.create(
+            id=_uuid(rng), name=f'{self.prefix} Cybersecurity Program', category='technical',
+            categories=['technical'], duration_months=12, status='active',
+        )
+        tracks = [
+            Track(id=_uuid(rng), program=program, key=key, name=f'{key.title()} Track', director_id=self.user_uuids[0])
+            for key in TRACK_KEYS
+        ]
+        self._bulk(Track, tracks, 'tracks')
+        self.cohorts = []
+        for i in range(self.counts['cohorts']):
+            track = tracks[i % len(tracks)]
+            start = (self.anchor - self.history * rng.random()).date()
+            self.cohorts.append(Cohort(
+                id=_uuid(rng), track=track, name=f'{self.prefix} {track.key} cohort {i}', start_date=start,
+                end_date=start + timedelta(days=365), mode=rng.choice(['virtual', 'hybrid', 'onsite']),
+                seat_cap=max(10, 2 * self.counts['users'] // max(self.counts['cohorts'], 1)), status='running',
+            ))
+        self._bulk(Cohort, self.cohorts, 'cohorts')
+        self._log('cohorts')
+
+    def _enrollments(self):
+        from programs.models import Enrollment
+        rng = self._rng('enrollments')
+        by_track = {key: [c for c in range(len(self.cohorts)) if self.cohorts[c].track.key == key] for key in TRACK_KEYS}
+        self.user_cohorts = [None] * len(self.user_ids)
+        for start, end in _chunks(len(self.students), self.batch_size):
+            batch = []
+            for i in self.students[start:end]:
+                options = by_track[self.user_tracks[i]] or range(len(self.cohorts))
+                if not options:
+                    continue
+                cohort = rng.choice(options)
+                self.user_cohorts[i] = cohort
+                status = _weighted(rng, [('active', 85), ('completed', 8), ('suspended', 4), ('withdrawn', 3)])
+                batch.append(Enrollment(
+                    id=_uuid(rng), cohort=self.cohorts[cohort], user_id=self.user_ids[i], status=status,
+                    payment_status=_weighted(rng, [('paid', 70), ('waived', 20), ('pending', 10)]),
+                    seat_type=_weighted(rng, [('paid', 60), ('scholarship', 25), ('sponsored', 15)]),
+                    joined_at=self._ago(rng),
+                ))
+            with keep_timestamps(Enrollment, 'joined_at'):
+                self._bulk(Enrollment, batch, 'enrollments')
+        self._log('enrollments')
+
+    def _mentorships(self):
+        from mentorship_coordination.models import MenteeMentorAssignment
+        mentors = list(self.mentors)
+        if not mentors:
+            return
+        rng = self._rng('mentorships')
+        for start, end in _chunks(len(self.students), self.batch_size):
+            batch = [
+                MenteeMentorAssignment(
+                    id=_uuid(rng), mentee_id=self.user_ids[i], mentor_id=self.user_ids[mentors[i % len(mentors)]],
+                    cohort_id=str(self.cohorts[self.user_cohorts[i]].id) if self.user_cohorts[i] is not None else None,
+                    track_id=self.user_tracks[i], status='active', assigned_at=self._ago(rng),
+                )
+                for i in self.students[start:end]
+            ]
+            self._bulk(MenteeMentorAssignment, batch, 'mentor_assignments')
+        self._log('mentor_assignments')
+
+    def _missions(self):
+        from missions.models import Mission
+        rng = self._rng('missions')
+        missions = []
+        for i in range(self.counts['missions']):
+            difficulty = rng.randint(1, 5)
+            skills = rng.sample(SKILLS['technical'], 2)
+            missions.append(Mission(
+                id=_uuid(rng), code=f'{self.prefix.upper()}-{i:05d}', track=rng.choice(TRACK_KEYS),
+                title=f'{skills[0]} mission {i}', description=f'Synthetic mission {i} practising {skills[0]}.',
+                difficulty=difficulty, tier=MISSION_TIERS[min(difficulty - 1, 3)],
+                mission_type=rng.choice(['beginner', 'intermediate', 'advanced']),
+                estimated_duration_min=rng.choice([30, 45, 60, 90, 120]), skills_tags=skills, competencies=skills,
+                subtasks=[{'id': n, 'title': f'Step {n}', 'order_index': n} for n in range(1, 4)],
+                requires_mentor_review=rng.random() < 0.3, is_active=True,
+            ))
+        self._bulk(Mission, missions, 'missions')
+        self.mission_ids = [m.id for m in missions]
+        self._log('missions')
+
+    def _submissions(self):
+        from missions.models import MissionAssignment, MissionSubmission
+        students, mentors = self.students, list(self.mentors)
+        if not students or not self.mission_ids:
+            return
+        rng = self._rng('submissions')
+        for start, end in _chunks(self.counts['submissions'], self.batch_size):
+            assignments, submissions = [], []
+            for _ in range(start, end):
+                student = self.user_uuids[rng.choice(students)]
+                created = self._ago(rng)
+                assignment = MissionAssignment(
+                    id=_uuid(rng), mission_id=rng.choice(self.mission_ids), assignment_type='individual',
+                    student_id=student, status='submitted', assigned_at=created,
+                )
+                status = _weighted(rng, SUBMISSION_STATUSES)
+                reviewed = status in ('approved', 'needs_revision', 'rejected')
+                submitted_at = None if status == 'draft' else created + timedelta(hours=rng.uniform(1, 72))
+                submissions.append(MissionSubmission(
+                    id=_uuid(rng), assignment=assignment, student_id=student, content='Synthetic submission',
+                    status=status, score=Decimal(rng.randint(35, 100)) if reviewed else None,
+                    reviewed_by_id=self.user_uuids[rng.choice(mentors)] if reviewed and mentors else None,
+                    reviewed_at=submitted_at + timedelta(hours=rng.uniform(2, 96)) if reviewed else None,
+                    submitted_at=submitted_at, created_at=created,
+                ))
+                assignments.append(assignment)
+            with keep_timestamps(MissionAssignment, 'assigned_at'), keep_timestamps(MissionSubmission, 'created_at'):
+                self._bulk(MissionAssignment, assignments, 'mission_assignments')
+                self._bulk(MissionSubmission, submissions, 'submissions')
+            self._log('submissions')
+
+    def _reaction_counts(self, rng: random.Random) -> List[int]:
+        """Reactions per post: heavy-tailed, summing to the reactions count, at most one per user."""
+        posts, users = self.counts['posts'], len(self.user_ids)
+        total = min(self.counts['reactions'], posts * users)
+        if not posts or not total:
+            return [0] * posts
+        weights = [rng.paretovariate(1.2) for _ in range(posts)]
+        scale = total / sum(weights)
+        counts = [min(users, int(w * scale)) for w in weights]
+        remainder = total - sum(counts)
+        order = sorted(range(posts), key=lambda p: -weights[p])
+        while remainder > 0:
+            for p in order:
+                if remainder == 0:
+                    break
+                if counts[p] < users:
+                    counts[p] += 1
+                    remainder -= 1
+        return counts
+
+    def _posts_and_reactions(self):
+        from community.models import Post, Reaction
+        rng = self._rng('posts')
+        reaction_rng = self._rng('reactions')
+        reaction_counts = self._reaction_counts(rng)
+        users = len(self.user_ids)
+        self.university_posts = [0] * len(self.universities)
+        for start, end in _chunks(self.counts['posts'], self.batch_size):
+            posts, reactions = [], []
+            for p in range(start, end):
+                author = rng.randrange(users)
+                university = self.user_universities[author]
+                if university is None and self.universities:
+                    university = rng.randrange(len(self.universities))
+                created = self._ago(rng)
+                post = Post(
+                    id=_uuid(rng), author_id=self.user_ids[author],
+                    university=self.universities[university] if university is not None else None,
+                    post_type=_weighted(rng, POST_TYPES), content=f'Synthetic post {p}',
+                    visibility='global' if rng.random() < 0.7 else 'university', status='published',
+                    is_featured=rng.random() < 0.001, tags=rng.sample(TRACK_KEYS, 1),
+                    reaction_count=reaction_counts[p], view_count=reaction_counts[p] * rng.randint(3, 12),
+                    created_at=created, published_at=created,
+                )
+                posts.append(post)
+                if university is not None:
+                    self.university_posts[university] += 1
+                window = max((self.anchor - created).total_seconds(), 1.0)
+                for reactor in reaction_rng.sample(range(users), reaction_counts[p]):
+                    reactions.append(Reaction(
+                        id=_uuid(reaction_rng), user_id=self.user_ids[reactor], post=post,
+                        reaction_type=_weighted(reaction_rng, REACTION_TYPES),
+                        created_at=created + timedelta(seconds=window * reaction_rng.random() ** 3),
+                    ))
+            with keep_timestamps(Post, 'created_at'), keep_timestamps(Reaction, 'created_at'):
+                self._bulk(Post, posts, 'posts')
+                for offset in range(0, len(reactions), self.batch_size):
+                    self._bulk(Reaction, reactions[offset:offset + self.batch_size], 'reactions')
+            self._log('posts')
+
+    def _behavior_signals(self):
+        from talentscope import rollups
+        from talentscope.models import BehaviorSignal
+        students = self.students
+        if not students:
+            return
+        rng = self._rng('behavior_signals')
+        for start, end in _chunks(self.counts['behavior_signals'], self.batch_size):
+            batch = []
+            for _ in range(start, end):
+                behavior_type, source, _ = rng.choices(BEHAVIOR_TYPES, weights=[w for *_, w in BEHAVIOR_TYPES])[0]
+                recorded = self._ago(rng, timedelta(days=60))
+                batch.append(BehaviorSignal(
+                    id=_uuid(rng), mentee_id=self.user_ids[rng.choice(students)], behavior_type=behavior_type,
+                    value=Decimal(rng.randint(1, 40)) / 10, source=source, recorded_at=recorded, created_at=recorded,
+                ))
+            with keep_timestamps(BehaviorSignal, 'created_at'):
+                self._bulk(BehaviorSignal, batch, 'behavior_signals')
+            rollups.apply_behavior_signals(batch)
+            self._log('behavior_signals')
+
+    def _skill_signals(self):
+        from talentscope import rollups
+        from talentscope.models import SkillSignal
+        students = self.students
+        if not students:
+            return
+        rng = self._rng('skill_signals')
+        categories = list(SKILLS)
+        for start, end in _chunks(self.counts['skill_signals'], self.batch_size):
+            batch = []
+            for _ in range(start, end):
+                category = rng.choice(categories)
+                practiced = self._ago(rng, timedelta(days=90))
+                batch.append(SkillSignal(
+                    id=_uuid(rng), mentee_id=self.user_ids[rng.choice(students)], skill_name=rng.choice(SKILLS[category]),
+                    skill_category=category, mastery_level=Decimal(rng.randint(5, 100)),
+                    hours_practiced=Decimal(rng.randint(1, 80)) / 4, last_practiced=practiced,
+                    source=rng.choice(['mission', 'course', 'mentor_feedback']), created_at=practiced,
+                    updated_at=practiced,
+                ))
+            with keep_timestamps(SkillSignal, 'created_at', 'updated_at'):
+                self._bulk(SkillSignal, batch, 'skill_signals')
+            rollups.apply_skill_signals(batch)
+            self._log('skill_signals')
+
+    def _recipes(self):
+        from recipes.models import Recipe
+        rng = self._rng('recipes')
+        recipes = []
+        for i in range(self.counts['recipes']):
+            category = rng.choice(list(SKILLS))
+            skill = rng.choice(SKILLS[category])
+            recipes.append(Recipe(
+                id=_uuid(rng), title=f'{skill} recipe {i}', slug=f'{self.prefix}-recipe-{i}',
+                summary=f'Practise {skill} in one short exercise.', description=f'Synthetic recipe {i} for {skill}.',
+                difficulty=rng.choice(['beginner', 'intermediate', 'advanced']), recipe_type=rng.choice(RECIPE_TYPES),
+                estimated_minutes=rng.choice([5, 10, 15, 20, 30, 45, 60]), track_codes=rng.sample(TRACK_KEYS, 2),
+                skill_codes=[skill.upper().replace(' ', '_')], tools_used=['jq'],
+                steps=[{'step_number': n, 'instruction': f'Step {n}'} for n in range(1, 4)],
+                is_free_sample=rng.random() < 0.1, usage_count=int(rng.paretovariate(1.3) * 10),
+                avg_rating=Decimal(rng.randint(25, 50)) / 10,
+            ))
+        self._bulk(Recipe, recipes, 'recipes')
+        self._log('recipes')
+
+    def _derived(self):
+        from community.models import University
+        members = [0] * len(self.universities)
+        for university in self.user_universities:
+            if university is not None:
+                members[university] += 1
+        for university, member_count, post_count in zip(self.universities, members, self.university_posts):
+            university.member_count, university.post_count = member_count, post_count
+        University.objects.bulk_update(self.universities, ['member_count', 'post_count'], batch_size=self.batch_size)
+        if self.rebuild_trending:
+            from community import trending
+            self.written['trending_entries'] = trending.rebuild(chunk_size=self.batch_size)
+            self._log('trending_entries')
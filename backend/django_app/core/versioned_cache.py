@@ -0,0 +1,58 @@
+"""
+Version counters for invalidating cache entries without deleting them.
+
+An entry's key embeds the current value of one or more counters; bumping a counter
+makes every entry built under the old value unreachable, so a change is visible on
+the next read. Entry TTLs then only bound memory. Counters are stored without
+expiry and seeded from the clock rather than 0, so a counter that is evicted and
+seeded again never repeats a value that an old entry is still keyed under.
+
+Used by the identity snapshot, curriculum track projections, mentee 360 profiles
+and the community GenerationalCache; pass `backend` to use a cache other than the
+default one.
+"""
+
+import time
+from typing import Iterable, List, Optional
+
+from django.core.cache import cache
+
+# Stale entries are never served, so this only decides how long an unreachable entry
+# holds memory before the backend drops it.
+ENTRY_TTL = 60 * 60
+
+
+def seed_version() -> int:
+    return time.time_ns() // 1000  # microseconds: a re-seed right after eviction still moves on
+
+
+def _initial(key: str, backend) -> int:
+    backend.add(key, seed_version(), None)
+    return int(backend.get(key) or 0)
+
+
+def current_versions(keys: Iterable[str], backend=None, found: Optional[dict] = None) -> List[int]:
+    """
+    Current value of each counter, in order, seeding any that are missing. Pass
+    `found`, a get_many result that already includes the keys, to skip the read.
+    """
+    backend = backend if backend is not None else cache
+    keys = list(keys)
+    if found is None:
+        found = backend.get_many(keys)
+    return [int(found[key]) if found.get(key) is not None else _initial(key, backend) for key in keys]
+
+
+def current_version(key: str, backend=None) -> int:
+    return current_versions([key], backend)[0]
+
+
+def bump_version(key: str, backend=None) -> None:
+    """Move a counter on, invalidating every entry keyed under its current value."""
+    backend = backend if backend is not None else cache
+    try:
+        backend.incr(key)
+    except ValueError:
+        # Missing or evicted (or DummyCache): a fresh seed is already a new version
+        if not backend.add(key, seed_version(), None):
+            backend.incr(key)
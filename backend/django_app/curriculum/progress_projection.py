@@ -0,0 +1,210 @@
+"""
+Per-user track progress projection for curriculum listings.
+
+Module and lesson serializers used to ask the database, per object, for the lesson
+count and the viewer's UserModuleProgress / UserLessonProgress row, so a track page cost
+queries in proportion to its modules and lessons. A TrackProgressProjection holds all of
+that for one (user, track): lesson counts per module, the module progress rows and the
+lesson progress rows, built with one grouped query per kind and cached.
+
+Cache keys carry two versions:
+- curriculum:progress:content:<track_id> is bumped when the track's modules or lessons
+  change, which invalidates every user's projection for that track;
+- curriculum:progress:ver:<user_id>:<track_id> is bumped when a progress row is deleted
+  or a patch cannot be applied safely.
+
+Progress writes do not invalidate: once the write commits, the post_save signals
+(curriculum/signals.py) patch the one changed row into the cached projection, so the
+next read is still a cache hit.
+Serializers read through TrackProgressMixin, which memoizes projections per request in
+the serializer context.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from django.core.cache import cache
+from django.db.models import Count
+
+from core.versioned_cache import ENTRY_TTL, bump_version, current_versions
+
+logger = logging.getLogger(__name__)
+
+PATCH_LOCK_TTL = 5
+CONTEXT_KEY = 'track_progress_projections'
+
+
+@dataclass
+class TrackProgressProjection:
+    user_id: int
+    track_id: str
+    lesson_counts: Dict[str, int] = field(default_factory=dict)
+    modules: Dict[str, dict] = field(default_factory=dict)
+    lessons: Dict[str, dict] = field(default_factory=dict)
+
+    def lesson_count(self, module_id) -> int:
+        return self.lesson_counts.get(str(module_id), 0)
+
+    def module_progress(self, module_id) -> Optional[dict]:
+        return self.modules.get(str(module_id))
+
+    def lesson_progress(self, lesson_id) -> Optional[dict]:
+        return self.lessons.get(str(lesson_id))
+
+
+def module_progress_row(progress) -> dict:
+    return {
+        'status': progress.status,
+        'completion_percentage': float(progress.completion_percentage),
+        'lessons_completed': progress.lessons_completed,
+        'missions_completed': progress.missions_completed,
+        'is_blocked': progress.is_blocked,
+        'time_spent_minutes': progress.time_spent_minutes,
+    }
+
+
+def lesson_progress_row(progress) -> dict:
+    return {
+        'status': progress.status,
+        'progress_percentage': float(progress.progress_percentage),
+        'time_spent_minutes': progress.time_spent_minutes,
+        'quiz_score': float(progress.quiz_score) if progress.quiz_score else None,
+    }
+
+
+# Versioning ---------------------------------------------------------------
+
+def _content_key(track_id) -> str:
+    return f'curriculum:progress:content:{track_id}'
+
+
+def _user_key(user_id, track_id) -> str:
+    return f'curriculum:progress:ver:{user_id}:{track_id}'
+
+
+def _versions(user_id, track_id):
+    return current_versions([_content_key(track_id), _user_key(user_id, track_id)])
+
+
+def _projection_key(user_id, track_id, content_version, user_version) -> str:
+    return f'curriculum:progress:{user_id}:{track_id}:c{content_version}:v{user_version}'
+
+
+def invalidate_track_content(track_id) -> None:
+    """Drop every user's projection for a track (modules or lessons changed)."""
+    if track_id:
+        bump_version(_content_key(track_id))
+
+
+def invalidate_user_track(user_id, track_id) -> None:
+    """Drop one user's projection for a track."""
+    if track_id:
+        bump_version(_user_key(user_id, track_id))
+
+
+# Build and read -----------------------------------------------------------
+
+def build_track_projection(user_id, track_id) -> TrackProgressProjection:
+    from .models import Lesson, UserLessonProgress, UserModuleProgress
+
+    projection = TrackProgressProjection(user_id=user_id, track_id=str(track_id))
+
+    counts = (
+        Lesson.objects.filter(module__track_id=track_id)
+        .values('module_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for row in counts:
+        projection.lesson_counts[str(row['module_id'])] = row['count']
+
+    for progress in UserModuleProgress.objects.filter(user_id=user_id, module__track_id=track_id).only(
+        'module_id', 'status', 'completion_percentage', 'lessons_completed',
+        'missions_completed', 'is_blocked', 'time_spent_minutes',
+    ):
+        projection.modules[str(progress.module_id)] = module_progress_row(progress)
+
+    for progress in UserLessonProgress.objects.filter(user_id=user_id, lesson__module__track_id=track_id).only(
+        'lesson_id', 'status', 'progress_percentage', 'time_spent_minutes', 'quiz_score',
+    ):
+        projection.lessons[str(progress.lesson_id)] = lesson_progress_row(progress)
+
+    return projection
+
+
+def get_track_projection(user_id, track_id) -> TrackProgressProjection:
+    """Return the cached projection for (user, track), building it on a miss."""
+    key = _projection_key(user_id, track_id, *_versions(user_id, track_id))
+    projection = cache.get(key)
+    if projection is None:
+        projection = build_track_projection(user_id, track_id)
+        cache.set(key, projection, ENTRY_TTL)
+    return projection
+
+
+# Incremental patches ------------------------------------------------------
+
+def _patch(user_id, track_id, apply) -> None:
+    """
+    Apply `apply(projection)` to the cached projection, if there is one.
+
+    Patches are read-modify-write, so they run under a short per-(user, track) lock;
+    a writer that cannot take the lock invalidates instead of risking a lost update.
+    """
+    if not track_id:
+        return
+    key = _projection_key(user_id, track_id, *_versions(user_id, track_id))
+    lock_key = f'{key}:lock'
+    if not cache.add(lock_key, 1, PATCH_LOCK_TTL):
+        invalidate_user_track(user_id, track_id)
+        return
+    try:
+        projection = cache.get(key)
+        if projection is not None:
+            apply(projection)
+            cache.set(key, projection, ENTRY_TTL)
+    except Exception as e:
+        logger.warning(f"Track progress projection patch failed, invalidating: {e}")
+        invalidate_user_track(user_id, track_id)
+    finally:
+        cache.delete(lock_key)
+
+
+def patch_module_progress(progress, track_id) -> None:
+    row = module_progress_row(progress)
+    _patch(progress.user_id, track_id, lambda p: p.modules.__setitem__(str(progress.module_id), row))
+
+
+def patch_lesson_progress(progress, track_id) -> None:
+    row = lesson_progress_row(progress)
+    _patch(progress.user_id, track_id, lambda p: p.lessons.__setitem__(str(progress.lesson_id), row))
+
+
+# Serializer access --------------------------------------------------------
+
+class TrackProgressMixin:
+    """
+    Serializer mixin: `self.track_projection(track_id)` returns the viewer's projection
+    for a track, or None for anonymous viewers and modules without a track (callers
+    then fall back to their per-object query). Projections are memoized in the shared
+    serializer context, so a whole track page reads each one once.
+    """
+
+    def track_projection(self, track_id) -> Optional[TrackProgressProjection]:
+        request = self.context.get('request')
+        if not track_id or request is None or not request.user.is_authenticated:
+            return None
+        projections = self.context.setdefault(CONTEXT_KEY, {})
+        if track_id not in projections:
+            projections[track_id] = get_track_projection(request.user.pk, track_id)
+        return projections[track_id]
+
+    def module_projection(self, module) -> Optional[TrackProgressProjection]:
+        return self.track_projection(module.track_id)
+
+    def lesson_projection(self, lesson) -> Optional[TrackProgressProjection]:
+        module = lesson.module if lesson.module_id else None
+        return self.track_projection(module.track_id) if module is not None else None
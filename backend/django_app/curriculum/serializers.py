@@ -3,6 +3,7 @@ Curriculum Engine serializers - API responses for tracks, modules, lessons, and
 """
 from rest_framework import serializers
 from django.db.models import Count, Avg
+from .progress_projection import TrackProgressMixin
 from .models import (
     CurriculumTrack, CurriculumLevel, CurriculumModule, CurriculumContent,
     StrategicSession, UserTrackEnrollment, UserContentProgress, Lesson, ModuleMission,
@@ -245,7 +246,7 @@ class CurriculumTrackSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
 
 
-class LessonSerializer(serializers.ModelSerializer):
+class LessonSerializer(TrackProgressMixin, serializers.ModelSerializer):
     """Serializer for lessons."""
     is_completed = serializers.SerializerMethodField()
     user_progress = serializers.SerializerMethodField()
@@ -265,6 +266,10 @@ class LessonSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at']
     
     def get_is_completed(self, obj):
+        projection = self.lesson_projection(obj)
+        if projection is not None:
+            progress = projection.lesson_progress(obj.id)
+            return bool(progress and progress['status'] == 'completed')
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return obj.user_progress.filter(
@@ -274,6 +279,9 @@ class LessonSerializer(serializers.ModelSerializer):
         return False
     
     def get_user_progress(self, obj):
+        projection = self.lesson_projection(obj)
+        if projection is not None:
+            return projection.lesson_progress(obj.id)
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             progress = obj.user_progress.filter(user=request.user).first()
@@ -326,12 +334,15 @@ class RecipeRecommendationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
 
 
-class CurriculumModuleListSerializer(serializers.ModelSerializer):
+class CurriculumModuleListSerializer(TrackProgressMixin, serializers.ModelSerializer):
     """List serializer for curriculum modules (minimal data)."""
     lesson_count = serializers.SerializerMethodField()
     mission_count = serializers.IntegerField(read_only=True)
 
     def get_lesson_count(self, obj):
+        projection = self.module_projection(obj)
+        if projection is not None:
+            return projection.lesson_count(obj.id)
         return obj.lessons.count()
     completion_percentage = serializers.SerializerMethodField()
     is_locked = serializers.SerializerMethodField()
@@ -348,6 +359,10 @@ class CurriculumModuleListSerializer(serializers.ModelSerializer):
         read_only_fields = ['id']
     
     def get_completion_percentage(self, obj):
+        projection = self.module_projection(obj)
+        if projection is not None:
+            progress = projection.module_progress(obj.id)
+            return progress['completion_percentage'] if progress else 0
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             progress = obj.user_progress.filter(user=request.user).first()
@@ -369,7 +384,7 @@ class CurriculumModuleListSerializer(serializers.ModelSerializer):
         return False
 
 
-class CurriculumModuleDetailSerializer(serializers.ModelSerializer):
+class CurriculumModuleDetailSerializer(TrackProgressMixin, serializers.ModelSerializer):
     """Detail serializer for curriculum modules (full data)."""
     lessons = LessonSerializer(many=True, read_only=True)
     module_missions = ModuleMissionSerializer(many=True, read_only=True)
@@ -380,6 +395,9 @@ class CurriculumModuleDetailSerializer(serializers.ModelSerializer):
     lesson_count = serializers.SerializerMethodField()
 
     def get_lesson_count(self, obj):
+        projection = self.module_projection(obj)
+        if projection is not None:
+            return projection.lesson_count(obj.id)
         return obj.lessons.count()
     
     class Meta:
@@ -395,6 +413,9 @@ class CurriculumModuleDetailSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
     
     def get_user_progress(self, obj):
+        projection = self.module_projection(obj)
+        if projection is not None:
+            return projection.module_progress(obj.id)
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             progress = obj.user_progress.filter(user=request.user).first()
@@ -1,9 +1,12 @@
 """
 Signals for Curriculum Engine — keeps denormalized counts in sync.
 """
+from django.db import transaction
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
+from core.signal_utils import is_cascade
+
 
 @receiver([post_save, post_delete], sender='curriculum.Lesson')
 def update_module_lesson_count(sender, instance, **kwargs):
@@ -13,3 +16,54 @@ def update_module_lesson_count(sender, instance, **kwargs):
         count = module.lessons.count()
         module.lesson_count = count
         module.save(update_fields=['lesson_count'])
+
+
+@receiver([post_save, post_delete], sender='curriculum.Lesson')
+def invalidate_lesson_projections(sender, instance, **kwargs):
+    """A lesson added, moved or removed changes lesson counts for the whole track."""
+    from .progress_projection import invalidate_track_content
+    module = instance.module
+    if module:
+        invalidate_track_content(module.track_id)
+
+
+@receiver([post_save, post_delete], sender='curriculum.CurriculumModule')
+def invalidate_module_projections(sender, instance, **kwargs):
+    from .progress_projection import invalidate_track_content
+    invalidate_track_content(instance.track_id)
+
+
+@receiver(post_save, sender='curriculum.UserModuleProgress')
+def patch_module_projection(sender, instance, **kwargs):
+    """
+    Patch the learner's cached track projection in place instead of rebuilding it.
+
+    Deferred to commit, so a rolled-back write never reaches the cache.
+    """
+    from .progress_projection import patch_module_progress
+    track_id = instance.module.track_id
+    transaction.on_commit(lambda: patch_module_progress(instance, track_id))
+
+
+@receiver(post_save, sender='curriculum.UserLessonProgress')
+def patch_lesson_projection(sender, instance, **kwargs):
+    from .progress_projection import patch_lesson_progress
+    track_id = instance.lesson.module.track_id
+    transaction.on_commit(lambda: patch_lesson_progress(instance, track_id))
+
+
+@receiver(post_delete, sender='curriculum.UserModuleProgress')
+def invalidate_module_progress_projection(sender, instance, origin=None, **kwargs):
+    # Module and user deletes already invalidate (or orphan) the projection as a whole.
+    if is_cascade(sender, origin):
+        return
+    from .progress_projection import invalidate_user_track
+    invalidate_user_track(instance.user_id, instance.module.track_id)
+
+
+@receiver(post_delete, sender='curriculum.UserLessonProgress')
+def invalidate_lesson_progress_projection(sender, instance, origin=None, **kwargs):
+    if is_cascade(sender, origin):
+        return
+    from .progress_projection import invalidate_user_track
+    invalidate_user_track(instance.user_id, instance.lesson.module.track_id)
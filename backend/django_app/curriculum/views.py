@@ -30,6 +30,7 @@ from .serializers import (
     CrossTrackProgramProgressSerializer,
     CurriculumTrackMentorAssignmentSerializer,
 )
+from users.utils.identity_snapshot import get_identity_snapshot
 
 
 def get_user_subscription_tier(user):
@@ -37,23 +38,13 @@ def get_user_subscription_tier(user):
     Get user's subscription tier for entitlement checks.
     Returns: 'free', 'starter_normal', 'starter_enhanced', 'professional'
     """
-    # TODO: Integrate with subscriptions app
-    # For now, return a default
-    try:
-        from subscriptions.models import Subscription
-        subscription = Subscription.objects.filter(
-            user=user,
-            status='active'
-        ).order_by('-start_date').first()
-        
-        if subscription:
-            if subscription.plan_id == 'professional':
-                return 'professional'
-            if subscription.enhanced_access_until and subscription.enhanced_access_until > timezone.now():
-                return 'starter_enhanced'
-            return 'starter_normal'
-    except Exception:
-        pass
+    identity = get_identity_snapshot(user)
+    if identity.tier == 'premium':
+        return 'professional'
+    if identity.has_enhanced_access:
+        return 'starter_enhanced'
+    if identity.tier == 'starter':
+        return 'starter_normal'
     return 'free'
 
 
@@ -482,7 +473,8 @@ class LessonViewSet(viewsets.ModelViewSet):
         if module_id:
             queryset = queryset.filter(module_id=module_id)
         
-        return queryset.order_by('order_index')
+        # LessonSerializer reads progress from the module's track projection
+        return queryset.select_related('module').order_by('order_index')
 
     @action(detail=False, methods=['post'], url_path='upload-video')
     def upload_video(self, request):
@@ -556,9 +548,14 @@ class LessonViewSet(viewsets.ModelViewSet):
         if progress.status == 'in_progress' and not progress.started_at:
             progress.started_at = timezone.now()
         
-        if progress.status == 'completed' and not progress.completed_at:
+        just_completed = progress.status == 'completed' and not progress.completed_at
+        if just_completed:
             progress.completed_at = timezone.now()
-            
+        
+        # Save before rolling up, so module/track counts include this lesson
+        progress.save()
+        
+        if just_completed:
             # Log activity
             CurriculumActivity.objects.create(
                 user=user,
@@ -575,8 +572,6 @@ class LessonViewSet(viewsets.ModelViewSet):
             # Update track progress so sidebar and dashboards stay in sync with learning
             self._update_track_progress_after_lesson(user, lesson.module)
         
-        progress.save()
-        
         return Response({
             'status': 'updated',
             'progress': UserLessonProgressSerializer(progress).data
@@ -630,10 +625,10 @@ class LessonViewSet(viewsets.ModelViewSet):
             status='completed',
             lesson__module_id__in=track_module_ids
         ).count() if track_module_ids else 0
-        total_lessons = sum(
-            m.lessons.filter(is_required=True).count()
-            for m in track_modules
-        )
+        total_lessons = Lesson.objects.filter(
+            module_id__in=track_module_ids,
+            is_required=True
+        ).count() if track_module_ids else 0
         track_progress.lessons_completed = completed_lessons
         track_progress.completion_percentage = (completed_lessons / total_lessons * 100) if total_lessons > 0 else 0
         track_progress.total_points = (track_progress.total_points or 0) + 10
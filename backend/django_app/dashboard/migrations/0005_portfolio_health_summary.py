@@ -0,0 +1,63 @@
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_summaries(apps, schema_editor):
+    from dashboard.portfolio_health import summarize_items
+    PortfolioItem = apps.get_model('dashboard', 'PortfolioItem')
+    ReadinessScore = apps.get_model('dashboard', 'ReadinessScore')
+    PortfolioHealthSummary = apps.get_model('dashboard', 'PortfolioHealthSummary')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+    items = {}
+    for user_id, status, skill_tags in PortfolioItem.objects.values_list('user__id', 'status', 'skill_tags').iterator():
+        items.setdefault(user_id, []).append((status, skill_tags))
+    readiness = {}
+    for user_id, score, trend in ReadinessScore.objects.order_by('user_id', 'updated_at').values_list(
+        'user_id', 'score', 'trend',
+    ).iterator():
+        readiness[user_id] = (score, trend)
+
+    summaries = []
+    for user_id in User.objects.filter(id__in=set(items) | set(readiness)).values_list('id', flat=True):
+        score, trend = readiness.get(user_id, (0, 0.0))
+        summaries.append(PortfolioHealthSummary(
+            user_id=user_id, readiness_score=score, readiness_trend=trend,
+            **summarize_items(items.get(user_id, [])),
+        ))
+    PortfolioHealthSummary.objects.bulk_create(summaries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('dashboard', '0004_merge_20260209_1202'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PortfolioHealthSummary',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('total_items', models.IntegerField(default=0)),
+                ('approved_items', models.IntegerField(default=0)),
+                ('pending_items', models.IntegerField(default=0)),
+                ('in_review_items', models.IntegerField(default=0)),
+                ('skill_counts', models.JSONField(blank=True, default=dict, help_text='Skill tag -> number of items tagged with it')),
+                ('top_skills', models.JSONField(blank=True, default=list)),
+                ('health_score', models.FloatField(default=0.0, help_text='Approved items as a percentage of all items')),
+                ('readiness_score', models.IntegerField(default=0)),
+                ('readiness_trend', models.FloatField(default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='portfolio_health', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'portfolio_health_summaries',
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
@@ -94,6 +94,28 @@ class PortfolioItem(models.Model):
         ]
 
 
+class PortfolioHealthSummary(models.Model):
+    """
+    Per-user portfolio health, maintained incrementally by dashboard.signals as portfolio
+    items and readiness scores change (see dashboard/portfolio_health.py).
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='portfolio_health')
+    total_items = models.IntegerField(default=0)
+    approved_items = models.IntegerField(default=0)
+    pending_items = models.IntegerField(default=0)
+    in_review_items = models.IntegerField(default=0)
+    skill_counts = models.JSONField(default=dict, blank=True, help_text='Skill tag -> number of items tagged with it')
+    top_skills = models.JSONField(default=list, blank=True)
+    health_score = models.FloatField(default=0.0, help_text='Approved items as a percentage of all items')
+    readiness_score = models.IntegerField(default=0)
+    readiness_trend = models.FloatField(default=0.0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'portfolio_health_summaries'
+
+
 class MentorshipSession(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, to_field='uuid_id', on_delete=models.CASCADE, related_name='mentorship_sessions')
@@ -0,0 +1,145 @@
+"""
+Portfolio health summaries.
+
+Each user has one PortfolioHealthSummary row holding their portfolio item counts by
+status, a skill-tag frequency table, the derived top skills and health score, and the
+latest ReadinessScore. dashboard.signals keeps it current as items are created,
+updated or deleted (applying the difference between an item's old and new state
+under a row lock) and as readiness scores land. Portfolio health and the cohort peer
+directory read the summary instead of rescanning items.
+"""
+import json
+from types import SimpleNamespace
+
+from django.db import transaction
+from django.utils import timezone
+
+TOP_SKILLS = 10
+PENDING_STATUSES = ('draft', 'submitted', 'pending')
+
+COUNT_FIELDS = ['total_items', 'approved_items', 'pending_items', 'in_review_items']
+ITEM_FIELDS = COUNT_FIELDS + ['skill_counts', 'top_skills', 'health_score']
+
+
+def parse_skill_tags(raw) -> list:
+    """PortfolioItem.skill_tags is a JSON array stored as text; bad data counts as no tags."""
+    if not raw:
+        return []
+    try:
+        skills = json.loads(raw) if isinstance(raw, str) else raw
+    except (TypeError, ValueError):
+        return []
+    return [skill for skill in skills if skill and isinstance(skill, str)] if isinstance(skills, list) else []
+
+
+def top_skills(skill_counts: dict, limit: int = TOP_SKILLS) -> list:
+    """Most frequent skills, each scored 0-10 relative to the most frequent one."""
+    ranked = sorted(skill_counts.items(), key=lambda kv: (-kv[1], kv[0]))[:limit]
+    max_count = ranked[0][1] if ranked else 1
+    return [
+        {'skill': skill, 'count': count, 'score': min(10, (count / max_count) * 10)}
+        for skill, count in ranked
+    ]
+
+
+def _apply(summary, status, skill_tags, sign):
+    """Add (sign=1) or remove (sign=-1) one item's contribution to a summary."""
+    summary.total_items += sign
+    if status == 'approved':
+        summary.approved_items += sign
+    elif status in PENDING_STATUSES:
+        summary.pending_items += sign
+    elif status == 'in_review':
+        summary.in_review_items += sign
+    counts = summary.skill_counts
+    for skill in parse_skill_tags(skill_tags):
+        remaining = counts.get(skill, 0) + sign
+        if remaining > 0:
+            counts[skill] = remaining
+        else:
+            counts.pop(skill, None)
+
+
+def _derive(summary):
+    summary.top_skills = top_skills(summary.skill_counts)
+    summary.health_score = (
+        round(summary.approved_items / summary.total_items * 100, 2) if summary.total_items > 0 else 0.0
+    )
+
+
+def summarize_items(items) -> dict:
+    """Summary fields for an iterable of (status, skill_tags) pairs."""
+    summary = SimpleNamespace(skill_counts={}, **dict.fromkeys(COUNT_FIELDS, 0))
+    for status, skill_tags in items:
+        _apply(summary, status, skill_tags, 1)
+    _derive(summary)
+    return {field: getattr(summary, field) for field in ITEM_FIELDS}
+
+
+def _latest_readiness(user_id):
+    from .models import ReadinessScore
+    return ReadinessScore.objects.filter(user_id=user_id).order_by('-updated_at').values_list(
+        'score', 'trend',
+    ).first() or (0, 0.0)
+
+
+def rebuild_summary(user_id):
+    """Recompute a user's summary from scratch."""
+    from .models import PortfolioHealthSummary, PortfolioItem
+    score, trend = _latest_readiness(user_id)
+    fields = summarize_items(PortfolioItem.objects.filter(user__id=user_id).values_list('status', 'skill_tags'))
+    summary, _ = PortfolioHealthSummary.objects.update_or_create(
+        user_id=user_id, defaults={**fields, 'readiness_score': score, 'readiness_trend': trend},
+    )
+    return summary
+
+
+def get_summary(user_id):
+    """A user's summary, built on first use."""
+    from .models import PortfolioHealthSummary
+    return PortfolioHealthSummary.objects.filter(user_id=user_id).first() or rebuild_summary(user_id)
+
+
+def apply_item_change(user_id, old=None, new=None):
+    """
+    Move one portfolio item's contribution from its old (status, skill_tags) to its new
+    one; either side is None for creates and deletes.
+    """
+    from .models import PortfolioHealthSummary
+    with transaction.atomic():
+        summary = PortfolioHealthSummary.objects.select_for_update().filter(user_id=user_id).first()
+        if summary is None:
+            # No summary yet: build it from the items as they now are
+            rebuild_summary(user_id)
+            return
+        if old is not None:
+            _apply(summary, *old, -1)
+        if new is not None:
+            _apply(summary, *new, 1)
+        _derive(summary)
+        summary.save(update_fields=ITEM_FIELDS + ['updated_at'])
+
+
+def refresh_readiness(user_id):
+    """Copy the user's latest ReadinessScore onto their summary."""
+    from .models import PortfolioHealthSummary
+    score, trend = _latest_readiness(user_id)
+    updated = PortfolioHealthSummary.objects.filter(user_id=user_id).update(
+        readiness_score=score, readiness_trend=trend, updated_at=timezone.now(),
+    )
+    if not updated:
+        rebuild_summary(user_id)
+
+
+def health_payload(summary) -> dict:
+    return {
+        'totalItems': summary.total_items,
+        'approvedItems': summary.approved_items,
+        'pendingItems': summary.pending_items,
+        'inReviewItems': summary.in_review_items,
+        'healthScore': summary.health_score,
+        'averageScore': 0,  # TODO: Calculate from mentor reviews
+        'topSkills': summary.top_skills,
+        'readinessScore': summary.readiness_score,
+        'readinessTrend': summary.readiness_trend,
+    }
@@ -7,17 +7,23 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.pagination import PageNumberPagination
 from django.utils import timezone
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
 from django.conf import settings
-from .models import PortfolioItem, ReadinessScore
+from django.db.models import Count, FloatField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from .models import PortfolioItem
+from .portfolio_health import get_summary, health_payload
 from users.models import User
 from programs.models import Enrollment
 import json
 import uuid
 import os
 
+PEER_ENROLLMENT_STATUSES = ['active', 'completed']
+
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
@@ -272,65 +278,7 @@ def get_portfolio_health(request, user_id):
             status=status.HTTP_403_FORBIDDEN
         )
 
-    items = PortfolioItem.objects.filter(user=request.user)
-    total_items = items.count()
-    approved_items = items.filter(status='approved').count()
-    pending_items = items.filter(status__in=['draft', 'submitted', 'pending']).count()
-    in_review_items = items.filter(status='in_review').count()
-    
-    # Calculate health score (0-100)
-    if total_items > 0:
-        health_score = (approved_items / total_items) * 100
-    else:
-        health_score = 0
-    
-    # Get top skills from all items
-    all_skills = []
-    for item in items:
-        if item.skill_tags:
-            try:
-                skills = json.loads(item.skill_tags) if isinstance(item.skill_tags, str) else item.skill_tags
-                if isinstance(skills, list):
-                    all_skills.extend(skills)
-            except:
-                pass
-    
-    # Count skill frequency
-    skill_counts = {}
-    for skill in all_skills:
-        if skill:  # Only count non-empty skills
-            skill_counts[skill] = skill_counts.get(skill, 0) + 1
-    
-    # Get top 10 skills with count and score
-    # Score is based on frequency (normalized to 0-10 scale)
-    top_skills = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-    max_count = top_skills[0][1] if top_skills else 1  # Get max count for normalization
-    
-    top_skills_list = [
-        {
-            'skill': skill,
-            'count': count,
-            'score': min(10, (count / max_count) * 10) if max_count > 0 else 0  # Normalize to 0-10
-        }
-        for skill, count in top_skills
-    ]
-    
-    # Readiness score from ReadinessScore model (TalentScope/profiler)
-    readiness = ReadinessScore.objects.filter(user=request.user).order_by('-updated_at').first()
-    readiness_score = readiness.score if readiness else 0
-    readiness_trend = readiness.trend if readiness else 0
-    
-    return Response({
-        'totalItems': total_items,
-        'approvedItems': approved_items,
-        'pendingItems': pending_items,
-        'inReviewItems': in_review_items,
-        'healthScore': round(health_score, 2),
-        'averageScore': 0,  # TODO: Calculate from mentor reviews
-        'topSkills': top_skills_list,
-        'readinessScore': readiness_score,
-        'readinessTrend': readiness_trend,
-    })
+    return Response(health_payload(get_summary(request.user.id)))
 
 
 @api_view(['POST'])
@@ -391,26 +339,40 @@ def upload_portfolio_file(request, user_id):
     }, status=status.HTTP_201_CREATED)
 
 
+class CohortPeerPagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+def _peer_status(readiness):
+    if readiness >= 80:
+        return 'job_ready'
+    if readiness >= 50:
+        return 'emerging'
+    return 'building'
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_cohort_peers(request):
     """
-    GET /api/v1/student/dashboard/portfolio/cohort-peers
+    GET /api/v1/student/dashboard/portfolio/cohort-peers?page=&page_size=
     Get cohort peers for the current user with readiness, portfolio health, and item counts.
+
+    Peers are read a page at a time in one query joined to their PortfolioHealthSummary,
+    ordered by readiness.
     """
     user = request.user
 
-    # Get user's cohort IDs from enrollments
-    enrollments = Enrollment.objects.filter(
-        user=user,
-        status__in=['active', 'completed']
-    ).select_related('cohort', 'cohort__track')
-
-    cohort_ids = list(enrollments.values_list('cohort_id', flat=True).distinct())
-    cohort_names = list(
-        enrollments.values_list('cohort__name', flat=True).distinct()
+    # Get user's cohorts from enrollments
+    cohorts = list(
+        Enrollment.objects.filter(user=user, status__in=PEER_ENROLLMENT_STATUSES)
+        .values_list('cohort_id', 'cohort__name')
+        .distinct()
     )
-    cohort_names = [n for n in cohort_names if n]
+    cohort_ids = [cohort_id for cohort_id, _ in cohorts]
+    cohort_names = [name for _, name in cohorts if name]
 
     if not cohort_ids:
         return Response({
@@ -418,71 +380,67 @@ def get_cohort_peers(request):
             'cohortName': None,
             'averageReadiness': 0,
             'totalOutcomes': 0,
+            'count': 0,
+            'next': None,
+            'previous': None,
         })
 
-    # Get peer user IDs in same cohort(s), excluding self
-    peer_user_ids = set(
-        Enrollment.objects.filter(
-            cohort_id__in=cohort_ids,
-            status__in=['active', 'completed']
-        ).exclude(user=user).values_list('user_id', flat=True).distinct()
+    # Peer user IDs in same cohort(s), excluding self
+    peer_enrollments = Enrollment.objects.filter(cohort_id__in=cohort_ids, status__in=PEER_ENROLLMENT_STATUSES)
+    peer_ids = peer_enrollments.exclude(user=user).values('user_id')
+    peer_track = (
+        peer_enrollments.filter(user_id=OuterRef('pk'))
+        .order_by('-joined_at')
+        .values('cohort__track__key')[:1]
+    )
+    peers = (
+        User.objects.filter(id__in=peer_ids)
+        .annotate(
+            cohort_track=Subquery(peer_track),
+            readiness=Coalesce('portfolio_health__readiness_score', 0),
+            items_count=Coalesce('portfolio_health__total_items', 0),
+            health=Coalesce('portfolio_health__health_score', 0.0, output_field=FloatField()),
+        )
+        .order_by('-readiness', 'id')
+        .values(
+            'uuid_id', 'username', 'email', 'first_name', 'last_name',
+            'cohort_track', 'readiness', 'items_count', 'health',
+        )
+    )
+    totals = User.objects.filter(id__in=peer_ids).aggregate(
+        peer_count=Count('id'),
+        total_readiness=Coalesce(Sum('portfolio_health__readiness_score'), 0),
+        total_outcomes=Coalesce(Sum('portfolio_health__total_items'), 0),
     )
 
-    # Build peer data with readiness, portfolio health, items
-    peers_data = []
-    total_readiness = 0
-    total_outcomes = 0
-
-    for peer_user in User.objects.filter(id__in=peer_user_ids).select_related():
-        items = PortfolioItem.objects.filter(user=peer_user)
-        items_count = items.count()
-        approved_count = items.filter(status='approved').count()
-        health = round((approved_count / items_count * 100), 1) if items_count > 0 else 0
-        health_display = round(health / 10, 1)  # 0-10 scale for display
-
-        readiness = ReadinessScore.objects.filter(user=peer_user).order_by('-updated_at').first()
-        readiness_val = readiness.score if readiness else 0
-        total_readiness += readiness_val
-        total_outcomes += items_count
-
-        # Get track from enrollment
-        peer_enrollment = Enrollment.objects.filter(
-            user=peer_user,
-            cohort_id__in=cohort_ids,
-            status__in=['active', 'completed']
-        ).select_related('cohort__track').first()
-        track_key = peer_enrollment.cohort.track.key if peer_enrollment and peer_enrollment.cohort and peer_enrollment.cohort.track else ''
+    paginator = CohortPeerPagination()
+    page = paginator.paginate_queryset(peers, request)
 
+    peers_data = []
+    for peer in page:
         # Handle: use username or email prefix for public profile link
-        handle = getattr(peer_user, 'username', None) or (peer_user.email.split('@')[0] if peer_user.email else str(peer_user.uuid_id))
-        name = f"{peer_user.first_name or ''} {peer_user.last_name or ''}".strip() or peer_user.email or handle
-
-        # Status based on readiness
-        if readiness_val >= 80:
-            status_key = 'job_ready'
-        elif readiness_val >= 50:
-            status_key = 'emerging'
-        else:
-            status_key = 'building'
-
+        handle = peer['username'] or (peer['email'].split('@')[0] if peer['email'] else str(peer['uuid_id']))
+        name = f"{peer['first_name'] or ''} {peer['last_name'] or ''}".strip() or peer['email'] or handle
         peers_data.append({
-            'id': str(peer_user.uuid_id),
+            'id': str(peer['uuid_id']),
             'name': name,
             'handle': handle,
-            'track': track_key,
-            'readiness': readiness_val,
-            'health': health_display,
-            'items': items_count,
-            'status': status_key,
+            'track': peer['cohort_track'] or '',
+            'readiness': peer['readiness'],
+            'health': round(peer['health'] / 10, 1),  # 0-10 scale for display
+            'items': peer['items_count'],
+            'status': _peer_status(peer['readiness']),
         })
 
-    peer_count = len(peers_data)
-    avg_readiness = round(total_readiness / peer_count, 0) if peer_count > 0 else 0
+    peer_count = totals['peer_count']
+    avg_readiness = round(totals['total_readiness'] / peer_count, 0) if peer_count > 0 else 0
 
     return Response({
         'peers': peers_data,
         'cohortName': cohort_names[0] if cohort_names else None,
         'averageReadiness': int(avg_readiness),
-        'totalOutcomes': total_outcomes,
+        'totalOutcomes': totals['total_outcomes'],
+        'count': paginator.page.paginator.count,
+        'next': paginator.get_next_link(),
+        'previous': paginator.get_previous_link(),
     })
-
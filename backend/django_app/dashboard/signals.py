@@ -0,0 +1,44 @@
+"""
+Signals for the student dashboard — keep PortfolioHealthSummary in sync.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.signal_utils import is_cascade, previous, remember_previous
+
+
+@receiver(pre_save, sender='dashboard.PortfolioItem')
+def remember_portfolio_item_state(sender, instance, raw=False, **kwargs):
+    """Record the stored status and tags so post_save can apply only the difference."""
+    remember_previous(
+        sender, instance, '_health_previous', lambda rows: rows.values_list('status', 'skill_tags').first(), raw,
+    )
+
+
+@receiver(post_save, sender='dashboard.PortfolioItem')
+def update_portfolio_health_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .portfolio_health import apply_item_change
+    apply_item_change(
+        instance.user.pk,
+        old=previous(instance, '_health_previous'),
+        new=(instance.status, instance.skill_tags),
+    )
+
+
+@receiver(post_delete, sender='dashboard.PortfolioItem')
+def update_portfolio_health_on_delete(sender, instance, origin=None, **kwargs):
+    # A user delete removes the summary along with the items.
+    if is_cascade(sender, origin):
+        return
+    from .portfolio_health import apply_item_change
+    apply_item_change(instance.user.pk, old=(instance.status, instance.skill_tags))
+
+
+@receiver([post_save, post_delete], sender='dashboard.ReadinessScore')
+def update_portfolio_health_readiness(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or is_cascade(sender, origin):
+        return
+    from .portfolio_health import refresh_readiness
+    refresh_readiness(instance.user_id)
@@ -2,6 +2,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from django.db.models import Max, Q
 from django.utils import timezone
 from datetime import timedelta
 from .models import (
@@ -342,7 +343,10 @@ def leaderboard(request):
     user = request.user
     cohort_id = getattr(user, 'cohort_id', None)
     
-    gamification_scores = GamificationPoints.objects.all().order_by('-points')[:10]
+    # Streaks are read from the maintained Habit.streak values (coaching/streaks.py)
+    gamification_scores = GamificationPoints.objects.select_related('user').annotate(
+        habit_streak=Max('user__coaching_habits__streak', filter=Q(user__coaching_habits__is_active=True))
+    ).order_by('-points')[:10]
     
     leaderboard_list = []
     user_rank = None
@@ -357,6 +361,7 @@ def leaderboard(request):
             'user_id': str(score.user.id),
             'user_name': score.user.first_name or score.user.email.split('@')[0],
             'points': score.points,
+            'streak': score.habit_streak or 0,
             'avatar': None,
             'is_current_user': is_current_user,
         })
@@ -369,6 +374,9 @@ def leaderboard(request):
                 'user_id': str(user.id),
                 'user_name': user.first_name or user.email.split('@')[0],
                 'points': user_gamification.points,
+                'streak': Habit.objects.filter(user=user, is_active=True).aggregate(
+                    streak=Max('streak')
+                )['streak'] or 0,
                 'avatar': None,
                 'is_current_user': True,
             })
@@ -384,28 +392,18 @@ def dashboard_habits(request):
     
     habits = Habit.objects.filter(user=user, type='core')
     today = timezone.now().date()
-    today_logs = HabitLog.objects.filter(user=user, log_date=today)
-    logged_habit_ids = set(today_logs.values_list('habit_id', flat=True))
+    logged_habit_ids = set(
+        HabitLog.objects.filter(user=user, date=today).values_list('habit_id', flat=True)
+    )
     
     habit_list = []
     for habit in habits:
-        logs = HabitLog.objects.filter(habit=habit, status='done').order_by('-log_date')
-        streak = 0
-        if logs.exists():
-            current_date = today
-            for log in logs:
-                if log.log_date == current_date:
-                    streak += 1
-                    current_date -= timedelta(days=1)
-                else:
-                    break
-        
         habit_list.append({
             'id': str(habit.id),
             'name': habit.name,
             'category': getattr(habit, 'category', 'learn'),
             'completed': habit.id in logged_habit_ids,
-            'streak': streak,
+            'streak': habit.streak,
             'today_logged': habit.id in logged_habit_ids,
         })
     
@@ -9,6 +9,7 @@ import logging
 
 from programs.models import Program, Track, Cohort, Enrollment, MentorAssignment
 from programs.services.director_service import DirectorService
+from talentscope.readiness import average_readiness
 from .models import DirectorDashboardCache, DirectorCohortHealth
 from .monitoring import track_performance
 
@@ -55,14 +56,9 @@ class DirectorDashboardService:
             status='pending_payment'
         ).count()
         
-        # Calculate average readiness (mock - should come from TalentScope)
-        readiness_scores = []
-        for cohort in cohorts:
-            enrollments = Enrollment.objects.filter(cohort=cohort, status='active')
-            for enrollment in enrollments:
-                readiness_scores.append(75.0)  # TODO: Get from TalentScope
-        
-        avg_readiness = sum(readiness_scores) / len(readiness_scores) if readiness_scores else Decimal('0.00')
+        # Average of each active student's latest TalentScope readiness snapshot
+        avg_readiness = average_readiness(Enrollment.objects.filter(cohort__in=cohorts, status='active'))
+        avg_readiness = Decimal(str(avg_readiness)) if avg_readiness is not None else Decimal('0.00')
         
         # Calculate average completion rate
         completion_rates = [c.completion_rate for c in cohorts if c.completion_rate > 0]
@@ -135,8 +131,8 @@ class DirectorDashboardService:
             enrollments = Enrollment.objects.filter(cohort=cohort, status='active')
             seats_used_total = enrollments.count()
             
-            # Calculate readiness (mock)
-            readiness_avg = 75.0  # TODO: Get from TalentScope
+            # Latest TalentScope readiness, None until snapshots exist
+            readiness_avg = average_readiness(enrollments)
             
             # Get completion percentage
             completion_pct = cohort.completion_rate
@@ -156,7 +152,7 @@ class DirectorDashboardService:
                 risk_score += 3.0
                 risk_flags.append('low_completion')
             
-            if readiness_avg < 60:
+            if readiness_avg is not None and readiness_avg < 60:
                 risk_score += 2.0
                 risk_flags.append('low_readiness')
             
@@ -186,7 +182,7 @@ class DirectorDashboardService:
                 defaults={
                     'cohort_name': cohort.name,
                     'seats_used_total': seats_used_total,
-                    'readiness_avg': readiness_avg,
+                    'readiness_avg': readiness_avg or 0,
                     'completion_pct': completion_pct,
                     'mentor_coverage_pct': mentor_coverage_pct,
                     'risk_score': risk_score,
@@ -2,7 +2,7 @@
 Admin interface for Foundations models.
 """
 from django.contrib import admin
-from .models import FoundationsModule, FoundationsProgress
+from .models import FoundationsModule, FoundationsModuleProgress, FoundationsProgress, FoundationsReadinessSync
 
 
 @admin.register(FoundationsModule)
@@ -23,3 +23,18 @@ class FoundationsProgressAdmin(admin.ModelAdmin):
     def is_complete(self, obj):
         return obj.is_complete()
     is_complete.boolean = True
+
+
+@admin.register(FoundationsModuleProgress)
+class FoundationsModuleProgressAdmin(admin.ModelAdmin):
+    list_display = ['user', 'module', 'watch_percentage', 'time_spent_seconds', 'completed', 'last_heartbeat_at']
+    list_filter = ['completed']
+    search_fields = ['user__email', 'user__username']
+    readonly_fields = ['created_at', 'updated_at']
+
+
+@admin.register(FoundationsReadinessSync)
+class FoundationsReadinessSyncAdmin(admin.ModelAdmin):
+    list_display = ['cohort', 'status', 'processed', 'total_students', 'complete_count', 'created_at', 'finished_at']
+    list_filter = ['status']
+    readonly_fields = ['id', 'created_at', 'started_at', 'finished_at']
@@ -8,3 +8,6 @@ class FoundationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'foundations'
     verbose_name = 'Tier 1 Foundations'
+
+    def ready(self):
+        import foundations.signals  # noqa: F401
@@ -0,0 +1,389 @@
+"""
+Buffered Foundations progress heartbeats.
+
+The video player reports watch progress every few seconds. Rather than a
+read-modify-write of the FoundationsProgress JSON documents on every tick,
+update_module_progress hands each heartbeat to a per-process buffer keyed by
+user and module:
+
+  - heartbeats for the same user and module are merged monotonically: the highest
+    watch percentage wins, time spent is summed and the latest entry per
+    interaction type is kept;
+  - the buffer is written in batches to FoundationsModuleProgress rows when it
+    holds FOUNDATIONS_HEARTBEAT_MAX_SIZE entries or every
+    FOUNDATIONS_HEARTBEAT_FLUSH_INTERVAL seconds, and once more at interpreter
+    shutdown;
+  - a heartbeat that takes a video module to FOUNDATIONS_HEARTBEAT_COMPLETE_PERCENTAGE
+    flushes that user's entries within the request, so module completion and the
+    Foundations completion transition are not delayed by the buffer;
+  - entries from a failed flush go back into the buffer. One that still fails after
+    MAX_FLUSH_ATTEMPTS flushes is dropped, unless it completes its module: those stay
+    queued until a flush succeeds, so a database outage cannot lose a completion.
+
+A flush locks the affected rows and applies max/sum against the stored values, so
+buffers in several worker processes can write the same rows in any order. Status
+reads and complete_module flush the user's pending heartbeats first, but only from
+this process's buffer: heartbeats that reached another worker show up once that
+worker flushes, up to FOUNDATIONS_HEARTBEAT_FLUSH_INTERVAL seconds later.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from core.buffered_flush import BufferedFlusher, ProcessSingleton
+
+logger = logging.getLogger(__name__)
+
+MAX_FLUSH_ATTEMPTS = 3
+MODULE_CACHE_TTL = 60.0
+
+
+@dataclass
+class Heartbeat:
+    """Merged, not yet written progress for one user and module."""
+    watch_percentage: float = 0.0
+    time_spent_seconds: int = 0
+    interactions: Dict[str, dict] = field(default_factory=dict)
+    last_heartbeat_at: Optional[datetime] = None
+    events: int = 0
+    attempts: int = 0
+
+    def merge(self, other: 'Heartbeat') -> None:
+        self.watch_percentage = max(self.watch_percentage, other.watch_percentage)
+        self.time_spent_seconds += other.time_spent_seconds
+        self.interactions.update(other.interactions)
+        if other.last_heartbeat_at and (
+            self.last_heartbeat_at is None or other.last_heartbeat_at > self.last_heartbeat_at
+        ):
+            self.last_heartbeat_at = other.last_heartbeat_at
+        self.events += other.events
+
+
+def make_heartbeat(watch_percentage=0, time_spent_seconds=0, interaction=None, at=None) -> Heartbeat:
+    """Build a single-event Heartbeat from request values (clamped, validated by the caller)."""
+    at = at or timezone.now()
+    interactions = {}
+    if interaction:
+        interactions[interaction.get('type', 'unknown')] = {
+            'viewed': True,
+            'time_spent_seconds': interaction.get('timeSpent', 0),
+            'last_viewed_at': at.isoformat(),
+        }
+    return Heartbeat(
+        watch_percentage=min(100.0, max(0.0, float(watch_percentage or 0))),
+        time_spent_seconds=max(0, int(time_spent_seconds or 0)),
+        interactions=interactions,
+        last_heartbeat_at=at,
+        events=1,
+    )
+
+
+def completion_percentage() -> float:
+    return float(getattr(settings, 'FOUNDATIONS_HEARTBEAT_COMPLETE_PERCENTAGE', 100))
+
+
+# Module lookup ----------------------------------------------------------------
+
+_modules: Dict = {}
+_modules_loaded_at = 0.0
+_modules_lock = threading.Lock()
+
+
+def active_modules(refresh: bool = False) -> Dict:
+    """{module_id: module_type} for active modules, cached in-process for MODULE_CACHE_TTL seconds."""
+    global _modules, _modules_loaded_at
+    if not refresh and time.monotonic() - _modules_loaded_at < MODULE_CACHE_TTL:
+        return _modules
+    from .models import FoundationsModule
+    with _modules_lock:
+        _modules = dict(FoundationsModule.objects.filter(is_active=True).values_list('id', 'module_type'))
+        _modules_loaded_at = time.monotonic()
+    return _modules
+
+
+def invalidate_modules() -> None:
+    """Make the next active_modules() call reload (a module was saved or deleted)."""
+    global _modules_loaded_at
+    _modules_loaded_at = 0.0
+
+
+def module_type(module_id):
+    """Type of an active module, or None; reloads the cache once for unknown ids."""
+    modules = active_modules()
+    if module_id not in modules:
+        modules = active_modules(refresh=True)
+    return modules.get(module_id)
+
+
+def reaches_completion(module_type, watch_percentage) -> bool:
+    return module_type == 'video' and watch_percentage >= completion_percentage()
+
+
+# Writes -----------------------------------------------------------------------
+
+Key = Tuple[int, object]
+
+
+def _lock_module_rows(keys):
+    from .models import FoundationsModuleProgress
+    users = {user_id for user_id, _ in keys}
+    modules = {module_id for _, module_id in keys}
+    rows = FoundationsModuleProgress.objects.select_for_update().filter(
+        user_id__in=users, module_id__in=modules,
+    ).order_by('pk')
+    return {(row.user_id, row.module_id): row for row in rows if (row.user_id, row.module_id) in keys}
+
+
+def _lock_progress(user_ids):
+    from .models import FoundationsProgress
+    progress = FoundationsProgress.objects.select_for_update().filter(user_id__in=user_ids).order_by('pk')
+    return {p.user_id: p for p in progress}
+
+
+def write_heartbeats(entries: Dict[Key, Heartbeat], now=None) -> List[Key]:
+    """
+    Merge heartbeats into FoundationsModuleProgress and FoundationsProgress.
+
+    Runs a fixed number of queries per batch (plus inserts for first-seen users and
+    modules, and the completion check for modules that complete). Returns the
+    (user_id, module_id) keys that completed in this batch.
+    """
+    from users.models import User
+    from .models import FoundationsModuleProgress, FoundationsProgress
+
+    if not entries:
+        return []
+    now = now or timezone.now()
+    modules = active_modules()
+    if any(module_id not in modules for _, module_id in entries):
+        modules = active_modules(refresh=True)
+    entries = {key: beat for key, beat in entries.items() if key[1] in modules}
+    if not entries:
+        return []
+
+    with transaction.atomic():
+        rows = _lock_module_rows(entries.keys())
+        missing = [key for key in entries if key not in rows]
+        if missing:
+            FoundationsModuleProgress.objects.bulk_create(
+                [FoundationsModuleProgress(user_id=user_id, module_id=module_id) for user_id, module_id in missing],
+                ignore_conflicts=True,
+            )
+            rows.update(_lock_module_rows(set(missing)))
+
+        user_ids = {user_id for user_id, _ in entries}
+        progress = _lock_progress(user_ids)
+        if len(progress) < len(user_ids):
+            FoundationsProgress.objects.bulk_create(
+                [FoundationsProgress(user_id=user_id) for user_id in user_ids - set(progress)],
+                ignore_conflicts=True,
+            )
+            progress.update(_lock_progress(user_ids - set(progress)))
+
+        minutes = defaultdict(int)
+        latest = {}
+        completed = []
+        for (user_id, module_id), beat in entries.items():
+            row = rows[(user_id, module_id)]
+            watched = Decimal(str(round(beat.watch_percentage, 2)))
+            if watched > row.watch_percentage:
+                row.watch_percentage = watched
+            previous_minutes = row.time_spent_seconds // 60
+            row.time_spent_seconds += beat.time_spent_seconds
+            minutes[user_id] += row.time_spent_seconds // 60 - previous_minutes
+            if beat.last_heartbeat_at and (
+                row.last_heartbeat_at is None or beat.last_heartbeat_at > row.last_heartbeat_at
+            ):
+                row.last_heartbeat_at = beat.last_heartbeat_at
+            row.updated_at = now
+            if not row.completed and reaches_completion(modules[module_id], float(row.watch_percentage)):
+                row.completed = True
+                row.completed_at = now
+                completed.append((user_id, module_id))
+            seen = row.last_heartbeat_at or now
+            if user_id not in latest or seen > latest[user_id][0]:
+                latest[user_id] = (seen, module_id)
+
+            user_progress = progress[user_id]
+            if beat.interactions:
+                user_progress.interactions = {**(user_progress.interactions or {}), **beat.interactions}
+
+        FoundationsModuleProgress.objects.bulk_update(
+            [rows[key] for key in entries],
+            ['watch_percentage', 'time_spent_seconds', 'completed', 'completed_at', 'last_heartbeat_at', 'updated_at'],
+        )
+
+        finished = []
+        for user_id, module_id in completed:
+            user_progress = progress[user_id]
+            if user_progress.mark_module_completed(module_id, float(rows[(user_id, module_id)].watch_percentage), now):
+                finished.append(user_id)
+        for user_id, user_progress in progress.items():
+            user_progress.total_time_spent_minutes += minutes[user_id]
+            user_progress.last_accessed_module_id = latest[user_id][1]
+            user_progress.updated_at = now
+        FoundationsProgress.objects.bulk_update(
+            list(progress.values()),
+            ['total_time_spent_minutes', 'last_accessed_module_id', 'interactions', 'modules_completed',
+             'status', 'completion_percentage', 'started_at', 'completed_at', 'updated_at'],
+        )
+        if finished:
+            User.objects.filter(pk__in=finished).update(foundations_complete=True, foundations_completed_at=now)
+    return completed
+
+
+# Buffer -----------------------------------------------------------------------
+
+class HeartbeatBuffer(BufferedFlusher):
+    """Per-user map of merged heartbeats with size/time based batch flushing."""
+
+    thread_name = 'foundations-heartbeat-flusher'
+
+    def __init__(self, max_size: int = 500, flush_interval: float = 5.0):
+        super().__init__(flush_interval)
+        self.max_size = max(1, int(max_size))
+        self._pending: Dict[int, Dict[object, Heartbeat]] = {}
+        self._size = 0
+        self._urgent = set()
+
+    # ------------------------------------------------------------------ queue
+
+    def record(self, user_id, module_id, heartbeat: Heartbeat, *, flush_now: bool = False) -> Heartbeat:
+        """
+        Merge a heartbeat into the user's pending entry; returns a copy of the merged
+        entry. flush_now writes the user's entries before returning.
+        """
+        with self._lock:
+            modules = self._pending.setdefault(user_id, {})
+            pending = modules.get(module_id)
+            if pending is None:
+                pending = modules[module_id] = Heartbeat()
+                self._size += 1
+            pending.merge(heartbeat)
+            merged = replace(pending, interactions=dict(pending.interactions))
+            size = self._size
+            if flush_now:
+                self._urgent.add(user_id)
+
+        if flush_now:
+            self.flush(user_ids=[user_id])
+        elif size >= self.max_size:
+            self._wake_or_flush()
+        else:
+            self._ensure_flusher()
+        return merged
+
+    def pending(self, user_id=None) -> int:
+        with self._lock:
+            if user_id is not None:
+                return len(self._pending.get(user_id, {}))
+            return self._size
+
+    def _drain(self, limit: int, user_ids: Optional[Iterable] = None) -> Dict[Key, Heartbeat]:
+        batch = {}
+        with self._lock:
+            for user_id in list(user_ids if user_ids is not None else self._pending):
+                if len(batch) >= limit:
+                    break
+                modules = self._pending.pop(user_id, None)
+                if not modules:
+                    continue
+                self._size -= len(modules)
+                for module_id, beat in modules.items():
+                    batch[(user_id, module_id)] = beat
+        return batch
+
+    def _requeue(self, batch: Dict[Key, Heartbeat]) -> None:
+        completion = completion_percentage()
+        with self._lock:
+            for (user_id, module_id), beat in batch.items():
+                beat.attempts += 1
+                # From the cached module types: the database may be what is failing
+                completes = beat.watch_percentage >= completion and _modules.get(module_id, 'video') == 'video'
+                if beat.attempts >= MAX_FLUSH_ATTEMPTS and not completes:
+                    logger.warning(f"Dropping Foundations heartbeat for user {user_id}, module {module_id}")
+                    continue
+                modules = self._pending.setdefault(user_id, {})
+                if module_id in modules:
+                    modules[module_id].merge(beat)
+                else:
+                    modules[module_id] = beat
+                    self._size += 1
+
+    # ------------------------------------------------------------------ flush
+
+    def flush(self, user_ids: Optional[Iterable] = None) -> int:
+        """
+        Write pending entries (all, or the given users'); returns entries written.
+
+        A flush for given users also takes every user queued for an immediate flush,
+        so concurrent completions are written together instead of one flush each;
+        callers blocked on the flush lock then find their entries already written.
+        """
+        user_ids = list(user_ids) if user_ids is not None else None
+        written = 0
+        with self._flush_lock:
+            with self._lock:
+                if user_ids is not None:
+                    user_ids = list(self._urgent.union(user_ids))
+                self._urgent.clear()
+            while True:
+                batch = self._drain(self.max_size, user_ids)
+                if not batch:
+                    break
+                try:
+                    write_heartbeats(batch)
+                except Exception as e:
+                    # Merges commute, so a failed batch goes back into the buffer for the next flush
+                    logger.warning(f"Foundations heartbeat flush failed for {len(batch)} entries: {e}")
+                    self._requeue(batch)
+                    break
+                written += len(batch)
+        return written
+
+
+def _build_buffer() -> HeartbeatBuffer:
+    return HeartbeatBuffer(
+        max_size=getattr(settings, 'FOUNDATIONS_HEARTBEAT_MAX_SIZE', 500),
+        flush_interval=getattr(settings, 'FOUNDATIONS_HEARTBEAT_FLUSH_INTERVAL', 5.0),
+    )
+
+
+_buffer = ProcessSingleton(_build_buffer)
+
+
+def get_heartbeat_buffer() -> HeartbeatBuffer:
+    """Return the process-wide buffer, creating it from settings on first use."""
+    return _buffer.get()
+
+
+def record_heartbeat(user_id, module_id, heartbeat: Heartbeat) -> Heartbeat:
+    """
+    Accept a progress heartbeat, buffered unless FOUNDATIONS_HEARTBEAT_BUFFER_ENABLED
+    is off. A heartbeat that can complete a video module is written immediately.
+    """
+    completes = reaches_completion(module_type(module_id), heartbeat.watch_percentage)
+    if not getattr(settings, 'FOUNDATIONS_HEARTBEAT_BUFFER_ENABLED', True):
+        write_heartbeats({(user_id, module_id): heartbeat})
+        return heartbeat
+    return get_heartbeat_buffer().record(user_id, module_id, heartbeat, flush_now=completes)
+
+
+def flush_user(user_id) -> int:
+    """Write this process's pending heartbeats for a user so the next read sees them."""
+    buffer = _buffer.instance
+    if buffer is None or not buffer.pending(user_id):
+        return 0
+    return buffer.flush(user_ids=[user_id])
@@ -0,0 +1,193 @@
+"""
+Load test for buffered Foundations progress heartbeats (foundations/heartbeats.py).
+
+Simulates `--viewers` users watching a video module at the same time: `--threads`
+workers send `--ticks` progress heartbeats per viewer (watch percentage rising to
+100, `--tick-seconds` of watch time each), interleaved across viewers the way a
+player fleet reports. Compares:
+
+  1. legacy: the previous per-heartbeat read-modify-write of FoundationsProgress
+     (module lookup, get_or_create, full-row save), measured on `--legacy-sample`
+     heartbeats and extrapolated;
+  2. buffered: HeartbeatBuffer with batched flushes every `--flush-interval`
+     seconds; reports ingest latency, SQL statements, flushes and how quickly the
+     completing heartbeat of each viewer was persisted.
+
+Viewers and the module are committed (worker threads use their own connections)
+and deleted afterwards. Use PostgreSQL; SQLite serialises the concurrent writers.
+"""
+import threading
+import time
+import uuid
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+
+from foundations import heartbeats
+from foundations.heartbeats import HeartbeatBuffer, make_heartbeat
+from foundations.models import FoundationsModule, FoundationsModuleProgress, FoundationsProgress
+
+User = get_user_model()
+
+BULK_BATCH_SIZE = 5000
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+class _StatementCounter:
+    """execute_wrapper that counts statements across every thread's connection."""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = 'Load-test buffered Foundations progress heartbeats against per-heartbeat writes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--viewers', type=int, default=5000, help='Concurrent viewers')
+        parser.add_argument('--ticks', type=int, default=20, help='Heartbeats per viewer')
+        parser.add_argument('--tick-seconds', type=int, default=10, help='Watch time reported per heartbeat')
+        parser.add_argument('--threads', type=int, default=64, help='Worker threads sending heartbeats')
+        parser.add_argument('--flush-interval', type=float, default=1.0)
+        parser.add_argument('--max-size', type=int, default=500, help='Entries per flush batch')
+        parser.add_argument('--legacy-sample', type=int, default=500, help='Heartbeats for the legacy measurement')
+
+    def handle(self, *args, **options):
+        run_id = uuid.uuid4().hex[:8]
+        module = FoundationsModule.objects.create(
+            title=f'bench-{run_id}', module_type='video', is_mandatory=False, order=10 ** 6,
+        )
+        try:
+            users = self._viewers(run_id, options['viewers'])
+            heartbeats.active_modules(refresh=True)
+            self._legacy(module, users, options)
+            self._buffered(module, users, options)
+        finally:
+            User.objects.filter(username__startswith=f'bench-{run_id}-').delete()
+            module.delete()
+            self.stdout.write('Synthetic data deleted')
+
+    def _viewers(self, run_id, count):
+        users = User.objects.bulk_create(
+            [User(username=f'bench-{run_id}-{i}', email=f'bench-{run_id}-{i}@bench.local') for i in range(count)],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        if users and users[0].pk is None:
+            users = list(User.objects.filter(username__startswith=f'bench-{run_id}-').order_by('id'))
+        return [user.pk for user in users]
+
+    # 1. Legacy read-modify-write ---------------------------------------------
+
+    def _legacy(self, module, users, options):
+        sample = min(options['legacy_sample'], len(users) * options['ticks'])
+        counter = _StatementCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(counter):
+            for i in range(sample):
+                user_id = users[i % len(users)]
+                FoundationsModule.objects.get(id=module.id, is_active=True)
+                progress, _ = FoundationsProgress.objects.get_or_create(user_id=user_id)
+                module_data = progress.modules_completed.get(str(module.id), {})
+                module_data['watch_percentage'] = min(100, (i // len(users) + 1) * 100 / options['ticks'])
+                progress.modules_completed[str(module.id)] = module_data
+                progress.last_accessed_module_id = module.id
+                progress.save()
+        elapsed = time.perf_counter() - started
+        total = len(users) * options['ticks']
+        FoundationsProgress.objects.filter(user_id__in=users).delete()
+
+        self.stdout.write(f'\nLegacy per-heartbeat writes ({sample} heartbeats, single thread)')
+        self.stdout.write(f'  {elapsed * 1000 / sample:8.3f} ms and {counter.count / sample:.1f} statements per heartbeat')
+        self.stdout.write(
+            f'  extrapolated to {total} heartbeats: {elapsed / sample * total:8.1f} s, '
+            f'{counter.count / sample * total:.0f} statements'
+        )
+        self._legacy_per_heartbeat = elapsed / sample
+
+    # 2. Buffered heartbeats ----------------------------------------------------
+
+    def _buffered(self, module, users, options):
+        ticks, threads = options['ticks'], options['threads']
+        buffer = HeartbeatBuffer(max_size=options['max_size'], flush_interval=0)
+        counter = _StatementCounter()
+        lock = threading.Lock()
+        latencies, completion_latencies = [], []
+        stop = threading.Event()
+        flushes = [0]
+
+        def flusher():
+            with connections['default'].execute_wrapper(counter):
+                while not stop.wait(options['flush_interval']):
+                    if buffer.flush():
+                        flushes[0] += 1
+            connections['default'].close()
+
+        def viewer_worker(viewer_ids):
+            local, completing = [], []
+            with connections['default'].execute_wrapper(counter):
+                for tick in range(ticks):
+                    watch = (tick + 1) * 100.0 / ticks
+                    for user_id in viewer_ids:
+                        beat = make_heartbeat(watch_percentage=watch, time_spent_seconds=options['tick_seconds'])
+                        completes = heartbeats.reaches_completion('video', watch)
+                        sent = time.perf_counter()
+                        buffer.record(user_id, module.id, beat, flush_now=completes)
+                        elapsed = (time.perf_counter() - sent) * 1000
+                        (completing if completes else local).append(elapsed)
+            connections['default'].close()
+            with lock:
+                latencies.extend(local)
+                completion_latencies.extend(completing)
+
+        background = threading.Thread(target=flusher, daemon=True)
+        background.start()
+        workers = [threading.Thread(target=viewer_worker, args=(users[i::threads],)) for i in range(threads)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        stop.set()
+        background.join()
+        with connection.execute_wrapper(counter):
+            buffer.flush()
+        elapsed = time.perf_counter() - started
+
+        total = len(users) * ticks
+        rows = FoundationsModuleProgress.objects.filter(module=module)
+        completed = rows.filter(completed=True).count()
+        expected_seconds = ticks * options['tick_seconds']
+        consistent = rows.filter(time_spent_seconds=expected_seconds).count()
+
+        self.stdout.write(
+            f'\nBuffered heartbeats ({len(users)} viewers x {ticks} ticks = {total} heartbeats, {threads} threads)'
+        )
+        self.stdout.write(f'  wall time {elapsed:8.2f} s   {total / elapsed:10.0f} heartbeats/s')
+        self.stdout.write(
+            f'  ingest latency p50 {_percentile(latencies, 50):7.3f} ms   p99 {_percentile(latencies, 99):7.3f} ms'
+        )
+        self.stdout.write(
+            f'  completing heartbeat persisted in p50 {_percentile(completion_latencies, 50):7.2f} ms   '
+            f'p99 {_percentile(completion_latencies, 99):7.2f} ms'
+        )
+        self.stdout.write(
+            f'  {counter.count} statements ({counter.count / total:.3f} per heartbeat), '
+            f'{flushes[0]} timed flushes of up to {options["max_size"]} entries'
+        )
+        self.stdout.write(f'  rows: {rows.count()} written, {completed} completed, {consistent} with full watch time')
+        if elapsed:
+            speedup = self._legacy_per_heartbeat * total / elapsed
+            self.stdout.write(self.style.SUCCESS(f'  speedup vs extrapolated legacy: {speedup:.1f}x'))
+        if completed != len(users) or consistent != len(users):
+            self.stderr.write(self.style.ERROR('  merged progress does not match the heartbeats sent'))
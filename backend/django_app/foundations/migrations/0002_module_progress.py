@@ -0,0 +1,68 @@
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.dateparse import parse_datetime
+
+
+def backfill_module_progress(apps, schema_editor):
+    """Copy the per-module entries of FoundationsProgress.modules_completed into rows."""
+    FoundationsModule = apps.get_model('foundations', 'FoundationsModule')
+    FoundationsProgress = apps.get_model('foundations', 'FoundationsProgress')
+    FoundationsModuleProgress = apps.get_model('foundations', 'FoundationsModuleProgress')
+
+    module_ids = {str(pk): pk for pk in FoundationsModule.objects.values_list('id', flat=True)}
+    rows = []
+    for progress in FoundationsProgress.objects.only('user_id', 'modules_completed').iterator():
+        for module_key, data in (progress.modules_completed or {}).items():
+            if module_key not in module_ids or not isinstance(data, dict):
+                continue
+            try:
+                watch = min(Decimal('100'), max(Decimal('0'), Decimal(str(data.get('watch_percentage') or 0))))
+            except InvalidOperation:
+                watch = Decimal('0')
+            completed_at = data.get('completed_at')
+            rows.append(FoundationsModuleProgress(
+                user_id=progress.user_id,
+                module_id=module_ids[module_key],
+                watch_percentage=watch,
+                completed=bool(data.get('completed')),
+                completed_at=parse_datetime(completed_at) if isinstance(completed_at, str) else None,
+            ))
+    FoundationsModuleProgress.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('foundations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FoundationsModuleProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('watch_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(100)])),
+                ('time_spent_seconds', models.IntegerField(default=0)),
+                ('completed', models.BooleanField(default=False)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_heartbeat_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('module', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress_rows', to='foundations.foundationsmodule')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='foundations_module_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Foundations Module Progress',
+                'verbose_name_plural': 'Foundations Module Progress',
+                'db_table': 'foundations_module_progress',
+                'indexes': [models.Index(fields=['module', 'completed'], name='foundations_modprog_done_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'module'), name='foundations_module_progress_uniq')],
+            },
+        ),
+        migrations.RunPython(backfill_module_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('programs', '0016_cohort_public_registration'),
+        ('foundations', '0002_module_progress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FoundationsReadinessSync',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('total_students', models.IntegerField(default=0)),
+                ('processed', models.IntegerField(default=0)),
+                ('complete_count', models.IntegerField(default=0)),
+                ('status_counts', models.JSONField(blank=True, default=dict, help_text='{foundations status: students}')),
+                ('missing_counts', models.JSONField(blank=True, default=dict, help_text='{missing requirement: students}')),
+                ('average_completion', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('cohort', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='foundations_readiness_syncs', to='programs.cohort')),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'foundations_readiness_syncs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['cohort', '-created_at'], name='foundations_sync_cohort_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='FoundationsReadinessMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('foundations_complete', models.BooleanField(default=False)),
+                ('foundations_status', models.CharField(default='not_started', max_length=20)),
+                ('completion_percentage', models.DecimalField(decimal_places=2, default=0, max_digits=5)),
+                ('missing_requirements', models.JSONField(blank=True, default=list)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('drop_off_module_id', models.UUIDField(blank=True, null=True)),
+                ('last_accessed_module_id', models.UUIDField(blank=True, null=True)),
+                ('sync', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='members', to='foundations.foundationsreadinesssync')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'foundations_readiness_members',
+                'constraints': [models.UniqueConstraint(fields=('sync', 'user'), name='foundations_readiness_member_uniq')],
+            },
+        ),
+    ]
@@ -5,6 +5,7 @@ Tracks user progress through the Foundations orientation tier.
 import uuid
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
 User = get_user_model()
@@ -156,47 +157,175 @@ class FoundationsProgress(models.Model):
     
     def calculate_completion(self):
         """Calculate completion percentage based on mandatory modules."""
-        mandatory_modules = FoundationsModule.objects.filter(is_mandatory=True, is_active=True)
-        
-        if not mandatory_modules.exists():
-            return 100.0
-        
-        completed_count = 0
-        for module in mandatory_modules:
-            module_data = self.modules_completed.get(str(module.id), {})
-            if module_data.get('completed', False):
-                completed_count += 1
-        
-        percentage = (completed_count / mandatory_modules.count()) * 100
-        self.completion_percentage = round(percentage, 2)
+        from .requirements import module_requirements
+        self.completion_percentage = module_requirements().completion_percentage(self.modules_completed)
         return self.completion_percentage
     
     def is_complete(self):
         """Check if Foundations is complete (all mandatory modules + assessment + reflection)."""
-        mandatory_modules = FoundationsModule.objects.filter(is_mandatory=True, is_active=True)
-        
-        # Check all mandatory modules are completed
-        for module in mandatory_modules:
-            module_data = self.modules_completed.get(str(module.id), {})
-            if not module_data.get('completed', False):
-                return False
-        
-        # Check assessment is completed (if there's an assessment module)
-        assessment_modules = FoundationsModule.objects.filter(
-            module_type='assessment',
-            is_mandatory=True,
-            is_active=True
-        )
-        if assessment_modules.exists() and self.assessment_score is None:
-            return False
-        
-        # Check reflection is submitted (if there's a reflection module)
-        reflection_modules = FoundationsModule.objects.filter(
-            module_type='reflection',
-            is_mandatory=True,
-            is_active=True
+        from .requirements import module_requirements
+        return module_requirements().is_complete(
+            self.modules_completed, self.assessment_score, self.goals_reflection
         )
-        if reflection_modules.exists() and not self.goals_reflection:
-            return False
-        
-        return True
+    
+    def mark_module_completed(self, module_id, watch_percentage=100, completed_at=None):
+        """
+        Record a completed module in modules_completed and move the status forward.
+        Returns True when this completes Foundations; the caller saves the row and
+        flags the user.
+        """
+        completed_at = completed_at or timezone.now()
+        module_data = self.modules_completed.get(str(module_id), {})
+        module_data['completed'] = True
+        module_data['watch_percentage'] = watch_percentage
+        module_data['completed_at'] = completed_at.isoformat()
+        self.modules_completed[str(module_id)] = module_data
+        self.last_accessed_module_id = module_id
+
+        if self.status == 'not_started':
+            self.status = 'in_progress'
+            if not self.started_at:
+                self.started_at = completed_at
+
+        self.calculate_completion()
+        if self.is_complete():
+            self.status = 'completed'
+            self.completed_at = completed_at
+            return True
+        return False
+
+
+class FoundationsModuleProgress(models.Model):
+    """
+    Per-module progress for a user, written in batches from progress heartbeats
+    (see foundations/heartbeats.py). watch_percentage only ever grows and
+    time_spent_seconds is a running total, so concurrent flushes commute.
+    """
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='foundations_module_progress'
+    )
+    module = models.ForeignKey(
+        FoundationsModule,
+        on_delete=models.CASCADE,
+        related_name='progress_rows'
+    )
+    watch_percentage = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        default=0,
+        validators=[MinValueValidator(0), MaxValueValidator(100)]
+    )
+    time_spent_seconds = models.IntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    last_heartbeat_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'foundations_module_progress'
+        verbose_name = 'Foundations Module Progress'
+        verbose_name_plural = 'Foundations Module Progress'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'module'], name='foundations_module_progress_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['module', 'completed'], name='foundations_modprog_done_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.module_id} ({self.watch_percentage}%)"
+
+
+class FoundationsReadinessSync(models.Model):
+    """
+    One run of the cohort Foundations readiness sync (foundations/readiness_sync.py).
+    Holds the job's progress while it runs and the cohort summary once it completes.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    cohort = models.ForeignKey(
+        'programs.Cohort',
+        on_delete=models.CASCADE,
+        related_name='foundations_readiness_syncs'
+    )
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+
+    # Progress
+    total_students = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+
+    # Summary
+    complete_count = models.IntegerField(default=0)
+    status_counts = models.JSONField(default=dict, blank=True, help_text='{foundations status: students}')
+    missing_counts = models.JSONField(default=dict, blank=True, help_text='{missing requirement: students}')
+    average_completion = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'foundations_readiness_syncs'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['cohort', '-created_at'], name='foundations_sync_cohort_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.cohort_id} readiness sync ({self.status}, {self.processed}/{self.total_students})"
+
+    @property
+    def progress_percentage(self):
+        if self.status == 'completed':
+            return 100.0
+        if not self.total_students:
+            return 0.0
+        return round(self.processed / self.total_students * 100, 1)
+
+
+class FoundationsReadinessMember(models.Model):
+    """A cohort member's Foundations readiness as computed by one FoundationsReadinessSync."""
+    sync = models.ForeignKey(
+        FoundationsReadinessSync,
+        on_delete=models.CASCADE,
+        related_name='members'
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    foundations_complete = models.BooleanField(default=False)
+    foundations_status = models.CharField(max_length=20, default='not_started')
+    completion_percentage = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    missing_requirements = models.JSONField(default=list, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    drop_off_module_id = models.UUIDField(null=True, blank=True)
+    last_accessed_module_id = models.UUIDField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'foundations_readiness_members'
+        constraints = [
+            models.UniqueConstraint(fields=['sync', 'user'], name='foundations_readiness_member_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} ({self.foundations_status}, {self.completion_percentage}%)"
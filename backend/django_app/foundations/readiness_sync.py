@@ -0,0 +1,260 @@
+"""
+Cohort-wide Foundations readiness sync.
+
+sync_enterprise_readiness used to walk a cohort's enrollments inside the request,
+loading each student's FoundationsProgress and re-querying the module list for each
+completion check. A sync is now a FoundationsReadinessSync job:
+
+  - members are read in keyset-ordered chunks, each chunk one query joining
+    enrollments, users and Foundations progress;
+  - completion state and missing requirements are evaluated against the cached
+    ModuleRequirements descriptor (foundations/requirements.py), with no further
+    queries per student;
+  - each chunk writes its FoundationsReadinessMember rows and advances the job's
+    processed count, which is the progress the endpoint reports;
+  - the finished job holds the cohort summary (status counts, average completion,
+    missing-requirement counts) and replaces the previous sync's member rows.
+
+start_sync() queues the job on Celery when it is installed and runs it inline
+otherwise. A cohort has at most one queued or running sync at a time: the check and
+the insert run under a lock on the cohort row, so concurrent requests share one job.
+A job left queued or running for longer than STALE_AFTER is marked failed when the
+next one starts; if it does finish later, it discards its rows instead of replacing
+the newer sync's, and a finishing sync only ever replaces members of older syncs.
+sync_payload() returns the member rows a page at a time.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .requirements import module_requirements
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1000
+ENROLLMENT_STATUSES = ('active', 'pending')
+STALE_AFTER = timedelta(minutes=30)  # a queued/running sync older than this is presumed dead
+MEMBERS_PAGE_SIZE = 100
+MAX_MEMBERS_PAGE_SIZE = 500
+
+MEMBER_FIELDS = (
+    'id', 'user_id',
+    'user__foundations_progress__id',
+    'user__foundations_progress__status',
+    'user__foundations_progress__modules_completed',
+    'user__foundations_progress__assessment_score',
+    'user__foundations_progress__goals_reflection',
+    'user__foundations_progress__confirmed_track_key',
+    'user__foundations_progress__started_at',
+    'user__foundations_progress__completed_at',
+    'user__foundations_progress__drop_off_module_id',
+    'user__foundations_progress__last_accessed_module_id',
+)
+
+
+def _progress(row, name):
+    return row[f'user__foundations_progress__{name}']
+
+
+def evaluate_member(row, requirements):
+    """FoundationsReadinessMember field values for one MEMBER_FIELDS row."""
+    from .models import FoundationsReadinessMember
+    if _progress(row, 'id') is None:
+        return FoundationsReadinessMember(
+            user_id=row['user_id'],
+            missing_requirements=requirements.missing({}, None, '', ''),
+        )
+    modules_completed = _progress(row, 'modules_completed') or {}
+    assessment_score = _progress(row, 'assessment_score')
+    goals_reflection = _progress(row, 'goals_reflection')
+    return FoundationsReadinessMember(
+        user_id=row['user_id'],
+        foundations_complete=requirements.is_complete(modules_completed, assessment_score, goals_reflection),
+        foundations_status=_progress(row, 'status'),
+        completion_percentage=Decimal(str(requirements.completion_percentage(modules_completed))),
+        missing_requirements=requirements.missing(
+            modules_completed, assessment_score, goals_reflection, _progress(row, 'confirmed_track_key'),
+        ),
+        started_at=_progress(row, 'started_at'),
+        completed_at=_progress(row, 'completed_at'),
+        drop_off_module_id=_progress(row, 'drop_off_module_id'),
+        last_accessed_module_id=_progress(row, 'last_accessed_module_id'),
+    )
+
+
+def cohort_members(cohort_id):
+    from programs.models import Enrollment
+    return Enrollment.objects.filter(cohort_id=cohort_id, status__in=ENROLLMENT_STATUSES)
+
+
+# Jobs -------------------------------------------------------------------------
+
+def start_sync(cohort, requested_by=None):
+    """
+    Queue a readiness sync for the cohort, or return the one already in flight.
+    Returns (sync, created).
+    """
+    from programs.models import Cohort
+    from .models import FoundationsReadinessSync
+    from .tasks import sync_cohort_readiness_task
+
+    with transaction.atomic():
+        # Serializes concurrent starts for the cohort until this transaction commits
+        Cohort.objects.select_for_update().filter(pk=cohort.pk).values_list('pk', flat=True).first()
+        now = timezone.now()
+        in_flight = FoundationsReadinessSync.objects.filter(cohort=cohort, status__in=('queued', 'running'))
+        current = in_flight.filter(created_at__gte=now - STALE_AFTER).first()
+        if current is not None:
+            return current, False
+        in_flight.update(status='failed', error='Presumed dead: superseded by a newer sync', finished_at=now)
+        sync = FoundationsReadinessSync.objects.create(cohort=cohort, requested_by=requested_by)
+
+    if hasattr(sync_cohort_readiness_task, 'delay'):
+        transaction.on_commit(lambda: sync_cohort_readiness_task.delay(str(sync.id)))
+    else:
+        # Without Celery the sync runs in the request
+        run_sync(sync.id)
+        sync.refresh_from_db()
+    return sync, True
+
+
+def run_sync(sync_id, chunk_size=CHUNK_SIZE):
+    """Run a queued sync to completion; returns the sync, or None if another worker claimed it."""
+    from .models import FoundationsReadinessMember, FoundationsReadinessSync
+
+    claimed = FoundationsReadinessSync.objects.filter(id=sync_id, status='queued').update(
+        status='running', started_at=timezone.now(),
+    )
+    if not claimed:
+        return None
+    sync = FoundationsReadinessSync.objects.get(id=sync_id)
+
+    try:
+        requirements = module_requirements()
+        members = cohort_members(sync.cohort_id)
+        sync.total_students = members.count()
+        sync.save(update_fields=['total_students'])
+
+        status_counts, missing_counts = Counter(), Counter()
+        completion_total = Decimal('0')
+        last_id = None
+        while True:
+            chunk = members.order_by('id')
+            if last_id is not None:
+                chunk = chunk.filter(id__gt=last_id)
+            rows = list(chunk.values(*MEMBER_FIELDS)[:chunk_size])
+            if not rows:
+                break
+            last_id = rows[-1]['id']
+
+            evaluated = [evaluate_member(row, requirements) for row in rows]
+            for member in evaluated:
+                member.sync_id = sync.id
+                status_counts[member.foundations_status] += 1
+                missing_counts.update(member.missing_requirements)
+                completion_total += member.completion_percentage
+            with transaction.atomic():
+                FoundationsReadinessMember.objects.bulk_create(evaluated, batch_size=chunk_size)
+                FoundationsReadinessSync.objects.filter(id=sync.id).update(
+                    processed=F('processed') + len(evaluated),
+                    complete_count=F('complete_count') + sum(1 for m in evaluated if m.foundations_complete),
+                )
+
+        sync.refresh_from_db(fields=['processed', 'complete_count'])
+        sync.status_counts = dict(status_counts)
+        sync.missing_counts = dict(missing_counts.most_common())
+        sync.average_completion = round(completion_total / sync.processed, 2) if sync.processed else 0
+        sync.finished_at = timezone.now()
+        with transaction.atomic():
+            # A sync presumed dead by start_sync() must not claim to be current
+            finished = FoundationsReadinessSync.objects.filter(id=sync.id, status='running').update(
+                status='completed', status_counts=sync.status_counts, missing_counts=sync.missing_counts,
+                average_completion=sync.average_completion, finished_at=sync.finished_at,
+            )
+            if not finished:
+                FoundationsReadinessMember.objects.filter(sync=sync).delete()
+            else:
+                FoundationsReadinessMember.objects.filter(
+                    sync__cohort_id=sync.cohort_id, sync__created_at__lt=sync.created_at,
+                ).delete()
+        sync.refresh_from_db()
+        if not finished:
+            logger.warning(f"Discarded superseded Foundations readiness sync {sync.id} for cohort {sync.cohort_id}")
+        else:
+            logger.info(f"Synced Foundations readiness for cohort {sync.cohort_id}: {sync.processed} students")
+    except Exception as e:
+        logger.error(f"Failed to sync Foundations readiness for cohort {sync.cohort_id}: {e}", exc_info=True)
+        FoundationsReadinessSync.objects.filter(id=sync.id).update(
+            status='failed', error=str(e), finished_at=timezone.now(),
+        )
+        sync.refresh_from_db()
+    return sync
+
+
+# Reads ------------------------------------------------------------------------
+
+def sync_payload(sync, include_members=True, page=1, page_size=MEMBERS_PAGE_SIZE) -> dict:
+    """
+    API representation of a sync: progress, summary and, once completed, one page of
+    members (ordered by email) with `members_page` describing it.
+    """
+    payload = {
+        'sync_id': str(sync.id),
+        'cohort_id': str(sync.cohort_id),
+        'cohort_name': sync.cohort.name,
+        'status': sync.status,
+        'total_students': sync.total_students,
+        'processed': sync.processed,
+        'progress_percentage': sync.progress_percentage,
+        'foundations_complete_count': sync.complete_count,
+        'status_counts': sync.status_counts,
+        'missing_requirements': sync.missing_counts,
+        'average_completion': float(sync.average_completion),
+        'requested_at': sync.created_at.isoformat(),
+        'started_at': sync.started_at.isoformat() if sync.started_at else None,
+        'synced_at': sync.finished_at.isoformat() if sync.status == 'completed' and sync.finished_at else None,
+    }
+    if sync.status == 'failed':
+        payload['error'] = sync.error
+    if include_members and sync.status == 'completed':
+        page = max(1, int(page))
+        page_size = min(max(1, int(page_size)), MAX_MEMBERS_PAGE_SIZE)
+        offset = (page - 1) * page_size
+        total = sync.members.count()
+        payload['members_page'] = {
+            'page': page,
+            'page_size': page_size,
+            'total': total,
+            'next_page': page + 1 if offset + page_size < total else None,
+        }
+        payload['readiness_data'] = [
+            {
+                'user_id': str(row['user_id']),
+                'email': row['user__email'],
+                'name': f"{row['user__first_name']} {row['user__last_name']}".strip() or row['user__email'],
+                'foundations_complete': row['foundations_complete'],
+                'foundations_status': row['foundations_status'],
+                'completion_percentage': float(row['completion_percentage']),
+                'missing_requirements': row['missing_requirements'],
+                'started_at': row['started_at'].isoformat() if row['started_at'] else None,
+                'completed_at': row['completed_at'].isoformat() if row['completed_at'] else None,
+                'drop_off_module_id': str(row['drop_off_module_id']) if row['drop_off_module_id'] else None,
+                'last_accessed_module_id': (
+                    str(row['last_accessed_module_id']) if row['last_accessed_module_id'] else None
+                ),
+            }
+            for row in sync.members.order_by('user__email').values(
+                'user_id', 'user__email', 'user__first_name', 'user__last_name', 'foundations_complete',
+                'foundations_status', 'completion_percentage', 'missing_requirements', 'started_at',
+                'completed_at', 'drop_off_module_id', 'last_accessed_module_id',
+            )[offset:offset + page_size]
+        ]
+    return payload
@@ -0,0 +1,93 @@
+"""
+Cached descriptor of what Foundations completion requires.
+
+Completion checks used to query FoundationsModule up to three times per progress
+row: the mandatory modules, then whether a mandatory assessment or reflection module
+exists. ModuleRequirements captures all of it from one query and is cached under
+REQUIREMENTS_CACHE_KEY until a module is saved or deleted (foundations/signals.py),
+so checking a cohort of thousands costs nothing beyond reading their progress.
+
+The checks take the FoundationsProgress fields as arguments so they work on model
+instances and on values() rows alike.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from django.core.cache import cache
+
+REQUIREMENTS_CACHE_KEY = 'foundations:requirements'
+REQUIREMENTS_TTL = 60 * 60  # signals invalidate on change, TTL only bounds staleness from raw SQL edits
+
+
+@dataclass(frozen=True)
+class ModuleRequirements:
+    mandatory: Tuple[Tuple[str, str], ...]  # (module id, title) of active mandatory modules, in display order
+    requires_assessment: bool
+    requires_reflection: bool
+
+    def incomplete_modules(self, modules_completed) -> List[str]:
+        """Titles of mandatory modules not marked completed in modules_completed."""
+        modules_completed = modules_completed or {}
+        return [
+            title for module_id, title in self.mandatory
+            if not (modules_completed.get(module_id) or {}).get('completed', False)
+        ]
+
+    def completion_percentage(self, modules_completed) -> float:
+        if not self.mandatory:
+            return 100.0
+        done = len(self.mandatory) - len(self.incomplete_modules(modules_completed))
+        return round(done / len(self.mandatory) * 100, 2)
+
+    def is_complete(self, modules_completed, assessment_score, goals_reflection) -> bool:
+        """All mandatory modules, plus the assessment and reflection when those modules exist."""
+        if self.incomplete_modules(modules_completed):
+            return False
+        if self.requires_assessment and assessment_score is None:
+            return False
+        if self.requires_reflection and not goals_reflection:
+            return False
+        return True
+
+    def missing(self, modules_completed, assessment_score, goals_reflection, confirmed_track_key) -> List[str]:
+        """What is still missing for completion, including track confirmation."""
+        missing = [f"Module: {title}" for title in self.incomplete_modules(modules_completed)]
+        if self.requires_assessment and assessment_score is None:
+            missing.append("Assessment")
+        if self.requires_reflection and not goals_reflection:
+            missing.append("Reflection")
+        if not confirmed_track_key:
+            missing.append("Track Confirmation")
+        return missing
+
+
+def build_requirements() -> ModuleRequirements:
+    from .models import FoundationsModule
+    rows = FoundationsModule.objects.filter(is_mandatory=True, is_active=True).order_by(
+        'order', 'id',
+    ).values_list('id', 'title', 'module_type')
+    mandatory, types = [], set()
+    for module_id, title, module_type in rows:
+        mandatory.append((str(module_id), title))
+        types.add(module_type)
+    return ModuleRequirements(
+        mandatory=tuple(mandatory),
+        requires_assessment='assessment' in types,
+        requires_reflection='reflection' in types,
+    )
+
+
+def module_requirements() -> ModuleRequirements:
+    """The current requirements, from the cache or one FoundationsModule query."""
+    requirements: Optional[ModuleRequirements] = cache.get(REQUIREMENTS_CACHE_KEY)
+    if requirements is None:
+        requirements = build_requirements()
+        cache.set(REQUIREMENTS_CACHE_KEY, requirements, REQUIREMENTS_TTL)
+    return requirements
+
+
+def invalidate_requirements() -> None:
+    cache.delete(REQUIREMENTS_CACHE_KEY)
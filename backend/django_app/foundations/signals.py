@@ -0,0 +1,14 @@
+"""
+Signals for Foundations — drop cached module metadata when modules change.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+@receiver(post_save, sender='foundations.FoundationsModule')
+@receiver(post_delete, sender='foundations.FoundationsModule')
+def invalidate_module_caches(sender, **kwargs):
+    from .heartbeats import invalidate_modules
+    from .requirements import invalidate_requirements
+    invalidate_requirements()
+    invalidate_modules()
@@ -0,0 +1,25 @@
+"""
+Background tasks for Foundations.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@shared_task(name='foundations.sync_cohort_readiness')
+def sync_cohort_readiness_task(sync_id):
+    """Run a queued cohort Foundations readiness sync (foundations/readiness_sync.py)."""
+    from .readiness_sync import run_sync
+
+    sync = run_sync(sync_id)
+    if sync is None:
+        return {'status': 'skipped'}
+    return {'status': sync.status, 'processed': sync.processed}
@@ -3,54 +3,33 @@ Tier 1 Foundations API views.
 Handles Foundations modules, progress tracking, and completion.
 """
 import logging
+from decimal import Decimal
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
+from django.core.exceptions import ValidationError
 from django.db import transaction
 
-from .models import FoundationsModule, FoundationsProgress
+from . import heartbeats
+from .models import FoundationsModule, FoundationsModuleProgress, FoundationsProgress, FoundationsReadinessSync
+from .requirements import module_requirements
 from .assessment_questions import FOUNDATIONS_ASSESSMENT_QUESTIONS, calculate_assessment_score
 from users.models import User
+from users.utils.identity_snapshot import get_user_role_names
 
 logger = logging.getLogger(__name__)
 
 
 def _get_missing_requirements(progress):
     """Helper function to identify what's missing for Foundations completion."""
-    missing = []
-    
-    # Check mandatory modules
-    mandatory_modules = FoundationsModule.objects.filter(is_mandatory=True, is_active=True)
-    for module in mandatory_modules:
-        module_data = progress.modules_completed.get(str(module.id), {})
-        if not module_data.get('completed', False):
-            missing.append(f"Module: {module.title}")
-    
-    # Check assessment
-    assessment_modules = FoundationsModule.objects.filter(
-        module_type='assessment',
-        is_mandatory=True,
-        is_active=True
-    )
-    if assessment_modules.exists() and progress.assessment_score is None:
-        missing.append("Assessment")
-    
-    # Check reflection
-    reflection_modules = FoundationsModule.objects.filter(
-        module_type='reflection',
-        is_mandatory=True,
-        is_active=True
+    return module_requirements().missing(
+        progress.modules_completed,
+        progress.assessment_score,
+        progress.goals_reflection,
+        progress.confirmed_track_key,
     )
-    if reflection_modules.exists() and not progress.goals_reflection:
-        missing.append("Reflection")
-    
-    # Check track confirmation
-    if not progress.confirmed_track_key:
-        missing.append("Track Confirmation")
-    
-    return missing
 
 
 @api_view(['GET'])
@@ -70,6 +49,9 @@ def get_foundations_status(request):
             'message': 'Please complete the AI profiler first'
         }, status=status.HTTP_403_FORBIDDEN)
     
+    # Write buffered progress heartbeats so this read sees them
+    heartbeats.flush_user(user.id)
+    
     # Get or create Foundations progress
     progress, created = FoundationsProgress.objects.get_or_create(
         user=user,
@@ -99,11 +81,17 @@ def get_foundations_status(request):
     # Calculate completion
     progress.calculate_completion()
     
-    # Get all modules
+    # Get all modules, with watch progress from the heartbeat-maintained rows
     modules = FoundationsModule.objects.filter(is_active=True).order_by('order')
+    watched = dict(
+        FoundationsModuleProgress.objects.filter(user=user).values_list('module_id', 'watch_percentage')
+    )
     modules_data = []
     for module in modules:
         module_progress = progress.modules_completed.get(str(module.id), {})
+        watch_percentage = module_progress.get('watch_percentage', 0)
+        if module.id in watched:
+            watch_percentage = max(float(watched[module.id]), float(watch_percentage or 0))
         modules_data.append({
             'id': str(module.id),
             'title': module.title,
@@ -116,7 +104,7 @@ def get_foundations_status(request):
             'is_mandatory': module.is_mandatory,
             'estimated_minutes': module.estimated_minutes,
             'completed': module_progress.get('completed', False),
-            'watch_percentage': module_progress.get('watch_percentage', 0),
+            'watch_percentage': watch_percentage,
             'completed_at': module_progress.get('completed_at'),
         })
     
@@ -160,51 +148,51 @@ def complete_module(request, module_id):
             status=status.HTTP_404_NOT_FOUND
         )
     
-    progress, _ = FoundationsProgress.objects.get_or_create(user=user)
-    
-    # Update module completion
-    module_data = progress.modules_completed.get(str(module.id), {})
-    module_data['completed'] = True
-    module_data['watch_percentage'] = request.data.get('watch_percentage', 100)
-    module_data['completed_at'] = timezone.now().isoformat()
-    
-    # Track interaction data if provided
-    interaction_data = request.data.get('interaction', None)
-    if interaction_data:
-        if not progress.interactions:
-            progress.interactions = {}
-        progress.interactions[interaction_data.get('type', 'unknown')] = {
-            'viewed': True,
-            'time_spent_seconds': interaction_data.get('timeSpent', 0),
-            'completed_at': timezone.now().isoformat()
-        }
-    
-    # Update time spent if provided
-    time_spent = request.data.get('time_spent_seconds', 0)
-    if time_spent > 0:
-        progress.total_time_spent_minutes += int(time_spent / 60)
-    
-    progress.modules_completed[str(module.id)] = module_data
-    progress.last_accessed_module_id = module.id
-    
-    # Update status
-    if progress.status == 'not_started':
-        progress.status = 'in_progress'
-        if not progress.started_at:
-            progress.started_at = timezone.now()
-    
-    # Recalculate completion
-    progress.calculate_completion()
-    
-    # Check if all mandatory modules are complete
-    if progress.is_complete():
-        progress.status = 'completed'
-        progress.completed_at = timezone.now()
-        user.foundations_complete = True
-        user.foundations_completed_at = timezone.now()
-        user.save()
+    # Pending heartbeats for this user are written first; the row lock keeps a
+    # concurrent heartbeat flush from overwriting the completion (or vice versa)
+    heartbeats.flush_user(user.id)
+    now = timezone.now()
+    watch_percentage = request.data.get('watch_percentage', 100)
     
-    progress.save()
+    with transaction.atomic():
+        progress, _ = FoundationsProgress.objects.select_for_update().get_or_create(user=user)
+        
+        # Track interaction data if provided
+        interaction_data = request.data.get('interaction', None)
+        if interaction_data:
+            if not progress.interactions:
+                progress.interactions = {}
+            progress.interactions[interaction_data.get('type', 'unknown')] = {
+                'viewed': True,
+                'time_spent_seconds': interaction_data.get('timeSpent', 0),
+                'completed_at': now.isoformat()
+            }
+        
+        # Update time spent if provided
+        time_spent = request.data.get('time_spent_seconds', 0)
+        if time_spent > 0:
+            progress.total_time_spent_minutes += int(time_spent / 60)
+        
+        # Update module completion, status and overall completion
+        if progress.mark_module_completed(module.id, watch_percentage, now):
+            user.foundations_complete = True
+            user.foundations_completed_at = now
+            user.save()
+        
+        progress.save()
+        
+        module_row, _ = FoundationsModuleProgress.objects.select_for_update().get_or_create(
+            user=user, module=module
+        )
+        module_row.completed = True
+        module_row.completed_at = module_row.completed_at or now
+        try:
+            module_row.watch_percentage = max(
+                module_row.watch_percentage, Decimal(str(min(100, max(0, float(watch_percentage)))))
+            )
+        except (TypeError, ValueError):
+            pass
+        module_row.save()
     
     return Response({
         'success': True,
@@ -222,48 +210,38 @@ def update_module_progress(request, module_id):
     POST /api/v1/foundations/modules/{module_id}/progress
     Update progress for a module (e.g., video watch percentage).
     Also tracks interaction data and time spent.
+    
+    Progress is a heartbeat: it is merged into the user's buffered entry for the
+    module and written in batches (see foundations/heartbeats.py). A heartbeat
+    that finishes a video module is written before the response.
     """
     user = request.user
     
-    try:
-        module = FoundationsModule.objects.get(id=module_id, is_active=True)
-    except FoundationsModule.DoesNotExist:
+    module_type = heartbeats.module_type(module_id)
+    if module_type is None:
         return Response(
             {'detail': 'Module not found'},
             status=status.HTTP_404_NOT_FOUND
         )
     
-    progress, _ = FoundationsProgress.objects.get_or_create(user=user)
-    
-    # Update progress data
-    module_data = progress.modules_completed.get(str(module.id), {})
-    watch_percentage = request.data.get('watch_percentage', 0)
-    module_data['watch_percentage'] = min(100, max(0, watch_percentage))
-    
-    # Track interaction data if provided
-    interaction_data = request.data.get('interaction', None)
-    if interaction_data:
-        if not progress.interactions:
-            progress.interactions = {}
-        progress.interactions[interaction_data.get('type', 'unknown')] = {
-            'viewed': True,
-            'time_spent_seconds': interaction_data.get('timeSpent', 0),
-            'last_viewed_at': timezone.now().isoformat()
-        }
-    
-    # Update time spent
-    time_spent = request.data.get('time_spent_seconds', 0)
-    if time_spent > 0:
-        progress.total_time_spent_minutes += int(time_spent / 60)
+    try:
+        heartbeat = heartbeats.make_heartbeat(
+            watch_percentage=request.data.get('watch_percentage', 0),
+            time_spent_seconds=request.data.get('time_spent_seconds', 0),
+            interaction=request.data.get('interaction', None),
+        )
+    except (AttributeError, TypeError, ValueError):
+        return Response(
+            {'detail': 'watch_percentage and time_spent_seconds must be numbers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
     
-    progress.modules_completed[str(module.id)] = module_data
-    progress.last_accessed_module_id = module.id
-    progress.save()
+    merged = heartbeats.record_heartbeat(user.id, module_id, heartbeat)
     
     return Response({
         'success': True,
-        'watch_percentage': module_data['watch_percentage'],
-        'total_time_spent_minutes': progress.total_time_spent_minutes
+        'watch_percentage': merged.watch_percentage,
+        'completed': heartbeats.reaches_completion(module_type, merged.watch_percentage),
     })
 
 
@@ -650,25 +628,30 @@ def submit_feedback(request):
     })
 
 
-@api_view(['POST'])
+@api_view(['GET', 'POST'])
 @permission_classes([IsAuthenticated])
 def sync_enterprise_readiness(request, cohort_id):
     """
     POST /api/v1/foundations/enterprise/{cohort_id}/foundations-readiness
     Sync Foundations completion status for enterprise cohort members.
     Used by Enterprise Dashboard to track onboarding readiness.
+    
+    POST starts a background sync (or returns the one already running) and answers
+    202 until it completes; GET returns the latest sync (or ?sync_id=) with its
+    progress, cohort summary and, once completed, the per-student readiness data
+    a page at a time (?page=, ?page_size=).
     """
     user = request.user
     
     # Check if user has permission to sync enterprise data
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(user)
     is_admin = 'admin' in user_roles or user.is_staff
     is_director = False
     
     # Check if user is a director of a program that includes this cohort
     try:
         from programs.models import Cohort
-        cohort = Cohort.objects.get(id=cohort_id)
+        cohort = Cohort.objects.select_related('track').get(id=cohort_id)
         if cohort.track and cohort.track.director_id == user.uuid_id:
             is_director = True
     except Cohort.DoesNotExist:
@@ -683,46 +666,46 @@ def sync_enterprise_readiness(request, cohort_id):
             status=status.HTTP_403_FORBIDDEN
         )
     
-    # Get all enrollments in this cohort
+    from .readiness_sync import MEMBERS_PAGE_SIZE, start_sync, sync_payload
+
     try:
-        from programs.models import Enrollment
-        enrollments = Enrollment.objects.filter(
-            cohort_id=cohort_id,
-            status__in=['active', 'pending']
-        ).select_related('user')
-        
-        readiness_data = []
-        for enrollment in enrollments:
-            student = enrollment.user
-            progress = FoundationsProgress.objects.filter(user=student).first()
-            
-            readiness_data.append({
-                'user_id': str(student.id),
-                'email': student.email,
-                'name': f"{student.first_name} {student.last_name}".strip() or student.email,
-                'foundations_complete': progress.is_complete() if progress else False,
-                'foundations_status': progress.status if progress else 'not_started',
-                'completion_percentage': float(progress.completion_percentage) if progress else 0.0,
-                'started_at': progress.started_at.isoformat() if progress and progress.started_at else None,
-                'completed_at': progress.completed_at.isoformat() if progress and progress.completed_at else None,
-                'drop_off_module_id': str(progress.drop_off_module_id) if progress and progress.drop_off_module_id else None,
-                'last_accessed_module_id': str(progress.last_accessed_module_id) if progress and progress.last_accessed_module_id else None,
-            })
-        
-        logger.info(f"Synced Foundations readiness for cohort {cohort_id}: {len(readiness_data)} students")
-        
-        return Response({
-            'success': True,
-            'cohort_id': str(cohort_id),
-            'cohort_name': cohort.name,
-            'total_students': len(readiness_data),
-            'foundations_complete_count': sum(1 for r in readiness_data if r['foundations_complete']),
-            'readiness_data': readiness_data,
-            'synced_at': timezone.now().isoformat()
-        })
+        page = int(request.query_params.get('page', 1))
+        page_size = int(request.query_params.get('page_size', MEMBERS_PAGE_SIZE))
+    except ValueError:
+        return Response(
+            {'error': 'page and page_size must be integers'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if request.method == 'GET':
+        syncs = FoundationsReadinessSync.objects.filter(cohort=cohort).select_related('cohort')
+        sync_id = request.query_params.get('sync_id')
+        try:
+            sync = syncs.get(id=sync_id) if sync_id else syncs.first()
+        except (FoundationsReadinessSync.DoesNotExist, ValidationError):
+            sync = None
+        if sync is None:
+            return Response(
+                {'error': 'No readiness sync found for this cohort'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'success': True, **sync_payload(sync, page=page, page_size=page_size)})
+    
+    try:
+        sync, created = start_sync(cohort, requested_by=user)
     except Exception as e:
-        logger.error(f"Failed to sync Foundations readiness for cohort {cohort_id}: {e}", exc_info=True)
+        logger.error(f"Failed to start Foundations readiness sync for cohort {cohort_id}: {e}", exc_info=True)
         return Response(
             {'error': f'Failed to sync readiness data: {str(e)}'},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
+    
+    if sync.status == 'failed':
+        return Response(
+            {'error': f'Failed to sync readiness data: {sync.error}'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+    return Response(
+        {'success': True, 'created': created, **sync_payload(sync, page=page, page_size=page_size)},
+        status=status.HTTP_200_OK if sync.status == 'completed' else status.HTTP_202_ACCEPTED
+    )
@@ -0,0 +1,12 @@
+"""
+Celery configuration for mentor dashboard periodic tasks.
+"""
+from celery.schedules import crontab
+
+MENTORS_BEAT_SCHEDULE = {
+    'rebuild-mentor-dashboard-snapshots': {
+        'task': 'mentors.rebuild_dashboard_snapshots',
+        'schedule': crontab(minute=5, hour=0),  # Snapshots roll over to the new UTC day
+        'options': {'expires': 60 * 60},
+    },
+}
@@ -0,0 +1,467 @@
+"""
+Mentor dashboard snapshots.
+
+MentorDashboardView built the dashboard on every request: the mentor's assignments
+loaded into Python, separate session queries for today's schedule and the new
+assignments, and mocked review, at-risk and cohort figures. Each mentor now has one
+MentorDashboardSnapshot row with the data those parts are derived from:
+
+  - students: each actively assigned student with track, assignment date, curriculum
+    completion, latest readiness, submission counts, recent posts and last activity;
+  - schedule: sessions scheduled or confirmed on the snapshot's day;
+  - reviews:  the oldest mission submissions from those students awaiting review.
+
+Sections are built for many mentors at once, one grouped query per source, and
+mentors.signals refreshes only what a change touches, after commit:
+
+  - assignment saved or deleted -> that mentor's students and reviews;
+  - session saved or deleted    -> that mentor's schedule;
+  - submission saved or deleted -> the student's entry and the reviews of every mentor
+    the student is assigned to.
+
+A dashboard load is one keyed read of the row (load_snapshot()); priorities, the
+at-risk roster and cohort analytics are derived from it in Python (dashboard()). The
+day-bound parts are rebuilt for the new day by mentors.rebuild_dashboard_snapshots just
+after midnight UTC, which also picks up curriculum and readiness changes; a snapshot
+still from an earlier day is rebuilt on read.
+"""
+import logging
+from collections import Counter
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ('students', 'schedule', 'reviews')
+REBUILD_CHUNK_SIZE = 200
+
+REVIEW_STATUSES = ('submitted', 'under_review')
+SENT_BACK_STATUSES = ('needs_revision', 'rejected')
+SCHEDULED_STATUSES = ('scheduled', 'confirmed')
+REVIEW_QUEUE_SIZE = 5
+REVIEW_URGENT_HOURS = 48
+
+ACTIVITY_WINDOW_DAYS = 7
+NEW_ASSIGNMENT_DAYS = 7
+AT_RISK_INACTIVE_DAYS = 14
+AT_RISK_SENT_BACK = 2
+AT_RISK_READINESS = 40
+COMPLETION_BANDS = [(85, 'excellent'), (70, 'good'), (50, 'needs_attention'), (0, 'at_risk')]
+TOP_PERFORMERS = 3
+
+
+def _day_bounds(day):
+    start = datetime.combine(day, time.min, tzinfo=dt_timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _full_name(first_name, last_name) -> str:
+    return f"{first_name or ''} {last_name or ''}".strip()
+
+
+# Section builders -----------------------------------------------------------
+
+def build_students(mentor_ids, day, student_ids=None) -> Dict:
+    """{mentor_id: {str(student_id): entry}} for active assignments, one query per source."""
+    from community.models import Post
+    from curriculum.models import UserTrackProgress
+    from missions.models import MissionSubmission
+    from talentscope.readiness import latest_readiness_score
+    from users.models import User
+    from .models import MentorStudentAssignment
+
+    assignments = MentorStudentAssignment.objects.filter(mentor_id__in=mentor_ids, is_active=True)
+    if student_ids is not None:
+        assignments = assignments.filter(student_id__in=student_ids)
+    rosters = {mentor_id: {} for mentor_id in mentor_ids}
+    for row in assignments.values(
+        'mentor_id', 'student_id', 'track_slug', 'assigned_at', 'last_interaction_at',
+        'student__first_name', 'student__last_name', 'student__email',
+    ).order_by('assigned_at'):
+        # A student assigned on several tracks shows the latest one
+        rosters[row['mentor_id']][str(row['student_id'])] = {
+            'id': row['student_id'],
+            'name': _full_name(row['student__first_name'], row['student__last_name']) or row['student__email'],
+            'email': row['student__email'],
+            'track': row['track_slug'],
+            'assigned_at': _iso(row['assigned_at']),
+            'last_interaction_at': _iso(row['last_interaction_at']),
+            'completion': 0.0,
+            'readiness': None,
+            'pending_reviews': 0,
+            'sent_back': 0,
+            'missions_completed_7d': 0,
+            'submissions_7d': 0,
+            'posts_7d': 0,
+            'last_activity': None,
+        }
+    ids = {entry['id'] for roster in rosters.values() for entry in roster.values()}
+    if not ids:
+        return rosters
+
+    window_start = _day_bounds(day)[1] - timedelta(days=ACTIVITY_WINDOW_DAYS)
+    metrics = {student_id: {} for student_id in ids}
+    last_seen = {student_id: [] for student_id in ids}
+
+    for row in UserTrackProgress.objects.filter(user_id__in=ids).values('user_id').annotate(
+        completion=Max('completion_percentage'), last=Max('last_activity_at'),
+    ).order_by():
+        metrics[row['user_id']]['completion'] = round(float(row['completion'] or 0), 1)
+        last_seen[row['user_id']].append(row['last'])
+
+    for row in MissionSubmission.objects.filter(student__id__in=ids).values('student__id').annotate(
+        pending=Count('id', filter=Q(status__in=REVIEW_STATUSES)),
+        sent_back=Count('id', filter=Q(status__in=SENT_BACK_STATUSES)),
+        completed=Count('id', filter=Q(status='approved', reviewed_at__gte=window_start)),
+        submitted=Count('id', filter=Q(submitted_at__gte=window_start)),
+        last=Max('submitted_at'),
+    ).order_by():
+        metrics[row['student__id']].update(
+            pending_reviews=row['pending'], sent_back=row['sent_back'],
+            missions_completed_7d=row['completed'], submissions_7d=row['submitted'],
+        )
+        last_seen[row['student__id']].append(row['last'])
+
+    for row in Post.objects.filter(author_id__in=ids, status='published').values('author_id').annotate(
+        recent=Count('id', filter=Q(created_at__gte=window_start)), last=Max('created_at'),
+    ).order_by():
+        metrics[row['author_id']]['posts_7d'] = row['recent']
+        last_seen[row['author_id']].append(row['last'])
+
+    for student_id, score in User.objects.filter(id__in=ids).annotate(
+        readiness=latest_readiness_score('pk'),
+    ).values_list('id', 'readiness'):
+        if score is not None:
+            metrics[student_id]['readiness'] = round(float(score), 1)
+
+    for student_id, values in last_seen.items():
+        seen = [value for value in values if value]
+        if seen:
+            metrics[student_id]['last_activity'] = _iso(max(seen))
+    for roster in rosters.values():
+        for entry in roster.values():
+            entry.update(metrics[entry['id']])
+    return rosters
+
+
+def build_schedule(mentor_ids, day) -> Dict:
+    """{mentor_id: [session]} for sessions scheduled or confirmed on `day`."""
+    from .models import MentorSession
+
+    start, end = _day_bounds(day)
+    schedules = {mentor_id: [] for mentor_id in mentor_ids}
+    for row in MentorSession.objects.filter(
+        mentor_id__in=mentor_ids, scheduled_at__gte=start, scheduled_at__lt=end, status__in=SCHEDULED_STATUSES,
+    ).values(
+        'id', 'mentor_id', 'student_id', 'student__first_name', 'student__last_name', 'student__email',
+        'track_slug', 'title', 'scheduled_at', 'duration_minutes', 'status', 'meeting_url',
+    ).order_by('scheduled_at'):
+        schedules[row['mentor_id']].append({
+            'id': str(row['id']),
+            'student_id': row['student_id'],
+            'student_name': _full_name(row['student__first_name'], row['student__last_name']) or row['student__email'],
+            'student_email': row['student__email'],
+            'track': row['track_slug'],
+            'title': row['title'],
+            'scheduled_at': _iso(row['scheduled_at']),
+            'duration_minutes': row['duration_minutes'],
+            'status': row['status'],
+            'meeting_url': row['meeting_url'],
+        })
+    return schedules
+
+
+def build_reviews(rosters: Dict) -> Dict:
+    """{mentor_id: [submission]}: the oldest REVIEW_QUEUE_SIZE awaiting review per mentor."""
+    from missions.models import MissionSubmission
+
+    queues = {mentor_id: [] for mentor_id in rosters}
+    mentors_of = {}
+    for mentor_id, roster in rosters.items():
+        for entry in roster.values():
+            if entry['pending_reviews']:
+                mentors_of.setdefault(entry['id'], []).append((mentor_id, entry))
+    if not mentors_of:
+        return queues
+
+    for row in MissionSubmission.objects.filter(
+        student__id__in=mentors_of, status__in=REVIEW_STATUSES,
+    ).values('id', 'student__id', 'assignment__mission__title', 'status', 'submitted_at').order_by('submitted_at', 'id'):
+        for mentor_id, entry in mentors_of[row['student__id']]:
+            if len(queues[mentor_id]) < REVIEW_QUEUE_SIZE:
+                queues[mentor_id].append({
+                    'submission_id': str(row['id']),
+                    'student_id': entry['id'],
+                    'student_name': entry['name'],
+                    'track': entry['track'],
+                    'mission_title': row['assignment__mission__title'],
+                    'status': row['status'],
+                    'submitted_at': _iso(row['submitted_at']),
+                })
+    return queues
+
+
+# Writes ---------------------------------------------------------------------
+
+def rebuild(mentor_ids: Iterable, day=None) -> int:
+    """Build every section of these mentors' snapshots for `day` (today); returns snapshots written."""
+    from .models import MentorDashboardSnapshot
+
+    mentor_ids = list(mentor_ids)
+    if not mentor_ids:
+        return 0
+    day = day or timezone.now().date()
+    students = build_students(mentor_ids, day)
+    schedules = build_schedule(mentor_ids, day)
+    reviews = build_reviews(students)
+    with transaction.atomic():
+        existing = {
+            snapshot.mentor_id: snapshot
+            for snapshot in MentorDashboardSnapshot.objects.select_for_update().filter(mentor_id__in=mentor_ids)
+        }
+        created = []
+        for mentor_id in mentor_ids:
+            snapshot = existing.get(mentor_id)
+            if snapshot is None:
+                snapshot = MentorDashboardSnapshot(mentor_id=mentor_id, version=0)
+                created.append(snapshot)
+            snapshot.as_of = day
+            snapshot.students = students[mentor_id]
+            snapshot.schedule = schedules[mentor_id]
+            snapshot.reviews = reviews[mentor_id]
+            snapshot.version += 1
+            snapshot.refreshed_at = timezone.now()
+        MentorDashboardSnapshot.objects.bulk_create(created, ignore_conflicts=True)
+        MentorDashboardSnapshot.objects.bulk_update(
+            list(existing.values()), ['as_of', 'students', 'schedule', 'reviews', 'version', 'refreshed_at'],
+        )
+    return len(mentor_ids)
+
+
+def refresh(mentor_ids: Iterable, sections: Iterable[str] = SECTIONS, student_ids=None) -> int:
+    """
+    Rebuild `sections` of the existing, current-day snapshots of these mentors. With
+    student_ids, only those students' entries are rebuilt (and dropped once they are no
+    longer assigned). Snapshots from an earlier day are left for rebuild(). Returns
+    snapshots updated.
+    """
+    from .models import MentorDashboardSnapshot
+
+    sections = set(sections)
+    day = timezone.now().date()
+    with transaction.atomic():
+        snapshots = list(
+            MentorDashboardSnapshot.objects.select_for_update().filter(mentor_id__in=set(mentor_ids), as_of=day)
+        )
+        if not snapshots:
+            return 0
+        ids = [snapshot.mentor_id for snapshot in snapshots]
+        if 'students' in sections:
+            built = build_students(ids, day, student_ids=student_ids)
+            for snapshot in snapshots:
+                if student_ids is None:
+                    snapshot.students = built[snapshot.mentor_id]
+                    continue
+                for student_id in student_ids:
+                    entry = built[snapshot.mentor_id].get(str(student_id))
+                    if entry is None:
+                        snapshot.students.pop(str(student_id), None)
+                    else:
+                        snapshot.students[str(student_id)] = entry
+        if 'schedule' in sections:
+            schedules = build_schedule(ids, day)
+            for snapshot in snapshots:
+                snapshot.schedule = schedules[snapshot.mentor_id]
+        if 'reviews' in sections:
+            reviews = build_reviews({snapshot.mentor_id: snapshot.students for snapshot in snapshots})
+            for snapshot in snapshots:
+                snapshot.reviews = reviews[snapshot.mentor_id]
+        for snapshot in snapshots:
+            snapshot.version += 1
+            snapshot.refreshed_at = timezone.now()
+        MentorDashboardSnapshot.objects.bulk_update(
+            snapshots, [*(section for section in SECTIONS if section in sections), 'version', 'refreshed_at'],
+        )
+    return len(snapshots)
+
+
+def rebuild_all(chunk_size: int = REBUILD_CHUNK_SIZE, day=None) -> int:
+    """Rebuild every mentor's snapshot for `day`, chunk_size mentors at a time."""
+    from .models import Mentor
+
+    written = 0
+    last_id = None
+    while True:
+        mentors = Mentor.objects.order_by('id')
+        if last_id is not None:
+            mentors = mentors.filter(id__gt=last_id)
+        chunk = list(mentors.values_list('id', flat=True)[:chunk_size])
+        if not chunk:
+            return written
+        written += rebuild(chunk, day=day)
+        last_id = chunk[-1]
+
+
+# Reads ----------------------------------------------------------------------
+
+def load_snapshot(mentor_slug: str, user):
+    """The user's snapshot for their mentor profile `mentor_slug`, rebuilt if missing or from an earlier day; None if no such mentor."""
+    from .models import Mentor, MentorDashboardSnapshot
+
+    lookup = {'mentor__mentor_slug': mentor_slug, 'mentor__user': user}
+    snapshot = MentorDashboardSnapshot.objects.select_related('mentor__user').filter(**lookup).first()
+    if snapshot is not None and snapshot.as_of == timezone.now().date():
+        return snapshot
+    mentor_id = (
+        snapshot.mentor_id if snapshot is not None
+        else Mentor.objects.filter(mentor_slug=mentor_slug, user=user).values_list('id', flat=True).first()
+    )
+    if mentor_id is None:
+        return None
+    rebuild([mentor_id])
+    return MentorDashboardSnapshot.objects.select_related('mentor__user').get(mentor_id=mentor_id)
+
+
+def _days_since(value: Optional[str], now) -> Optional[int]:
+    return (now - datetime.fromisoformat(value)).days if value else None
+
+
+def at_risk_students(students: List[dict], now) -> List[dict]:
+    """Students with at least one risk signal, most signals and longest inactivity first."""
+    flagged = []
+    for student in students:
+        inactive_days = _days_since(student['last_activity'] or student['assigned_at'], now) or 0
+        issues = []
+        if inactive_days >= AT_RISK_INACTIVE_DAYS:
+            issues.append(f"No activity for {inactive_days} days")
+        if student['sent_back'] >= AT_RISK_SENT_BACK:
+            issues.append(f"{student['sent_back']} submissions sent back")
+        if student['readiness'] is not None and student['readiness'] < AT_RISK_READINESS:
+            issues.append(f"Readiness {student['readiness']:.0f}")
+        if not issues:
+            continue
+        flagged.append({
+            'student_id': student['id'],
+            'student_name': student['name'],
+            'track': student['track'],
+            'risk_level': 'high' if len(issues) > 1 else 'medium',
+            'issues': issues,
+            'days_inactive': inactive_days,
+            'completion': student['completion'],
+            'recommended_action': (
+                'Schedule intervention session' if len(issues) > 1 else 'Check in with the student this week'
+            ),
+        })
+    flagged.sort(key=lambda item: (-len(item['issues']), -item['days_inactive']))
+    return flagged
+
+
+def cohort_analytics(students: List[dict], at_risk: List[dict], now) -> dict:
+    completions = [student['completion'] for student in students]
+    bands = Counter(
+        next(band for threshold, band in COMPLETION_BANDS if completion >= threshold) for completion in completions
+    )
+    ranked = sorted(students, key=lambda student: -student['completion'])
+    return {
+        'total_students': len(students),
+        'tracks_distribution': dict(Counter(student['track'] for student in students)),
+        'average_completion': round(sum(completions) / len(completions), 1) if completions else 0.0,
+        'completion_distribution': {band: bands.get(band, 0) for _, band in COMPLETION_BANDS},
+        'recent_activity': {
+            'missions_completed_last_7_days': sum(student['missions_completed_7d'] for student in students),
+            'submissions_last_7_days': sum(student['submissions_7d'] for student in students),
+            'community_posts_last_7_days': sum(student['posts_7d'] for student in students),
+        },
+        'top_performers': [
+            {'name': student['name'], 'completion': student['completion'], 'track': student['track']}
+            for student in ranked[:TOP_PERFORMERS] if student['completion'] >= COMPLETION_BANDS[1][0]
+        ],
+        'needs_help': [
+            {'name': item['student_name'], 'completion': item['completion'], 'track': item['track'],
+             'days_stuck': item['days_inactive']}
+            for item in at_risk
+        ],
+    }
+
+
+def _priority(kind, type_, title, description, level, action_url, items, total):
+    return {
+        'id': kind, 'type': type_, 'title': title, 'description': description, 'priority': level,
+        'action_url': action_url, 'items': items, 'total_count': total,
+    }
+
+
+def _review_priority(item: dict, now) -> str:
+    waited = now - datetime.fromisoformat(item['submitted_at']) if item['submitted_at'] else timedelta(0)
+    return 'high' if waited >= timedelta(hours=REVIEW_URGENT_HOURS) else 'medium'
+
+
+def today_priorities(snapshot, students: List[dict], at_risk: List[dict], now) -> List[dict]:
+    slug = snapshot.mentor.mentor_slug
+    priorities = []
+
+    pending = sum(student['pending_reviews'] for student in students)
+    if pending:
+        items = [{**item, 'priority': _review_priority(item, now)} for item in snapshot.reviews[:3]]
+        priorities.append(_priority(
+            'quiz_reviews', 'quiz_reviews', f"{pending} Reviews Needed",
+            f"{pending} mission submissions are awaiting review", 1, f'/mentor/{slug}/reviews', items, pending,
+        ))
+    if at_risk:
+        priorities.append(_priority(
+            'at_risk_students', 'at_risk_students', f"{len(at_risk)} Students At Risk",
+            f"{len(at_risk)} students need immediate attention", 1, f'/mentor/{slug}/interventions',
+            at_risk[:3], len(at_risk),
+        ))
+    if snapshot.schedule:
+        priorities.append(_priority(
+            'today_sessions', 'sessions', f"{len(snapshot.schedule)} Sessions Today",
+            f"You have {len(snapshot.schedule)} mentoring sessions scheduled", 2, f'/mentor/{slug}/schedule',
+            snapshot.schedule, len(snapshot.schedule),
+        ))
+    cutoff = now - timedelta(days=NEW_ASSIGNMENT_DAYS)
+    new = [
+        {'student_name': student['name'], 'track': student['track'], 'assigned_at': student['assigned_at'],
+         'welcome_needed': student['last_interaction_at'] is None}
+        for student in students if student['assigned_at'] and datetime.fromisoformat(student['assigned_at']) >= cutoff
+    ]
+    if new:
+        new.sort(key=lambda item: item['assigned_at'], reverse=True)
+        priorities.append(_priority(
+            'new_assignments', 'assignments', f"{len(new)} New Student Assignments",
+            f"You have {len(new)} newly assigned students", 3, f'/mentor/{slug}/students', new[:3], len(new),
+        ))
+    return priorities
+
+
+def dashboard(snapshot, now=None) -> dict:
+    """The mentor dashboard payload, derived from a snapshot without further queries."""
+    now = now or timezone.now()
+    mentor = snapshot.mentor
+    students = sorted(snapshot.students.values(), key=lambda student: student['name'].lower())
+    at_risk = at_risk_students(students, now)
+    return {
+        'mentor': {
+            'id': str(mentor.id),
+            'slug': mentor.mentor_slug,
+            'full_name': mentor.user.get_full_name(),
+            'bio': mentor.bio,
+            'expertise_tracks': mentor.expertise_tracks,
+            'capacity': mentor.max_students_per_cohort,
+            'assigned_students_count': len(students),
+        },
+        'assigned_students': students,
+        'today_priorities': today_priorities(snapshot, students, at_risk, now),
+        'today_schedule': snapshot.schedule,
+        'cohort_analytics': cohort_analytics(students, at_risk, now),
+        'snapshot': {'as_of': snapshot.as_of.isoformat(), 'version': snapshot.version,
+                     'refreshed_at': _iso(snapshot.refreshed_at)},
+    }
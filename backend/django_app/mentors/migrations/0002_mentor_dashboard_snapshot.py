@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mentors', '0001_create_mentor_models'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MentorDashboardSnapshot',
+            fields=[
+                ('mentor', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='dashboard_snapshot', serialize=False, to='mentors.mentor')),
+                ('as_of', models.DateField(help_text='Day the schedule and 7-day figures were computed for')),
+                ('students', models.JSONField(blank=True, default=dict, help_text='Assigned students keyed by user id')),
+                ('schedule', models.JSONField(blank=True, default=list, help_text='Sessions scheduled or confirmed on as_of')),
+                ('reviews', models.JSONField(blank=True, default=list, help_text='Oldest submissions awaiting review')),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('refreshed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'mentor_dashboard_snapshots',
+            },
+        ),
+    ]
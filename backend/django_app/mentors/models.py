@@ -245,3 +245,29 @@ class MentorSession(models.Model):
         """Check if session is scheduled for today."""
         today = timezone.now().date()
         return self.scheduled_at.date() == today and self.is_upcoming()
+
+
+class MentorDashboardSnapshot(models.Model):
+    """
+    Precomputed mentor dashboard (see mentors/dashboard_snapshot.py): the mentor's
+    assigned students with their progress figures, the day's schedule and the review
+    queue, refreshed per section as assignments, sessions and submissions change.
+    """
+    mentor = models.OneToOneField(
+        Mentor,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='dashboard_snapshot'
+    )
+    as_of = models.DateField(help_text="Day the schedule and 7-day figures were computed for")
+    students = models.JSONField(default=dict, blank=True, help_text="Assigned students keyed by user id")
+    schedule = models.JSONField(default=list, blank=True, help_text="Sessions scheduled or confirmed on as_of")
+    reviews = models.JSONField(default=list, blank=True, help_text="Oldest submissions awaiting review")
+    version = models.PositiveIntegerField(default=1)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'mentor_dashboard_snapshots'
+
+    def __str__(self):
+        return f"Dashboard snapshot for {self.mentor_id} ({self.as_of}, v{self.version})"
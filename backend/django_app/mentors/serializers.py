@@ -86,8 +86,8 @@ class MentorSessionCreateSerializer(serializers.ModelSerializer):
 
 
 class MentorDashboardSerializer(serializers.Serializer):
-    """Complete mentor dashboard data serializer."""
-    mentor = MentorSerializer()
+    """Complete mentor dashboard data serializer (payload built by dashboard_snapshot.dashboard)."""
+    mentor = serializers.DictField(read_only=True)
     assigned_students = serializers.ListField(
         child=serializers.DictField(),
         read_only=True
@@ -96,8 +96,12 @@ class MentorDashboardSerializer(serializers.Serializer):
         child=serializers.DictField(),
         read_only=True
     )
-    today_schedule = MentorSessionSerializer(many=True, read_only=True)
+    today_schedule = serializers.ListField(
+        child=serializers.DictField(),
+        read_only=True
+    )
     cohort_analytics = serializers.DictField(read_only=True)
+    snapshot = serializers.DictField(read_only=True)
 
 
 class MentorStudentDetailSerializer(serializers.Serializer):
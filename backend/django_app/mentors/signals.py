@@ -0,0 +1,46 @@
+"""
+Signals for the mentor dashboard — refresh the affected MentorDashboardSnapshot
+sections once the change commits (see mentors/dashboard_snapshot.py).
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+
+def _refresh_on_commit(mentor_ids, sections, student_ids=None):
+    from .dashboard_snapshot import refresh
+    mentor_ids = set(mentor_ids)
+    if mentor_ids:
+        transaction.on_commit(lambda: refresh(mentor_ids, sections, student_ids=student_ids))
+
+
+@receiver(post_save, sender='mentors.MentorStudentAssignment')
+@receiver(post_delete, sender='mentors.MentorStudentAssignment')
+def refresh_dashboard_on_assignment_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_on_commit([instance.mentor_id], ('students', 'reviews'), student_ids=[instance.student_id])
+
+
+@receiver(post_save, sender='mentors.MentorSession')
+@receiver(post_delete, sender='mentors.MentorSession')
+def refresh_dashboard_on_session_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    _refresh_on_commit([instance.mentor_id], ('schedule',))
+
+
+@receiver(post_save, sender='missions.MissionSubmission')
+@receiver(post_delete, sender='missions.MissionSubmission')
+def refresh_dashboard_on_submission_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .models import MentorStudentAssignment
+    # MissionSubmission.student points at User.uuid_id
+    pairs = list(MentorStudentAssignment.objects.filter(
+        student__uuid_id=instance.student_id, is_active=True,
+    ).values_list('mentor_id', 'student_id'))
+    if pairs:
+        _refresh_on_commit(
+            [mentor_id for mentor_id, _ in pairs], ('students', 'reviews'), student_ids=[pairs[0][1]],
+        )
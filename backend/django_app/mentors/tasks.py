@@ -0,0 +1,29 @@
+"""
+Background tasks for the mentor dashboard.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@shared_task(name='mentors.rebuild_dashboard_snapshots')
+def rebuild_dashboard_snapshots_task():
+    """Rebuild every mentor dashboard snapshot for the new day; one worker at a time."""
+    from core.locks import leader_lock
+    from .dashboard_snapshot import rebuild_all
+
+    with leader_lock('mentors.rebuild_dashboard_snapshots') as leader:
+        if not leader:
+            logger.info("Mentor dashboard rebuild already running on another worker; skipping")
+            return {'status': 'skipped'}
+        written = rebuild_all()
+    logger.info(f"Rebuilt {written} mentor dashboard snapshots")
+    return {'status': 'success', 'snapshots': written}
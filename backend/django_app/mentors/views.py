@@ -3,8 +3,7 @@ Mentor Dashboard API Views
 Complete mentor command center with student management, scheduling, and analytics.
 """
 import logging
-from datetime import datetime, timedelta
-from django.utils import timezone
+from datetime import datetime
 from django.db.models import Q, Avg, Count, F
 from django.shortcuts import get_object_or_404
 from rest_framework import status
@@ -15,6 +14,7 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
 
 from users.permissions import IsMentor
+from .dashboard_snapshot import dashboard, load_snapshot
 from .models import Mentor, MentorStudentAssignment, MentorStudentNote, MentorSession
 from .serializers import (
     MentorDashboardSerializer,
@@ -30,57 +30,19 @@ logger = logging.getLogger(__name__)
 class MentorDashboardView(APIView):
     """
     GET /api/v1/mentors/[slug]/dashboard
-    Main mentor dashboard with overview, priorities, and analytics.
+    Main mentor dashboard with overview, priorities, and analytics, served from the
+    mentor's MentorDashboardSnapshot (see mentors/dashboard_snapshot.py).
     """
     permission_classes = [IsAuthenticated, IsMentor]
 
     def get(self, request, mentor_slug):
         """Get mentor dashboard data."""
         try:
-            # Get mentor profile
-            mentor = get_object_or_404(Mentor, mentor_slug=mentor_slug, user=request.user)
-
-            # Get assigned students
-            assignments = MentorStudentAssignment.objects.filter(
-                mentor=mentor,
-                is_active=True
-            ).select_related('student')
-
-            assigned_students = [assignment.student for assignment in assignments]
-
-            # Calculate today's priorities (AI would enhance this)
-            today_priorities = self._calculate_today_priorities(mentor, assigned_students)
-
-            # Get schedule for today
-            today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-            today_end = today_start + timedelta(days=1)
+            snapshot = load_snapshot(mentor_slug, request.user)
+            if snapshot is None:
+                return Response({'detail': 'Mentor not found'}, status=status.HTTP_404_NOT_FOUND)
 
-            today_sessions = MentorSession.objects.filter(
-                mentor=mentor,
-                scheduled_at__range=(today_start, today_end),
-                status__in=['scheduled', 'confirmed']
-            ).select_related('student').order_by('scheduled_at')
-
-            # Calculate cohort analytics
-            cohort_analytics = self._calculate_cohort_analytics(mentor, assigned_students)
-
-            dashboard_data = {
-                'mentor': {
-                    'id': str(mentor.id),
-                    'slug': mentor.mentor_slug,
-                    'full_name': mentor.user.get_full_name(),
-                    'bio': mentor.bio,
-                    'expertise_tracks': mentor.expertise_tracks,
-                    'capacity': mentor.max_students_per_cohort,
-                    'assigned_students_count': len(assigned_students),
-                },
-                'assigned_students': assigned_students,
-                'today_priorities': today_priorities,
-                'today_schedule': MentorSessionSerializer(today_sessions, many=True).data,
-                'cohort_analytics': cohort_analytics,
-            }
-
-            serializer = MentorDashboardSerializer(dashboard_data)
+            serializer = MentorDashboardSerializer(dashboard(snapshot))
             return Response(serializer.data)
 
         except Exception as e:
@@ -90,174 +52,6 @@ class MentorDashboardView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _calculate_today_priorities(self, mentor, students):
-        """Calculate today's priorities for the mentor."""
-        priorities = []
-
-        # 1. Quiz reviews needed
-        quiz_reviews = self._get_quiz_reviews_needed(mentor, students)
-        if quiz_reviews:
-            priorities.append({
-                'id': 'quiz_reviews',
-                'type': 'quiz_reviews',
-                'title': f"{len(quiz_reviews)} Quiz Reviews Needed",
-                'description': f"{len(quiz_reviews)} students submitted quizzes for review",
-                'priority': 1,
-                'action_url': f'/mentor/{mentor.mentor_slug}/reviews',
-                'items': quiz_reviews[:3],  # Show top 3
-                'total_count': len(quiz_reviews)
-            })
-
-        # 2. At-risk students
-        at_risk_students = self._get_at_risk_students(mentor, students)
-        if at_risk_students:
-            priorities.append({
-                'id': 'at_risk_students',
-                'type': 'at_risk_students',
-                'title': f"{len(at_risk_students)} Students At Risk",
-                'description': f"{len(at_risk_students)} students need immediate attention",
-                'priority': 1,
-                'action_url': f'/mentor/{mentor.mentor_slug}/interventions',
-                'items': at_risk_students[:3],
-                'total_count': len(at_risk_students)
-            })
-
-        # 3. Today's sessions
-        today_sessions = self._get_today_sessions(mentor)
-        if today_sessions:
-            priorities.append({
-                'id': 'today_sessions',
-                'type': 'sessions',
-                'title': f"{len(today_sessions)} Sessions Today",
-                'description': f"You have {len(today_sessions)} mentoring sessions scheduled",
-                'priority': 2,
-                'action_url': f'/mentor/{mentor.mentor_slug}/schedule',
-                'items': today_sessions,
-                'total_count': len(today_sessions)
-            })
-
-        # 4. New student assignments
-        new_assignments = self._get_new_assignments(mentor)
-        if new_assignments:
-            priorities.append({
-                'id': 'new_assignments',
-                'type': 'assignments',
-                'title': f"{len(new_assignments)} New Student Assignments",
-                'description': f"You have {len(new_assignments)} newly assigned students",
-                'priority': 3,
-                'action_url': f'/mentor/{mentor.mentor_slug}/students',
-                'items': new_assignments[:3],
-                'total_count': len(new_assignments)
-            })
-
-        return priorities
-
-    def _get_quiz_reviews_needed(self, mentor, students):
-        """Mock: Get students who submitted quizzes for review."""
-        # In production, this would query the curriculum/progress system
-        return [
-            {
-                'student_name': 'Sarah K.',
-                'track': 'defender',
-                'quiz_title': 'Log Analysis Fundamentals',
-                'submitted_at': '2 hours ago',
-                'priority': 'high'
-            },
-            {
-                'student_name': 'James M.',
-                'track': 'defender',
-                'quiz_title': 'Alert Triage Quiz',
-                'submitted_at': '4 hours ago',
-                'priority': 'medium'
-            }
-        ]
-
-    def _get_at_risk_students(self, mentor, students):
-        """Mock: Get at-risk students based on progress."""
-        # In production, this would use AI ReadinessScore and progress analytics
-        return [
-            {
-                'student_name': 'James M.',
-                'track': 'defender',
-                'risk_level': 'high',
-                'issues': ['Stuck for 14 days', 'Failed 3 quizzes', 'Low engagement'],
-                'recommended_action': 'Schedule intervention session'
-            }
-        ]
-
-    def _get_today_sessions(self, mentor):
-        """Get today's scheduled sessions."""
-        today_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        today_end = today_start + timedelta(days=1)
-
-        sessions = MentorSession.objects.filter(
-            mentor=mentor,
-            scheduled_at__range=(today_start, today_end),
-            status__in=['scheduled', 'confirmed']
-        ).select_related('student')
-
-        return [{
-            'id': str(session.id),
-            'student_name': session.student.get_full_name(),
-            'track': session.track_slug,
-            'title': session.title,
-            'scheduled_at': session.scheduled_at.isoformat(),
-            'duration_minutes': session.duration_minutes,
-            'meeting_url': session.meeting_url,
-        } for session in sessions]
-
-    def _get_new_assignments(self, mentor):
-        """Get recently assigned students."""
-        # Assignments from the last 7 days
-        week_ago = timezone.now() - timedelta(days=7)
-
-        assignments = MentorStudentAssignment.objects.filter(
-            mentor=mentor,
-            assigned_at__gte=week_ago,
-            is_active=True
-        ).select_related('student')
-
-        return [{
-            'student_name': assignment.student.get_full_name(),
-            'track': assignment.track_slug,
-            'assigned_at': assignment.assigned_at.isoformat(),
-            'welcome_needed': True
-        } for assignment in assignments]
-
-    def _calculate_cohort_analytics(self, mentor, students):
-        """Calculate cohort performance analytics."""
-        # Mock analytics - in production would query progress/missions/curriculum data
-        return {
-            'total_students': len(students),
-            'tracks_distribution': {
-                'defender': 12,
-                'grc': 4,
-                'offensive': 2,
-                'innovation': 1,
-                'leadership': 1
-            },
-            'average_completion': 68.5,
-            'completion_distribution': {
-                'excellent': 3,  # 85%+
-                'good': 8,       # 70-84%
-                'needs_attention': 6,  # 50-69%
-                'at_risk': 3      # <50%
-            },
-            'recent_activity': {
-                'missions_completed_last_7_days': 23,
-                'quizzes_submitted_last_7_days': 18,
-                'community_posts_last_7_days': 45
-            },
-            'top_performers': [
-                {'name': 'Sarah K.', 'completion': 92, 'track': 'defender'},
-                {'name': 'Aisha N.', 'completion': 85, 'track': 'offensive'}
-            ],
-            'needs_help': [
-                {'name': 'James M.', 'completion': 45, 'track': 'defender', 'days_stuck': 14},
-                {'name': 'David R.', 'completion': 52, 'track': 'grc', 'days_stuck': 7}
-            ]
-        }
-
 
 class MentorStudentDetailView(APIView):
     """
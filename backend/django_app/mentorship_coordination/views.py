@@ -7,7 +7,7 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import MultiPartParser, FormParser
 from django.utils import timezone
-from django.db.models import Q, Count, F
+from django.db.models import Q, Count
 from django.contrib.auth import get_user_model
 from datetime import timedelta
 import json
@@ -31,6 +31,8 @@ from .serializers import (
 )
 from missions.models import MissionSubmission
 from student_dashboard.services import DashboardAggregationService
+from talentscope import mentee360
+from users.utils.identity_snapshot import get_user_role_names
 import logging
 
 logger = logging.getLogger(__name__)
@@ -238,13 +240,7 @@ def get_current_mentor(user):
 
     # Fallback: active role record
     try:
-        from users.models import UserRole
-        has_mentor_role = UserRole.objects.filter(
-            user=user,
-            role__name='mentor',
-            is_active=True
-        ).exists()
-        if has_mentor_role:
+        if 'mentor' in get_user_role_names(user):
             return user
     except Exception:
         # If role system isn't available, keep legacy behavior
@@ -569,143 +565,30 @@ def mentor_mentee_talentscope(request, mentor_id, mentee_id):
     if not _mentor_can_view_mentee(mentor, mentee):
         return Response({'error': 'Mentee not assigned to this mentor'}, status=status.HTTP_403_FORBIDDEN)
 
-    # Pull TalentScope models if available
-    try:
-        from talentscope.models import SkillSignal, BehaviorSignal, ReadinessSnapshot
-    except Exception:
-        SkillSignal = None
-        BehaviorSignal = None
-        ReadinessSnapshot = None
-
-    # Latest readiness snapshot (source of truth for advanced fields)
-    latest_snapshot = None
-    if ReadinessSnapshot is not None:
-        latest_snapshot = ReadinessSnapshot.objects.filter(mentee=mentee).order_by('-snapshot_date').first()
-
-    # Skills heatmap (skill_name -> mastery_level)
-    skills_heatmap = {}
-    if SkillSignal is not None:
-        latest_by_skill = {}
-        for s in SkillSignal.objects.filter(mentee=mentee).order_by('-created_at')[:500]:
-            if s.skill_name not in latest_by_skill:
-                latest_by_skill[s.skill_name] = s
-        skills_heatmap = {k: float(v.mastery_level) for k, v in latest_by_skill.items()}
-
-    # Behavioral trends (last 30 days)
-    today = timezone.now().date()
-    start = today - timedelta(days=29)
-    days = [start + timedelta(days=i) for i in range(30)]
-    trend_map = {d.isoformat(): {'missions_completed': 0, 'hours_studied': 0.0, 'reflections_count': 0} for d in days}
-
-    # Missions completed (approved)
-    for row in MissionSubmission.objects.filter(
-        student=mentee,
-        status='approved',
-        created_at__date__gte=start,
-        created_at__date__lte=today
-    ).values('created_at__date').annotate(c=Count('id')):
-        day = row['created_at__date'].isoformat()
-        trend_map[day]['missions_completed'] = int(row['c'])
-
-    if BehaviorSignal is not None:
-        # hours_studied: sum of study_consistency values
-        for row in BehaviorSignal.objects.filter(
-            mentee=mentee,
-            behavior_type='study_consistency',
-            recorded_at__date__gte=start,
-            recorded_at__date__lte=today
-        ).values('recorded_at__date').annotate(total=Count('id'), sum_val=F('recorded_at__date')):
-            # We can't sum DecimalField with this limited import set in this file; do a simple per-row loop instead.
-            pass
-
-        # fallback simple aggregation in python (safe, small window)
-        for sig in BehaviorSignal.objects.filter(
-            mentee=mentee,
-            recorded_at__date__gte=start,
-            recorded_at__date__lte=today
-        ).only('behavior_type', 'value', 'recorded_at')[:2000]:
-            day = sig.recorded_at.date().isoformat()
-            if day not in trend_map:
-                continue
-            if sig.behavior_type == 'study_consistency':
-                trend_map[day]['hours_studied'] += float(sig.value)
-            if sig.behavior_type == 'reflection_frequency':
-                trend_map[day]['reflections_count'] += 1
-
-    behavioral_trends = [
-        {'date': d, **vals} for d, vals in sorted(trend_map.items(), key=lambda x: x[0])
-    ]
-
-    # Readiness over time
-    readiness_over_time = []
-    if ReadinessSnapshot is not None:
-        for snap in ReadinessSnapshot.objects.filter(mentee=mentee).order_by('snapshot_date')[:120]:
-            readiness_over_time.append({
-                'date': snap.snapshot_date.date().isoformat(),
-                'score': float(snap.core_readiness_score)
-            })
-
-    # Ingested signals (best-effort counts)
-    mentor_evaluations = MentorSession.objects.filter(mentor=mentor, mentee=mentee).count()
-    habit_logs = 0
-    community_engagement = 0
-    if BehaviorSignal is not None:
-        habit_logs = BehaviorSignal.objects.filter(mentee=mentee, source='habit_log').count()
-        community_engagement = BehaviorSignal.objects.filter(
-            mentee=mentee,
-            behavior_type__in=['engagement_level', 'collaboration']
-        ).count()
-
-    # Count mission submissions where a mentor/overall score exists.
-    # We intentionally avoid touching AI feedback tables here so this
-    # endpoint works even if those migrations haven't been applied yet.
-    mission_scores = MissionSubmission.objects.filter(
-        student=mentee,
-        score__isnull=False,
-    ).count()
-
-    # Default advanced fields from snapshot when available
-    core_readiness_score = float(latest_snapshot.core_readiness_score) if latest_snapshot else None
-    career_readiness_stage = getattr(latest_snapshot, 'career_readiness_stage', None) if latest_snapshot else None
-    learning_velocity = float(latest_snapshot.learning_velocity) if latest_snapshot and latest_snapshot.learning_velocity is not None else None
-    estimated_readiness_window = getattr(latest_snapshot, 'estimated_readiness_window', None) if latest_snapshot else None
-
-    readiness_breakdown = getattr(latest_snapshot, 'breakdown', None) if latest_snapshot else None
-    gap_analysis = None
-    professional_tier_data = None
-    if latest_snapshot:
-        gap_analysis = {
-            'strengths': getattr(latest_snapshot, 'strengths', []) or [],
-            'weaknesses': getattr(latest_snapshot, 'weaknesses', []) or [],
-            'missing_skills': getattr(latest_snapshot, 'missing_skills', []) or [],
-            'improvement_plan': getattr(latest_snapshot, 'improvement_plan', []) or [],
-        }
-        professional_tier_data = {
-            'job_fit_score': float(latest_snapshot.job_fit_score) if latest_snapshot.job_fit_score is not None else None,
-            'hiring_timeline_prediction': getattr(latest_snapshot, 'hiring_timeline_prediction', None),
-            'track_benchmarks': getattr(latest_snapshot, 'track_benchmarks', None) or {},
-        }
+    # One read of the materialized profile (talentscope.mentee360), kept current by its writers
+    profile = mentee360.get_profile(mentee.id)
+    readiness = profile['readiness']
 
     return Response({
         'mentee_id': str(mentee.id),
         'mentee_name': mentee.get_full_name() or mentee.email,
         'ingested_signals': {
-            'mentor_evaluations': mentor_evaluations,
-            'habit_logs': habit_logs,
-            'mission_scores': mission_scores,
+            'mentor_evaluations': profile['mentor_sessions'].get(str(mentor.id), 0),
+            'habit_logs': profile['habit_logs'],
+            'mission_scores': profile['mission_scores'],
             'reflection_sentiment': {'positive': 0, 'neutral': 0, 'negative': 0},
-            'community_engagement': community_engagement,
+            'community_engagement': profile['community_engagement'],
         },
-        'skills_heatmap': skills_heatmap,
-        'behavioral_trends': behavioral_trends,
-        'readiness_over_time': readiness_over_time,
-        'core_readiness_score': core_readiness_score,
-        'career_readiness_stage': career_readiness_stage,
-        'learning_velocity': learning_velocity,
-        'estimated_readiness_window': estimated_readiness_window,
-        'readiness_breakdown': readiness_breakdown,
-        'gap_analysis': gap_analysis,
-        'professional_tier_data': professional_tier_data,
+        'skills_heatmap': profile['skills_heatmap'],
+        'behavioral_trends': mentee360.behavioral_trends(profile),
+        'readiness_over_time': profile['readiness_history'],
+        'core_readiness_score': readiness.get('core_readiness_score'),
+        'career_readiness_stage': readiness.get('career_readiness_stage'),
+        'learning_velocity': readiness.get('learning_velocity'),
+        'estimated_readiness_window': readiness.get('estimated_readiness_window'),
+        'readiness_breakdown': readiness.get('breakdown'),
+        'gap_analysis': readiness.get('gap_analysis'),
+        'professional_tier_data': readiness.get('professional_tier_data'),
     })
 
 
@@ -2568,7 +2451,7 @@ def mentee_sessions(request):
         # Verify the mentee_id matches the authenticated user (students can only see their own sessions)
         if str(request.user.id) != str(mentee_id):
             # Check if user is a mentor (mentors can view their mentees' sessions)
-            if not request.user.user_roles.filter(role__name='mentor', is_active=True).exists():
+            if 'mentor' not in get_user_role_names(request.user):
                 return Response(
                     {'error': 'You can only view your own sessions'},
                     status=status.HTTP_403_FORBIDDEN
@@ -3589,7 +3472,7 @@ def messages_endpoint(request, assignment_id):
                     logger.info(f"✅ Using MenteeMentorAssignment {assignment.id} for mentee {request.user.id} and mentor {mentor_assignment.mentor.id}")
             
             # Case 2: User is a mentor - find mentee from their assigned cohorts
-            if not assignment and request.user.user_roles.filter(role__name='mentor', is_active=True).exists():
+            if not assignment and 'mentor' in get_user_role_names(request.user):
                 # Get mentee_id from request body (when sending message) or query params
                 # Frontend sends 'recipient_id' in FormData (snake_case)
                 mentee_id = None
@@ -3857,11 +3740,11 @@ def mark_message_read(request, message_id):
 
 
 def _user_is_director(user):
-    return user.user_roles.filter(role__name='program_director', is_active=True).exists()
+    return 'program_director' in get_user_role_names(user)
 
 
 def _user_is_mentor(user):
-    return user.user_roles.filter(role__name='mentor', is_active=True).exists()
+    return 'mentor' in get_user_role_names(user)
 
 
 def _user_display_name(user):
@@ -3,4 +3,7 @@ from django.apps import AppConfig
 
 class MissionsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'missions'
\ No newline at end of file
+    name = 'missions'
+
+    def ready(self):
+        import missions.signals  # noqa: F401
@@ -0,0 +1,57 @@
+# Materialized per-student mission catalog (missions/visibility.py)
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('missions', '0005_add_mastery_enhancements'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentMissionCatalog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('version', models.IntegerField(default=1)),
+                ('built_version', models.IntegerField(default=0)),
+                ('track_key_seen', models.CharField(blank=True, help_text='User.track_key the catalog was built for', max_length=100, null=True)),
+                ('student_track', models.CharField(blank=True, help_text='Normalized mission track used for locking', max_length=20, null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+                ('student', models.OneToOneField(db_column='student_id', on_delete=django.db.models.deletion.CASCADE, related_name='mission_catalog', to=settings.AUTH_USER_MODEL, to_field='uuid_id')),
+            ],
+            options={
+                'db_table': 'student_mission_catalogs',
+            },
+        ),
+        migrations.CreateModel(
+            name='StudentMissionState',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('mission_created_at', models.DateTimeField(help_text='Copy of Mission.created_at, the keyset sort key')),
+                ('status', models.CharField(default='not_started', help_text='Latest submission status, or not_started', max_length=20)),
+                ('is_locked', models.BooleanField(default=False)),
+                ('lock_reason', models.TextField(blank=True, null=True)),
+                ('ai_score', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True)),
+                ('ai_feedback', models.JSONField(blank=True, help_text='Score, top strengths and gaps from the latest AI feedback', null=True)),
+                ('artifacts_uploaded', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_states', to='missions.mission')),
+                ('student', models.ForeignKey(db_column='student_id', on_delete=django.db.models.deletion.CASCADE, related_name='mission_states', to=settings.AUTH_USER_MODEL, to_field='uuid_id')),
+                ('submission', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='missions.missionsubmission')),
+            ],
+            options={
+                'db_table': 'student_mission_states',
+                'unique_together': {('student', 'mission')},
+                'indexes': [
+                    models.Index(fields=['student', '-mission_created_at', '-mission'], name='student_mission_keyset_idx'),
+                    models.Index(fields=['student', 'status'], name='student_mission_status_idx'),
+                ],
+            },
+        ),
+    ]
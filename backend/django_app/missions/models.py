@@ -234,4 +234,56 @@ class AIFeedback(models.Model):
         ordering = ['-generated_at']
 
     def __str__(self):
-        return f"AI Feedback for {self.submission.id}"
\ No newline at end of file
+        return f"AI Feedback for {self.submission.id}"
+
+class StudentMissionCatalog(models.Model):
+    """
+    Per-student header for the materialized mission catalog (missions/visibility.py).
+
+    Events bump `version`; the catalog is rebuilt on the next read whenever
+    `built_version` lags behind it.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.OneToOneField(User, on_delete=models.CASCADE, related_name='mission_catalog', db_column='student_id', to_field='uuid_id')
+    version = models.IntegerField(default=1)
+    built_version = models.IntegerField(default=0)
+    track_key_seen = models.CharField(max_length=100, blank=True, null=True, help_text='User.track_key the catalog was built for')
+    student_track = models.CharField(max_length=20, blank=True, null=True, help_text='Normalized mission track used for locking')
+    refreshed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'student_mission_catalogs'
+
+    @property
+    def is_stale(self):
+        return self.built_version != self.version
+
+    def __str__(self):
+        return f"Mission catalog for {self.student_id} (v{self.built_version}/{self.version})"
+
+
+class StudentMissionState(models.Model):
+    """One eligible mission for one student, with its submission status and lock state."""
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    student = models.ForeignKey(User, on_delete=models.CASCADE, related_name='mission_states', db_column='student_id', to_field='uuid_id')
+    mission = models.ForeignKey(Mission, on_delete=models.CASCADE, related_name='student_states')
+    mission_created_at = models.DateTimeField(help_text='Copy of Mission.created_at, the keyset sort key')
+    status = models.CharField(max_length=20, default='not_started', help_text='Latest submission status, or not_started')
+    submission = models.ForeignKey(MissionSubmission, on_delete=models.SET_NULL, blank=True, null=True, related_name='+')
+    is_locked = models.BooleanField(default=False)
+    lock_reason = models.TextField(blank=True, null=True)
+    ai_score = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True)
+    ai_feedback = models.JSONField(blank=True, null=True, help_text='Score, top strengths and gaps from the latest AI feedback')
+    artifacts_uploaded = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'student_mission_states'
+        unique_together = [['student', 'mission']]
+        indexes = [
+            models.Index(fields=['student', '-mission_created_at', '-mission'], name='student_mission_keyset_idx'),
+            models.Index(fields=['student', 'status'], name='student_mission_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.mission_id} for {self.student_id} ({self.status})"
@@ -0,0 +1,68 @@
+"""
+Signals for the Missions app — keep the materialized student mission catalog
+(missions/visibility.py) in step with the data it is derived from.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .visibility import (
+    LOCK_FIELDS, mark_catalogs_stale, mark_cohort_catalogs_stale, mark_mission_catalogs_stale,
+    sync_submission_state,
+)
+
+
+def _origin_model(origin):
+    if origin is None:
+        return None
+    return origin.model if isinstance(origin, QuerySet) else type(origin)
+
+
+def _sync_submission(submission):
+    sync_submission_state(submission.student_id, submission.assignment.mission_id)
+
+
+@receiver([post_save, post_delete], sender='missions.MissionSubmission')
+def sync_catalog_on_submission(sender, instance, origin=None, **kwargs):
+    """Submissions and reviews change the status of one catalog row."""
+    from .models import Mission
+    # Deleting the student or the mission removes the catalog rows themselves
+    if _origin_model(origin) in (get_user_model(), Mission):
+        return
+    _sync_submission(instance)
+
+
+@receiver([post_save, post_delete], sender='missions.AIFeedback')
+@receiver([post_save, post_delete], sender='missions.MissionArtifact')
+def sync_catalog_on_review_output(sender, instance, origin=None, **kwargs):
+    # Rows removed along with their submission are covered by the submission's signal
+    if origin is not None and _origin_model(origin) is not sender:
+        return
+    _sync_submission(instance.submission)
+
+
+@receiver([post_save, post_delete], sender='missions.MissionAssignment')
+def stale_catalogs_on_assignment(sender, instance, **kwargs):
+    if instance.assignment_type == 'cohort' and instance.cohort_id:
+        mark_cohort_catalogs_stale(instance.cohort_id)
+
+
+@receiver(post_save, sender='missions.Mission')
+def stale_catalogs_on_mission(sender, instance, **kwargs):
+    """A mission edit can change eligibility or lock state for the students it reaches."""
+    # A deleted mission's rows cascade away, and no other row's lock state depends on it
+    mark_mission_catalogs_stale(instance)
+
+
+@receiver([post_save, post_delete], sender='programs.Enrollment')
+def stale_catalog_on_enrollment(sender, instance, **kwargs):
+    mark_catalogs_stale(student__id=instance.user_id)
+
+
+@receiver(post_save, sender='curriculum.UserTrackProgress')
+def stale_catalog_on_track_progress(sender, instance, update_fields=None, **kwargs):
+    """Points and tier completion flags drive lock state."""
+    if update_fields is not None and not LOCK_FIELDS.intersection(update_fields):
+        return
+    mark_catalogs_stale(student__id=instance.user_id)
@@ -13,6 +13,7 @@ from .models_mentorship_interaction import MentorshipInteraction
 from .models_capstone import CapstoneProject
 from .models import Mission
 from users.models import User
+from users.utils.identity_snapshot import get_user_role_names
 
 
 @api_view(['POST'])
@@ -25,7 +26,7 @@ def create_mentorship_interaction(request):
     user = request.user
     
     # Verify user is a mentor
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)] if hasattr(user, 'user_roles') else []
+    user_roles = get_user_role_names(user)
     if 'mentor' not in user_roles and not user.is_staff:
         return Response({'error': 'Only mentors can create interactions'}, status=status.HTTP_403_FORBIDDEN)
     
@@ -311,7 +312,7 @@ def list_mentorship_interactions(request):
     user = request.user
     
     # Determine role
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)] if hasattr(user, 'user_roles') else []
+    user_roles = get_user_role_names(user)
     is_mentor = 'mentor' in user_roles or user.is_staff
     
     role = request.query_params.get('role')
@@ -22,6 +22,7 @@ from .tasks import process_mission_ai_review
 from student_dashboard.services import DashboardAggregationService
 from dashboard.models import PortfolioItem
 from talentscope.models import SkillSignal
+from users.utils.identity_snapshot import get_user_role_names
 import logging
 
 logger = logging.getLogger(__name__)
@@ -960,7 +961,7 @@ def mission_performance_analytics(request):
     user = request.user
     
     # Check if user is admin or has analytics permissions
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(user)
     is_admin = 'admin' in user_roles or user.is_staff
     
     if not is_admin:
@@ -1059,7 +1060,7 @@ def mission_completion_heatmap(request):
     user = request.user
     
     # Check if user is admin
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(user)
     is_admin = 'admin' in user_roles or user.is_staff
     
     if not is_admin:
@@ -1106,7 +1107,7 @@ def enterprise_mission_analytics(request, cohort_id=None):
     user = request.user
     
     # Check if user is admin, director, or has enterprise access
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(user)
     is_admin = 'admin' in user_roles or user.is_staff
     is_director = 'director' in user_roles
     
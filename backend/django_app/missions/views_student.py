@@ -4,7 +4,7 @@ Implements complete MXP specification.
 """
 from datetime import datetime, timedelta
 from django.utils import timezone
-from django.db.models import Q, Count, Avg, F
+from django.db.models import Count, Avg, F
 from django.db import transaction
 from django.core.exceptions import ObjectDoesNotExist
 from rest_framework import status
@@ -22,6 +22,9 @@ from .serializers import (
 from subscriptions.utils import get_user_tier
 from subscriptions.models import UserSubscription, SubscriptionPlan
 from .tasks import process_mission_ai_review
+from .visibility import (
+    InvalidCursor, ensure_student_catalog, page_after, student_mission_states,
+)
 from student_dashboard.services import DashboardAggregationService
 from django.core.cache import cache
 from .services import upload_file_to_storage, generate_presigned_upload_url
@@ -171,173 +174,35 @@ def list_student_missions(request):
     track_filter = request.query_params.get('track', 'all')
     tier_filter = request.query_params.get('tier', 'all')
     search = request.query_params.get('search', '').strip()
-    recommended = request.query_params.get('recommended', 'false').lower() == 'true'
-    urgent = request.query_params.get('urgent', 'false').lower() == 'true'
-
-    # --- Student context: cohorts and track ---
-    try:
-        enrollments = Enrollment.objects.filter(user=user, status='active').select_related('cohort', 'cohort__track')
-        cohort_ids = list(enrollments.values_list('cohort_id', flat=True))
-        enrollment = enrollments.first()
-        student_track_raw = getattr(user, 'track_key', None) or (enrollment.track_key if enrollment and getattr(enrollment, 'track_key', None) else None)
-    except Exception:
-        cohort_ids = []
-        enrollment = None
-        student_track_raw = None
-
-    # Normalize student track to mission track (defender, offensive, grc, innovation, leadership)
-    def normalize_track(key):
-        if not key:
-            return None
-        k = (key or '').strip().lower()
-        if k in ('cyber_defense', 'defensive-security', 'defender'):
-            return 'defender'
-        if k in ('offensive', 'grc', 'innovation', 'leadership'):
-            return k
-        return k if k in ('defender', 'offensive', 'grc', 'innovation', 'leadership') else None
-
-    student_track = normalize_track(student_track_raw)
-
-    # Mission IDs assigned to the student's cohort(s)
-    from .models import MissionAssignment
-    assigned_mission_ids = set(
-        MissionAssignment.objects.filter(
-            assignment_type='cohort',
-            cohort_id__in=cohort_ids
-        ).values_list('mission_id', flat=True)
-    ) if cohort_ids else set()
-
-    # Base queryset: missions that are (a) assigned to student's cohort(s) OR (b) in student's track OR (c) no track set (show to all)
-    missions = Mission.objects.filter(is_active=True)
-    if assigned_mission_ids or student_track:
-        q = Q()
-        if assigned_mission_ids:
-            q |= Q(id__in=assigned_mission_ids)
-        if student_track:
-            q |= Q(track=student_track)
-        # Missions with no track set appear for everyone (e.g. unassigned-to-track missions from director)
-        q |= Q(track__isnull=True)
-        missions = missions.filter(q).distinct()
-    else:
-        # No cohort and no track: show all active missions (lock by track later)
-        pass
-
-    # Optional explicit difficulty filter (do not restrict by profiler when showing by cohort/track)
-    if difficulty_filter != 'all':
-        try:
-            missions = missions.filter(difficulty=int(difficulty_filter))
-        except (ValueError, TypeError):
-            pass
-
-    if track_filter != 'all':
-        missions = missions.filter(track__isnull=False, track=track_filter)
-
-    if tier_filter != 'all':
-        missions = missions.filter(tier__isnull=False, tier=tier_filter)
-
-    if search:
-        missions = missions.filter(
-            Q(title__icontains=search) |
-            Q(code__icontains=search) |
-            Q(description__icontains=search)
-        )
-
-    # Get user submissions to add status
-    user_submissions = {
-        str(sub.assignment.mission_id): sub
-        for sub in MissionSubmission.objects.filter(student=user).select_related('assignment__mission')
-    }
+    cursor = request.query_params.get('cursor')
+
+    # Eligible missions, statuses and lock states come from the student's materialized
+    # catalog (rebuilt here only if an event has marked it stale)
+    ensure_student_catalog(user)
+    states = student_mission_states(
+        user,
+        status=status_filter,
+        difficulty=difficulty_filter,
+        track=track_filter,
+        tier=tier_filter,
+        search=search,
+    )
 
-    # Filter by status if needed (before pagination)
-    if status_filter != 'all':
-        mission_ids_by_status = []
-        for mission in missions:
-            submission = user_submissions.get(str(mission.id))
-            mission_status = submission.status if submission else 'not_started'
-            if mission_status == status_filter:
-                mission_ids_by_status.append(mission.id)
-        missions = missions.filter(id__in=mission_ids_by_status)
-
-    # Pagination
+    # Pagination: keyset via ?cursor=, with ?page= kept for existing clients
     page = int(request.query_params.get('page', 1))
     page_size = int(request.query_params.get('page_size', 20))
-    offset = (page - 1) * page_size
-
-    total_count = missions.count()
-    missions_page = missions[offset:offset + page_size]
-
-    # Curriculum progress per track (for tier-based locking and points)
-    from curriculum.models import CurriculumTrack, UserTrackProgress
-    track_progress_by_slug = {}
-    all_user_progress = []
-    if user:
-        # Fetch ALL UserTrackProgress for this user so points are consistent with sidebar
-        all_user_progress = list(
-            UserTrackProgress.objects.filter(user=user).select_related('track')
-        )
-        # Build lookup by slug for tier locking (mission.track matches CurriculumTrack.slug or .code)
-        track_slugs = set()
-        for m in missions_page:
-            if m.track:
-                track_slugs.add(m.track)
-        if student_track:
-            track_slugs.add(student_track)
-        if track_slugs:
-            curriculum_tracks = CurriculumTrack.objects.filter(
-                Q(slug__in=track_slugs) | Q(code__in=track_slugs)
-            )
-            for ct in curriculum_tracks:
-                prog = next((p for p in all_user_progress if p.track_id == ct.id), None)
-                if prog:
-                    track_progress_by_slug[ct.slug] = prog
-                    track_progress_by_slug[ct.code] = prog
-
-    track_names = {
-        'defender': 'Defender',
-        'offensive': 'Offensive',
-        'grc': 'GRC',
-        'innovation': 'Innovation',
-        'leadership': 'Leadership',
-    }
+    total_count = states.count()
+    try:
+        if cursor or page <= 1:
+            page_states, next_cursor = page_after(states, cursor, page_size)
+        else:
+            page_states, next_cursor = page_after(states[(page - 1) * page_size:], None, page_size)
+    except InvalidCursor:
+        return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
 
-    # Build response with submission status and tier-based lock
     results = []
-    for mission in missions_page:
-        submission = user_submissions.get(str(mission.id))
-
-        is_locked = False
-        lock_reason = None
-
-        # Lock if mission is for a different track (when student has a track and mission has a track)
-        if student_track and mission.track and mission.track != student_track:
-            is_locked = True
-            lock_reason = f"This mission is for the {track_names.get(mission.track, mission.track)} track."
-        # Lock by points: mission requires_points and user hasn't attained points_required (from primary track progress)
-        elif getattr(mission, 'requires_points', False) and mission.points_required is not None and not is_locked:
-            # Use primary track points (mission's track or student's track) — matches sidebar Track Progress
-            track_for_points = mission.track or student_track
-            prog = track_progress_by_slug.get(track_for_points) if track_for_points else None
-            user_points = getattr(prog, 'total_points', 0) or 0 if prog else 0
-            if user_points < mission.points_required:
-                is_locked = True
-                lock_reason = f"Earn {mission.points_required - user_points} more points (from curriculum progress) to unlock. You have {user_points}/{mission.points_required}."
-        # Otherwise lock by tier: intermediate -> need beginner done; advanced -> need intermediate; mastery -> need advanced
-        elif mission.tier and not is_locked:
-            # Use mission track for progress; if mission has no track, use student's track so level locking still applies
-            prog = track_progress_by_slug.get(mission.track) if mission.track else (track_progress_by_slug.get(student_track) if student_track else None)
-            if mission.tier == 'intermediate':
-                if not (prog and getattr(prog, 'tier2_completion_requirements_met', False)):
-                    is_locked = True
-                    lock_reason = f"Complete Beginner level in {track_names.get(mission.track, mission.track or 'this')} track to unlock."
-            elif mission.tier == 'advanced':
-                if not (prog and getattr(prog, 'tier3_completion_requirements_met', False)):
-                    is_locked = True
-                    lock_reason = f"Complete Intermediate level in {track_names.get(mission.track, mission.track or 'this')} track to unlock."
-            elif mission.tier in ('mastery', 'capstone'):
-                if not (prog and (getattr(prog, 'tier4_completion_requirements_met', False) or getattr(prog, 'tier5_completion_requirements_met', False))):
-                    is_locked = True
-                    lock_reason = f"Complete Advanced level in {track_names.get(mission.track, mission.track or 'this')} track to unlock."
-
+    for state in page_states:
+        mission = state.mission
         # Expose only human-readable code for display; do not expose UUID as "code" on student-facing cards
         display_code = mission.code if (mission.code and mission.code != str(mission.id)) else None
         mission_data = {
@@ -353,50 +218,31 @@ def list_student_missions(request):
             'track': mission.track,
             'tier': mission.tier,
             'requirements': {},
-            'is_locked': is_locked,
-            'lock_reason': lock_reason,
+            'is_locked': state.is_locked,
+            'lock_reason': state.lock_reason,
+            'status': state.status,
+            'progress_percent': 0,
         }
-        
-        if submission:
-            mission_data['status'] = submission.status
-            mission_data['progress_percent'] = 0
-
-            # Get AI score from AIFeedback if exists
-            try:
-                ai_feedback_obj = AIFeedback.objects.filter(submission=submission).first()
-                mission_data['ai_score'] = float(ai_feedback_obj.score) if ai_feedback_obj and ai_feedback_obj.score else None
-
-                # AI feedback summary
-                if ai_feedback_obj:
-                    mission_data['ai_feedback'] = {
-                        'score': float(ai_feedback_obj.score) if ai_feedback_obj.score else None,
-                        'strengths': ai_feedback_obj.strengths[:3] if ai_feedback_obj.strengths else [],
-                        'gaps': ai_feedback_obj.improvements[:3] if ai_feedback_obj.improvements else [],
-                    }
-            except Exception:
-                mission_data['ai_score'] = None
 
-            mission_data['submission_id'] = str(submission.id)
-
-            # Count artifacts
-            from missions.models import MissionArtifact
-            artifacts = MissionArtifact.objects.filter(submission=submission)
-            mission_data['artifacts_uploaded'] = artifacts.count()
+        if state.submission_id:
+            mission_data['ai_score'] = float(state.ai_score) if state.ai_score else None
+            if state.ai_feedback:
+                mission_data['ai_feedback'] = state.ai_feedback
+            mission_data['submission_id'] = str(state.submission_id)
+            mission_data['artifacts_uploaded'] = state.artifacts_uploaded
             mission_data['artifacts_required'] = 0  # requirements field doesn't exist yet
-        else:
-            mission_data['status'] = 'not_started'
-            mission_data['progress_percent'] = 0
-        
+
         results.append(mission_data)
-    
+
     return Response({
         'results': results,
         'count': len(results),
         'total': total_count,
         'page': page,
         'page_size': page_size,
-        'has_next': offset + page_size < total_count,
-        'has_previous': page > 1,
+        'next_cursor': next_cursor,
+        'has_next': next_cursor is not None,
+        'has_previous': bool(cursor) or page > 1,
     }, status=status.HTTP_200_OK)
 
 
@@ -0,0 +1,373 @@
+"""
+Mission visibility engine: a materialized per-student mission catalog.
+
+list_student_missions used to work out, on every request, which missions a student can
+see (cohort assignments, track, untracked missions), their latest submission status,
+lock state and reason (track, points_required, tier flags on UserTrackProgress), AI
+score and artifact count - iterating the whole catalog in Python for status filters and
+running two queries per page row.
+
+Here that work happens once per student and is stored in StudentMissionState, one row
+per eligible mission, with StudentMissionCatalog as the header. Pages are then a
+filtered, keyset-paginated read of the student's rows joined to Mission.
+
+Freshness is event driven (missions/signals.py):
+- submission, AI feedback and artifact writes patch the one affected row in place;
+- assignment, enrollment, mission and curriculum-progress changes bump the version of
+  the catalogs they can affect (a mission edit only its track's, its cohorts' and
+  those already listing it), and the next read rebuilds the whole catalog with a
+  fixed number of set-based queries.
+"""
+
+import base64
+import json
+import logging
+from datetime import datetime
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+UPSERT_BATCH_SIZE = 500
+
+TRACK_NAMES = {
+    'defender': 'Defender',
+    'offensive': 'Offensive',
+    'grc': 'GRC',
+    'innovation': 'Innovation',
+    'leadership': 'Leadership',
+}
+
+# UserTrackProgress fields that can change a lock state
+LOCK_FIELDS = frozenset({
+    'track', 'track_id', 'total_points',
+    'tier2_completion_requirements_met', 'tier3_completion_requirements_met',
+    'tier4_completion_requirements_met', 'tier5_completion_requirements_met',
+})
+
+STATE_FIELDS = [
+    'mission_created_at', 'status', 'submission', 'is_locked', 'lock_reason',
+    'ai_score', 'ai_feedback', 'artifacts_uploaded', 'updated_at',
+]
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def normalize_track(key):
+    """Map a student track key to a mission track (defender, offensive, grc, innovation, leadership)."""
+    if not key:
+        return None
+    k = (key or '').strip().lower()
+    if k in ('cyber_defense', 'defensive-security', 'defender'):
+        return 'defender'
+    if k in ('offensive', 'grc', 'innovation', 'leadership'):
+        return k
+    return None
+
+
+# Lock state ----------------------------------------------------------------
+
+def lock_state(mission, student_track, progress_by_track):
+    """
+    Return (is_locked, lock_reason) for a mission.
+
+    Missions for another track are locked; otherwise points_required is checked
+    against the track's curriculum points, then the mission tier against the
+    previous level's completion flag.
+    """
+    if student_track and mission.track and mission.track != student_track:
+        return True, f"This mission is for the {TRACK_NAMES.get(mission.track, mission.track)} track."
+
+    track_label = TRACK_NAMES.get(mission.track, mission.track or 'this')
+    if getattr(mission, 'requires_points', False) and mission.points_required is not None:
+        track_for_points = mission.track or student_track
+        prog = progress_by_track.get(track_for_points) if track_for_points else None
+        user_points = (prog.total_points or 0) if prog else 0
+        if user_points < mission.points_required:
+            return True, (
+                f"Earn {mission.points_required - user_points} more points (from curriculum progress) to unlock. "
+                f"You have {user_points}/{mission.points_required}."
+            )
+        return False, None
+
+    if mission.tier:
+        prog = progress_by_track.get(mission.track or student_track) if (mission.track or student_track) else None
+        if mission.tier == 'intermediate':
+            if not (prog and prog.tier2_completion_requirements_met):
+                return True, f"Complete Beginner level in {track_label} track to unlock."
+        elif mission.tier == 'advanced':
+            if not (prog and prog.tier3_completion_requirements_met):
+                return True, f"Complete Intermediate level in {track_label} track to unlock."
+        elif mission.tier in ('mastery', 'capstone'):
+            if not (prog and (prog.tier4_completion_requirements_met or prog.tier5_completion_requirements_met)):
+                return True, f"Complete Advanced level in {track_label} track to unlock."
+    return False, None
+
+
+# Building ------------------------------------------------------------------
+
+def _student_context(user):
+    """Active cohort ids and the normalized mission track for a student."""
+    from programs.models import Enrollment
+    enrollments = list(
+        Enrollment.objects.filter(user=user, status='active').values_list('cohort_id', 'cohort__track__key')
+    )
+    cohort_ids = [cohort_id for cohort_id, _ in enrollments]
+    enrollment_track = enrollments[0][1] if enrollments else None
+    return cohort_ids, normalize_track(getattr(user, 'track_key', None) or enrollment_track)
+
+
+def _eligible_missions(student_track, cohort_ids):
+    """Active missions assigned to the student's cohorts, in their track, or with no track."""
+    from .models import Mission, MissionAssignment
+    missions = Mission.objects.filter(is_active=True)
+    if cohort_ids or student_track:
+        q = Q(track__isnull=True)
+        if cohort_ids:
+            q |= Q(id__in=MissionAssignment.objects.filter(
+                assignment_type='cohort', cohort_id__in=cohort_ids,
+            ).values('mission_id'))
+        if student_track:
+            q |= Q(track=student_track)
+        missions = missions.filter(q)
+    return missions
+
+
+def _progress_by_track(user):
+    from curriculum.models import UserTrackProgress
+    progress = {}
+    for prog in UserTrackProgress.objects.filter(user=user).select_related('track'):
+        progress[prog.track.slug] = prog
+        progress[prog.track.code] = prog
+    return progress
+
+
+def _submission_states(student_uuid, mission_ids=None):
+    """
+    Latest submission per mission for a student, with its AI feedback summary and
+    artifact count: {mission_id: {...}}, in three queries.
+    """
+    from .models import AIFeedback, MissionArtifact, MissionSubmission
+
+    submissions = MissionSubmission.objects.filter(student_id=student_uuid)
+    if mission_ids is not None:
+        submissions = submissions.filter(assignment__mission_id__in=mission_ids)
+    latest = {}
+    for sub_id, mission_id, sub_status in (
+        submissions.order_by('created_at', 'id').values_list('id', 'assignment__mission_id', 'status')
+    ):
+        latest[mission_id] = {'submission_id': sub_id, 'status': sub_status}
+    if not latest:
+        return latest
+
+    by_submission = {state['submission_id']: state for state in latest.values()}
+    for feedback in (
+        AIFeedback.objects.filter(submission_id__in=list(by_submission))
+        .order_by('-generated_at')
+        .only('submission_id', 'score', 'strengths', 'improvements')
+    ):
+        state = by_submission[feedback.submission_id]
+        if 'ai_feedback' in state:
+            continue
+        score = float(feedback.score) if feedback.score else None
+        state['ai_score'] = feedback.score if feedback.score else None
+        state['ai_feedback'] = {
+            'score': score,
+            'strengths': feedback.strengths[:3] if feedback.strengths else [],
+            'gaps': feedback.improvements[:3] if feedback.improvements else [],
+        }
+
+    artifact_counts = (
+        MissionArtifact.objects.filter(submission_id__in=list(by_submission))
+        .values('submission_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    for row in artifact_counts:
+        by_submission[row['submission_id']]['artifacts_uploaded'] = row['count']
+    return latest
+
+
+def _state_fields(sub_state):
+    if sub_state is None:
+        return {
+            'status': 'not_started', 'submission_id': None, 'ai_score': None,
+            'ai_feedback': None, 'artifacts_uploaded': 0,
+        }
+    return {
+        'status': sub_state['status'],
+        'submission_id': sub_state['submission_id'],
+        'ai_score': sub_state.get('ai_score'),
+        'ai_feedback': sub_state.get('ai_feedback'),
+        'artifacts_uploaded': sub_state.get('artifacts_uploaded', 0),
+    }
+
+
+def get_catalog(user):
+    from .models import StudentMissionCatalog
+    catalog, _ = StudentMissionCatalog.objects.get_or_create(student=user)
+    return catalog
+
+
+def needs_rebuild(catalog, user):
+    return catalog.is_stale or catalog.track_key_seen != (getattr(user, 'track_key', None) or None)
+
+
+def rebuild_student_catalog(user, catalog=None):
+    """Recompute every StudentMissionState row for a student, set-based."""
+    from .models import StudentMissionCatalog, StudentMissionState
+
+    catalog = catalog or get_catalog(user)
+    version = catalog.version
+    cohort_ids, student_track = _student_context(user)
+    missions = list(_eligible_missions(student_track, cohort_ids).only(
+        'id', 'created_at', 'track', 'tier', 'requires_points', 'points_required',
+    ))
+    progress = _progress_by_track(user)
+    submissions = _submission_states(user.uuid_id)
+
+    now = timezone.now()
+    rows = []
+    for mission in missions:
+        is_locked, lock_reason = lock_state(mission, student_track, progress)
+        rows.append(StudentMissionState(
+            student=user,
+            mission_id=mission.id,
+            mission_created_at=mission.created_at,
+            is_locked=is_locked,
+            lock_reason=lock_reason,
+            updated_at=now,
+            **_state_fields(submissions.get(mission.id)),
+        ))
+
+    with transaction.atomic():
+        StudentMissionState.objects.filter(student=user).exclude(
+            mission_id__in=[mission.id for mission in missions]
+        ).delete()
+        StudentMissionState.objects.bulk_create(
+            rows,
+            batch_size=UPSERT_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['student', 'mission'],
+            update_fields=STATE_FIELDS,
+        )
+        StudentMissionCatalog.objects.filter(pk=catalog.pk).update(
+            built_version=version,
+            track_key_seen=getattr(user, 'track_key', None) or None,
+            student_track=student_track,
+            refreshed_at=now,
+        )
+    catalog.built_version = version
+    catalog.track_key_seen = getattr(user, 'track_key', None) or None
+    catalog.student_track = student_track
+    catalog.refreshed_at = now
+    return catalog
+
+
+def ensure_student_catalog(user):
+    catalog = get_catalog(user)
+    if needs_rebuild(catalog, user):
+        catalog = rebuild_student_catalog(user, catalog)
+    return catalog
+
+
+# Events --------------------------------------------------------------------
+
+def sync_submission_state(student_uuid, mission_id):
+    """Patch status, AI score and artifact count of one row after a submission-side write."""
+    from .models import StudentMissionState
+    fields = _state_fields(_submission_states(student_uuid, [mission_id]).get(mission_id))
+    StudentMissionState.objects.filter(student_id=student_uuid, mission_id=mission_id).update(
+        updated_at=timezone.now(), **fields
+    )
+
+
+def mark_catalogs_stale(**filters):
+    """Bump the catalog version for matching students (all of them with no filters)."""
+    from .models import StudentMissionCatalog
+    return StudentMissionCatalog.objects.filter(**filters).update(version=F('version') + 1)
+
+
+def mark_cohort_catalogs_stale(cohort_id):
+    from programs.models import Enrollment
+    return mark_catalogs_stale(student__id__in=Enrollment.objects.filter(cohort_id=cohort_id).values('user_id'))
+
+
+def mark_mission_catalogs_stale(mission):
+    """
+    Bump the catalogs a mission edit can change: students who already have a row for it,
+    students in its track or without one (they see every track), and students in cohorts
+    it is assigned to. Missions with no track are visible to everyone.
+    """
+    from programs.models import Enrollment
+    from .models import MissionAssignment, StudentMissionCatalog
+
+    if not mission.track:
+        return mark_catalogs_stale()
+    assigned_cohorts = MissionAssignment.objects.filter(
+        mission_id=mission.pk, assignment_type='cohort', cohort_id__isnull=False,
+    ).values('cohort_id')
+    scope = (
+        Q(student_track=mission.track) | Q(student_track__isnull=True) |
+        Q(student__mission_states__mission_id=mission.pk) |
+        Q(student__id__in=Enrollment.objects.filter(cohort_id__in=assigned_cohorts).values('user_id'))
+    )
+    catalog_ids = StudentMissionCatalog.objects.filter(scope).values('pk')
+    return mark_catalogs_stale(pk__in=catalog_ids)
+
+
+# Reading -------------------------------------------------------------------
+
+def encode_cursor(state):
+    raw = json.dumps([state.mission_created_at.isoformat(), str(state.mission_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, mission_id = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+        return datetime.fromisoformat(created_at), mission_id
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e))
+
+
+def student_mission_states(user, status='all', difficulty='all', track='all', tier='all', search=''):
+    """Filtered StudentMissionState queryset for a student, in catalog order."""
+    from .models import StudentMissionState
+
+    states = StudentMissionState.objects.filter(student=user, mission__is_active=True)
+    if status != 'all':
+        states = states.filter(status=status)
+    if difficulty != 'all':
+        try:
+            states = states.filter(mission__difficulty=int(difficulty))
+        except (ValueError, TypeError):
+            pass
+    if track != 'all':
+        states = states.filter(mission__track=track)
+    if tier != 'all':
+        states = states.filter(mission__tier=tier)
+    if search:
+        states = states.filter(
+            Q(mission__title__icontains=search) |
+            Q(mission__code__icontains=search) |
+            Q(mission__description__icontains=search)
+        )
+    return states.select_related('mission').order_by('-mission_created_at', '-mission_id')
+
+
+def page_after(states, cursor, page_size):
+    """Keyset page: (rows, next_cursor). Raises InvalidCursor for a malformed cursor."""
+    if cursor:
+        created_at, mission_id = decode_cursor(cursor)
+        states = states.filter(
+            Q(mission_created_at__lt=created_at) |
+            Q(mission_created_at=created_at, mission_id__lt=mission_id)
+        )
+    rows = list(states[:page_size + 1])
+    next_cursor = encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+    return rows[:page_size], next_cursor
@@ -16,6 +16,7 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from users.utils.identity_snapshot import get_user_role_names
 from .models import ProfilerSession
 
 
@@ -23,7 +24,7 @@ def _is_admin_or_analyst(user) -> bool:
     """
     Helper for analytics access: admin or analyst role (read-only for analyst).
     """
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(user)
     return user.is_staff or "admin" in user_roles or "analyst" in user_roles
 
 
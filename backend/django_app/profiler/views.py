@@ -23,6 +23,7 @@ from .serializers import (
 )
 from .session_manager import session_manager
 from student_dashboard.services import DashboardAggregationService
+from users.utils.identity_snapshot import get_user_role_names
 
 logger = logging.getLogger(__name__)
 
@@ -1230,7 +1231,7 @@ def get_future_you_by_mentee(request, mentee_id):
         )
     
     # Check permissions - user can view their own data, or if they're a mentor assigned to this mentee
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_analyst = 'analyst' in user_roles
     is_admin = 'admin' in user_roles
     is_mentor = request.user.is_mentor
@@ -1315,7 +1316,7 @@ def get_mentee_profiler_results(request, mentee_id):
         )
     
     # Check permissions - user can view their own data, or if they're a mentor/coach/admin assigned to this mentee
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_analyst = 'analyst' in user_roles
     is_admin = 'admin' in user_roles or request.user.is_staff
     is_mentor = request.user.is_mentor
@@ -1475,7 +1476,7 @@ def get_cohort_profiler_analytics(request, cohort_id):
     Get profiler analytics for a cohort (admin/director only).
     """
     # Check permissions
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_admin = 'admin' in user_roles or request.user.is_staff
     is_director = 'director' in user_roles
     
@@ -1605,7 +1606,7 @@ def get_enterprise_profiler_analytics(request):
     Query params: ?sponsor_id={id}&cohort_id={id}&date_from={date}&date_to={date}
     """
     # Check admin permissions
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_admin = 'admin' in user_roles or request.user.is_staff
     
     if not is_admin:
@@ -1917,7 +1918,7 @@ def admin_reset_profiler(request, user_id):
     Admin-only: Reset a user's profiler session to allow retake.
     """
     # Check admin permissions
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_admin = 'admin' in user_roles or request.user.is_staff
     
     if not is_admin:
@@ -1979,7 +1980,7 @@ def admin_adjust_scores(request, session_id):
     }
     """
     # Check admin permissions
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_admin = 'admin' in user_roles or request.user.is_staff
     
     if not is_admin:
@@ -2175,7 +2176,7 @@ def list_retake_requests(request):
     List all retake requests (admin only).
     """
     # Check if user is admin
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_admin = request.user.is_staff or 'admin' in user_roles
     
     if not is_admin:
@@ -2224,7 +2225,7 @@ def approve_retake_request(request, request_id):
     Approve a retake request (admin only).
     """
     # Check if user is admin
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_admin = request.user.is_staff or 'admin' in user_roles
     
     if not is_admin:
@@ -2285,7 +2286,7 @@ def reject_retake_request(request, request_id):
     Reject a retake request (admin only).
     """
     # Check if user is admin
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_admin = request.user.is_staff or 'admin' in user_roles
     
     if not is_admin:
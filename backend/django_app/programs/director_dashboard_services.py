@@ -9,6 +9,7 @@ from datetime import timedelta
 from programs.models import Program, Track, Cohort, Enrollment, CalendarEvent, MentorAssignment
 from programs.director_dashboard_models import DirectorDashboardCache, DirectorCohortDashboard
 from django.contrib.auth import get_user_model
+from talentscope.readiness import average_readiness
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -93,8 +94,10 @@ class DirectorDashboardAggregationService:
             if completion_rates else 0
         )
         
-        # Mock readiness scores (should come from TalentScope)
-        avg_readiness_score = 65.0  # TODO: Aggregate from student_dashboard_cache
+        # Latest TalentScope readiness snapshot of each active student
+        avg_readiness_score = average_readiness(
+            Enrollment.objects.filter(cohort__in=cohorts, status='active')
+        ) or 0.0
         
         # Mock portfolio health (should come from Portfolio Engine)
         avg_portfolio_health = 70.0  # TODO: Aggregate from portfolio data
@@ -238,7 +241,7 @@ class DirectorDashboardAggregationService:
             mentor_session_completion_pct = 85.0  # TODO: From Mentorship OS
             
             # Talent metrics
-            readiness_avg = 65.0  # TODO: From TalentScope
+            readiness_avg = average_readiness(enrollments.filter(status='active')) or 0.0
             completion_pct = cohort.completion_rate or 0
             portfolio_health_avg = 70.0  # TODO: From Portfolio Engine
             mission_approval_time_avg = None  # TODO: From Missions MXP
@@ -14,6 +14,7 @@ from programs.models import (
     CalendarEvent, ProgramRule, Certificate, Waitlist
 )
 from progress.models import Progress
+from talentscope.readiness import readiness_scores as latest_readiness_scores
 from users.models import User
 
 logger = logging.getLogger(__name__)
@@ -434,11 +435,8 @@ class DirectorService:
         """Get cohort readiness dashboard data."""
         enrollments = Enrollment.objects.filter(cohort=cohort, status='active')
         
-        # Calculate readiness scores (mock - should come from TalentScope)
-        readiness_scores = []
-        for enrollment in enrollments:
-            # Mock readiness score (0-100)
-            readiness_scores.append(75.0)  # TODO: Get from TalentScope
+        # Latest TalentScope readiness per student; students without a snapshot yet are left out
+        readiness_scores = [score for score in latest_readiness_scores(enrollments) if score is not None]
         
         avg_readiness = sum(readiness_scores) / len(readiness_scores) if readiness_scores else 0
         
@@ -12,6 +12,7 @@ from django.utils import timezone
 from django.utils.text import slugify
 
 from .models import Recipe, UserRecipeProgress, RecipeContextLink, UserRecipeBookmark, RecipeSource, RecipeLLMJob
+from users.utils.identity_snapshot import get_user_role_names
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from .serializers import (
@@ -595,7 +596,7 @@ def recipe_effectiveness_analytics(request):
     user = request.user
     
     # Check if user is admin
-    user_roles = [ur.role.name for ur in user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(user)
     is_admin = 'admin' in user_roles or user.is_staff
     
     if not is_admin:
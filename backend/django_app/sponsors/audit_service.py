@@ -5,6 +5,7 @@ Uses users.audit_models.AuditLog (metadata field; valid action types).
 """
 from django.utils import timezone
 from users.audit_models import AuditLog
+from users.utils.audit_buffer import write_audit_entry
 from .models import Sponsor, SponsorIntervention
 
 
@@ -30,7 +31,7 @@ class SponsorAuditService:
         if additional_data:
             data.update(additional_data)
         try:
-            AuditLog.objects.create(
+            write_audit_entry(AuditLog(
                 user=user,
                 actor_type="user",
                 actor_identifier=_actor_identifier(user),
@@ -39,7 +40,7 @@ class SponsorAuditService:
                 resource_id=str(sponsor.id),
                 metadata=data,
                 timestamp=timezone.now(),
-            )
+            ))
         except Exception:
             pass
 
@@ -55,7 +56,7 @@ class SponsorAuditService:
             "export_timestamp": timezone.now().isoformat(),
         }
         try:
-            AuditLog.objects.create(
+            write_audit_entry(AuditLog(
                 user=user,
                 actor_type="user",
                 actor_identifier=_actor_identifier(user),
@@ -64,7 +65,7 @@ class SponsorAuditService:
                 resource_id=str(sponsor.id),
                 metadata=data,
                 timestamp=timezone.now(),
-            )
+            ))
         except Exception:
             pass
 
@@ -79,7 +80,7 @@ class SponsorAuditService:
             "deployment_timestamp": intervention.deployed_at.isoformat(),
         }
         try:
-            AuditLog.objects.create(
+            write_audit_entry(AuditLog(
                 user=user,
                 actor_type="user",
                 actor_identifier=_actor_identifier(user),
@@ -88,7 +89,7 @@ class SponsorAuditService:
                 resource_id=str(intervention.id),
                 metadata=data,
                 timestamp=timezone.now(),
-            )
+            ))
         except Exception:
             pass
 
@@ -105,7 +106,7 @@ class SponsorAuditService:
         if additional_data:
             data.update(SponsorAuditService.get_privacy_safe_data(additional_data))
         try:
-            AuditLog.objects.create(
+            write_audit_entry(AuditLog(
                 user=user,
                 actor_type="user",
                 actor_identifier=_actor_identifier(user),
@@ -114,7 +115,7 @@ class SponsorAuditService:
                 resource_id=str(cohort.id) if cohort else None,
                 metadata=data,
                 timestamp=timezone.now(),
-            )
+            ))
         except Exception:
             pass
 
@@ -123,7 +124,7 @@ class SponsorAuditService:
         """Log financial actions (invoices, refunds, payments) for full audit trail."""
         safe = SponsorAuditService.get_privacy_safe_data(metadata or {})
         try:
-            AuditLog.objects.create(
+            write_audit_entry(AuditLog(
                 user=user,
                 actor_type="user",
                 actor_identifier=_actor_identifier(user),
@@ -132,7 +133,7 @@ class SponsorAuditService:
                 resource_id=resource_id,
                 metadata={"event": action, **safe},
                 timestamp=timezone.now(),
-            )
+            ))
         except Exception:
             pass
 
@@ -153,7 +154,7 @@ class SponsorAuditService:
             "notes": student_cohort.notes,
         })
         try:
-            AuditLog.objects.create(
+            write_audit_entry(AuditLog(
                 user=user,
                 actor_type="user",
                 actor_identifier=_actor_identifier(user),
@@ -162,7 +163,7 @@ class SponsorAuditService:
                 resource_id=str(student_cohort.id),
                 metadata=data,
                 timestamp=timezone.now(),
-            )
+            ))
         except Exception:
             pass
 
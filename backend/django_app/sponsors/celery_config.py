@@ -0,0 +1,12 @@
+"""
+Celery configuration for sponsor periodic tasks.
+"""
+from celery.schedules import crontab
+
+SPONSORS_BEAT_SCHEDULE = {
+    'refresh-sponsor-cohort-scores': {
+        'task': 'sponsors.refresh_cohort_scores',
+        'schedule': crontab(minute='*/15'),  # Also rolls scores over to the new day
+        'options': {'expires': 15 * 60},
+    },
+}
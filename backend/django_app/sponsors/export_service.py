@@ -1,13 +1,35 @@
 """
 Export service for sponsor dashboard reports.
 Supports PDF, CSV, and PowerPoint formats.
+
+Report data comes from grouped queries over the sponsor's cohort enrollments and
+revenue-share (hire) records, with readiness and rank read from the cohort's current
+scoring snapshot (services.scoring_service):
+  - CSV is streamed row by row with StreamingHttpResponse, including the full student
+    roster read with a server-side iterator, so large cohorts never sit in memory.
+  - PDF and PPTX are rendered by a Celery worker (sponsors.tasks.render_sponsor_export_task)
+    into default_storage under a content-addressed name in the cohort's directory: a
+    hash of the cohort, its data version (cohort_version) and the format. Repeat
+    downloads of an unchanged cohort are served from storage; any data change, including
+    a rescore of the cohort's snapshot, yields a new name and a fresh render, which
+    deletes the artifact it supersedes.
 """
 import csv
+import hashlib
 import io
+import logging
 from datetime import datetime
-from django.http import HttpResponse
-from .models import Sponsor, SponsorCohort
-from . import services as sponsor_services
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Max, Q, Sum
+from django.http import FileResponse, StreamingHttpResponse
+
+from .models import RevenueShareTracking, Sponsor, SponsorCohort, SponsorStudentCohort
+from .services.scoring_service import CohortScoringService
+
+logger = logging.getLogger(__name__)
 
 # Optional imports for PDF/PPTX generation
 try:
@@ -27,199 +49,415 @@ try:
 except ImportError:
     PPTX_AVAILABLE = False
 
+# Bump when a report layout changes so cached artifacts are re-rendered
+REPORT_LAYOUT_VERSION = 1
+ARTIFACT_DIR = 'sponsor_exports'
+RENDER_LOCK_TTL = 10 * 60
+ROSTER_CHUNK_SIZE = 2000
+TOP_TALENT_LIMIT = 10
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'pdf': 'application/pdf',
+    'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
+}
+
+
+def active_cohort_for(sponsor: Sponsor):
+    """The sponsor's active cohort; cohorts belong to the Organization sharing the sponsor's slug."""
+    return (
+        SponsorCohort.objects.filter(organization__slug=sponsor.slug, is_active=True)
+        .select_related('organization')
+        .order_by(F('start_date').desc(nulls_last=True), 'name')
+        .first()
+    )
+
+
+# Report data ---------------------------------------------------------------
+
+def cohort_version(cohort: SponsorCohort) -> str:
+    """Fingerprint of everything a report for this cohort reads; changes whenever the data does."""
+    enrollments = SponsorStudentCohort.objects.filter(
+        sponsor_cohort__organization_id=cohort.organization_id,
+    ).aggregate(
+        count=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+        completion=Sum('completion_percentage'),
+        joined=Max('joined_at'),
+        completed=Max('completed_at'),
+        activity=Max('last_activity_at'),
+    )
+    hires = RevenueShareTracking.objects.filter(cohort__organization_id=cohort.organization_id).aggregate(
+        count=Count('id'), updated=Max('updated_at'),
+    )
+    # Readiness and rank come from the scoring snapshot, which changes with time as well as data
+    snapshot = cohort.score_snapshots.aggregate(version=Max('version'))['version']
+    parts = [REPORT_LAYOUT_VERSION, cohort.id, cohort.updated_at, snapshot]
+    parts += [enrollments[k] for k in sorted(enrollments)] + [hires[k] for k in sorted(hires)]
+    return hashlib.sha256('|'.join(str(p) for p in parts).encode()).hexdigest()
+
+
+def track_performance(cohort: SponsorCohort) -> list:
+    """Students, completion, time to complete, hires and salary per track across the sponsor's active cohorts."""
+    rows = (
+        SponsorStudentCohort.objects.filter(
+            sponsor_cohort__organization_id=cohort.organization_id, sponsor_cohort__is_active=True,
+        )
+        .values(track=F('sponsor_cohort__track_slug'))
+        .annotate(
+            students=Count('id', filter=Q(is_active=True)),
+            completion_rate=Avg('completion_percentage', filter=Q(is_active=True)),
+            avg_time=Avg(
+                ExpressionWrapper(F('completed_at') - F('joined_at'), output_field=DurationField()),
+                filter=Q(completed_at__isnull=False),
+            ),
+        )
+        .order_by('track')
+    )
+    hires = {
+        row['track']: row
+        for row in RevenueShareTracking.objects.filter(
+            cohort__organization_id=cohort.organization_id, cohort__is_active=True,
+        )
+        .values(track=F('cohort__track_slug'))
+        .annotate(hires=Count('id'), avg_salary=Avg('first_year_salary_kes'))
+        .order_by()
+    }
+    performance = []
+    for row in rows:
+        hired = hires.get(row['track'], {})
+        performance.append({
+            'track': row['track'],
+            'students': row['students'],
+            'completion_rate': round(float(row['completion_rate'] or 0), 1),
+            'avg_time_days': row['avg_time'].days if row['avg_time'] else None,
+            'hires': hired.get('hires', 0),
+            'avg_salary_kes': round(float(hired['avg_salary'])) if hired.get('avg_salary') else None,
+        })
+    return performance
+
+
+def top_talent(cohort: SponsorCohort, limit: int = TOP_TALENT_LIMIT, snapshot=None) -> list:
+    """Highest readiness scores in the cohort, from its current scoring snapshot."""
+    snapshot = snapshot or CohortScoringService.current_snapshot(cohort)
+    return CohortScoringService.ranked_students(snapshot, limit=limit)
+
+
+def build_report(cohort: SponsorCohort, snapshot=None) -> dict:
+    return {
+        'summary': {
+            'active_students': cohort.students_enrolled,
+            'completion_rate': cohort.completion_rate,
+            'track': cohort.track_slug,
+            'start_date': cohort.start_date,
+        },
+        'tracks': track_performance(cohort),
+        'top_talent': top_talent(cohort, snapshot=snapshot),
+    }
+
+
+def iter_roster(cohort: SponsorCohort, snapshot=None):
+    """Every enrollment in the cohort with its snapshot readiness, streamed from a server-side cursor."""
+    snapshot = snapshot or CohortScoringService.current_snapshot(cohort)
+    return (
+        snapshot.student_scores.order_by('student__email')
+        .values_list(
+            'student__first_name', 'student__last_name', 'student__email', 'enrollment__enrollment_status',
+            'enrollment__completion_percentage', 'readiness_score', 'enrollment__joined_at',
+            'enrollment__last_activity_at',
+        )
+        .iterator(chunk_size=ROSTER_CHUNK_SIZE)
+    )
+
+
+# CSV -----------------------------------------------------------------------
+
+class _Echo:
+    """File-like object whose write() hands the row back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_rows(sponsor: Sponsor, cohort: SponsorCohort):
+    snapshot = CohortScoringService.current_snapshot(cohort)
+    report = build_report(cohort, snapshot)
+    summary = report['summary']
+
+    yield ['Executive Summary']
+    yield ['Metric', 'Value']
+    yield ['Active Students', summary['active_students']]
+    yield ['Completion Rate', f"{summary['completion_rate']}%"]
+    yield []
+
+    yield ['Track Performance']
+    yield ['Track', 'Students', 'Completion Rate', 'Avg Time (days)', 'Hires', 'Avg Salary']
+    for row in report['tracks']:
+        yield [
+            row['track'].title(),
+            row['students'],
+            f"{row['completion_rate']}%",
+            row['avg_time_days'] if row['avg_time_days'] is not None else '',
+            row['hires'],
+            f"KES {row['avg_salary_kes']:,}" if row['avg_salary_kes'] else '',
+        ]
+    yield []
+
+    yield ['Top Talent']
+    yield ['Rank', 'Name', 'Email', 'Readiness Score', 'Completion %']
+    for talent in report['top_talent']:
+        yield [
+            talent['cohort_rank'],
+            talent['student_name'],
+            talent['student_email'],
+            talent['readiness_score'],
+            f"{talent['completion_percentage']}%"
+        ]
+    yield []
+
+    yield ['Students']
+    yield ['Name', 'Email', 'Status', 'Completion %', 'Readiness Score', 'Joined', 'Last Activity']
+    for first, last, email, enrollment_status, completion, readiness, joined, activity in iter_roster(cohort, snapshot):
+        yield [
+            f'{first} {last}'.strip(), email, enrollment_status, f'{completion}%', round(readiness, 1),
+            joined.date().isoformat() if joined else '', activity.isoformat() if activity else '',
+        ]
+
+
+# PDF / PPTX ----------------------------------------------------------------
+
+def render_pdf(sponsor: Sponsor, cohort: SponsorCohort, report: dict) -> bytes:
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    styles = getSampleStyleSheet()
+    story = []
+
+    # Title
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        spaceAfter=30,
+    )
+    story.append(Paragraph(f"{sponsor.name} Dashboard Report", title_style))
+    story.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
+    story.append(Spacer(1, 20))
+
+    # Executive Summary
+    story.append(Paragraph("Executive Summary", styles['Heading2']))
+    summary = report['summary']
+    summary_data = [
+        ['Metric', 'Value'],
+        ['Active Students', str(summary['active_students'])],
+        ['Completion Rate', f"{summary['completion_rate']}%"],
+        ['Track', summary['track'].title()],
+        ['Start Date', summary['start_date'].strftime('%B %Y') if summary['start_date'] else 'TBD'],
+    ]
+    summary_table = Table(summary_data)
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 14),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    story.append(summary_table)
+    story.append(Spacer(1, 20))
+
+    # Track Performance
+    story.append(Paragraph("Track Performance", styles['Heading2']))
+    track_data = [['Track', 'Students', 'Completion', 'Avg Days', 'Hires', 'Avg Salary']]
+    for row in report['tracks']:
+        track_data.append([
+            row['track'].title(),
+            str(row['students']),
+            f"{row['completion_rate']}%",
+            str(row['avg_time_days'] or '-'),
+            str(row['hires']),
+            f"KES {row['avg_salary_kes']:,}" if row['avg_salary_kes'] else '-',
+        ])
+    track_table = Table(track_data)
+    track_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    story.append(track_table)
+    story.append(Spacer(1, 20))
+
+    # Top Talent
+    story.append(Paragraph("Top Talent", styles['Heading2']))
+    talent_data = [['Rank', 'Name', 'Readiness Score', 'Completion %']]
+    for talent in report['top_talent']:
+        talent_data.append([
+            str(talent['cohort_rank']),
+            talent['student_name'],
+            str(talent['readiness_score']),
+            f"{talent['completion_percentage']}%"
+        ])
+    talent_table = Table(talent_data)
+    talent_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black)
+    ]))
+    story.append(talent_table)
+
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def render_pptx(sponsor: Sponsor, cohort: SponsorCohort, report: dict) -> bytes:
+    prs = Presentation()
+
+    # Title slide
+    slide = prs.slides.add_slide(prs.slide_layouts[0])
+    slide.shapes.title.text = f"{sponsor.name} Dashboard Report"
+    slide.placeholders[1].text = f"Cohort: {cohort.name}\nGenerated: {datetime.now().strftime('%B %d, %Y')}"
+
+    bullet_slide_layout = prs.slide_layouts[1]
+
+    # Executive Summary slide
+    slide = prs.slides.add_slide(bullet_slide_layout)
+    slide.shapes.title.text = 'Executive Summary'
+    tf = slide.shapes.placeholders[1].text_frame
+    summary = report['summary']
+    tf.text = f"Active Students: {summary['active_students']}"
+    tf.add_paragraph().text = f"Completion Rate: {summary['completion_rate']}%"
+    tf.add_paragraph().text = f"Track: {summary['track'].title()}"
+
+    # Track Performance slide
+    slide = prs.slides.add_slide(bullet_slide_layout)
+    slide.shapes.title.text = 'Track Performance'
+    tf = slide.shapes.placeholders[1].text_frame
+    for row in report['tracks']:
+        tf.add_paragraph().text = (
+            f"{row['track'].title()}: {row['students']} students, "
+            f"{row['completion_rate']}% completion, {row['hires']} hires"
+        )
+
+    # Top Talent slide
+    slide = prs.slides.add_slide(bullet_slide_layout)
+    slide.shapes.title.text = 'Top Talent'
+    tf = slide.shapes.placeholders[1].text_frame
+    for talent in report['top_talent'][:5]:
+        tf.add_paragraph().text = (
+            f"#{talent['cohort_rank']}: {talent['student_name']} - {talent['readiness_score']} readiness"
+        )
+
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    return buffer.getvalue()
+
+
+RENDERERS = {
+    'pdf': render_pdf if REPORTLAB_AVAILABLE else None,
+    'pptx': render_pptx if PPTX_AVAILABLE else None,
+}
+
+
+def artifact_path(cohort: SponsorCohort, export_format: str, version: str = None) -> str:
+    version = version or cohort_version(cohort)
+    digest = hashlib.sha256(f'{cohort.id}:{version}:{export_format}'.encode()).hexdigest()
+    return f'{ARTIFACT_DIR}/{cohort.id}/{digest}.{export_format}'
+
+
+def prune_artifacts(cohort_id, current: str) -> int:
+    """Delete the cohort's artifacts of the same format that `current` supersedes; returns how many."""
+    directory, name = current.rsplit('/', 1)
+    extension = name.rsplit('.', 1)[-1]
+    try:
+        _, files = default_storage.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    stale = [f for f in files if f != name and f.endswith(f'.{extension}')]
+    for f in stale:
+        default_storage.delete(f'{directory}/{f}')
+    if stale:
+        logger.info(f'[sponsor_export] Pruned {len(stale)} superseded {extension} artifacts for cohort {cohort_id}')
+    return len(stale)
+
+
+def render_lock_key(path: str) -> str:
+    return f'sponsor_export:rendering:{path}'
+
+
+def render_artifact(cohort_id, export_format: str) -> str:
+    """Render a PDF/PPTX report into the artifact cache (no-op if already there); returns its path."""
+    cohort = SponsorCohort.objects.select_related('organization').get(id=cohort_id)
+    snapshot = CohortScoringService.current_snapshot(cohort)
+    path = artifact_path(cohort, export_format)
+    if default_storage.exists(path):
+        return path
+    sponsor = Sponsor.objects.filter(slug=cohort.organization.slug).first() or Sponsor(
+        name=cohort.organization.name, slug=cohort.organization.slug,
+    )
+    content = RENDERERS[export_format](sponsor, cohort, build_report(cohort, snapshot))
+    default_storage.save(path, ContentFile(content))
+    logger.info(f'[sponsor_export] Rendered {export_format} for cohort {cohort_id} ({len(content)} bytes)')
+    prune_artifacts(cohort_id, path)
+    return path
+
+
+def _filename(sponsor: Sponsor, export_format: str) -> str:
+    return f'{sponsor.slug}_dashboard_{datetime.now().strftime("%Y%m%d")}.{export_format}'
+
 
 class SponsorExportService:
     """Service for generating sponsor dashboard exports"""
 
     @staticmethod
-    def generate_csv_export(sponsor: Sponsor, cohort: SponsorCohort) -> HttpResponse:
-        """Generate CSV export of dashboard data"""
-        # Get dashboard data
-        ai_insights = sponsor_services.SponsorAIService.get_dashboard_ai_insights(cohort)
-
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="{sponsor.slug}_dashboard_{datetime.now().strftime("%Y%m%d")}.csv"'
-
-        writer = csv.writer(response)
-
-        # Executive Summary
-        writer.writerow(['Executive Summary'])
-        writer.writerow(['Metric', 'Value'])
-        writer.writerow(['Active Students', cohort.students_enrolled])
-        writer.writerow(['Completion Rate', f"{cohort.completion_rate}%"])
-        writer.writerow([])
-
-        # Track Performance
-        writer.writerow(['Track Performance'])
-        writer.writerow(['Track', 'Students', 'Completion Rate', 'Avg Time (days)', 'Hires', 'Avg Salary'])
-        tracks = ['defender', 'grc', 'innovation', 'leadership', 'offensive']
-        for track in tracks:
-            # Mock data - would be calculated from real data
-            writer.writerow([
-                track.title(),
-                '25',  # Mock
-                '72.1%',  # Mock
-                '38',  # Mock
-                '12',  # Mock
-                'KES 3.2M'  # Mock
-            ])
-        writer.writerow([])
-
-        # Top Talent
-        writer.writerow(['Top Talent'])
-        writer.writerow(['Rank', 'Name', 'Email', 'Readiness Score', 'Completion %'])
-        for talent in ai_insights['readiness_scores'][:10]:
-            writer.writerow([
-                talent['cohort_rank'],
-                talent['student_name'],
-                talent['student_email'],
-                talent['readiness_score'],
-                f"{talent['completion_percentage']}%"
-            ])
-
+    def generate_csv_export(sponsor: Sponsor, cohort: SponsorCohort) -> StreamingHttpResponse:
+        """Stream a CSV export of dashboard data"""
+        writer = csv.writer(_Echo())
+        response = StreamingHttpResponse(
+            (writer.writerow(row) for row in _csv_rows(sponsor, cohort)),
+            content_type=CONTENT_TYPES['csv'],
+        )
+        response['Content-Disposition'] = f'attachment; filename="{_filename(sponsor, "csv")}"'
         return response
 
     @staticmethod
-    def generate_pdf_export(sponsor: Sponsor, cohort: SponsorCohort) -> HttpResponse:
-        """Generate PDF export of dashboard data"""
-        if not REPORTLAB_AVAILABLE:
-            # Fallback to CSV if PDF libraries not available
-            return SponsorExportService.generate_csv_export(sponsor, cohort)
-
-        # Create PDF response
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename="{sponsor.slug}_dashboard_{datetime.now().strftime("%Y%m%d")}.pdf"'
-
-        # Create PDF document
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            spaceAfter=30,
-        )
-        story.append(Paragraph(f"{sponsor.name} Dashboard Report", title_style))
-        story.append(Paragraph(f"Generated on {datetime.now().strftime('%B %d, %Y')}", styles['Normal']))
-        story.append(Spacer(1, 20))
-
-        # Executive Summary
-        story.append(Paragraph("Executive Summary", styles['Heading2']))
-        ai_insights = sponsor_services.SponsorAIService.get_dashboard_ai_insights(cohort)
-
-        summary_data = [
-            ['Metric', 'Value'],
-            ['Active Students', str(cohort.students_enrolled)],
-            ['Completion Rate', f"{cohort.completion_rate}%"],
-            ['Track', cohort.track_slug.title()],
-            ['Start Date', cohort.start_date.strftime('%B %Y') if cohort.start_date else 'TBD'],
-        ]
-
-        summary_table = Table(summary_data)
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 14),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(summary_table)
-        story.append(Spacer(1, 20))
-
-        # Top Talent
-        story.append(Paragraph("Top Talent", styles['Heading2']))
-        talent_data = [['Rank', 'Name', 'Readiness Score', 'Completion %']]
-        for talent in ai_insights['readiness_scores'][:10]:
-            talent_data.append([
-                str(talent['cohort_rank']),
-                talent['student_name'],
-                str(talent['readiness_score']),
-                f"{talent['completion_percentage']}%"
-            ])
-
-        talent_table = Table(talent_data)
-        talent_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.blue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(talent_table)
-
-        # Build PDF
-        doc.build(story)
-        pdf = buffer.getvalue()
-        buffer.close()
-
-        response.write(pdf)
-        return response
+    def can_render(export_format: str) -> bool:
+        return RENDERERS.get(export_format) is not None
 
     @staticmethod
-    def generate_pptx_export(sponsor: Sponsor, cohort: SponsorCohort) -> HttpResponse:
-        """Generate PowerPoint export of dashboard data"""
-        if not PPTX_AVAILABLE:
-            # Fallback to CSV if PPTX libraries not available
-            return SponsorExportService.generate_csv_export(sponsor, cohort)
-
-        # Create PowerPoint response
-        response = HttpResponse(content_type='application/vnd.openxmlformats-officedocument.presentationml.presentation')
-        response['Content-Disposition'] = f'attachment; filename="{sponsor.slug}_dashboard_{datetime.now().strftime("%Y%m%d")}.pptx"'
-
-        # Create presentation
-        prs = Presentation()
-
-        # Title slide
-        title_slide_layout = prs.slide_layouts[0]
-        slide = prs.slides.add_slide(title_slide_layout)
-        title = slide.shapes.title
-        subtitle = slide.placeholders[1]
-
-        title.text = f"{sponsor.name} Dashboard Report"
-        subtitle.text = f"Cohort: {cohort.name}\nGenerated: {datetime.now().strftime('%B %d, %Y')}"
-
-        # Executive Summary slide
-        bullet_slide_layout = prs.slide_layouts[1]
-        slide = prs.slides.add_slide(bullet_slide_layout)
-        shapes = slide.shapes
-        title_shape = shapes.title
-        body_shape = shapes.placeholders[1]
-
-        title_shape.text = 'Executive Summary'
-        tf = body_shape.text_frame
-        tf.text = f'Active Students: {cohort.students_enrolled}'
-        p = tf.add_paragraph()
-        p.text = f'Completion Rate: {cohort.completion_rate}%'
-        p = tf.add_paragraph()
-        p.text = f'Track: {cohort.track_slug.title()}'
-
-        # Top Talent slide
-        slide = prs.slides.add_slide(bullet_slide_layout)
-        shapes = slide.shapes
-        title_shape = shapes.title
-        body_shape = shapes.placeholders[1]
-
-        title_shape.text = 'Top Talent'
-        tf = body_shape.text_frame
-
-        ai_insights = sponsor_services.SponsorAIService.get_dashboard_ai_insights(cohort)
-        for talent in ai_insights['readiness_scores'][:5]:
-            p = tf.add_paragraph()
-            p.text = f"#{talent['cohort_rank']}: {talent['student_name']} - {talent['readiness_score']} readiness"
-
-        # Save to response
-        buffer = io.BytesIO()
-        prs.save(buffer)
-        pptx_data = buffer.getvalue()
-        buffer.close()
-
-        response.write(pptx_data)
-        return response
+    def artifact_export(sponsor: Sponsor, cohort: SponsorCohort, export_format: str):
+        """
+        FileResponse for the cohort's current PDF/PPTX artifact. If it is not rendered
+        yet, queue the render (once per artifact) and return None; without Celery it is
+        rendered in the request instead.
+        """
+        path = artifact_path(cohort, export_format)
+        lock_key = render_lock_key(path)
+        if not default_storage.exists(path) and cache.add(lock_key, 1, RENDER_LOCK_TTL):
+            from .tasks import render_sponsor_export_task
+            if hasattr(render_sponsor_export_task, 'delay'):
+                try:
+                    render_sponsor_export_task.delay(str(cohort.id), export_format, lock_key)
+                except Exception:
+                    cache.delete(lock_key)
+                    raise
+                return None
+            # Without Celery the report is rendered in the request, under the version it scored
+            result = render_sponsor_export_task(str(cohort.id), export_format, lock_key)
+            path = result.get('path', path)
+        if default_storage.exists(path):
+            try:
+                artifact = default_storage.open(path, 'rb')
+            except FileNotFoundError:
+                return None  # Pruned by a newer render since the check
+            return FileResponse(
+                artifact,
+                as_attachment=True,
+                filename=_filename(sponsor, export_format),
+                content_type=CONTENT_TYPES[export_format],
+            )
+        return None
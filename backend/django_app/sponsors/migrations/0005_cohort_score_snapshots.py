@@ -0,0 +1,54 @@
+# Versioned sponsor cohort scoring snapshots (sponsors/services/scoring_service.py)
+
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sponsors', '0004_add_manual_finance_invoice'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SponsorCohortScoreSnapshot',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('version', models.IntegerField(help_text='Increments with each snapshot of the cohort')),
+                ('source_fingerprint', models.CharField(help_text='Hash of the enrollment and intervention data scored', max_length=64)),
+                ('student_count', models.IntegerField(default=0)),
+                ('summary', models.JSONField(default=dict, help_text='Dropout risk, completion attribution and alerts')),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+                ('sponsor_cohort', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='score_snapshots', to='sponsors.sponsorcohort')),
+            ],
+            options={
+                'db_table': 'sponsor_cohort_score_snapshots',
+                'ordering': ['-version'],
+                'unique_together': {('sponsor_cohort', 'version')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SponsorStudentScore',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('readiness_score', models.FloatField()),
+                ('cohort_rank', models.IntegerField(blank=True, help_text='Rank among active students; null when inactive', null=True)),
+                ('risk_score', models.FloatField(help_text='0-1 dropout risk')),
+                ('risk_band', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High')], max_length=10)),
+                ('enrollment', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='sponsors.sponsorstudentcohort')),
+                ('snapshot', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='student_scores', to='sponsors.sponsorcohortscoresnapshot')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'sponsor_student_scores',
+                'indexes': [
+                    models.Index(fields=['snapshot', 'cohort_rank'], name='sponsor_score_rank_idx'),
+                    models.Index(fields=['snapshot', 'risk_band'], name='sponsor_score_risk_idx'),
+                ],
+            },
+        ),
+    ]
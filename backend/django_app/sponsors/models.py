@@ -710,4 +710,71 @@ class ManualFinanceInvoice(models.Model):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Manual invoice {self.sponsor_name} - {self.amount_kes} {self.currency}"
\ No newline at end of file
+        return f"Manual invoice {self.sponsor_name} - {self.amount_kes} {self.currency}"
+
+
+class SponsorCohortScoreSnapshot(models.Model):
+    """
+    One scoring pass over a sponsor cohort (sponsors/services/scoring_service.py):
+    readiness, rank and dropout risk per student plus cohort-level risk and
+    intervention attribution. Superseded when the cohort's source fingerprint changes.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    sponsor_cohort = models.ForeignKey(
+        SponsorCohort,
+        on_delete=models.CASCADE,
+        related_name='score_snapshots'
+    )
+    version = models.IntegerField(help_text='Increments with each snapshot of the cohort')
+    source_fingerprint = models.CharField(max_length=64, help_text='Hash of the enrollment and intervention data scored')
+    student_count = models.IntegerField(default=0)
+    summary = models.JSONField(default=dict, help_text='Dropout risk, completion attribution and alerts')
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'sponsor_cohort_score_snapshots'
+        ordering = ['-version']
+        unique_together = [['sponsor_cohort', 'version']]
+
+    def __str__(self):
+        return f"{self.sponsor_cohort.name} scores v{self.version}"
+
+
+class SponsorStudentScore(models.Model):
+    """Per-student row of a SponsorCohortScoreSnapshot."""
+    RISK_BANDS = [
+        ('low', 'Low'),
+        ('medium', 'Medium'),
+        ('high', 'High'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    snapshot = models.ForeignKey(
+        SponsorCohortScoreSnapshot,
+        on_delete=models.CASCADE,
+        related_name='student_scores'
+    )
+    enrollment = models.ForeignKey(
+        SponsorStudentCohort,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    student = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    readiness_score = models.FloatField()
+    cohort_rank = models.IntegerField(null=True, blank=True, help_text='Rank among active students; null when inactive')
+    risk_score = models.FloatField(help_text='0-1 dropout risk')
+    risk_band = models.CharField(max_length=10, choices=RISK_BANDS)
+
+    class Meta:
+        db_table = 'sponsor_student_scores'
+        indexes = [
+            models.Index(fields=['snapshot', 'cohort_rank'], name='sponsor_score_rank_idx'),
+            models.Index(fields=['snapshot', 'risk_band'], name='sponsor_score_risk_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} readiness {self.readiness_score} ({self.risk_band} risk)"
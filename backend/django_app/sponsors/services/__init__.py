@@ -1,2 +1,4 @@
 # Services package
 from .cohorts_service import SponsorCohortsService
+from .scoring_service import CohortScoringService
+from .ai_service import SponsorAIService
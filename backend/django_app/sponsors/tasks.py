@@ -0,0 +1,80 @@
+"""
+Background tasks for sponsor report exports and cohort scoring.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@shared_task(name='sponsors.render_export')
+def render_sponsor_export_task(cohort_id, export_format, lock_key=None):
+    """
+    Render a sponsor PDF/PPTX report into the artifact cache (sponsors/export_service.py).
+
+    `lock_key` is the render lock the requesting view took; it is released whether the
+    render succeeds or not, so a failed render can be queued again straight away.
+    """
+    from django.core.cache import cache
+    from .export_service import render_artifact
+
+    try:
+        path = render_artifact(cohort_id, export_format)
+        return {'status': 'success', 'path': path}
+    except Exception as e:
+        logger.error(f"Error rendering {export_format} export for cohort {cohort_id}: {e}", exc_info=True)
+        return {'status': 'error', 'message': str(e)}
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+
+
+@shared_task(name='sponsors.score_cohort')
+def score_sponsor_cohort_task(cohort_id, lock_key=None):
+    """
+    Rescore one sponsor cohort if its data changed (sponsors/services/scoring_service.py).
+
+    `lock_key` is the scoring lock taken by whoever queued the task; it is released
+    however the rescore ends.
+    """
+    from django.core.cache import cache
+    from .models import SponsorCohort
+    from .services.scoring_service import CohortScoringService
+
+    try:
+        cohort = SponsorCohort.objects.select_related('organization').get(id=cohort_id)
+        snapshot = CohortScoringService.rescore_if_changed(cohort)
+        return {'status': 'success', 'version': snapshot.version}
+    except Exception as e:
+        logger.error(f"Error scoring sponsor cohort {cohort_id}: {e}", exc_info=True)
+        return {'status': 'error', 'message': str(e)}
+    finally:
+        if lock_key:
+            cache.delete(lock_key)
+
+
+@shared_task(name='sponsors.refresh_cohort_scores')
+def refresh_sponsor_scores_task():
+    """Rescore every sponsor cohort whose data changed since its latest snapshot; one worker at a time."""
+    from core.locks import leader_lock
+    from .models import SponsorCohort
+    from .services.scoring_service import CohortScoringService
+
+    with leader_lock('sponsors.refresh_cohort_scores') as leader:
+        if not leader:
+            logger.info("Sponsor score refresh already running on another worker; skipping")
+            return {'status': 'skipped'}
+        rescored = 0
+        for cohort in SponsorCohort.objects.select_related('organization').iterator():
+            latest_version = cohort.score_snapshots.order_by('-version').values_list('version', flat=True).first()
+            snapshot = CohortScoringService.refresh(cohort)
+            rescored += snapshot.version != latest_version
+    logger.info(f"Rescored {rescored} sponsor cohorts")
+    return {'status': 'success', 'rescored': rescored}
@@ -23,7 +23,7 @@ urlpatterns = [
     path('<slug:slug>/stream/', views.sponsor_stream, name='sponsor-stream'),
 
     # Export
-    path('<slug:slug>/export/', views.sponsor_export, name='sponsor-export'),
+    path('<slug:slug>/export/', views.SponsorExportView.as_view(), name='sponsor-export'),
 
     # Cohorts management
     path('<slug:slug>/cohorts/', views.SponsorCohortsListView.as_view(), name='sponsor-cohorts-list'),
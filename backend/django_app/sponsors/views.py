@@ -13,6 +13,7 @@ from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.negotiation import DefaultContentNegotiation
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
 
@@ -23,7 +24,7 @@ from .services.finance_service import FinanceDataService
 from .services.payment_service import PaymentService
 from users.models import UserRole
 from .permissions import IsSponsorUser, IsSponsorAdmin, check_sponsor_access, check_sponsor_admin_access
-from .export_service import SponsorExportService
+from .export_service import SponsorExportService, active_cohort_for
 from .audit_service import SponsorAuditService
 from .serializers import (
     SponsorSerializer,
@@ -407,45 +408,67 @@ def sponsor_stream(request, slug):
     return response
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def sponsor_export(request, slug):
+class ExportFormatNegotiation(DefaultContentNegotiation):
+    """`?format=` names the export file type here, not a DRF renderer; always answer in JSON."""
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class SponsorExportView(APIView):
     """
     GET /api/sponsors/[slug]/export?format=csv|pdf|pptx
-    Export sponsor dashboard data in various formats
-    """
-    sponsor = get_object_or_404(Sponsor, slug=slug, is_active=True)
-    export_format = request.GET.get('format', 'csv').lower()
+    Export sponsor dashboard data in various formats.
 
-    # Get active cohort
-    cohort = SponsorCohort.objects.filter(
-        sponsor=sponsor,
-        is_active=True
-    ).first()
+    CSV is streamed. PDF/PPTX are rendered in the background: the first request
+    returns 202 and queues the render, later ones download the cached file.
+    """
+    permission_classes = [IsSponsorUser]
+    content_negotiation_class = ExportFormatNegotiation
 
-    if not cohort:
-        return Response({
-            'error': 'No active cohort found for this sponsor'
-        }, status=status.HTTP_404_NOT_FOUND)
-
-    try:
-        # Log export action
-        SponsorAuditService.log_export_action(request.user, sponsor, export_format, cohort)
-
-        if export_format == 'csv':
-            return SponsorExportService.generate_csv_export(sponsor, cohort)
-        elif export_format == 'pdf':
-            return SponsorExportService.generate_pdf_export(sponsor, cohort)
-        elif export_format in ['pptx', 'ppt']:
-            return SponsorExportService.generate_pptx_export(sponsor, cohort)
-        else:
+    def get(self, request, slug):
+        try:
+            sponsor = check_sponsor_access(request.user, slug)
+        except PermissionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_403_FORBIDDEN)
+        export_format = request.GET.get('format', 'csv').lower()
+        if export_format == 'ppt':
+            export_format = 'pptx'
+        if export_format not in ('csv', 'pdf', 'pptx'):
             return Response({
                 'error': 'Unsupported export format. Use csv, pdf, or pptx'
             }, status=status.HTTP_400_BAD_REQUEST)
-    except Exception as e:
-        return Response({
-            'error': f'Export failed: {str(e)}'
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        # Get active cohort
+        cohort = active_cohort_for(sponsor)
+
+        if not cohort:
+            return Response({
+                'error': 'No active cohort found for this sponsor'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        try:
+            # Log export action
+            SponsorAuditService.log_export_action(request.user, sponsor, export_format, cohort)
+
+            if export_format == 'csv' or not SponsorExportService.can_render(export_format):
+                # CSV, or the fallback when PDF/PPTX libraries are not installed
+                return SponsorExportService.generate_csv_export(sponsor, cohort)
+
+            artifact = SponsorExportService.artifact_export(sponsor, cohort, export_format)
+            if artifact is not None:
+                return artifact
+            response = Response({
+                'status': 'rendering',
+                'format': export_format,
+                'message': 'The report is being generated; retry shortly to download it.',
+            }, status=status.HTTP_202_ACCEPTED)
+            response['Retry-After'] = '5'
+            return response
+        except Exception as e:
+            return Response({
+                'error': f'Export failed: {str(e)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
 class SponsorCohortsListView(APIView):
@@ -108,9 +108,9 @@ class CoachingOSService:
     def get_summary(user_id: int) -> Dict[str, Any]:
         """Get coaching summary: streak, goals, reflections."""
         try:
-            # Get longest streak
-            habits = Habit.objects.filter(user_id=user_id)
-            max_streak = habits.aggregate(Max('streak_current'))['streak_current__max'] or 0
+            # Best current streak (maintained on Habit by coaching.streaks)
+            habits = Habit.objects.filter(user_id=user_id, is_active=True)
+            max_streak = habits.aggregate(Max('streak'))['streak__max'] or 0
             
             # Get active goals
             active_goals = Goal.objects.filter(
@@ -0,0 +1,212 @@
+"""
+Billing-cycle engine: grace-period downgrades and simulated renewals.
+
+Each job walks its candidate subscriptions in id order, one chunk per transaction.
+A chunk:
+  1. takes the job's transaction-scoped advisory lock (core.locks.xact_lock);
+  2. locks its subscription rows and applies the change with one UPDATE (renewals
+     also write their PaymentTransaction rows with one bulk_create, keyed by
+     "renewal:<subscription id>:<old period end>" so a retry cannot bill twice);
+  3. records the last id it handled on the run's BillingCycleRun checkpoint.
+
+A run is identified by its job name and schedule slot (BillingCycleRun.run_key). The
+cutoff time is stored on the run, and every trigger first finishes the job's unfinished
+runs from their last committed chunk, so a worker that dies mid-run is resumed by the
+next trigger even when that trigger falls in a new slot. A trigger for a finished slot
+does nothing.
+
+The Celery beat task (subscriptions.tasks.run_billing_cycle_task) runs the jobs under a
+leader lock, so only one worker processes a cycle at a time.
+
+Rules (DSD §14.2 / §5.4.3):
+  - past_due for longer than the 5-day grace period → canceled, moved to the Free plan
+  - canceled and past current_period_end            → moved to the Free plan
+  - active and past current_period_end              → period extended by 30 days with a
+    simulated completed payment (real gateways renew through webhooks instead)
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db import transaction
+from django.utils import timezone
+
+from core.locks import xact_lock
+from users.utils.identity_snapshot import bump_identity_versions
+
+logger = logging.getLogger(__name__)
+
+GRACE_PERIOD_DAYS = 5
+RENEWAL_PERIOD_DAYS = 30
+CHUNK_SIZE = 1000
+
+DOWNGRADE_PAST_DUE = 'downgrade_past_due'
+DOWNGRADE_CANCELED = 'downgrade_canceled'
+RENEW_ACTIVE = 'renew_active'
+
+# Hours per schedule slot; a job runs at most once per slot
+SLOT_HOURS = {
+    DOWNGRADE_PAST_DUE: 12,
+    DOWNGRADE_CANCELED: 12,
+    RENEW_ACTIVE: 24,
+}
+
+
+@dataclass(frozen=True)
+class BillingCycleResult:
+    job: str
+    run_key: str
+    processed: int = 0
+    chunks: int = 0
+    resumed: bool = False
+    skipped: bool = False
+
+
+def get_free_plan():
+    from .models import SubscriptionPlan
+    return SubscriptionPlan.objects.filter(tier='free', is_active=True).order_by('created_at').first()
+
+
+def run_key_for(job: str, as_of: datetime) -> str:
+    slot_hours = SLOT_HOURS[job]
+    hours = int(as_of.timestamp() // 3600)
+    slot = datetime.fromtimestamp((hours - hours % slot_hours) * 3600, tz=dt_timezone.utc)
+    return f'{job}:{slot:%Y%m%dT%H}'
+
+
+def _candidates(job: str, as_of: datetime):
+    from .models import UserSubscription
+    if job == DOWNGRADE_PAST_DUE:
+        return UserSubscription.objects.filter(
+            status='past_due', updated_at__lte=as_of - timedelta(days=GRACE_PERIOD_DAYS),
+        )
+    if job == DOWNGRADE_CANCELED:
+        return UserSubscription.objects.filter(
+            status='canceled', current_period_end__lte=as_of,
+        ).exclude(plan__tier='free')
+    if job == RENEW_ACTIVE:
+        return UserSubscription.objects.filter(
+            status='active', current_period_end__lte=as_of,
+        ).exclude(plan__tier='free')
+    raise ValueError(f'Unknown billing-cycle job: {job}')
+
+
+def _apply_chunk(job, rows, as_of, free_plan):
+    """Apply `job` to locked subscription rows; returns (rows changed, user ids whose identity changed)."""
+    from .models import PaymentTransaction, UserSubscription
+
+    ids = [row['id'] for row in rows]
+    now = timezone.now()
+    if job == DOWNGRADE_PAST_DUE:
+        changed = UserSubscription.objects.filter(id__in=ids).update(
+            plan=free_plan, status='canceled', enhanced_access_expires_at=None, updated_at=now,
+        )
+        return changed, [row['user_id'] for row in rows]
+    if job == DOWNGRADE_CANCELED:
+        changed = UserSubscription.objects.filter(id__in=ids).update(
+            plan=free_plan, enhanced_access_expires_at=None, updated_at=now,
+        )
+        return changed, [row['user_id'] for row in rows]
+
+    PaymentTransaction.objects.bulk_create(
+        [
+            PaymentTransaction(
+                user_id=row['user_id'],
+                subscription_id=row['id'],
+                amount=row['plan__price_monthly'] or 0,
+                currency='USD',
+                status='completed',
+                gateway_transaction_id=f"sim_renew_{row['id'].hex[:10]}_{as_of:%Y%m%d}",
+                idempotency_key=f"renewal:{row['id']}:{row['current_period_end'].isoformat()}",
+                gateway_response={'simulated': True, 'type': 'renewal', 'plan': row['plan__name']},
+                processed_at=now,
+            )
+            for row in rows
+        ],
+        ignore_conflicts=True,
+    )
+    changed = UserSubscription.objects.filter(id__in=ids).update(
+        current_period_start=now,
+        current_period_end=now + timedelta(days=RENEWAL_PERIOD_DAYS),
+        updated_at=now,
+    )
+    return changed, []
+
+
+def run_billing_job(job: str, as_of: datetime = None, chunk_size: int = CHUNK_SIZE) -> BillingCycleResult:
+    """Finish the job's unfinished runs, then run (or resume) it for the slot containing `as_of`."""
+    from .models import BillingCycleRun
+
+    as_of = as_of or timezone.now()
+    run_key = run_key_for(job, as_of)
+    free_plan = None
+    if job in (DOWNGRADE_PAST_DUE, DOWNGRADE_CANCELED):
+        free_plan = get_free_plan()
+        if free_plan is None:
+            logger.error('[billing] Free plan not found — cannot downgrade. Run seed_plans first.')
+            return BillingCycleResult(job, run_key, skipped=True)
+
+    # Runs left behind by a worker that died, possibly in an earlier slot
+    earlier = list(
+        BillingCycleRun.objects.filter(job=job, status='running').exclude(run_key=run_key).order_by('started_at')
+    )
+    processed = chunks = 0
+    for run in earlier:
+        done, done_chunks = _process_run(run, job, free_plan, chunk_size)
+        logger.info(f'[billing] {run.run_key}: resumed, {done} subscriptions in {done_chunks} chunks')
+        processed += done
+        chunks += done_chunks
+
+    run, created = BillingCycleRun.objects.get_or_create(run_key=run_key, defaults={'job': job, 'as_of': as_of})
+    resumed = bool(earlier) or not created
+    if run.status == 'completed':
+        return BillingCycleResult(job, run_key, processed=processed, chunks=chunks, resumed=resumed,
+                                  skipped=not earlier)
+    done, done_chunks = _process_run(run, job, free_plan, chunk_size)
+    logger.info(f'[billing] {run_key}: {done} subscriptions in {done_chunks} chunks'
+                f'{" (resumed)" if not created else ""}')
+    return BillingCycleResult(job, run_key, processed=processed + done, chunks=chunks + done_chunks,
+                              resumed=resumed)
+
+
+def _process_run(run, job, free_plan, chunk_size):
+    """Work through a run's remaining chunks; returns (rows changed, chunks) by this call."""
+    from .models import BillingCycleRun
+
+    processed = chunks = 0
+    while True:
+        with transaction.atomic():
+            xact_lock(f'billing_cycle:{job}')
+            run = BillingCycleRun.objects.select_for_update().get(pk=run.pk)
+            if run.status == 'completed':
+                break
+            candidates = _candidates(job, run.as_of)
+            if run.last_id is not None:
+                candidates = candidates.filter(id__gt=run.last_id)
+            rows = list(
+                candidates.select_for_update(of=('self',))
+                .order_by('id')
+                .values('id', 'user_id', 'current_period_end', 'plan__price_monthly', 'plan__name')[:chunk_size]
+            )
+            if not rows:
+                run.status = 'completed'
+                run.finished_at = timezone.now()
+                run.save(update_fields=['status', 'finished_at'])
+                break
+
+            changed, identity_user_ids = _apply_chunk(job, rows, run.as_of, free_plan)
+            run.last_id = rows[-1]['id']
+            run.processed += changed
+            run.chunks += 1
+            run.save(update_fields=['last_id', 'processed', 'chunks'])
+            if identity_user_ids:
+                transaction.on_commit(lambda ids=identity_user_ids: bump_identity_versions(ids))
+        processed += changed
+        chunks += 1
+    return processed, chunks
+
+
+def run_billing_cycle(as_of: datetime = None, jobs=None, chunk_size: int = CHUNK_SIZE):
+    """Run every billing-cycle job (downgrades before renewals) for the current slot."""
+    jobs = jobs or [DOWNGRADE_PAST_DUE, DOWNGRADE_CANCELED, RENEW_ACTIVE]
+    return [run_billing_job(job, as_of=as_of, chunk_size=chunk_size) for job in jobs]
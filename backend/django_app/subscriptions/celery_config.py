@@ -0,0 +1,24 @@
+"""
+Celery configuration for Subscription Engine periodic tasks.
+"""
+from celery.schedules import crontab
+
+SUBSCRIPTIONS_BEAT_SCHEDULE = {
+    'enforce-subscription-grace-periods': {
+        'task': 'subscriptions.run_billing_cycle',
+        'schedule': crontab(minute=0, hour='*/12'),
+        'kwargs': {'jobs': ['downgrade_past_due', 'downgrade_canceled']},
+        'options': {'expires': 60 * 60},  # Drop a backed-up run rather than stack them
+    },
+    'renew-subscriptions': {
+        'task': 'subscriptions.run_billing_cycle',
+        'schedule': crontab(minute=0, hour=2),
+        'kwargs': {'jobs': ['renew_active']},
+        'options': {'expires': 60 * 60},
+    },
+    'process-webhook-inbox': {
+        'task': 'subscriptions.process_webhook_inbox',
+        'schedule': crontab(minute='*/5'),  # Retries events that arrived before their subscription mapping
+        'options': {'expires': 5 * 60},
+    },
+}
@@ -0,0 +1,101 @@
+"""
+Synthetic benchmark for the billing-cycle engine (subscriptions/billing_cycle.py).
+
+Creates users and subscriptions in bulk (a mix of overdue past_due, expired canceled
+and due active subscriptions), runs every billing-cycle job, reports wall time and
+query counts, and rolls everything back.
+"""
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from subscriptions.billing_cycle import CHUNK_SIZE, run_billing_cycle
+from subscriptions.models import SubscriptionPlan, UserSubscription
+
+User = get_user_model()
+
+BULK_BATCH_SIZE = 5000
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure billing-cycle downgrades and renewals over synthetic subscriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subscriptions', type=int, default=100000, help='Synthetic subscriptions to create')
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self._run(options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Synthetic data rolled back')
+
+    def _run(self, options):
+        rng = random.Random(options['seed'])
+        total = options['subscriptions']
+        now = timezone.now()
+
+        free_plan = SubscriptionPlan.objects.filter(tier='free').order_by('created_at').first()
+        if free_plan is None:
+            free_plan = SubscriptionPlan.objects.create(name='free', tier='free', price_monthly=0)
+        paid_plan = SubscriptionPlan.objects.create(
+            name=f'bench-{uuid.uuid4().hex[:8]}', tier='starter', price_monthly=3,
+        )
+
+        started = time.perf_counter()
+        run_id = uuid.uuid4().hex[:8]
+        users = User.objects.bulk_create(
+            [
+                User(username=f'bench-{run_id}-{i}', email=f'bench-{run_id}-{i}@bench.local')
+                for i in range(total)
+            ],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        if users and users[0].pk is None:
+            users = list(User.objects.filter(username__startswith=f'bench-{run_id}-').order_by('id'))
+
+        subscriptions = []
+        for user in users:
+            kind = rng.random()
+            if kind < 0.2:
+                fields = {'status': 'past_due'}
+            elif kind < 0.4:
+                fields = {'status': 'canceled', 'current_period_end': now - timedelta(days=rng.randint(1, 30))}
+            else:
+                fields = {'status': 'active', 'current_period_end': now - timedelta(days=rng.randint(0, 3))}
+            subscriptions.append(UserSubscription(user=user, plan=paid_plan, **fields))
+        UserSubscription.objects.bulk_create(subscriptions, batch_size=BULK_BATCH_SIZE)
+        # auto_now sets updated_at on insert; age past_due rows beyond the grace period
+        UserSubscription.objects.filter(plan=paid_plan, status='past_due').update(
+            updated_at=now - timedelta(days=10),
+        )
+        setup_s = time.perf_counter() - started
+        self.stdout.write(f'Created {total} users and subscriptions in {setup_s:.2f} s')
+
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            results = run_billing_cycle(as_of=now, chunk_size=options['chunk_size'])
+            elapsed = time.perf_counter() - started
+
+        processed = 0
+        for result in results:
+            processed += result.processed
+            self.stdout.write(f'  {result.run_key}: {result.processed} subscriptions in {result.chunks} chunks')
+        self.stdout.write(f'{len(queries)} queries')
+        self.stdout.write(self.style.SUCCESS(
+            f'{processed} subscriptions in {elapsed:.2f} s ({processed / elapsed:,.0f}/sec)'
+        ))
@@ -0,0 +1,38 @@
+# Checkpointed billing-cycle runs and idempotent payment transactions
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0003_fix_user_subscriptions_user_id_uuid'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymenttransaction',
+            name='idempotency_key',
+            field=models.CharField(blank=True, help_text='Set by writers that may retry, e.g. "renewal:<subscription>:<period end>"', max_length=255, null=True, unique=True),
+        ),
+        migrations.CreateModel(
+            name='BillingCycleRun',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('job', models.CharField(db_index=True, max_length=40)),
+                ('run_key', models.CharField(help_text='Idempotency key: job name plus schedule slot', max_length=100, unique=True)),
+                ('as_of', models.DateTimeField(help_text='Cutoff time, fixed for the whole run so a resumed run sees the same set')),
+                ('last_id', models.UUIDField(blank=True, help_text='Last subscription id of the last committed chunk', null=True)),
+                ('processed', models.IntegerField(default=0)),
+                ('chunks', models.IntegerField(default=0)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('completed', 'Completed')], db_index=True, default='running', max_length=20)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'billing_cycle_runs',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Webhook event inbox and customer -> subscription mapping
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0004_billing_cycle_runs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usersubscription',
+            name='stripe_customer_id',
+            field=models.CharField(blank=True, db_index=True, help_text='Stripe customer, used to route customer-level webhook events', max_length=255, null=True),
+        ),
+        migrations.AddField(
+            model_name='usersubscription',
+            name='last_gateway_event_at',
+            field=models.DateTimeField(blank=True, help_text='Creation time of the newest gateway event applied; older events are stale', null=True),
+        ),
+        migrations.CreateModel(
+            name='WebhookEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('gateway', models.CharField(default='stripe', max_length=20)),
+                ('event_id', models.CharField(help_text='Gateway event id; a redelivery is dropped on insert', max_length=255)),
+                ('event_type', models.CharField(max_length=100)),
+                ('payload', models.JSONField(default=dict)),
+                ('event_created', models.DateTimeField(help_text='When the gateway created the event, the ordering key')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processed', 'Processed'), ('stale', 'Stale'), ('ignored', 'Ignored'), ('unmatched', 'Unmatched')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0, help_text='Passes that could not match the event to a subscription')),
+                ('received_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('subscription', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='webhook_events', to='subscriptions.usersubscription')),
+            ],
+            options={
+                'db_table': 'webhook_events',
+                'ordering': ['event_created'],
+                'indexes': [models.Index(fields=['status', 'event_created'], name='webhook_event_pending_idx')],
+                'constraints': [models.UniqueConstraint(fields=('gateway', 'event_id'), name='webhook_event_unique_id')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Retired plans: kept for existing subscribers, never assigned on downgrade
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('subscriptions', '0005_webhook_inbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscriptionplan',
+            name='is_active',
+            field=models.BooleanField(
+                default=True,
+                help_text='Retired plans keep their existing subscribers but are never assigned (e.g. on downgrade)',
+            ),
+        ),
+    ]
@@ -96,6 +96,10 @@ class SubscriptionPlan(models.Model):
         validators=[MinValueValidator(0)],
         help_text='Enhanced access period in days (e.g., 180 for Starter tier)'
     )
+    is_active = models.BooleanField(
+        default=True,
+        help_text='Retired plans keep their existing subscribers but are never assigned (e.g. on downgrade)'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -155,6 +159,18 @@ class UserSubscription(models.Model):
         blank=True,
         db_index=True
     )
+    stripe_customer_id = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text='Stripe customer, used to route customer-level webhook events'
+    )
+    last_gateway_event_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Creation time of the newest gateway event applied; older events are stale'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -229,6 +245,13 @@ class PaymentTransaction(models.Model):
     currency = models.CharField(max_length=3, default='USD')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
     gateway_transaction_id = models.CharField(max_length=255, blank=True, db_index=True, help_text='External gateway transaction ID')
+    idempotency_key = models.CharField(
+        max_length=255,
+        unique=True,
+        null=True,
+        blank=True,
+        help_text='Set by writers that may retry, e.g. "renewal:<subscription>:<period end>"'
+    )
     gateway_response = models.JSONField(default=dict, blank=True, help_text='Raw gateway response')
     failure_reason = models.TextField(blank=True, help_text='Reason for failure if status is failed')
     processed_at = models.DateTimeField(null=True, blank=True)
@@ -292,3 +315,71 @@ class PaymentSettings(models.Model):
     
     def __str__(self):
         return f"{self.setting_key}"
+
+
+class BillingCycleRun(models.Model):
+    """Checkpoint for one scheduled pass of a billing-cycle job (subscriptions/billing_cycle.py)."""
+    STATUS_CHOICES = [
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.CharField(max_length=40, db_index=True)
+    run_key = models.CharField(max_length=100, unique=True, help_text='Idempotency key: job name plus schedule slot')
+    as_of = models.DateTimeField(help_text='Cutoff time, fixed for the whole run so a resumed run sees the same set')
+    last_id = models.UUIDField(null=True, blank=True, help_text='Last subscription id of the last committed chunk')
+    processed = models.IntegerField(default=0)
+    chunks = models.IntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running', db_index=True)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'billing_cycle_runs'
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"{self.run_key} ({self.status}, {self.processed} processed)"
+
+
+class WebhookEvent(models.Model):
+    """Inbox of payment-gateway webhook events, applied in order by subscriptions/webhooks.py."""
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('stale', 'Stale'),
+        ('ignored', 'Ignored'),
+        ('unmatched', 'Unmatched'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    gateway = models.CharField(max_length=20, default='stripe')
+    event_id = models.CharField(max_length=255, help_text='Gateway event id; a redelivery is dropped on insert')
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    event_created = models.DateTimeField(help_text='When the gateway created the event, the ordering key')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0, help_text='Passes that could not match the event to a subscription')
+    subscription = models.ForeignKey(
+        UserSubscription,
+        on_delete=models.SET_NULL,
+        related_name='webhook_events',
+        null=True,
+        blank=True
+    )
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'webhook_events'
+        constraints = [
+            models.UniqueConstraint(fields=['gateway', 'event_id'], name='webhook_event_unique_id'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'event_created'], name='webhook_event_pending_idx'),
+        ]
+        ordering = ['event_created']
+
+    def __str__(self):
+        return f"{self.gateway} {self.event_type} {self.event_id} ({self.status})"
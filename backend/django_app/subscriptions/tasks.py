@@ -2,11 +2,6 @@
 Background tasks for Subscription Engine.
 """
 import logging
-from django.utils import timezone
-from datetime import timedelta
-from django.db import transaction
-from .models import UserSubscription, SubscriptionPlan
-from student_dashboard.services import DashboardAggregationService
 
 logger = logging.getLogger(__name__)
 
@@ -19,62 +14,48 @@ except ImportError:
         return decorator
 
 
+@shared_task(name='subscriptions.run_billing_cycle')
+def run_billing_cycle_task(jobs=None):
+    """
+    Celery beat entry point for grace-period downgrades and renewals.
+
+    Only the worker holding the leader lock runs the cycle; others return at once.
+    """
+    from core.locks import leader_lock
+    from .billing_cycle import run_billing_cycle
+
+    with leader_lock('subscriptions.billing_cycle') as leader:
+        if not leader:
+            logger.info("Billing cycle already running on another worker; skipping")
+            return {'status': 'skipped'}
+        results = run_billing_cycle(jobs=jobs)
+    return {
+        'status': 'success',
+        'runs': [
+            {'run_key': r.run_key, 'processed': r.processed, 'chunks': r.chunks, 'skipped': r.skipped}
+            for r in results
+        ],
+    }
+
+
+@shared_task(name='subscriptions.process_webhook_inbox')
+def process_webhook_inbox_task():
+    """Apply pending payment-gateway webhook events from the inbox (subscriptions/webhooks.py)."""
+    from .webhooks import drain_inbox
+    return {'status': 'success', **drain_inbox()}
+
+
 @shared_task(name='subscriptions.process_stripe_webhook')
 def process_stripe_webhook_task(event):
     """
-    Process Stripe webhook events.
+    Process a Stripe webhook event: store it in the inbox, then drain the inbox.
+
+    A redelivered event is dropped by the inbox's unique event id.
     """
-    try:
-        event_type = event['type']
-        data = event['data']['object']
-        
-        if event_type == 'charge.succeeded':
-            # Find user by customer ID
-            customer_id = data.get('customer')
-            subscription = UserSubscription.objects.filter(
-                stripe_subscription_id__isnull=False
-            ).first()  # Would need customer_id mapping
-            
-            if subscription:
-                subscription.status = 'active'
-                subscription.save()
-                DashboardAggregationService.queue_update(
-                    subscription.user,
-                    'payment_succeeded',
-                    'urgent'
-                )
-        
-        elif event_type == 'subscription.updated':
-            subscription_id = data.get('id')
-            try:
-                subscription = UserSubscription.objects.get(stripe_subscription_id=subscription_id)
-                subscription.status = data.get('status', 'active')
-                subscription.current_period_end = timezone.datetime.fromtimestamp(
-                    data.get('current_period_end', 0),
-                    tz=timezone.utc
-                )
-                subscription.save()
-                DashboardAggregationService.queue_update(
-                    subscription.user,
-                    'subscription_updated',
-                    'urgent'
-                )
-            except UserSubscription.DoesNotExist:
-                pass
-        
-        elif event_type == 'invoice.payment_failed':
-            subscription_id = data.get('subscription')
-            try:
-                subscription = UserSubscription.objects.get(stripe_subscription_id=subscription_id)
-                subscription.status = 'past_due'
-                subscription.save()
-            except UserSubscription.DoesNotExist:
-                pass
-        
-        logger.info(f"Processed Stripe webhook: {event_type}")
-        return {'status': 'success', 'event_type': event_type}
-        
-    except Exception as e:
-        logger.error(f"Error processing webhook: {e}", exc_info=True)
-        return {'status': 'error', 'message': str(e)}
+    from .webhooks import drain_inbox, ingest_event
 
+    _, created = ingest_event(event)
+    if not created:
+        logger.info(f"Duplicate Stripe webhook ignored: {event.get('id')}")
+        return {'status': 'duplicate', 'event_type': event.get('type')}
+    return {'status': 'success', 'event_type': event.get('type'), **drain_inbox()}
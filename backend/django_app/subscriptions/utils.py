@@ -2,31 +2,31 @@
 Subscription utilities - Entitlement enforcement.
 """
 from functools import wraps
+from django.core.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework import status
-from .models import UserSubscription, SubscriptionPlan
 
 
 def get_user_tier(user_or_uuid):
-    """Get user's subscription tier.
+    """Get user's subscription tier (plan name) from the cached identity snapshot.
     Args:
-        user_or_uuid: User object or user UUID
+        user_or_uuid: User object, user UUID or user primary key
     """
     try:
         from users.models import User
+        from users.utils.identity_snapshot import get_identity_snapshot
 
         # If it's a User object, use it directly
         if isinstance(user_or_uuid, User):
             user = user_or_uuid
+        elif isinstance(user_or_uuid, int):
+            user = User(pk=user_or_uuid)
         else:
             # Otherwise try to get the user by uuid_id
-            user = User.objects.get(uuid_id=user_or_uuid)
+            user = User.objects.only('id').get(uuid_id=user_or_uuid)
 
-        subscription = UserSubscription.objects.filter(user=user, status='active').first()
-        if subscription and subscription.plan:
-            return subscription.plan.name
-        return 'free'
-    except (UserSubscription.DoesNotExist, User.DoesNotExist, ValueError, AttributeError):
+        return get_identity_snapshot(user).plan_name
+    except (User.DoesNotExist, ValidationError, ValueError, AttributeError):
         return 'free'
 
 
@@ -52,7 +52,7 @@ def require_tier(required_tier: str):
     def decorator(func):
         @wraps(func)
         def wrapper(request, *args, **kwargs):
-            user_tier = get_user_tier(request.user.id)
+            user_tier = get_user_tier(request.user)
             if not has_access(user_tier, required_tier):
                 return Response(
                     {
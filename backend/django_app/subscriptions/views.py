@@ -8,8 +8,8 @@ import requests
 from django.utils import timezone
 from django.db import transaction
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from .models import SubscriptionPlan, UserSubscription, PaymentTransaction, PaymentGateway
 from .serializers import (
@@ -232,6 +232,7 @@ def upgrade_subscription(request):
                     'quantity': 1,
                 }],
                 mode='subscription',
+                client_reference_id=str(user.id),
                 success_url=f"{os.environ.get('FRONTEND_URL', 'http://localhost:3000')}/subscription/success?session_id={{CHECKOUT_SESSION_ID}}",
                 cancel_url=f"{os.environ.get('FRONTEND_URL', 'http://localhost:3000')}/subscription/cancel",
             )
@@ -281,16 +282,13 @@ def upgrade_subscription(request):
 
 
 @api_view(['POST'])
-@permission_classes([IsAuthenticated])
+@authentication_classes([])
+@permission_classes([AllowAny])
 def stripe_webhook(request):
     """
     POST /api/v1/subscription/webhooks/stripe
-    Handle Stripe webhooks.
+    Handle Stripe webhooks. Stripe is authenticated by the signature, not a user session.
     """
-    import json
-    import hmac
-    import hashlib
-    
     stripe_key = os.environ.get('STRIPE_SECRET_KEY')
     webhook_secret = os.environ.get('STRIPE_WEBHOOK_SECRET')
     
@@ -309,9 +307,12 @@ def stripe_webhook(request):
     except stripe.error.SignatureVerificationError:
         return Response({'error': 'Invalid signature'}, status=status.HTTP_400_BAD_REQUEST)
     
-    # Handle events
-    from subscriptions.tasks import process_stripe_webhook_task
-    process_stripe_webhook_task.delay(event)
+    # Store in the inbox before acknowledging; redeliveries are dropped by event id
+    from subscriptions.webhooks import event_payload, ingest_event
+    from subscriptions.tasks import process_webhook_inbox_task
+    _, created = ingest_event(event_payload(event))
+    if created:
+        transaction.on_commit(process_webhook_inbox_task.delay)
     
     return Response({'status': 'received'}, status=status.HTTP_200_OK)
 
@@ -0,0 +1,276 @@
+"""
+Payment-gateway webhook ingestion.
+
+The webhook view verifies the signature and stores the event in the WebhookEvent inbox;
+the unique (gateway, event_id) constraint drops redeliveries. drain_inbox() then applies
+pending events in batches:
+
+  - events are read in gateway creation order and folded per subscription, so a burst
+    of updates for one subscription becomes one write with its final state;
+  - each event is routed by Stripe subscription id, customer id (stripe_customer_id)
+    or, for checkout sessions, client_reference_id (our user id), resolved for the
+    whole batch in one query;
+  - UserSubscription.last_gateway_event_at is a watermark: an event created before the
+    newest event already applied to its subscription is marked stale, so late
+    deliveries cannot roll the state back;
+  - events that match no subscription yet (e.g. an invoice that overtook its
+    checkout.session.completed) stay pending for later passes, then become unmatched;
+  - the batch ends with one bulk_update of subscriptions and at most one urgent
+    dashboard update per student.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from core.locks import xact_lock
+from users.utils.identity_snapshot import bump_identity_versions
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+MAX_UNMATCHED_ATTEMPTS = 5
+
+# Stripe subscription status -> UserSubscription.status
+STRIPE_STATUSES = {
+    'active': 'active',
+    'trialing': 'trial',
+    'past_due': 'past_due',
+    'unpaid': 'past_due',
+    'incomplete': 'past_due',
+    'canceled': 'canceled',
+    'incomplete_expired': 'canceled',
+}
+
+# A bare charge proves a payment went through, not that a canceled subscription restarted
+CHARGE_RECOVERS = ('past_due', 'trial')
+
+SUBSCRIPTION_FIELDS = [
+    'status', 'current_period_start', 'current_period_end',
+    'stripe_subscription_id', 'stripe_customer_id', 'last_gateway_event_at', 'updated_at',
+]
+
+
+@dataclass
+class Transition:
+    """What one gateway event says about a subscription."""
+    subscription_ref: Optional[str] = None
+    customer_ref: Optional[str] = None
+    user_ref: Optional[int] = None
+    status: Optional[str] = None
+    only_from: Optional[tuple] = None  # apply status only to subscriptions currently in one of these
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+    reason: Optional[str] = None
+
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, tz=dt_timezone.utc) if value else None
+
+
+def parse_event(event_type, obj) -> Optional[Transition]:
+    """Map a Stripe event to a Transition, or None for event types we do not handle."""
+    if event_type == 'checkout.session.completed':
+        user_ref = obj.get('client_reference_id')
+        return Transition(
+            subscription_ref=obj.get('subscription'),
+            customer_ref=obj.get('customer'),
+            user_ref=int(user_ref) if user_ref and str(user_ref).isdigit() else None,
+            status='active' if obj.get('subscription') else None,
+            reason='subscription_updated',
+        )
+    if event_type in ('customer.subscription.created', 'customer.subscription.updated', 'subscription.updated'):
+        return Transition(
+            subscription_ref=obj.get('id'),
+            customer_ref=obj.get('customer'),
+            status=STRIPE_STATUSES.get(obj.get('status', 'active')),
+            period_start=_timestamp(obj.get('current_period_start')),
+            period_end=_timestamp(obj.get('current_period_end')),
+            reason='subscription_updated',
+        )
+    if event_type == 'customer.subscription.deleted':
+        return Transition(
+            subscription_ref=obj.get('id'), customer_ref=obj.get('customer'),
+            status='canceled', reason='subscription_updated',
+        )
+    if event_type in ('invoice.paid', 'invoice.payment_succeeded'):
+        return Transition(
+            subscription_ref=obj.get('subscription'), customer_ref=obj.get('customer'),
+            status='active', reason='payment_succeeded',
+        )
+    if event_type == 'invoice.payment_failed':
+        return Transition(
+            subscription_ref=obj.get('subscription'), customer_ref=obj.get('customer'),
+            status='past_due', reason='payment_failed',
+        )
+    if event_type == 'charge.succeeded':
+        return Transition(
+            customer_ref=obj.get('customer'), status='active', only_from=CHARGE_RECOVERS, reason='payment_succeeded',
+        )
+    return None
+
+
+# Inbox ---------------------------------------------------------------------
+
+def event_payload(event) -> dict:
+    """Plain JSON data of a verified SDK event (stripe.Event is no longer a dict subclass)."""
+    if hasattr(event, 'to_dict_recursive'):
+        return event.to_dict_recursive()
+    return event.to_dict()
+
+
+def ingest_event(event, gateway='stripe'):
+    """Store a verified webhook event; returns (WebhookEvent, created). Redeliveries return created=False."""
+    from .models import WebhookEvent
+    return WebhookEvent.objects.get_or_create(
+        gateway=gateway,
+        event_id=event['id'],
+        defaults={
+            'event_type': event.get('type', ''),
+            'payload': event,
+            'event_created': _timestamp(event.get('created')) or timezone.now(),
+        },
+    )
+
+
+# Draining ------------------------------------------------------------------
+
+class _SubscriptionIndex:
+    """Batch lookup of subscriptions by Stripe subscription id, customer id and user id."""
+
+    def __init__(self, transitions):
+        from .models import UserSubscription
+        sub_refs = {t.subscription_ref for t in transitions if t.subscription_ref}
+        customer_refs = {t.customer_ref for t in transitions if t.customer_ref}
+        user_refs = {t.user_ref for t in transitions if t.user_ref}
+        self.by_ref, self.by_customer, self.by_user = {}, {}, {}
+        if not (sub_refs or customer_refs or user_refs):
+            return
+        for sub in UserSubscription.objects.filter(
+            Q(stripe_subscription_id__in=sub_refs) | Q(stripe_customer_id__in=customer_refs) | Q(user_id__in=user_refs)
+        ):
+            self.add(sub)
+
+    def add(self, sub):
+        if sub.stripe_subscription_id:
+            self.by_ref[sub.stripe_subscription_id] = sub
+        if sub.stripe_customer_id:
+            self.by_customer[sub.stripe_customer_id] = sub
+        self.by_user[sub.user_id] = sub
+
+    def find(self, t):
+        return (
+            (t.subscription_ref and self.by_ref.get(t.subscription_ref))
+            or (t.user_ref and self.by_user.get(t.user_ref))
+            or (t.customer_ref and self.by_customer.get(t.customer_ref))
+            or None
+        )
+
+
+def _apply(sub, t, event_created):
+    if t.subscription_ref:
+        sub.stripe_subscription_id = t.subscription_ref
+    if t.customer_ref:
+        sub.stripe_customer_id = t.customer_ref
+    if t.status and (t.only_from is None or sub.status in t.only_from):
+        sub.status = t.status
+    if t.period_start:
+        sub.current_period_start = t.period_start
+    if t.period_end:
+        sub.current_period_end = t.period_end
+    sub.last_gateway_event_at = event_created
+
+
+def queue_dashboard_updates(reasons):
+    """One urgent dashboard update per user, skipping users that already have one queued."""
+    from student_dashboard.models import DashboardUpdateQueue
+    if not reasons:
+        return 0
+    queued = set(
+        DashboardUpdateQueue.objects.filter(
+            user_id__in=list(reasons), priority='urgent', processed_at__isnull=True,
+        ).values_list('user_id', flat=True)
+    )
+    items = [
+        DashboardUpdateQueue(user_id=user_id, reason=reason, priority='urgent')
+        for user_id, reason in reasons.items() if user_id not in queued
+    ]
+    DashboardUpdateQueue.objects.bulk_create(items)
+    return len(items)
+
+
+def _drain_batch(after, batch_size):
+    """Apply one batch of pending events created after `after`; returns (last event, counts) or None."""
+    from .models import UserSubscription, WebhookEvent
+
+    with transaction.atomic():
+        xact_lock('subscriptions.webhook_inbox')
+        events = WebhookEvent.objects.select_for_update().filter(status='pending')
+        if after is not None:
+            created, event_pk = after
+            events = events.filter(Q(event_created__gt=created) | Q(event_created=created, id__gt=event_pk))
+        events = list(events.order_by('event_created', 'id')[:batch_size])
+        if not events:
+            return None
+
+        transitions = {
+            event.id: parse_event(event.event_type, (event.payload.get('data') or {}).get('object') or {})
+            for event in events
+        }
+        index = _SubscriptionIndex([t for t in transitions.values() if t])
+        now = timezone.now()
+        changed, reasons = {}, {}
+        counts = dict.fromkeys(['processed', 'stale', 'ignored', 'unmatched', 'pending'], 0)
+
+        for event in events:
+            t = transitions[event.id]
+            sub = index.find(t) if t else None
+            if t is None:
+                event.status = 'ignored'
+            elif sub is None:
+                event.attempts += 1
+                if event.attempts >= MAX_UNMATCHED_ATTEMPTS:
+                    event.status = 'unmatched'
+            elif sub.last_gateway_event_at and event.event_created < sub.last_gateway_event_at:
+                event.status = 'stale'
+                event.subscription_id = sub.id
+            else:
+                _apply(sub, t, event.event_created)
+                index.add(sub)
+                sub.updated_at = now
+                changed[sub.id] = sub
+                reasons[sub.user_id] = t.reason
+                event.status = 'processed'
+                event.subscription_id = sub.id
+            if event.status != 'pending':
+                event.processed_at = now
+            counts[event.status] += 1
+
+        if changed:
+            UserSubscription.objects.bulk_update(list(changed.values()), SUBSCRIPTION_FIELDS)
+        WebhookEvent.objects.bulk_update(events, ['status', 'attempts', 'subscription', 'processed_at'])
+        queue_dashboard_updates(reasons)
+        if reasons:
+            transaction.on_commit(lambda ids=list(reasons): bump_identity_versions(ids))
+
+    return (events[-1].event_created, events[-1].id), counts
+
+
+def drain_inbox(batch_size: int = BATCH_SIZE):
+    """Apply every pending inbox event once, in gateway order; returns counts by outcome."""
+    totals = dict.fromkeys(['processed', 'stale', 'ignored', 'unmatched', 'pending'], 0)
+    after = None
+    while True:
+        result = _drain_batch(after, batch_size)
+        if result is None:
+            break
+        after, counts = result
+        for key, value in counts.items():
+            totals[key] += value
+    if any(totals.values()):
+        logger.info(f'[webhooks] Drained inbox: {totals}')
+    return totals
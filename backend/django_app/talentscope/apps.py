@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class TalentscopeConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'talentscope'
+
+    def ready(self):
+        import talentscope.signals  # noqa: F401
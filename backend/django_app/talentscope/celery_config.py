@@ -0,0 +1,17 @@
+"""
+Celery configuration for TalentScope periodic tasks.
+"""
+from celery.schedules import crontab
+
+TALENTSCOPE_BEAT_SCHEDULE = {
+    'compute-readiness-snapshots': {
+        'task': 'talentscope.compute_readiness_snapshots',
+        'schedule': crontab(minute='*/10'),  # Recomputes only mentees whose inputs changed
+        'options': {'expires': 10 * 60},
+    },
+    'prune-readiness-snapshots': {
+        'task': 'talentscope.prune_readiness_snapshots',
+        'schedule': crontab(minute=30, hour=3),
+        'options': {'expires': 60 * 60},
+    },
+}
@@ -0,0 +1,35 @@
+"""
+Run the incremental readiness engine (talentscope/readiness.py) once.
+
+Same work as the talentscope.compute_readiness_snapshots beat task: sweep the input
+watermarks, then write snapshots for every dirty mentee. --all marks every mentee
+with any input dirty first, e.g. after changing the scoring weights.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from talentscope.models import ReadinessWatermark
+from talentscope.readiness import BATCH_SIZE, mark_dirty, run_readiness_engine
+
+
+class Command(BaseCommand):
+    help = 'Compute ReadinessSnapshots for mentees whose inputs changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--mentee-id', type=int, action='append', dest='mentee_ids', help='Mark a mentee dirty (repeatable)')
+        parser.add_argument('--all', action='store_true', help='Reset the watermarks so every mentee with inputs is recomputed')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            ReadinessWatermark.objects.all().delete()
+        if options['mentee_ids']:
+            mark_dirty(options['mentee_ids'])
+        started = time.perf_counter()
+        stats = run_readiness_engine(batch_size=options['batch_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Marked {stats['marked']} mentees, wrote {stats['computed']} snapshots "
+            f"in {stats['batches']} batches ({elapsed:.2f} s)"
+        ))
@@ -0,0 +1,221 @@
+"""
+Materialized mentee 360 profiles.
+
+The mentor TalentScope view of a mentee (mentorship_coordination.views.
+mentor_mentee_talentscope) ran about ten queries per load: latest snapshot, skill
+mastery, approved submissions by day, behavior rollups twice, readiness history,
+mentor sessions, signal counts and scored submissions. Each mentee now has one
+MenteeProfile360 row holding all of it, in sections refreshed by the writers of the
+underlying tables (talentscope.signals, after commit):
+
+  - skills:    SkillSignal saves and deletes (missions.views_mxp mentor reviews);
+  - behavior:  BehaviorSignal saves and deletes (coaching habit logs, reflections);
+  - missions:  MissionSubmission saves and deletes;
+  - sessions:  mentorship_coordination.MentorSession saves and deletes;
+  - readiness: ReadinessSnapshot saves, and each batch the readiness engine writes.
+
+Daily totals are stored for the last TREND_DAYS days as of the refresh; older days
+drop out of the window when it is read, so the trend needs no daily rebuild.
+
+Reads go through a versioned cache key (mentee360:<mentee_id>:v<version>); a refresh
+bumps the version, so a miss is one query for the row. get_profile() builds the row
+for a mentee seen for the first time.
+"""
+import logging
+from datetime import timedelta
+from typing import Dict, Iterable
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from core.versioned_cache import ENTRY_TTL, bump_version, current_version
+
+logger = logging.getLogger(__name__)
+
+SECTIONS = ('skills', 'behavior', 'missions', 'sessions', 'readiness')
+TREND_DAYS = 30
+READINESS_HISTORY = 120
+
+PROFILE_FIELDS = (
+    'skills_heatmap', 'mission_days', 'behavior_days', 'habit_logs', 'community_engagement',
+    'mission_scores', 'mentor_sessions', 'readiness', 'readiness_history', 'version',
+)
+
+
+def _version_key(mentee_id) -> str:
+    return f'mentee360:ver:{mentee_id}'
+
+
+def _profile_key(mentee_id, version) -> str:
+    return f'mentee360:{mentee_id}:v{version}'
+
+
+def _current_version(mentee_id) -> int:
+    return current_version(_version_key(mentee_id))
+
+
+def bump_profile_version(mentee_id) -> None:
+    bump_version(_version_key(mentee_id))
+
+
+def _float(value):
+    return float(value) if value is not None else None
+
+
+def _trend_start(now):
+    return timezone.localdate(now) - timedelta(days=TREND_DAYS - 1)
+
+
+# Section builders -----------------------------------------------------------
+
+def _build_skills(mentee_id, now) -> dict:
+    from .rollups import skill_mastery
+    return {'skills_heatmap': {
+        name: float(level) for name, level in skill_mastery(mentee_id).values_list('skill_name', 'mastery_level')
+    }}
+
+
+def _build_behavior(mentee_id, now) -> dict:
+    from .rollups import daily_behavior, signal_counts
+    return {
+        'behavior_days': {
+            day.isoformat(): {'hours_studied': totals['hours_studied'], 'reflections_count': totals['reflections_count']}
+            for day, totals in daily_behavior(mentee_id, start=_trend_start(now)).items()
+        },
+        **signal_counts(mentee_id),
+    }
+
+
+def _build_missions(mentee_id, now) -> dict:
+    from missions.models import MissionSubmission
+    submissions = MissionSubmission.objects.filter(student__id=mentee_id)
+    days = submissions.filter(status='approved', created_at__date__gte=_trend_start(now)).values(
+        'created_at__date',
+    ).annotate(c=Count('id')).order_by()
+    return {
+        'mission_days': {row['created_at__date'].isoformat(): row['c'] for row in days},
+        'mission_scores': submissions.aggregate(n=Count('id', filter=Q(score__isnull=False)))['n'],
+    }
+
+
+def _build_sessions(mentee_id, now) -> dict:
+    from mentorship_coordination.models import MentorSession
+    return {'mentor_sessions': {
+        str(row['mentor_id']): row['c']
+        for row in MentorSession.objects.filter(mentee_id=mentee_id).values('mentor_id').annotate(
+            c=Count('id'),
+        ).order_by()
+    }}
+
+
+def _build_readiness(mentee_id, now) -> dict:
+    from .models import ReadinessSnapshot
+    history = list(
+        ReadinessSnapshot.objects.filter(mentee_id=mentee_id).order_by('-snapshot_date')[:READINESS_HISTORY]
+    )
+    if not history:
+        return {'readiness': {}, 'readiness_history': []}
+    latest = history[0]
+    return {
+        'readiness': {
+            'core_readiness_score': _float(latest.core_readiness_score),
+            'career_readiness_stage': latest.career_readiness_stage,
+            'learning_velocity': _float(latest.learning_velocity),
+            'estimated_readiness_window': latest.estimated_readiness_window,
+            'breakdown': latest.breakdown,
+            'gap_analysis': {
+                'strengths': latest.strengths or [],
+                'weaknesses': latest.weaknesses or [],
+                'missing_skills': latest.missing_skills or [],
+                'improvement_plan': latest.improvement_plan or [],
+            },
+            'professional_tier_data': {
+                'job_fit_score': _float(latest.job_fit_score),
+                'hiring_timeline_prediction': latest.hiring_timeline_prediction,
+                'track_benchmarks': latest.track_benchmarks or {},
+            },
+        },
+        'readiness_history': [
+            {'date': snapshot.snapshot_date.date().isoformat(), 'score': float(snapshot.core_readiness_score)}
+            for snapshot in reversed(history)
+        ],
+    }
+
+
+BUILDERS = {
+    'skills': _build_skills,
+    'behavior': _build_behavior,
+    'missions': _build_missions,
+    'sessions': _build_sessions,
+    'readiness': _build_readiness,
+}
+
+
+# Writes ---------------------------------------------------------------------
+
+def refresh(mentee_id, sections: Iterable[str] = SECTIONS, now=None):
+    """Rebuild `sections` of a mentee's profile (every section when it is new); returns the profile."""
+    from .models import MenteeProfile360
+    now = now or timezone.now()
+    with transaction.atomic():
+        profile = MenteeProfile360.objects.select_for_update().filter(mentee_id=mentee_id).first()
+        if profile is None:
+            profile, sections = MenteeProfile360(mentee_id=mentee_id, version=0), SECTIONS
+        for section in sections:
+            for field_name, value in BUILDERS[section](mentee_id, now).items():
+                setattr(profile, field_name, value)
+        profile.version += 1
+        profile.save()
+    bump_profile_version(mentee_id)
+    return profile
+
+
+def refresh_on_commit(mentee_id, *sections) -> None:
+    """Refresh once the current transaction commits; the writers' hook."""
+    if mentee_id is not None:
+        transaction.on_commit(lambda: refresh(mentee_id, sections))
+
+
+def refresh_many(mentee_ids, sections: Iterable[str], now=None) -> int:
+    """Refresh `sections` for those of `mentee_ids` that already have a profile; returns profiles refreshed."""
+    from .models import MenteeProfile360
+    existing = list(MenteeProfile360.objects.filter(mentee_id__in=set(mentee_ids)).values_list('mentee_id', flat=True))
+    for mentee_id in existing:
+        refresh(mentee_id, sections, now=now)
+    return len(existing)
+
+
+# Reads ----------------------------------------------------------------------
+
+def get_profile(mentee_id) -> Dict:
+    """The mentee's profile fields, from the versioned cache, the row or a first build."""
+    from .models import MenteeProfile360
+    key = _profile_key(mentee_id, _current_version(mentee_id))
+    data = cache.get(key)
+    if data is not None:
+        return data
+    data = MenteeProfile360.objects.filter(mentee_id=mentee_id).values(*PROFILE_FIELDS).first()
+    if data is None:
+        profile = refresh(mentee_id)
+        data = {field_name: getattr(profile, field_name) for field_name in PROFILE_FIELDS}
+        key = _profile_key(mentee_id, _current_version(mentee_id))
+    cache.set(key, data, ENTRY_TTL)
+    return data
+
+
+def behavioral_trends(profile: Dict, now=None) -> list:
+    """The last TREND_DAYS days of mission and behavior totals, zero-filled."""
+    start = _trend_start(now or timezone.now())
+    trends = []
+    for offset in range(TREND_DAYS):
+        day = (start + timedelta(days=offset)).isoformat()
+        behavior = profile['behavior_days'].get(day, {})
+        trends.append({
+            'date': day,
+            'missions_completed': profile['mission_days'].get(day, 0),
+            'hours_studied': behavior.get('hours_studied', 0.0),
+            'reflections_count': behavior.get('reflections_count', 0),
+        })
+    return trends
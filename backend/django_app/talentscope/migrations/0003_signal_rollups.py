@@ -0,0 +1,101 @@
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    BehaviorSignal = apps.get_model('talentscope', 'BehaviorSignal')
+    SkillSignal = apps.get_model('talentscope', 'SkillSignal')
+    BehaviorDailyRollup = apps.get_model('talentscope', 'BehaviorDailyRollup')
+    SkillMastery = apps.get_model('talentscope', 'SkillMastery')
+
+    rows = BehaviorSignal.objects.annotate(day=TruncDate('recorded_at')).values(
+        'mentee_id', 'behavior_type', 'source', 'day',
+    ).annotate(count=Count('id'), total=Sum('value')).order_by()
+    BehaviorDailyRollup.objects.bulk_create([
+        BehaviorDailyRollup(
+            mentee_id=row['mentee_id'], behavior_type=row['behavior_type'], source=row['source'],
+            day=row['day'], signal_count=row['count'], value_total=row['total'],
+        )
+        for row in rows.iterator()
+    ], batch_size=1000)
+
+    totals = {
+        (row['mentee_id'], row['skill_name']): row
+        for row in SkillSignal.objects.values('mentee_id', 'skill_name').annotate(
+            count=Count('id'), mastery=Sum('mastery_level'), hours=Sum('hours_practiced'),
+            practiced=Max('last_practiced'),
+        ).order_by().iterator()
+    }
+    latest = {}
+    for signal in SkillSignal.objects.order_by('updated_at', 'created_at').only(
+        'mentee_id', 'skill_name', 'skill_category', 'mastery_level', 'updated_at',
+    ).iterator():
+        latest[(signal.mentee_id, signal.skill_name)] = signal
+    SkillMastery.objects.bulk_create([
+        SkillMastery(
+            mentee_id=mentee_id, skill_name=skill_name, skill_category=signal.skill_category,
+            mastery_level=signal.mastery_level, mastery_total=totals[(mentee_id, skill_name)]['mastery'] or 0,
+            hours_practiced=totals[(mentee_id, skill_name)]['hours'] or 0,
+            signal_count=totals[(mentee_id, skill_name)]['count'],
+            last_practiced=totals[(mentee_id, skill_name)]['practiced'], latest_signal_at=signal.updated_at,
+        )
+        for (mentee_id, skill_name), signal in latest.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('talentscope', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BehaviorDailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('behavior_type', models.CharField(max_length=50)),
+                ('source', models.CharField(max_length=50)),
+                ('day', models.DateField()),
+                ('signal_count', models.IntegerField(default=0)),
+                ('value_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mentee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='behavior_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'ts_behavior_daily_rollups',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['mentee', 'day'], name='ts_behavior_rollup_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mentee', 'behavior_type', 'source', 'day'), name='ts_behavior_rollup_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillMastery',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('skill_name', models.CharField(max_length=255)),
+                ('skill_category', models.CharField(max_length=100)),
+                ('mastery_level', models.DecimalField(decimal_places=2, help_text='Mastery level of the most recently written signal', max_digits=5)),
+                ('mastery_total', models.DecimalField(decimal_places=2, default=0, help_text='Sum of mastery levels over all signals, for the average', max_digits=14)),
+                ('hours_practiced', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('signal_count', models.IntegerField(default=0)),
+                ('last_practiced', models.DateTimeField(blank=True, null=True)),
+                ('latest_signal_at', models.DateTimeField(help_text='When the signal behind mastery_level was written')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('mentee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='skill_mastery', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'ts_skill_mastery',
+                'ordering': ['-mastery_level'],
+                'indexes': [models.Index(fields=['mentee', 'latest_signal_at'], name='ts_skill_mastery_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mentee', 'skill_name'), name='ts_skill_mastery_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
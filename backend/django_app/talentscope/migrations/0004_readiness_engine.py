@@ -0,0 +1,36 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('talentscope', '0003_signal_rollups'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReadinessDirtyMentee',
+            fields=[
+                ('mentee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='readiness_dirty', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('marked_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'ts_readiness_dirty_mentees',
+            },
+        ),
+        migrations.CreateModel(
+            name='ReadinessWatermark',
+            fields=[
+                ('source', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('high_water', models.DateTimeField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'ts_readiness_watermarks',
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('talentscope', '0004_readiness_engine'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenteeProfile360',
+            fields=[
+                ('mentee', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile_360', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('skills_heatmap', models.JSONField(blank=True, default=dict, help_text='{skill_name: latest mastery}')),
+                ('mission_days', models.JSONField(blank=True, default=dict, help_text='{day: approved submissions}, recent days only')),
+                ('behavior_days', models.JSONField(blank=True, default=dict, help_text='{day: {hours_studied, reflections_count}}, recent days only')),
+                ('habit_logs', models.IntegerField(default=0)),
+                ('community_engagement', models.IntegerField(default=0)),
+                ('mission_scores', models.IntegerField(default=0, help_text='Submissions with a score')),
+                ('mentor_sessions', models.JSONField(blank=True, default=dict, help_text='{mentor_id: sessions with the mentee}')),
+                ('readiness', models.JSONField(blank=True, default=dict, help_text='Fields of the latest ReadinessSnapshot')),
+                ('readiness_history', models.JSONField(blank=True, default=list, help_text='[{date, score}], oldest first')),
+                ('version', models.PositiveIntegerField(default=1)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'ts_mentee_profiles',
+            },
+        ),
+    ]
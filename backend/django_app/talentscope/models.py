@@ -294,3 +294,152 @@ class ReadinessSnapshot(models.Model):
     
     def __str__(self):
         return f"{self.mentee.email} - Readiness: {self.core_readiness_score}% ({self.career_readiness_stage})"
+
+
+class BehaviorDailyRollup(models.Model):
+    """
+    Per-mentee daily totals of BehaviorSignal values, one row per behavior type,
+    source and day. Maintained on ingest by talentscope.rollups.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    mentee = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='behavior_rollups'
+    )
+    behavior_type = models.CharField(max_length=50)
+    source = models.CharField(max_length=50)
+    day = models.DateField()
+    signal_count = models.IntegerField(default=0)
+    value_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ts_behavior_daily_rollups'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['mentee', 'behavior_type', 'source', 'day'],
+                name='ts_behavior_rollup_unique',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['mentee', 'day'], name='ts_behavior_rollup_day_idx'),
+        ]
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.mentee_id} - {self.behavior_type} on {self.day}: {self.value_total} ({self.signal_count})"
+
+
+class SkillMastery(models.Model):
+    """
+    Latest mastery per mentee and skill, plus running totals over every SkillSignal
+    for that skill. Maintained on ingest by talentscope.rollups.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    mentee = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='skill_mastery'
+    )
+    skill_name = models.CharField(max_length=255)
+    skill_category = models.CharField(max_length=100)
+    mastery_level = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        help_text='Mastery level of the most recently written signal'
+    )
+    mastery_total = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text='Sum of mastery levels over all signals, for the average'
+    )
+    hours_practiced = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    signal_count = models.IntegerField(default=0)
+    last_practiced = models.DateTimeField(null=True, blank=True)
+    latest_signal_at = models.DateTimeField(help_text='When the signal behind mastery_level was written')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ts_skill_mastery'
+        constraints = [
+            models.UniqueConstraint(fields=['mentee', 'skill_name'], name='ts_skill_mastery_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['mentee', 'latest_signal_at'], name='ts_skill_mastery_recent_idx'),
+        ]
+        ordering = ['-mastery_level']
+
+    @property
+    def average_mastery(self):
+        return self.mastery_total / self.signal_count if self.signal_count else self.mastery_level
+
+    def __str__(self):
+        return f"{self.mentee_id} - {self.skill_name}: {self.mastery_level}%"
+
+
+class ReadinessDirtyMentee(models.Model):
+    """
+    Mentees whose readiness inputs changed since their last ReadinessSnapshot.
+    Marked on input writes and by the watermark sweep; drained by talentscope.readiness.
+    """
+    mentee = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='readiness_dirty'
+    )
+    marked_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'ts_readiness_dirty_mentees'
+
+    def __str__(self):
+        return f"{self.mentee_id} dirty since {self.marked_at}"
+
+
+class ReadinessWatermark(models.Model):
+    """How far the readiness engine has swept each input table for changed mentees."""
+    source = models.CharField(max_length=50, primary_key=True)
+    high_water = models.DateTimeField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ts_readiness_watermarks'
+
+    def __str__(self):
+        return f"{self.source} @ {self.high_water}"
+
+
+class MenteeProfile360(models.Model):
+    """
+    Materialized mentee 360 analytics: skill heatmap, daily mission and behavior
+    totals, signal counts, mentor session counts and latest readiness. Refreshed
+    section by section as the underlying rows are written (talentscope.mentee360).
+    """
+    mentee = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='profile_360'
+    )
+    skills_heatmap = models.JSONField(default=dict, blank=True, help_text='{skill_name: latest mastery}')
+    mission_days = models.JSONField(default=dict, blank=True, help_text='{day: approved submissions}, recent days only')
+    behavior_days = models.JSONField(
+        default=dict, blank=True, help_text='{day: {hours_studied, reflections_count}}, recent days only'
+    )
+    habit_logs = models.IntegerField(default=0)
+    community_engagement = models.IntegerField(default=0)
+    mission_scores = models.IntegerField(default=0, help_text='Submissions with a score')
+    mentor_sessions = models.JSONField(default=dict, blank=True, help_text='{mentor_id: sessions with the mentee}')
+    readiness = models.JSONField(default=dict, blank=True, help_text='Fields of the latest ReadinessSnapshot')
+    readiness_history = models.JSONField(default=list, blank=True, help_text='[{date, score}], oldest first')
+    version = models.PositiveIntegerField(default=1)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ts_mentee_profiles'
+
+    def __str__(self):
+        return f"Mentee 360 profile for {self.mentee_id} (v{self.version})"
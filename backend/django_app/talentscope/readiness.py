@@ -0,0 +1,364 @@
+"""
+Incremental ReadinessSnapshot engine.
+
+A mentee's readiness is derived from four inputs:
+
+  - technical:  latest mastery per skill (SkillMastery, see talentscope.rollups);
+  - practical:  mission submission scores and approvals (missions.MissionSubmission);
+  - curriculum: track completion (curriculum.UserTrackProgress);
+  - behavioral: days with any behavior signal in the last 30 (BehaviorDailyRollup).
+
+Only mentees whose inputs changed are recomputed. The dirty set
+(ReadinessDirtyMentee) is filled two ways:
+
+  - a watermark sweep: for each input table, mentees with rows written after that
+    table's ReadinessWatermark and before `now - READINESS_WATERMARK_LAG` (the lag
+    lets transactions that stamped a row earlier commit first). This catches
+    bulk_create and queryset.update writes, which send no signals;
+  - mark_dirty(), called by talentscope.signals when input rows are deleted and
+    available to any caller that changes inputs out of band.
+
+Readiness also moves without new inputs: active days fall out of the behavior window
+and velocity is measured against a snapshot at least VELOCITY_MIN_SPAN old. So
+mark_stale() marks mentees whose latest snapshot is older than STALE_AFTER (one day,
+the window's step), and idle mentees decay a day at a time.
+
+run_readiness_engine() sweeps, marks stale mentees, then drains the dirty set in batches: each batch is
+claimed (removed from the set, so marks arriving mid-run survive for the next
+pass), its inputs loaded with one grouped query per source, and its snapshots
+written with one bulk_create. Readers take the latest snapshot per mentee, an
+indexed (mentee, snapshot_date) lookup; latest_readiness_score() exposes it as a
+subquery for cohort-level aggregates. prune_snapshots() deletes snapshots older than
+READINESS_SNAPSHOT_RETENTION_DAYS, always keeping each mentee's latest.
+"""
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, Max, OuterRef, Q, Subquery
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+DEFAULT_WATERMARK_LAG = timedelta(minutes=2)
+BEHAVIOR_WINDOW_DAYS = 30
+STALE_AFTER = timedelta(days=1)
+VELOCITY_MIN_SPAN = timedelta(days=7)
+DEFAULT_SNAPSHOT_RETENTION_DAYS = 180
+
+WEIGHTS = {'technical': 0.35, 'practical': 0.30, 'curriculum': 0.20, 'behavioral': 0.15}
+STAGES = [(80, 'ready'), (60, 'emerging'), (40, 'building'), (0, 'exploring')]
+READY_SCORE = 80
+STRENGTH_MASTERY = 75
+WEAKNESS_MASTERY = 50
+MISSIONS_FOR_FULL_CREDIT = 5
+
+IMPROVEMENT_ACTIONS = {
+    'technical': 'Practice the weakest skills until each reaches 50% mastery',
+    'practical': 'Complete and submit more missions for mentor review',
+    'curriculum': 'Progress through the remaining track modules',
+    'behavioral': 'Log study activity on more days each week',
+}
+
+# source -> (model, change timestamp, mentee pk lookup)
+WATERMARK_SOURCES = {
+    'missions': ('missions.MissionSubmission', 'updated_at', 'student__id'),
+    'skills': ('talentscope.SkillSignal', 'updated_at', 'mentee_id'),
+    'behavior': ('talentscope.BehaviorSignal', 'created_at', 'mentee_id'),
+    'curriculum': ('curriculum.UserTrackProgress', 'last_activity_at', 'user_id'),
+}
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+@dataclass
+class ReadinessInputs:
+    """Everything one mentee's snapshot is computed from."""
+    skills: List[Tuple[str, str, float]] = field(default_factory=list)  # (name, category, mastery)
+    scored_missions: int = 0
+    mission_score_avg: float = 0.0
+    approved_missions: int = 0
+    active_days: int = 0
+    curriculum_completion: float = 0.0
+    assigned_skills: set = field(default_factory=set)
+    previous_score: Optional[float] = None  # velocity baseline, at least VELOCITY_MIN_SPAN old
+    previous_at: Optional[datetime] = None
+    previous_velocity: Optional[float] = None  # latest snapshot's, kept until a baseline exists
+
+
+# Dirty set and watermarks ---------------------------------------------------
+
+def mark_dirty(mentee_ids):
+    """Queue mentees for recomputation; marking an already dirty mentee is a no-op."""
+    from .models import ReadinessDirtyMentee
+    now = timezone.now()
+    ReadinessDirtyMentee.objects.bulk_create(
+        [ReadinessDirtyMentee(mentee_id=mentee_id, marked_at=now) for mentee_id in set(mentee_ids) if mentee_id],
+        ignore_conflicts=True,
+    )
+
+
+def _watermark_lag():
+    seconds = getattr(settings, 'READINESS_WATERMARK_LAG', None)
+    return DEFAULT_WATERMARK_LAG if seconds is None else timedelta(seconds=seconds)
+
+
+def sweep_watermarks(until=None) -> int:
+    """Mark mentees with input rows written in (watermark, until]; returns mentees marked."""
+    from .models import ReadinessWatermark
+    until = until or timezone.now() - _watermark_lag()
+    marked = set()
+    for source, (model_label, changed_field, mentee_field) in WATERMARK_SOURCES.items():
+        watermark = ReadinessWatermark.objects.filter(source=source).first()
+        since = watermark.high_water if watermark else _EPOCH
+        if since >= until:
+            continue
+        mentee_ids = set(
+            apps.get_model(model_label).objects.filter(
+                **{f'{changed_field}__gt': since, f'{changed_field}__lte': until}
+            ).values_list(mentee_field, flat=True).distinct().order_by()
+        )
+        mark_dirty(mentee_ids - marked)
+        marked |= mentee_ids
+        ReadinessWatermark.objects.update_or_create(source=source, defaults={'high_water': until})
+    return len(marked)
+
+
+def mark_stale(now=None) -> int:
+    """Mark mentees whose latest snapshot is older than STALE_AFTER; returns mentees marked."""
+    from .models import ReadinessSnapshot
+    now = now or timezone.now()
+    mentee_ids = list(
+        ReadinessSnapshot.objects.values('mentee_id').annotate(latest=Max('snapshot_date'))
+        .filter(latest__lt=now - STALE_AFTER).values_list('mentee_id', flat=True).order_by()
+    )
+    mark_dirty(mentee_ids)
+    return len(mentee_ids)
+
+
+def claim_dirty(limit: int) -> List[int]:
+    """Remove and return up to `limit` of the longest-waiting dirty mentees."""
+    from .models import ReadinessDirtyMentee
+    with transaction.atomic():
+        mentee_ids = list(
+            ReadinessDirtyMentee.objects.order_by('marked_at').values_list('mentee_id', flat=True)[:limit]
+        )
+        ReadinessDirtyMentee.objects.filter(mentee_id__in=mentee_ids).delete()
+    return mentee_ids
+
+
+# Inputs ---------------------------------------------------------------------
+
+def load_inputs(mentee_ids, now=None) -> Dict[int, ReadinessInputs]:
+    """Inputs for a batch of mentees, one grouped query per source."""
+    from curriculum.models import UserTrackProgress
+    from missions.models import MissionAssignment, MissionSubmission
+    from users.models import User
+    from .models import BehaviorDailyRollup, ReadinessSnapshot, SkillMastery
+    now = now or timezone.now()
+    inputs = {mentee_id: ReadinessInputs() for mentee_id in mentee_ids}
+
+    for mentee_id, name, category, mastery in SkillMastery.objects.filter(
+        mentee_id__in=mentee_ids,
+    ).values_list('mentee_id', 'skill_name', 'skill_category', 'mastery_level'):
+        inputs[mentee_id].skills.append((name, category, float(mastery)))
+
+    for row in MissionSubmission.objects.filter(student__id__in=mentee_ids).values('student__id').annotate(
+        scored=Count('id', filter=Q(score__isnull=False)),
+        score_avg=Avg('score', filter=Q(score__isnull=False)),
+        approved=Count('id', filter=Q(status='approved')),
+    ).order_by():
+        entry = inputs[row['student__id']]
+        entry.scored_missions = row['scored']
+        entry.mission_score_avg = float(row['score_avg'] or 0)
+        entry.approved_missions = row['approved']
+
+    for mentee_id, tags in MissionAssignment.objects.filter(student__id__in=mentee_ids).values_list(
+        'student__id', 'mission__skills_tags',
+    ):
+        inputs[mentee_id].assigned_skills.update(tag for tag in tags or [] if isinstance(tag, str) and tag)
+
+    window_start = timezone.localdate(now) - timedelta(days=BEHAVIOR_WINDOW_DAYS - 1)
+    for row in BehaviorDailyRollup.objects.filter(mentee_id__in=mentee_ids, day__gte=window_start).values(
+        'mentee_id',
+    ).annotate(days=Count('day', distinct=True)).order_by():
+        inputs[row['mentee_id']].active_days = row['days']
+
+    for row in UserTrackProgress.objects.filter(user_id__in=mentee_ids).values('user_id').annotate(
+        completion=Max('completion_percentage'),
+    ).order_by():
+        inputs[row['user_id']].curriculum_completion = float(row['completion'] or 0)
+
+    latest = ReadinessSnapshot.objects.filter(mentee_id=OuterRef('pk')).order_by('-snapshot_date')
+    baseline = latest.filter(snapshot_date__lte=now - VELOCITY_MIN_SPAN)
+    for mentee_id, score, taken_at, velocity in User.objects.filter(id__in=mentee_ids).annotate(
+        previous_score=Subquery(baseline.values('core_readiness_score')[:1]),
+        previous_at=Subquery(baseline.values('snapshot_date')[:1]),
+        previous_velocity=Subquery(latest.values('learning_velocity')[:1]),
+    ).values_list('id', 'previous_score', 'previous_at', 'previous_velocity'):
+        if score is not None:
+            inputs[mentee_id].previous_score = float(score)
+            inputs[mentee_id].previous_at = taken_at
+        if velocity is not None:
+            inputs[mentee_id].previous_velocity = float(velocity)
+    return inputs
+
+
+# Scoring --------------------------------------------------------------------
+
+def _stage(score: float) -> str:
+    return next(stage for threshold, stage in STAGES if score >= threshold)
+
+
+def _window_label(score: float, velocity: Optional[float]) -> Optional[str]:
+    if score >= READY_SCORE:
+        return 'Ready now'
+    if not velocity:
+        return None
+    months = (READY_SCORE - score) / velocity
+    for limit, label in [(1, '0-1 months'), (3, '1-3 months'), (6, '3-6 months'), (12, '6-12 months')]:
+        if months <= limit:
+            return label
+    return '12+ months'
+
+
+def score_inputs(inputs: ReadinessInputs, now=None) -> dict:
+    """ReadinessSnapshot field values for one mentee's inputs."""
+    now = now or timezone.now()
+    masteries = [mastery for _, _, mastery in inputs.skills]
+    volume = min(1.0, inputs.approved_missions / MISSIONS_FOR_FULL_CREDIT)
+    breakdown = {
+        'technical': sum(masteries) / len(masteries) if masteries else 0.0,
+        'practical': inputs.mission_score_avg * 0.7 + volume * 30 if inputs.scored_missions else volume * 30,
+        'curriculum': inputs.curriculum_completion,
+        'behavioral': inputs.active_days / BEHAVIOR_WINDOW_DAYS * 100,
+    }
+    breakdown = {area: round(min(100.0, value), 2) for area, value in breakdown.items()}
+    score = round(sum(breakdown[area] * weight for area, weight in WEIGHTS.items()), 2)
+
+    # Points per month against a baseline at least VELOCITY_MIN_SPAN old; a shorter span
+    # would turn a few minutes' change into a monthly rate
+    velocity = inputs.previous_velocity
+    if inputs.previous_at is not None and now - inputs.previous_at >= VELOCITY_MIN_SPAN:
+        months = (now - inputs.previous_at).total_seconds() / (30 * 86400)
+        velocity = round(max(0.0, (score - inputs.previous_score) / months), 2)
+
+    ranked = sorted(inputs.skills, key=lambda skill: (-skill[2], skill[0]))
+    strengths = [
+        {'skill': name, 'category': category, 'mastery': mastery}
+        for name, category, mastery in ranked if mastery >= STRENGTH_MASTERY
+    ][:5]
+    weaknesses = [
+        {'skill': name, 'category': category, 'mastery': mastery, 'priority': 'high' if mastery < 30 else 'medium'}
+        for name, category, mastery in reversed(ranked) if mastery < WEAKNESS_MASTERY
+    ]
+    known = {name for name, _, _ in inputs.skills}
+    missing_skills = [
+        {'skill': skill, 'priority': 'high'} for skill in sorted(inputs.assigned_skills - known)
+    ]
+    improvement_plan = [
+        {'area': area, 'current': value, 'target': 60, 'action': IMPROVEMENT_ACTIONS[area]}
+        for area, value in sorted(breakdown.items(), key=lambda kv: kv[1]) if value < 60
+    ]
+    window = _window_label(score, velocity)
+    return {
+        'core_readiness_score': Decimal(str(score)),
+        'career_readiness_stage': _stage(score),
+        'learning_velocity': Decimal(str(velocity)) if velocity is not None else None,
+        'estimated_readiness_window': window,
+        'hiring_timeline_prediction': window,
+        'breakdown': breakdown,
+        'strengths': strengths,
+        'weaknesses': weaknesses,
+        'missing_skills': missing_skills,
+        'improvement_plan': improvement_plan,
+    }
+
+
+# Engine ---------------------------------------------------------------------
+
+def compute_snapshots(mentee_ids, now=None) -> list:
+    """Write one snapshot per mentee in a single bulk insert."""
+    from .models import ReadinessSnapshot
+    now = now or timezone.now()
+    inputs = load_inputs(mentee_ids, now)
+    snapshots = [
+        ReadinessSnapshot(mentee_id=mentee_id, snapshot_date=now, **score_inputs(inputs[mentee_id], now))
+        for mentee_id in mentee_ids
+    ]
+    created = ReadinessSnapshot.objects.bulk_create(snapshots, batch_size=BATCH_SIZE)
+    # bulk_create sends no post_save, so the mentee 360 profiles are refreshed here
+    from .mentee360 import refresh_many
+    refresh_many(mentee_ids, ('readiness',), now=now)
+    return created
+
+
+def run_readiness_engine(batch_size: int = BATCH_SIZE, until=None, now=None) -> dict:
+    """Sweep watermarks and mark stale mentees, then recompute every dirty mentee in batches."""
+    stats = {'marked': sweep_watermarks(until), 'stale': mark_stale(now), 'computed': 0, 'batches': 0}
+    while True:
+        mentee_ids = claim_dirty(batch_size)
+        if not mentee_ids:
+            break
+        try:
+            compute_snapshots(mentee_ids, now)
+        except Exception:
+            mark_dirty(mentee_ids)
+            raise
+        stats['computed'] += len(mentee_ids)
+        stats['batches'] += 1
+    logger.info(
+        f"[readiness] marked {stats['marked']} changed and {stats['stale']} stale, "
+        f"computed {stats['computed']} in {stats['batches']} batches"
+    )
+    return stats
+
+
+def prune_snapshots(now=None, batch_size: int = BATCH_SIZE) -> int:
+    """Delete snapshots past retention except each mentee's latest; returns rows deleted."""
+    from .models import ReadinessSnapshot
+    now = now or timezone.now()
+    days = getattr(settings, 'READINESS_SNAPSHOT_RETENTION_DAYS', DEFAULT_SNAPSHOT_RETENTION_DAYS)
+    newer = ReadinessSnapshot.objects.filter(
+        mentee_id=OuterRef('mentee_id'), snapshot_date__gt=OuterRef('snapshot_date'),
+    )
+    expired = ReadinessSnapshot.objects.filter(snapshot_date__lt=now - timedelta(days=days)).filter(Exists(newer))
+    deleted = 0
+    while True:
+        ids = list(expired.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted += ReadinessSnapshot.objects.filter(id__in=ids).delete()[0]
+    logger.info(f"[readiness] pruned {deleted} snapshots older than {days} days")
+    return deleted
+
+
+# Reads ----------------------------------------------------------------------
+
+def latest_readiness_score(outer_ref: str = 'user_id'):
+    """Subquery: core readiness score of the latest snapshot for the user at `outer_ref`."""
+    from .models import ReadinessSnapshot
+    return Subquery(
+        ReadinessSnapshot.objects.filter(mentee_id=OuterRef(outer_ref))
+        .order_by('-snapshot_date').values('core_readiness_score')[:1]
+    )
+
+
+def average_readiness(queryset, outer_ref: str = 'user_id') -> Optional[float]:
+    """Mean latest readiness over a queryset of rows pointing at users; None without snapshots."""
+    value = queryset.annotate(readiness=latest_readiness_score(outer_ref)).aggregate(avg=Avg('readiness'))['avg']
+    return round(float(value), 2) if value is not None else None
+
+
+def readiness_scores(queryset, outer_ref: str = 'user_id') -> list:
+    """Latest readiness of each row's user (None where no snapshot exists yet)."""
+    return [
+        float(score) if score is not None else None
+        for score in queryset.annotate(readiness=latest_readiness_score(outer_ref)).values_list('readiness', flat=True)
+    ]
@@ -0,0 +1,245 @@
+"""
+TalentScope signal rollups.
+
+SkillSignal and BehaviorSignal are append-mostly event tables. Analytics never need
+individual rows, so two derived tables are kept current as signals are written:
+
+  - BehaviorDailyRollup: per mentee, behavior type, source and day, the number of
+    signals and the sum of their values;
+  - SkillMastery: per mentee and skill, the mastery level of the most recently
+    written signal plus running totals (signal count, mastery sum, hours practiced).
+
+talentscope.signals applies each save and delete through this module; callers that
+bulk_create signals (which sends no post_save) pass the new rows to
+apply_behavior_signals / apply_skill_signals. Trend, heatmap and count reads are one
+indexed query against the rollups however long a mentee's history is.
+rebuild_mentee() recomputes both tables for a mentee from the raw signals.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+COMMUNITY_BEHAVIORS = ('engagement_level', 'collaboration')
+
+
+def _decimal(value) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value or 0))
+
+
+def signal_day(recorded_at):
+    """Calendar day a signal is rolled up under (the current time zone, as TruncDate uses)."""
+    if timezone.is_aware(recorded_at):
+        return timezone.localdate(recorded_at)
+    return recorded_at.date()
+
+
+# Behavior rollups -----------------------------------------------------------
+
+def behavior_key(signal) -> tuple:
+    """(mentee_id, behavior_type, source, day, value) for a BehaviorSignal."""
+    return (
+        signal.mentee_id, signal.behavior_type, signal.source,
+        signal_day(signal.recorded_at), _decimal(signal.value),
+    )
+
+
+def _add_behavior(mentee_id, behavior_type, source, day, count, total):
+    from .models import BehaviorDailyRollup
+    lookup = {'mentee_id': mentee_id, 'behavior_type': behavior_type, 'source': source, 'day': day}
+    if count > 0:
+        rollup, created = BehaviorDailyRollup.objects.get_or_create(
+            **lookup, defaults={'signal_count': count, 'value_total': total},
+        )
+        if created:
+            return
+        BehaviorDailyRollup.objects.filter(pk=rollup.pk).update(
+            signal_count=F('signal_count') + count, value_total=F('value_total') + total,
+        )
+    else:
+        rollups = BehaviorDailyRollup.objects.filter(**lookup)
+        rollups.update(signal_count=F('signal_count') + count, value_total=F('value_total') + total)
+        rollups.filter(signal_count__lte=0).delete()
+
+
+def apply_behavior_change(old=None, new=None):
+    """Move one signal's contribution from its old behavior_key() to its new one."""
+    if old == new:
+        return
+    if old is not None:
+        mentee_id, behavior_type, source, day, value = old
+        _add_behavior(mentee_id, behavior_type, source, day, -1, -value)
+    if new is not None:
+        mentee_id, behavior_type, source, day, value = new
+        _add_behavior(mentee_id, behavior_type, source, day, 1, value)
+
+
+def apply_behavior_signals(signals):
+    """Roll up newly inserted signals, one write per (mentee, type, source, day)."""
+    totals = defaultdict(lambda: [0, Decimal('0')])
+    for signal in signals:
+        *group, value = behavior_key(signal)
+        totals[tuple(group)][0] += 1
+        totals[tuple(group)][1] += value
+    for (mentee_id, behavior_type, source, day), (count, total) in totals.items():
+        _add_behavior(mentee_id, behavior_type, source, day, count, total)
+
+
+# Skill mastery --------------------------------------------------------------
+
+def skill_key(signal) -> tuple:
+    """(skill_name, mastery_level, hours_practiced) for a SkillSignal."""
+    return signal.skill_name, _decimal(signal.mastery_level), _decimal(signal.hours_practiced)
+
+
+def rebuild_skill(mentee_id, skill_name):
+    """Recompute one SkillMastery row from the raw signals (used after deletes)."""
+    from .models import SkillMastery, SkillSignal
+    signals = SkillSignal.objects.filter(mentee_id=mentee_id, skill_name=skill_name)
+    latest = signals.order_by('-updated_at', '-created_at').first()
+    if latest is None:
+        SkillMastery.objects.filter(mentee_id=mentee_id, skill_name=skill_name).delete()
+        return None
+    totals = signals.aggregate(
+        count=Count('id'), mastery=Sum('mastery_level'), hours=Sum('hours_practiced'), practiced=Max('last_practiced'),
+    )
+    mastery, _ = SkillMastery.objects.update_or_create(
+        mentee_id=mentee_id,
+        skill_name=skill_name,
+        defaults={
+            'skill_category': latest.skill_category,
+            'mastery_level': latest.mastery_level,
+            'mastery_total': totals['mastery'] or 0,
+            'hours_practiced': totals['hours'] or 0,
+            'signal_count': totals['count'],
+            'last_practiced': totals['practiced'],
+            'latest_signal_at': latest.updated_at,
+        },
+    )
+    return mastery
+
+
+def apply_skill_signal(signal, old=None):
+    """
+    Fold one written signal into its SkillMastery row. `old` is the stored
+    skill_key() before an update, None for a new signal.
+    """
+    from .models import SkillMastery
+    name, level, hours = skill_key(signal)
+    if old is not None and old[0] != name:
+        rebuild_skill(signal.mentee_id, old[0])
+        old = None
+    with transaction.atomic():
+        mastery, created = SkillMastery.objects.select_for_update().get_or_create(
+            mentee_id=signal.mentee_id,
+            skill_name=name,
+            defaults={
+                'skill_category': signal.skill_category,
+                'mastery_level': level,
+                'mastery_total': level,
+                'hours_practiced': hours,
+                'signal_count': 1,
+                'last_practiced': signal.last_practiced,
+                'latest_signal_at': signal.updated_at,
+            },
+        )
+        if created:
+            return mastery
+        if old is None:
+            mastery.signal_count += 1
+        else:
+            mastery.mastery_total -= old[1]
+            mastery.hours_practiced -= old[2]
+        mastery.mastery_total += level
+        mastery.hours_practiced += hours
+        if signal.last_practiced and (not mastery.last_practiced or signal.last_practiced > mastery.last_practiced):
+            mastery.last_practiced = signal.last_practiced
+        if signal.updated_at >= mastery.latest_signal_at:
+            mastery.mastery_level = level
+            mastery.skill_category = signal.skill_category
+            mastery.latest_signal_at = signal.updated_at
+        mastery.save()
+    return mastery
+
+
+def apply_skill_signals(signals):
+    """Fold newly inserted signals in, oldest first so the newest sets mastery_level."""
+    for signal in sorted(signals, key=lambda s: s.updated_at):
+        apply_skill_signal(signal)
+
+
+# Rebuild --------------------------------------------------------------------
+
+def rebuild_mentee(mentee_id):
+    """Recompute a mentee's behavior rollups and skill mastery from the raw signals."""
+    from .models import BehaviorDailyRollup, BehaviorSignal, SkillMastery, SkillSignal
+    with transaction.atomic():
+        BehaviorDailyRollup.objects.filter(mentee_id=mentee_id).delete()
+        BehaviorDailyRollup.objects.bulk_create([
+            BehaviorDailyRollup(
+                mentee_id=mentee_id, behavior_type=row['behavior_type'], source=row['source'], day=row['day'],
+                signal_count=row['count'], value_total=row['total'],
+            )
+            for row in BehaviorSignal.objects.filter(mentee_id=mentee_id).annotate(day=TruncDate('recorded_at'))
+            .values('behavior_type', 'source', 'day').annotate(count=Count('id'), total=Sum('value'))
+            .order_by()
+        ])
+        SkillMastery.objects.filter(mentee_id=mentee_id).delete()
+        for skill_name in SkillSignal.objects.filter(mentee_id=mentee_id).values_list(
+            'skill_name', flat=True,
+        ).distinct().order_by():
+            rebuild_skill(mentee_id, skill_name)
+
+
+# Reads ----------------------------------------------------------------------
+
+def daily_behavior(mentee_id, start=None, end=None):
+    """
+    {day: {'missions_completed', 'hours_studied', 'reflections_count'}} for each day
+    in [start, end] with at least one behavior signal.
+    """
+    from .models import BehaviorDailyRollup
+    rollups = BehaviorDailyRollup.objects.filter(mentee_id=mentee_id)
+    if start is not None:
+        rollups = rollups.filter(day__gte=start)
+    if end is not None:
+        rollups = rollups.filter(day__lte=end)
+    rows = rollups.values('day').annotate(
+        missions=Sum('value_total', filter=Q(behavior_type='mission_completion')),
+        hours=Sum('value_total', filter=Q(behavior_type='study_consistency')),
+        reflections=Sum('signal_count', filter=Q(behavior_type='reflection_frequency')),
+    ).order_by('day')
+    return {
+        row['day']: {
+            'missions_completed': int(row['missions'] or 0),
+            'hours_studied': float(row['hours'] or 0),
+            'reflections_count': int(row['reflections'] or 0),
+        }
+        for row in rows
+    }
+
+
+def signal_counts(mentee_id) -> dict:
+    """Lifetime habit-log and community-engagement signal counts."""
+    from .models import BehaviorDailyRollup
+    totals = BehaviorDailyRollup.objects.filter(mentee_id=mentee_id).aggregate(
+        habit_logs=Sum('signal_count', filter=Q(source='habit_log')),
+        community_engagement=Sum('signal_count', filter=Q(behavior_type__in=COMMUNITY_BEHAVIORS)),
+    )
+    return {key: int(value or 0) for key, value in totals.items()}
+
+
+def skill_mastery(mentee_id, category=None, start=None, end=None):
+    """SkillMastery rows for a mentee, optionally limited to skills signalled in [start, end]."""
+    from .models import SkillMastery
+    masteries = SkillMastery.objects.filter(mentee_id=mentee_id)
+    if category:
+        masteries = masteries.filter(skill_category=category)
+    if start is not None:
+        masteries = masteries.filter(latest_signal_at__gte=start)
+    if end is not None:
+        masteries = masteries.filter(latest_signal_at__lte=end)
+    return masteries.order_by('-mastery_level', 'skill_name')
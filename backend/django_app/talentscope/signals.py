@@ -0,0 +1,128 @@
+"""
+Signals for TalentScope — keep behavior rollups and skill mastery in sync with the raw signals.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.signal_utils import is_cascade, previous, remember_previous
+
+
+@receiver(pre_save, sender='talentscope.BehaviorSignal')
+def remember_behavior_signal(sender, instance, raw=False, **kwargs):
+    """Record the stored signal so post_save can move it between rollups."""
+    remember_previous(
+        sender, instance, '_rollup_previous',
+        lambda rows: rows.only('mentee_id', 'behavior_type', 'source', 'recorded_at', 'value').first(),
+        raw,
+    )
+
+
+@receiver(post_save, sender='talentscope.BehaviorSignal')
+def update_behavior_rollup_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .rollups import apply_behavior_change, behavior_key
+    apply_behavior_change(old=previous(instance, '_rollup_previous', behavior_key), new=behavior_key(instance))
+
+
+@receiver(post_delete, sender='talentscope.BehaviorSignal')
+def update_behavior_rollup_on_delete(sender, instance, origin=None, **kwargs):
+    # A user delete removes the rollups along with the signals.
+    if is_cascade(sender, origin):
+        return
+    from .rollups import apply_behavior_change, behavior_key
+    apply_behavior_change(old=behavior_key(instance))
+
+
+@receiver(pre_save, sender='talentscope.SkillSignal')
+def remember_skill_signal(sender, instance, raw=False, **kwargs):
+    remember_previous(
+        sender, instance, '_mastery_previous',
+        lambda rows: rows.only('skill_name', 'mastery_level', 'hours_practiced').first(),
+        raw,
+    )
+
+
+@receiver(post_save, sender='talentscope.SkillSignal')
+def update_skill_mastery_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    from .rollups import apply_skill_signal, skill_key
+    apply_skill_signal(instance, old=previous(instance, '_mastery_previous', skill_key))
+
+
+@receiver(post_delete, sender='talentscope.SkillSignal')
+def update_skill_mastery_on_delete(sender, instance, origin=None, **kwargs):
+    if is_cascade(sender, origin):
+        return
+    from .rollups import rebuild_skill
+    rebuild_skill(instance.mentee_id, instance.skill_name)
+
+
+@receiver(post_delete, sender='talentscope.SkillSignal')
+@receiver(post_delete, sender='talentscope.BehaviorSignal')
+@receiver(post_delete, sender='curriculum.UserTrackProgress')
+def mark_readiness_dirty_on_delete(sender, instance, origin=None, **kwargs):
+    # Writes are picked up by the readiness watermark sweep; deletes leave no row to find.
+    if is_cascade(sender, origin):
+        return
+    from .readiness import mark_dirty
+    mark_dirty([getattr(instance, 'mentee_id', None) or getattr(instance, 'user_id', None)])
+
+
+@receiver(post_delete, sender='missions.MissionSubmission')
+def mark_readiness_dirty_on_submission_delete(sender, instance, origin=None, **kwargs):
+    if is_cascade(sender, origin):
+        return
+    from users.models import User
+    from .readiness import mark_dirty
+    mark_dirty(User.objects.filter(uuid_id=instance.student_id).values_list('id', flat=True))
+
+
+# Mentee 360 profiles (talentscope.mentee360) --------------------------------
+
+@receiver(post_save, sender='talentscope.SkillSignal')
+@receiver(post_delete, sender='talentscope.SkillSignal')
+def refresh_profile_skills(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or is_cascade(sender, origin):
+        return
+    from .mentee360 import refresh_on_commit
+    refresh_on_commit(instance.mentee_id, 'skills')
+
+
+@receiver(post_save, sender='talentscope.BehaviorSignal')
+@receiver(post_delete, sender='talentscope.BehaviorSignal')
+def refresh_profile_behavior(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or is_cascade(sender, origin):
+        return
+    from .mentee360 import refresh_on_commit
+    refresh_on_commit(instance.mentee_id, 'behavior')
+
+
+@receiver(post_save, sender='talentscope.ReadinessSnapshot')
+@receiver(post_delete, sender='talentscope.ReadinessSnapshot')
+def refresh_profile_readiness(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or is_cascade(sender, origin):
+        return
+    from .mentee360 import refresh_on_commit
+    refresh_on_commit(instance.mentee_id, 'readiness')
+
+
+@receiver(post_save, sender='missions.MissionSubmission')
+@receiver(post_delete, sender='missions.MissionSubmission')
+def refresh_profile_missions(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or is_cascade(sender, origin):
+        return
+    from users.models import User
+    from .mentee360 import refresh_on_commit
+    # MissionSubmission.student points at User.uuid_id
+    refresh_on_commit(User.objects.filter(uuid_id=instance.student_id).values_list('id', flat=True).first(), 'missions')
+
+
+@receiver(post_save, sender='mentorship_coordination.MentorSession')
+@receiver(post_delete, sender='mentorship_coordination.MentorSession')
+def refresh_profile_sessions(sender, instance, raw=False, origin=None, **kwargs):
+    if raw or is_cascade(sender, origin):
+        return
+    from .mentee360 import refresh_on_commit
+    refresh_on_commit(instance.mentee_id, 'sessions')
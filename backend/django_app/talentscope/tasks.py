@@ -0,0 +1,46 @@
+"""
+Background tasks for TalentScope.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    from celery import shared_task
+except ImportError:
+    def shared_task(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
+
+@shared_task(name='talentscope.compute_readiness_snapshots')
+def compute_readiness_snapshots_task(batch_size=None):
+    """
+    Celery beat entry point for the incremental readiness engine.
+
+    Only the worker holding the leader lock drains the dirty set; others return at once.
+    """
+    from core.locks import leader_lock
+    from .readiness import BATCH_SIZE, run_readiness_engine
+
+    with leader_lock('talentscope.readiness_engine') as leader:
+        if not leader:
+            logger.info("Readiness engine already running on another worker; skipping")
+            return {'status': 'skipped'}
+        stats = run_readiness_engine(batch_size=batch_size or BATCH_SIZE)
+    return {'status': 'success', **stats}
+
+
+@shared_task(name='talentscope.prune_readiness_snapshots')
+def prune_readiness_snapshots_task():
+    """Delete readiness snapshots past READINESS_SNAPSHOT_RETENTION_DAYS, keeping each mentee's latest."""
+    from core.locks import leader_lock
+    from .readiness import prune_snapshots
+
+    with leader_lock('talentscope.prune_readiness_snapshots') as leader:
+        if not leader:
+            logger.info("Readiness snapshot pruning already running on another worker; skipping")
+            return {'status': 'skipped'}
+        deleted = prune_snapshots()
+    return {'status': 'success', 'deleted': deleted}
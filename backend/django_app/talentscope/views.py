@@ -3,8 +3,7 @@ API views for TalentScope analytics.
 Analyst role: read-only access; consent-gated for cross-user data; all access audited.
 """
 from datetime import datetime, timedelta
-from django.db.models import Avg, Count, Sum, Q, F, Max
-from django.db.models.functions import TruncDate
+from django.db.models import Avg
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
@@ -13,7 +12,9 @@ from rest_framework.response import Response
 from users.models import User
 from users.utils.consent_utils import check_consent
 from users.utils.audit_utils import log_analytics_access
-from .models import SkillSignal, BehaviorSignal, MentorInfluence, ReadinessSnapshot
+from users.utils.identity_snapshot import get_user_role_names
+from . import rollups
+from .models import ReadinessSnapshot
 from .serializers import (
     ReadinessOverTimeSerializer,
     SkillHeatmapSerializer,
@@ -26,7 +27,7 @@ from .serializers import (
 
 def _can_access_mentee_analytics(request, mentee):
     """RLS/consent: analyst/admin can access; others only self; cross-user requires analytics consent."""
-    user_roles = [ur.role.name for ur in request.user.user_roles.filter(is_active=True)]
+    user_roles = get_user_role_names(request.user)
     is_analyst = 'analyst' in user_roles
     is_admin = 'admin' in user_roles
     if request.user.id == mentee.id:
@@ -124,38 +125,28 @@ def skills_heatmap(request, mentee_id):
     end_date = request.query_params.get('end_date')
     skill_category = request.query_params.get('skill_category')
     
-    # Query skill signals
-    skills = SkillSignal.objects.filter(mentee=mentee)
-    
-    if skill_category:
-        skills = skills.filter(skill_category=skill_category)
-    
+    start = end = None
     if start_date:
         try:
             start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            skills = skills.filter(created_at__gte=start)
         except ValueError:
             pass
     
     if end_date:
         try:
             end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            skills = skills.filter(created_at__lte=end)
         except ValueError:
             pass
     
-    # Get latest mastery level for each skill
-    latest_skills = skills.values('skill_name', 'skill_category').annotate(
-        mastery_level=Avg('mastery_level'),
-        last_practiced=Max('last_practiced')
-    ).order_by('-mastery_level')
+    # Latest mastery level for each skill signalled in the range
+    latest_skills = rollups.skill_mastery(mentee.id, category=skill_category, start=start, end=end)
     
     result = [
         {
-            'skill_name': item['skill_name'],
-            'category': item['skill_category'],
-            'mastery_level': float(item['mastery_level']),
-            'last_practiced': item['last_practiced'].isoformat() if item['last_practiced'] else None
+            'skill_name': item.skill_name,
+            'category': item.skill_category,
+            'mastery_level': float(item.mastery_level),
+            'last_practiced': item.last_practiced.isoformat() if item.last_practiced else None
         }
         for item in latest_skills
     ]
@@ -187,31 +178,25 @@ def skill_mastery(request, mentee_id):
 
     category = request.query_params.get('category')
     
-    # Query skill signals
-    skills = SkillSignal.objects.filter(mentee=mentee)
-    
-    if category:
-        skills = skills.filter(skill_category=category)
-    
-    # Aggregate by skill
-    skill_data = skills.values('skill_name', 'skill_category').annotate(
-        mastery_percentage=Avg('mastery_level'),
-        hours_practiced=Sum('hours_practiced'),
-        last_updated=Max('updated_at')
-    ).order_by('-mastery_percentage')
+    # Per-skill averages and totals kept on SkillMastery
+    skill_data = sorted(
+        rollups.skill_mastery(mentee.id, category=category),
+        key=lambda item: item.average_mastery,
+        reverse=True
+    )
     
     result = []
     for item in skill_data:
         # Generate a deterministic UUID from skill name for consistency
         import hashlib
-        skill_id = hashlib.md5(f"{mentee_id}-{item['skill_name']}".encode()).hexdigest()
+        skill_id = hashlib.md5(f"{mentee_id}-{item.skill_name}".encode()).hexdigest()
         result.append({
             'skill_id': skill_id,
-            'skill_name': item['skill_name'],
-            'category': item['skill_category'],
-            'mastery_percentage': float(item['mastery_percentage']),
-            'hours_practiced': float(item['hours_practiced'] or 0),
-            'last_updated': item['last_updated'].isoformat() if item['last_updated'] else None
+            'skill_name': item.skill_name,
+            'category': item.skill_category,
+            'mastery_percentage': float(item.average_mastery),
+            'hours_practiced': float(item.hours_practiced or 0),
+            'last_updated': item.updated_at.isoformat() if item.updated_at else None
         })
     
     return Response(result, status=status.HTTP_200_OK)
@@ -243,49 +228,25 @@ def behavioral_trends(request, mentee_id):
     start_date = request.query_params.get('start_date')
     end_date = request.query_params.get('end_date')
 
-    # Query behavior signals
-    behaviors = BehaviorSignal.objects.filter(mentee=mentee)
-    
+    start = end = None
     if start_date:
         try:
-            start = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-            behaviors = behaviors.filter(recorded_at__gte=start)
+            start = rollups.signal_day(datetime.fromisoformat(start_date.replace('Z', '+00:00')))
         except ValueError:
             pass
     
     if end_date:
         try:
-            end = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-            behaviors = behaviors.filter(recorded_at__lte=end)
+            end = rollups.signal_day(datetime.fromisoformat(end_date.replace('Z', '+00:00')))
         except ValueError:
             pass
     
-    # Group by date and aggregate
-    trends = behaviors.annotate(
-        date=TruncDate('recorded_at')
-    ).values('date').annotate(
-        missions_completed=Sum(
-            'value',
-            filter=Q(behavior_type='mission_completion')
-        ) or 0,
-        hours_studied=Sum(
-            'value',
-            filter=Q(behavior_type='study_consistency')
-        ) or 0,
-        reflections_count=Count(
-            'id',
-            filter=Q(behavior_type='reflection_frequency')
-        )
-    ).order_by('date')
+    # Daily totals from the behavior rollups
+    trends = rollups.daily_behavior(mentee.id, start=start, end=end)
     
     result = [
-        {
-            'date': item['date'].strftime('%Y-%m-%d') if item['date'] else None,
-            'missions_completed': int(item['missions_completed'] or 0),
-            'hours_studied': float(item['hours_studied'] or 0),
-            'reflections_count': item['reflections_count'] or 0
-        }
-        for item in trends
+        {'date': day.strftime('%Y-%m-%d'), **totals}
+        for day, totals in trends.items()
     ]
     
     return Response(result, status=status.HTTP_200_OK)
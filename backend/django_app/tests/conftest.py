@@ -11,6 +11,18 @@ from organizations.models import Organization
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def unbuffered_writes(settings):
+    """
+    Write buffered rows synchronously so tests can assert on them right away: audit
+    logs, Foundations progress heartbeats and community post views. Tests of a buffer
+    turn its flag back on.
+    """
+    settings.AUDIT_BUFFER_ENABLED = False
+    settings.FOUNDATIONS_HEARTBEAT_BUFFER_ENABLED = False
+    settings.COMMUNITY_VIEW_BUFFER_ENABLED = False
+
+
 @pytest.fixture
 def api_client():
     """API client for making requests."""
@@ -0,0 +1,137 @@
+"""
+Tests for the buffered audit log writer and partition-aware audit queries.
+
+Covers:
+- users.utils.audit_buffer.AuditLogBuffer (size/explicit flush, shutdown flush)
+- users.utils.audit_utils.log_audit_event buffering and sync writes
+- users.utils.audit_partitions helpers
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.utils import timezone
+
+from users.audit_models import AuditLog
+from users.utils import audit_buffer
+from users.utils.audit_buffer import AuditLogBuffer
+from users.utils.audit_partitions import (
+    add_months,
+    audit_logs_between,
+    drop_expired_audit_partitions,
+    month_start,
+    partition_name,
+)
+from users.utils.audit_utils import log_audit_event
+
+
+def _entry(**kwargs):
+    defaults = {
+        'actor_type': 'system',
+        'actor_identifier': 'system',
+        'action': 'read',
+        'resource_type': 'talentscope',
+        'timestamp': timezone.now(),
+    }
+    defaults.update(kwargs)
+    return AuditLog(**defaults)
+
+
+@pytest.fixture
+def buffered(settings, monkeypatch):
+    """Enable buffering with a fresh buffer that only flushes explicitly or on size."""
+    settings.AUDIT_BUFFER_ENABLED = True
+    buffer = AuditLogBuffer(max_size=5, flush_interval=0)
+    monkeypatch.setattr(audit_buffer._buffer, 'instance', buffer)
+    return buffer
+
+
+@pytest.mark.django_db
+class TestAuditLogBuffer:
+    """Test AuditLogBuffer queueing and bulk flushing."""
+
+    def test_entries_are_queued_until_flush(self, buffered, django_assert_num_queries):
+        with django_assert_num_queries(0):
+            for _ in range(3):
+                buffered.write(_entry())
+        assert buffered.pending() == 3
+        assert AuditLog.objects.count() == 0
+
+        with django_assert_num_queries(1):
+            assert buffered.flush() == 3
+        assert AuditLog.objects.count() == 3
+        assert buffered.pending() == 0
+
+    def test_size_threshold_triggers_flush(self, buffered):
+        for _ in range(5):
+            buffered.write(_entry())
+        assert AuditLog.objects.count() == 5
+        assert buffered.pending() == 0
+
+    def test_shutdown_flushes_remaining_entries(self, buffered):
+        buffered.write(_entry(action='login'))
+        buffered.shutdown()
+        assert AuditLog.objects.filter(action='login').count() == 1
+
+    def test_failed_flush_is_swallowed(self, buffered, monkeypatch):
+        def boom(*args, **kwargs):
+            raise RuntimeError('db down')
+        monkeypatch.setattr(AuditLog.objects, 'bulk_create', boom)
+        buffered.write(_entry())
+        assert buffered.flush() == 0
+
+
+@pytest.mark.django_db
+class TestLogAuditEvent:
+    """Test log_audit_event routing through the buffer."""
+
+    def test_log_audit_event_is_buffered(self, buffered):
+        entry = log_audit_event(request=None, user=None, action='read', resource_type='profiler')
+        assert entry is not None and entry.pk is None
+        assert AuditLog.objects.count() == 0
+        buffered.flush()
+        assert AuditLog.objects.filter(resource_type='profiler').count() == 1
+
+    def test_sync_writes_immediately(self, buffered):
+        entry = log_audit_event(request=None, user=None, action='login', resource_type='user', result='failure', sync=True)
+        assert entry.pk is not None
+        assert buffered.pending() == 0
+
+    def test_disabled_buffer_writes_immediately(self, settings):
+        settings.AUDIT_BUFFER_ENABLED = False
+        entry = log_audit_event(request=None, user=None, action='read', resource_type='profiler')
+        assert entry.pk is not None
+
+
+class TestPartitionHelpers:
+    """Test month arithmetic used for partition names."""
+
+    def test_month_helpers(self):
+        assert month_start(date(2026, 3, 17)) == date(2026, 3, 1)
+        assert month_start(datetime(2026, 3, 31, 23, 30, tzinfo=dt_timezone.utc)) == date(2026, 3, 1)
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert partition_name(date(2026, 2, 1)) == 'audit_logs_y2026m02'
+
+
+@pytest.mark.django_db
+class TestPartitionedQueries:
+    """Test range queries and retention on the active database."""
+
+    def test_audit_logs_between_is_half_open(self):
+        now = timezone.now()
+        AuditLog.objects.bulk_create([
+            _entry(timestamp=now - timedelta(days=40)),
+            _entry(timestamp=now - timedelta(days=10)),
+            _entry(timestamp=now),
+        ])
+        assert audit_logs_between(now - timedelta(days=30), now).count() == 1
+        assert audit_logs_between(now - timedelta(days=30)).count() == 2
+
+    def test_retention_removes_expired_rows(self):
+        today = date.today()
+        AuditLog.objects.bulk_create([
+            _entry(timestamp=timezone.now() - timedelta(days=400)),
+            _entry(timestamp=timezone.now()),
+        ])
+        drop_expired_audit_partitions(retention_months=6, today=today)
+        assert AuditLog.objects.count() == 1
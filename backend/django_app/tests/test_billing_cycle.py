@@ -0,0 +1,220 @@
+"""
+Test suite for the billing-cycle engine (subscriptions/billing_cycle.py).
+
+Covers:
+- grace-period and canceled-period downgrades to the active Free plan
+- renewals write one idempotent payment per billing period
+- a run interrupted mid-way resumes from its checkpoint without double billing, also
+  when the next trigger falls in a new schedule slot
+- query counts stay constant per chunk
+- the beat task skips when another worker holds the leader lock
+"""
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.locks import leader_lock
+from subscriptions import billing_cycle
+from subscriptions.billing_cycle import (
+    DOWNGRADE_CANCELED, DOWNGRADE_PAST_DUE, RENEW_ACTIVE, run_billing_cycle, run_billing_job,
+)
+from subscriptions.models import BillingCycleRun, PaymentTransaction, SubscriptionPlan, UserSubscription
+from subscriptions.tasks import run_billing_cycle_task
+
+User = get_user_model()
+
+
+@pytest.fixture
+def plans(db):
+    free = SubscriptionPlan.objects.create(name='free', tier='free', price_monthly=0)
+    paid = SubscriptionPlan.objects.create(name='starter_3', tier='starter', price_monthly=3)
+    return free, paid
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def _subscriptions(plan, count, prefix, **fields):
+    subs = []
+    for i in range(count):
+        user = User.objects.create_user(username=f'{prefix}{i}@test.com', email=f'{prefix}{i}@test.com', password='x')
+        subs.append(UserSubscription.objects.create(user=user, plan=plan, **fields))
+    return subs
+
+
+def _age(subs, **fields):
+    UserSubscription.objects.filter(id__in=[s.id for s in subs]).update(**fields)
+
+
+@pytest.mark.django_db
+class TestDowngrades:
+    def test_past_due_after_grace_and_expired_canceled(self, plans):
+        free, paid = plans
+        now = timezone.now()
+        overdue = _subscriptions(paid, 2, 'overdue', status='past_due')
+        in_grace = _subscriptions(paid, 1, 'grace', status='past_due')
+        expired = _subscriptions(paid, 1, 'expired', status='canceled', current_period_end=now - timedelta(days=1))
+        running = _subscriptions(paid, 1, 'running', status='canceled', current_period_end=now + timedelta(days=5))
+        _age(overdue, updated_at=now - timedelta(days=6))
+
+        run_billing_cycle(as_of=now, jobs=[DOWNGRADE_PAST_DUE, DOWNGRADE_CANCELED])
+
+        for sub in overdue:
+            sub.refresh_from_db()
+            assert (sub.plan_id, sub.status) == (free.id, 'canceled')
+        for sub in in_grace + running:
+            sub.refresh_from_db()
+            assert sub.plan_id == paid.id
+        expired[0].refresh_from_db()
+        assert expired[0].plan_id == free.id
+
+    def test_retired_free_plan_is_not_used(self, plans):
+        free, paid = plans
+        retired = SubscriptionPlan.objects.create(name='free_legacy', tier='free', price_monthly=0, is_active=False)
+        SubscriptionPlan.objects.filter(id=retired.id).update(created_at=free.created_at - timedelta(days=1))
+        now = timezone.now()
+        expired = _subscriptions(paid, 1, 'expired', status='canceled', current_period_end=now - timedelta(days=1))
+
+        run_billing_cycle(as_of=now, jobs=[DOWNGRADE_CANCELED])
+
+        expired[0].refresh_from_db()
+        assert expired[0].plan_id == free.id
+
+    def test_completed_slot_is_not_rerun(self, plans):
+        free, paid = plans
+        now = timezone.now()
+        first = run_billing_job(DOWNGRADE_CANCELED, as_of=now)
+        late = _subscriptions(paid, 1, 'late', status='canceled', current_period_end=now - timedelta(days=1))
+
+        second = run_billing_job(DOWNGRADE_CANCELED, as_of=now)
+
+        assert second.skipped and second.run_key == first.run_key
+        late[0].refresh_from_db()
+        assert late[0].plan_id == paid.id
+        assert run_billing_job(DOWNGRADE_CANCELED, as_of=now + timedelta(hours=12)).processed == 1
+
+    def test_run_killed_mid_way_is_finished_by_next_slot(self, plans):
+        free, paid = plans
+        now = timezone.now()
+        _subscriptions(paid, 5, 'killed', status='canceled', current_period_end=now - timedelta(days=1))
+        original = billing_cycle._apply_chunk
+        calls = {'n': 0}
+
+        def die_on_second_chunk(*args):
+            calls['n'] += 1
+            if calls['n'] == 2:
+                raise RuntimeError('worker died')
+            return original(*args)
+
+        with mock.patch.object(billing_cycle, '_apply_chunk', die_on_second_chunk):
+            with pytest.raises(RuntimeError):
+                run_billing_job(DOWNGRADE_CANCELED, as_of=now, chunk_size=2)
+        killed = BillingCycleRun.objects.get(job=DOWNGRADE_CANCELED)
+
+        # The next beat trigger lands in the next 12-hour slot
+        result = run_billing_job(DOWNGRADE_CANCELED, as_of=now + timedelta(hours=12), chunk_size=2)
+
+        killed.refresh_from_db()
+        assert result.run_key != killed.run_key and result.resumed
+        assert (killed.status, killed.processed) == ('completed', 5)
+        assert BillingCycleRun.objects.filter(job=DOWNGRADE_CANCELED, status='running').count() == 0
+        assert UserSubscription.objects.filter(plan=free).count() == 5
+
+
+@pytest.mark.django_db
+class TestRenewals:
+    def test_renewal_extends_period_and_bills_once(self, plans):
+        _, paid = plans
+        now = timezone.now()
+        due = _subscriptions(paid, 3, 'due', status='active', current_period_end=now - timedelta(hours=1))
+
+        result = run_billing_job(RENEW_ACTIVE, as_of=now, chunk_size=2)
+
+        assert (result.processed, result.chunks) == (3, 2)
+        assert PaymentTransaction.objects.filter(status='completed', amount=3).count() == 3
+        for sub in due:
+            sub.refresh_from_db()
+            assert sub.current_period_end > now + timedelta(days=29)
+        # A later slot finds nothing due, so nothing is billed twice
+        assert run_billing_job(RENEW_ACTIVE, as_of=now + timedelta(days=1)).processed == 0
+        assert PaymentTransaction.objects.count() == 3
+
+    def test_interrupted_run_resumes_without_double_billing(self, plans):
+        _, paid = plans
+        now = timezone.now()
+        _subscriptions(paid, 5, 'resume', status='active', current_period_end=now - timedelta(hours=1))
+
+        calls = {'n': 0}
+        original = billing_cycle._apply_chunk
+
+        def fail_second_chunk(*args):
+            calls['n'] += 1
+            if calls['n'] == 2:
+                raise RuntimeError('worker died')
+            return original(*args)
+
+        with mock.patch.object(billing_cycle, '_apply_chunk', fail_second_chunk):
+            with pytest.raises(RuntimeError):
+                run_billing_job(RENEW_ACTIVE, as_of=now, chunk_size=2)
+
+        run = BillingCycleRun.objects.get(job=RENEW_ACTIVE)
+        assert (run.status, run.processed, run.chunks) == ('running', 2, 1)
+        assert PaymentTransaction.objects.count() == 2
+
+        result = run_billing_job(RENEW_ACTIVE, as_of=now + timedelta(minutes=5), chunk_size=2)
+
+        assert result.resumed and result.processed == 3
+        run.refresh_from_db()
+        assert (run.status, run.processed) == ('completed', 5)
+        assert PaymentTransaction.objects.count() == 5
+
+    def test_replayed_chunk_does_not_duplicate_payments(self, plans):
+        _, paid = plans
+        now = timezone.now()
+        sub = _subscriptions(paid, 1, 'replay', status='active', current_period_end=now - timedelta(hours=1))[0]
+        row = UserSubscription.objects.filter(id=sub.id).values(
+            'id', 'user_id', 'current_period_end', 'plan__price_monthly', 'plan__name',
+        ).get()
+
+        billing_cycle._apply_chunk(RENEW_ACTIVE, [row], now, None)
+        billing_cycle._apply_chunk(RENEW_ACTIVE, [row], now, None)
+
+        assert PaymentTransaction.objects.filter(subscription=sub).count() == 1
+
+
+@pytest.mark.django_db
+class TestBillingCycleQueries:
+    def _queries(self, job, as_of):
+        with CaptureQueriesContext(connection) as queries:
+            result = run_billing_job(job, as_of=as_of, chunk_size=5)
+        return len(queries) / (result.chunks + 1)
+
+    def test_queries_per_chunk_do_not_grow_with_chunk_size(self, plans):
+        _, paid = plans
+        now = timezone.now()
+        _subscriptions(paid, 5, 'small', status='active', current_period_end=now - timedelta(hours=1))
+        small = self._queries(RENEW_ACTIVE, now)
+
+        _subscriptions(paid, 10, 'large', status='active', current_period_end=now)
+        large = self._queries(RENEW_ACTIVE, now + timedelta(days=1))
+
+        assert PaymentTransaction.objects.count() == 15
+        assert large <= small
+
+
+@pytest.mark.django_db
+class TestLeaderLock:
+    def test_task_skips_when_not_leader(self, plans, locmem_cache):
+        if connection.vendor == 'postgresql':
+            pytest.skip('Session advisory locks are re-entrant within one connection')
+        with leader_lock('subscriptions.billing_cycle') as leader:
+            assert leader
+            assert run_billing_cycle_task(jobs=[RENEW_ACTIVE]) == {'status': 'skipped'}
+        assert run_billing_cycle_task(jobs=[RENEW_ACTIVE])['status'] == 'success'
@@ -0,0 +1,155 @@
+"""
+Test suite for the community cache layer (community/cache.py).
+
+Covers:
+- generation bumps invalidate only the namespace's entries, without deleting keys
+- single-flight recompute under concurrent misses
+- stale-while-revalidate while another caller holds the recompute lock
+- probabilistic early refresh
+- cached_feed / FeedCacheManager wiring and hit-ratio counters
+"""
+import threading
+import time
+
+import pytest
+from django.core.cache.backends.locmem import LocMemCache
+
+from community import cache as community_cache_module
+from community.cache import FeedCacheManager, GenerationalCache, LOCK_PREFIX, cached_feed
+
+
+@pytest.fixture
+def backend():
+    backend = LocMemCache('community-cache-tests', {})
+    yield backend
+    backend.clear()
+
+
+@pytest.fixture
+def gcache(backend):
+    return GenerationalCache(backend=backend, lock_wait=1.0)
+
+
+class Compute:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            value = self.calls
+        time.sleep(self.delay)
+        return value
+
+
+class TestGenerations:
+    def test_bump_invalidates_only_its_namespace(self, gcache):
+        uni_a, uni_b = Compute(), Compute()
+        read_a = lambda: gcache.get_or_compute('feed:a', uni_a, 60, ['feed:university:a'])  # noqa: E731
+        read_b = lambda: gcache.get_or_compute('feed:b', uni_b, 60, ['feed:university:b'])  # noqa: E731
+
+        assert (read_a(), read_b()) == (1, 1)
+        gcache.bump('feed:university:a')
+
+        assert (read_a(), read_b()) == (2, 1)
+        assert (uni_a.calls, uni_b.calls) == (2, 1)
+
+    def test_evicted_counter_still_invalidates(self, gcache, backend):
+        compute = Compute()
+        gcache.get_or_compute('k', compute, 60, ['ns'])
+        backend.delete(gcache.generation_key('ns'))
+
+        assert gcache.get_or_compute('k', compute, 60, ['ns']) == 2
+
+
+class TestRecompute:
+    def test_concurrent_misses_recompute_once(self, gcache):
+        compute = Compute(delay=0.1)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def reader():
+            barrier.wait()
+            results.append(gcache.get_or_compute('hot', compute, 60, ['feed:global']))
+
+        workers = [threading.Thread(target=reader) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert compute.calls == 1
+        assert results == [1] * 8
+
+    def test_stale_value_served_while_another_caller_recomputes(self, gcache, backend):
+        compute = Compute()
+        gcache.get_or_compute('hot', compute, 60, ['feed:global'], stale_ttl=300)
+        gcache.bump('feed:global')
+
+        backend.add(f'{LOCK_PREFIX}hot', 1, 10)  # Another worker is recomputing
+        assert gcache.get_or_compute('hot', compute, 60, ['feed:global'], stale_ttl=300) == 1
+
+        backend.delete(f'{LOCK_PREFIX}hot')
+        assert gcache.get_or_compute('hot', compute, 60, ['feed:global'], stale_ttl=300) == 2
+        stats = gcache.stats.snapshot()['kinds']['default']
+        assert (stats['miss'], stats['stale'], stats['refresh']) == (1, 1, 1)
+
+    def test_expired_entry_refreshed_by_one_caller(self, gcache, backend):
+        compute = Compute()
+        gcache.get_or_compute('k', compute, 1, stale_ttl=60)
+        entry = backend.get('k')
+        backend.set('k', {**entry, 'expires': time.time() - 1}, 60)
+
+        assert gcache.get_or_compute('k', compute, 1, stale_ttl=60) == 2
+
+    def test_early_refresh_before_expiry(self, backend):
+        eager = GenerationalCache(backend=backend, beta=10 ** 9)
+        compute = Compute()
+        eager.get_or_compute('k', compute, 60)
+
+        assert eager.get_or_compute('k', compute, 60) == 2
+        assert eager.stats.snapshot()['kinds']['default']['early_refresh'] == 1
+
+        lazy = GenerationalCache(backend=backend, beta=0)
+        assert lazy.get_or_compute('k', compute, 60) == 2
+
+
+class TestDecorators:
+    @pytest.fixture(autouse=True)
+    def shared_backend(self, backend, monkeypatch):
+        monkeypatch.setattr(community_cache_module, 'community_cache', GenerationalCache(backend=backend))
+
+    def test_feed_invalidated_through_manager(self):
+        calls = []
+
+        @cached_feed()
+        def university_feed(university_id, page=1):
+            calls.append((university_id, page))
+            return [f'{university_id}-{page}-{len(calls)}']
+
+        assert university_feed(university_id='u1') == ['u1-1-1']
+        assert university_feed(university_id='u1') == ['u1-1-1']
+        assert university_feed(university_id='u1', skip_cache=True) == ['u1-1-2']
+
+        FeedCacheManager.invalidate_global_feed()
+        assert university_feed(university_id='u1') == ['u1-1-1']
+        FeedCacheManager.invalidate_university_feed('u1')
+        assert university_feed(university_id='u1') == ['u1-1-3']
+
+        stats = FeedCacheManager.get_cache_stats()
+        assert stats['kinds']['feed']['hit_ratio'] == 0.5
+        assert stats['invalidations'] == {'feed': 2}
+
+    def test_warm_university_feed(self):
+        calls = []
+
+        @cached_feed()
+        def university_feed(university_id, page=1):
+            calls.append(page)
+            return len(calls)
+
+        FeedCacheManager.warm_university_feed('u1', university_feed)
+        assert university_feed(university_id='u1', page=1) == 1
+        assert calls == [1]
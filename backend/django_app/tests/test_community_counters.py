@@ -0,0 +1,164 @@
+"""
+Test suite for community engagement counters (community/counters.py).
+
+Covers:
+- reactions, comments and replies move counters by deltas, without COUNT queries
+- toggling, switching reaction type and double deletes keep counters exact
+- buffered post views: no queries on record, bulk UPDATEs per flush, kept on failure
+- reconciliation repairs drifted counters and leaves correct ones alone
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from community import counters
+from community.counters import ViewCounter
+from community.models import Comment, Post, Reaction, University
+
+User = get_user_model()
+
+
+@pytest.fixture
+def author(db):
+    return User.objects.create_user(username='author@test.com', email='author@test.com', password='x')
+
+
+@pytest.fixture
+def post(author):
+    university = University.objects.create(name='Counter University', slug='counter-u', code='CU')
+    return Post.objects.create(author=author, university=university, content='Hello', status='published')
+
+
+def _client(api_client, name):
+    user = User.objects.create_user(username=f'{name}@test.com', email=f'{name}@test.com', password='x')
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+def _counts(instance, *fields):
+    instance.refresh_from_db(fields=fields)
+    return tuple(getattr(instance, f) for f in fields)
+
+
+def _no_recounts(queries, table):
+    # The old code recounted with .count(); serializer breakdowns (GROUP BY) are fine
+    return not [q['sql'] for q in queries.captured_queries if 'COUNT(*)' in q['sql'] and f'FROM "{table}"' in q['sql']]
+
+
+@pytest.mark.django_db
+class TestDeltaCounters:
+    def test_post_reactions(self, api_client, post):
+        client = _client(api_client, 'fan')
+        url = f'/api/v1/community/posts/{post.id}/react/'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.post(url, {'reaction_type': 'like'}, format='json')
+        assert (response.data['action'], response.data['reaction_count']) == ('created', 1)
+        assert _no_recounts(queries, 'community_reactions')
+
+        response = client.post(url, {'reaction_type': 'fire'}, format='json')
+        assert response.data['reaction_count'] == 1  # switched type, still one reaction
+        response = client.post(url, {'reaction_type': 'fire'}, format='json')
+        assert (response.data['action'], response.data['reaction_count']) == ('removed', 0)
+
+        Post.objects.filter(pk=post.pk).update(reaction_count=0)
+        counters.adjust_post(post.id, reactions=-1)
+        assert _counts(post, 'reaction_count') == (0,)  # never negative
+
+    def test_comments_replies_and_deletes(self, api_client, post):
+        client = _client(api_client, 'talker')
+        url = f'/api/v1/community/posts/{post.id}/comments/'
+
+        parent = client.post(url, {'post': post.id, 'content': 'First'}, format='json').data
+        with CaptureQueriesContext(connection) as queries:
+            reply = client.post(url, {'post': post.id, 'content': 'Reply', 'parent': parent['id']}, format='json').data
+        assert _no_recounts(queries, 'community_comments')
+        parent_comment = Comment.objects.get(pk=parent['id'])
+        assert _counts(post, 'comment_count') == (2,)
+        assert _counts(parent_comment, 'reply_count') == (1,)
+
+        react = client.post(f'/api/v1/community/comments/{parent["id"]}/react/', {'reaction_type': 'clap'}, format='json')
+        assert react.data['reaction_count'] == 1
+
+        assert client.delete(f'/api/v1/community/comments/{reply["id"]}/').status_code == 204
+        assert (_counts(post, 'comment_count'), _counts(parent_comment, 'reply_count')) == ((1,), (0,))
+
+        # Deleting an already deleted comment does not count it twice
+        client.delete(f'/api/v1/community/comments/{reply["id"]}/')
+        client.delete(f'/api/v1/community/comments/{parent["id"]}/')
+        assert (_counts(post, 'comment_count'), _counts(parent_comment, 'reply_count')) == ((0,), (0,))
+
+
+@pytest.mark.django_db
+class TestViewCounter:
+    def test_views_are_buffered_and_flushed_in_bulk(self, post, author, django_assert_num_queries):
+        other = Post.objects.create(author=author, content='Other', status='published')
+        counter = ViewCounter(flush_interval=0)
+
+        with django_assert_num_queries(0):
+            for _ in range(5):
+                counter.record(post.id)
+            counter.record(other.id, 2)
+        assert (counter.pending(post.id), counter.pending()) == (5, 7)
+
+        with django_assert_num_queries(2):  # view counts, trending weights
+            assert counter.flush() == 2
+        assert (_counts(post, 'view_count'), _counts(other, 'view_count')) == ((5,), (2,))
+        assert counter.pending() == 0
+
+    def test_failed_flush_keeps_tallies(self, post, monkeypatch):
+        counter = ViewCounter(flush_interval=0)
+        counter.record(post.id, 3)
+
+        def fail(counts):
+            raise RuntimeError('database unavailable')
+        monkeypatch.setattr(counters, 'write_view_counts', fail)
+        assert counter.flush() == 0
+        monkeypatch.undo()
+
+        counter.record(post.id)
+        assert counter.flush() == 1
+        assert _counts(post, 'view_count') == (4,)
+
+    def test_post_detail_records_a_view(self, api_client, post, settings, monkeypatch):
+        client = _client(api_client, 'reader')
+        client.get(f'/api/v1/community/posts/{post.id}/')
+        assert _counts(post, 'view_count') == (1,)
+
+        settings.COMMUNITY_VIEW_BUFFER_ENABLED = True
+        counter = ViewCounter(flush_interval=0)
+        monkeypatch.setattr(counters._view_counter, 'instance', counter)
+        client.get(f'/api/v1/community/posts/{post.id}/')
+        assert (_counts(post, 'view_count'), counter.pending(post.id)) == ((1,), 1)
+        assert counters.flush_views() == 1
+        assert _counts(post, 'view_count') == (2,)
+
+
+@pytest.mark.django_db
+class TestReconciliation:
+    def test_drift_is_repaired(self, post, author):
+        fan = User.objects.create_user(username='fan@test.com', email='fan@test.com', password='x')
+        Reaction.objects.create(user=fan, post=post, reaction_type='like')
+        parent = Comment.objects.create(post=post, author=fan, content='Parent')
+        Comment.objects.create(post=post, author=author, parent=parent, content='Reply')
+        Comment.objects.create(post=post, author=author, parent=parent, content='Gone', is_deleted=True)
+        Reaction.objects.create(user=author, comment=parent, reaction_type='clap')
+        healthy = Post.objects.create(author=author, content='Healthy', status='published')
+        Post.objects.filter(pk=post.pk).update(reaction_count=7, comment_count=0)
+        Comment.objects.filter(pk=parent.pk).update(reaction_count=0, reply_count=5)
+
+        assert counters.reconcile_counters(chunk_size=1) == {'posts': 1, 'comments': 1}
+        assert _counts(post, 'reaction_count', 'comment_count') == (1, 2)
+        assert _counts(parent, 'reaction_count', 'reply_count') == (1, 1)
+        assert _counts(healthy, 'reaction_count', 'comment_count') == (0, 0)
+        assert counters.reconcile_counters() == {'posts': 0, 'comments': 0}
+
+    def test_command_limits_to_posts(self, post, author):
+        other = Post.objects.create(author=author, content='Other', status='published', comment_count=3)
+        Post.objects.filter(pk=post.pk).update(comment_count=3)
+
+        call_command('reconcile_community_counters', '--post', str(post.id))
+
+        assert (_counts(post, 'comment_count'), _counts(other, 'comment_count')) == ((0,), (3,))
@@ -0,0 +1,140 @@
+"""
+Query-count regression tests for community feed serialization.
+
+Covers:
+- FeedView, post detail and SearchView issue a constant number of queries no
+  matter how many posts, reactions, comments and authors a page holds
+- hydrated values match what the per-object serializer code returned
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from community.models import (
+    Badge, Comment, PollVote, Post, Reaction, University, UniversityMembership, UserBadge,
+)
+
+User = get_user_model()
+
+
+@pytest.fixture
+def viewer(db):
+    return User.objects.create_user(username='viewer@test.com', email='viewer@test.com', password='testpass123')
+
+
+@pytest.fixture
+def viewer_client(api_client, viewer):
+    api_client.force_authenticate(user=viewer)
+    return api_client
+
+
+@pytest.fixture
+def university(db):
+    return University.objects.create(name='Query University', slug='query-u', code='QU')
+
+
+def _make_posts(count, viewer, university, prefix):
+    """Posts by distinct authors, each with reactions, a poll vote, comments and replies."""
+    badge, _ = Badge.objects.get_or_create(
+        slug='first-post', defaults={'name': 'First Post', 'category': 'community'}
+    )
+    posts = []
+    for i in range(count):
+        author = User.objects.create_user(
+            username=f'{prefix}{i}@test.com', email=f'{prefix}{i}@test.com', password='testpass123'
+        )
+        UniversityMembership.objects.create(user=author, university=university, is_primary=True)
+        UserBadge.objects.create(user=author, badge=badge)
+        post = Post.objects.create(
+            author=author, university=university, visibility='global', status='published',
+            post_type='poll' if i % 2 else 'text', content=f'{prefix} post {i} searchable',
+            poll_options=['a', 'b'] if i % 2 else [],
+        )
+        Reaction.objects.create(user=viewer, post=post, reaction_type='like')
+        Reaction.objects.create(user=author, post=post, reaction_type='fire')
+        if i % 2:
+            PollVote.objects.create(post=post, user=viewer, option_id=1)
+        for j in range(4):
+            comment = Comment.objects.create(post=post, author=author, content=f'comment {j}', reaction_count=j)
+            Comment.objects.create(post=post, author=viewer, parent=comment, content='reply')
+            Reaction.objects.create(user=viewer, comment=comment, reaction_type='clap')
+        posts.append(post)
+    return posts
+
+
+def _count_queries(callable_):
+    with CaptureQueriesContext(connection) as queries:
+        response = callable_()
+    assert response.status_code == 200, response.content
+    return len(queries), response
+
+
+@pytest.mark.django_db
+class TestFeedQueryCounts:
+    def test_feed_page_queries_do_not_grow_with_posts(self, viewer_client, viewer, university):
+        _make_posts(3, viewer, university, 'small')
+        small, _ = _count_queries(lambda: viewer_client.get('/api/v1/community/feed/?feed_type=global'))
+
+        _make_posts(9, viewer, university, 'large')
+        large, response = _count_queries(lambda: viewer_client.get('/api/v1/community/feed/?feed_type=global'))
+
+        assert len(response.data['posts']) == 12
+        assert large == small
+        assert large <= 12
+
+    def test_feed_hydrates_viewer_state(self, viewer_client, viewer, university):
+        _make_posts(2, viewer, university, 'state')
+        response = viewer_client.get('/api/v1/community/feed/?feed_type=global')
+        posts = {post['content']: post for post in response.data['posts']}
+
+        text_post = posts['state post 0 searchable']
+        poll_post = posts['state post 1 searchable']
+        assert text_post['user_reaction'] == 'like'
+        assert text_post['user_poll_vote'] is None
+        assert poll_post['user_poll_vote'] == [1]
+        assert text_post['author']['university_name'] == 'Query University'
+        assert text_post['author']['badge_count'] == 1
+
+
+@pytest.mark.django_db
+class TestPostDetailQueryCounts:
+    def test_detail_queries_do_not_grow_with_comments(self, viewer_client, viewer, university):
+        post = _make_posts(1, viewer, university, 'detail')[0]
+        few, response = _count_queries(lambda: viewer_client.get(f'/api/v1/community/posts/{post.id}/'))
+
+        for j in range(6):
+            comment = Comment.objects.create(post=post, author=viewer, content=f'extra {j}', reaction_count=10 + j)
+            Comment.objects.create(post=post, author=post.author, parent=comment, content='reply')
+        many, response = _count_queries(lambda: viewer_client.get(f'/api/v1/community/posts/{post.id}/'))
+
+        assert many == few
+        assert many <= 15
+
+        top = response.data['top_comments']
+        assert [c['content'] for c in top] == ['extra 5', 'extra 4', 'extra 3']
+        assert all(len(c['replies']) == 1 for c in top)
+        assert {r['reaction_type']: r['count'] for r in response.data['reaction_counts']} == {'like': 1, 'fire': 1}
+
+    def test_top_comment_viewer_reaction(self, viewer_client, viewer, university):
+        post = _make_posts(1, viewer, university, 'reacted')[0]
+        response = viewer_client.get(f'/api/v1/community/posts/{post.id}/')
+        top = response.data['top_comments']
+        assert [c['content'] for c in top] == ['comment 3', 'comment 2', 'comment 1']
+        assert all(c['user_reaction'] == 'clap' for c in top)
+        assert all(c['reaction_counts'] == [{'reaction_type': 'clap', 'count': 1}] for c in top)
+
+
+@pytest.mark.django_db
+class TestSearchQueryCounts:
+    def test_search_queries_do_not_grow_with_results(self, viewer_client, viewer, university):
+        if connection.vendor != 'postgresql':
+            pytest.skip('post search uses JSON containment on tags (PostgreSQL only)')
+        _make_posts(2, viewer, university, 'findme')
+        small, _ = _count_queries(lambda: viewer_client.get('/api/v1/community/search/?q=searchable'))
+
+        _make_posts(8, viewer, university, 'findmore')
+        large, response = _count_queries(lambda: viewer_client.get('/api/v1/community/search/?q=searchable'))
+
+        assert len(response.data['results']) == 10
+        assert large == small
@@ -0,0 +1,228 @@
+"""
+Test suite for the community trending index (community/trending.py).
+
+Covers:
+- entries per feed (global, university, track) and tiers follow post saves
+- rank order is the decayed-score order; reactions, comments and views move it
+- feeds page from the index with cursors and offsets, without duplicates
+- the tick repairs weight drift and expires pins; rebuild matches incremental upkeep
+"""
+import math
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+
+from community import counters, trending
+from community.models import Post, TrendingEntry, University, UniversityMembership
+
+User = get_user_model()
+
+
+@pytest.fixture
+def university(db):
+    return University.objects.create(name='Trend University', slug='trend-u', code='TU')
+
+
+@pytest.fixture
+def author(db):
+    return User.objects.create_user(
+        username='author@test.com', email='author@test.com', password='x', track_key='defender',
+    )
+
+
+@pytest.fixture
+def viewer_client(api_client, university):
+    viewer = User.objects.create_user(
+        username='viewer@test.com', email='viewer@test.com', password='x', track_key='defender',
+    )
+    UniversityMembership.objects.create(user=viewer, university=university, is_primary=True)
+    api_client.force_authenticate(user=viewer)
+    return api_client
+
+
+def _post(author, university=None, age_hours=0, **fields):
+    fields.setdefault('visibility', 'global')
+    post = Post.objects.create(author=author, university=university, content='Post', status='published', **fields)
+    if age_hours:
+        Post.objects.filter(pk=post.pk).update(created_at=timezone.now() - timedelta(hours=age_hours))
+        post.refresh_from_db()
+        trending.rebuild(post_ids=[post.pk])
+    return post
+
+
+def _entries(post):
+    return {(e.scope, e.scope_key): e for e in TrendingEntry.objects.filter(post=post)}
+
+
+def _feed(client, **params):
+    response = client.get('/api/v1/community/feed/', params)
+    assert response.status_code == 200, response.content
+    return response.data
+
+
+@pytest.mark.django_db
+class TestIndexMembership:
+    def test_entries_follow_post_fields(self, author, university):
+        post = _post(author, university)
+        assert set(_entries(post)) == {
+            ('global', ''), ('university', str(university.id)), ('track', 'defender'),
+        }
+
+        post.visibility = 'university'
+        post.is_pinned = True
+        post.save()
+        entries = _entries(post)
+        assert set(entries) == {('university', str(university.id)), ('track', 'defender')}
+        assert entries[('university', str(university.id))].tier == trending.TIER_PINNED
+
+        post.status = 'hidden'
+        post.save(update_fields=['status'])
+        assert _entries(post) == {}
+
+    def test_featured_posts_rank_first(self, author, university):
+        featured = _post(author, university, age_hours=72, is_featured=True)
+        fresh = _post(author, university)
+        entries = _entries(featured)
+        assert entries[('global', '')].tier == trending.TIER_FEATURED
+        assert entries[('global', '')].rank > _entries(fresh)[('global', '')].rank
+
+
+@pytest.mark.django_db
+class TestRanking:
+    def test_rank_order_is_decayed_score_order(self, author):
+        now = timezone.now()
+        old_popular = _post(author, age_hours=48)
+        Post.objects.filter(pk=old_popular.pk).update(reaction_count=10)
+        trending.rebuild(post_ids=[old_popular.pk])
+        new_quiet = _post(author, age_hours=1)
+        event = _post(author, age_hours=30, post_type='event')
+
+        entries = {e.post_id: e for e in TrendingEntry.objects.filter(scope='global')}
+        half_life = 24 * 3600
+        expected = {
+            old_popular.pk: 21 * 2 ** (-(now - old_popular.created_at).total_seconds() / half_life),
+            new_quiet.pk: 1 * 2 ** (-(now - new_quiet.created_at).total_seconds() / half_life),
+            event.pk: 2 * 2 ** (-(now - event.created_at).total_seconds() / half_life),
+        }
+        for post_id, score in expected.items():
+            assert math.isclose(trending.current_score(entries[post_id], now), score, rel_tol=1e-6)
+        by_rank = sorted(entries, key=lambda post_id: entries[post_id].rank, reverse=True)
+        assert by_rank == sorted(expected, key=expected.get, reverse=True)
+
+    def test_engagement_moves_weight(self, api_client, author):
+        post = _post(author)
+        fan = User.objects.create_user(username='fan@test.com', email='fan@test.com', password='x')
+        api_client.force_authenticate(user=fan)
+
+        api_client.post(f'/api/v1/community/posts/{post.id}/react/', {'reaction_type': 'like'}, format='json')
+        api_client.post(f'/api/v1/community/posts/{post.id}/comments/', {'post': post.id, 'content': 'Hi'}, format='json')
+        counters.write_view_counts({str(post.id): 50})
+
+        for entry in _entries(post).values():
+            assert entry.weight == pytest.approx(1 + 2 + 3 + 0.5)
+            assert entry.rank == pytest.approx(trending.entry_rank(entry.tier, entry.anchor, entry.weight))
+
+        api_client.post(f'/api/v1/community/posts/{post.id}/react/', {'reaction_type': 'like'}, format='json')
+        assert _entries(post)[('global', '')].weight == pytest.approx(4.5)
+
+
+@pytest.mark.django_db
+class TestFeedPages:
+    def test_cursor_pages_walk_the_index(self, viewer_client, author, university):
+        posts = [_post(author, university, age_hours=i) for i in range(7)]
+        Post.objects.filter(pk=posts[5].pk).update(comment_count=20)
+        trending.rebuild(post_ids=[posts[5].pk])
+
+        first = _feed(viewer_client, feed_type='global', page_size=3)
+        assert first['total_count'] == 7 and first['has_more']
+        assert first['posts'][0]['id'] == str(posts[5].id)
+
+        seen, cursor = [p['id'] for p in first['posts']], first['next_cursor']
+        while cursor:
+            data = _feed(viewer_client, feed_type='global', page_size=3, cursor=cursor)
+            seen += [p['id'] for p in data['posts']]
+            cursor = data['next_cursor']
+        assert len(seen) == len(set(seen)) == 7
+        assert seen[1:] == [str(p.id) for i, p in enumerate(posts) if i != 5]
+
+        second = _feed(viewer_client, feed_type='global', page_size=3, page=2)
+        assert [p['id'] for p in second['posts']] == seen[3:6]
+        assert viewer_client.get('/api/v1/community/feed/', {'cursor': 'bogus!'}).status_code == 400
+
+    def test_university_and_track_feeds(self, viewer_client, author, university):
+        other = University.objects.create(name='Other University', slug='other-u', code='OU')
+        outsider = User.objects.create_user(
+            username='outsider@test.com', email='outsider@test.com', password='x', track_key='grc',
+        )
+        local = _post(author, university, visibility='university')
+        pinned = _post(author, university, age_hours=100, visibility='university', is_pinned=True)
+        highlight = _post(outsider, other, is_featured=True)
+        _post(outsider, other)
+
+        data = _feed(viewer_client, feed_type='my-university')
+        assert [p['id'] for p in data['posts']] == [str(pinned.id), str(highlight.id), str(local.id)]
+        assert data['total_count'] == 3
+
+        data = _feed(viewer_client, feed_type='track')
+        assert {p['id'] for p in data['posts']} == {str(local.id), str(pinned.id)}
+
+    def test_legacy_ranking_when_index_disabled(self, viewer_client, author, settings):
+        settings.COMMUNITY_TRENDING_INDEX_ENABLED = False
+        quiet = _post(author)
+        busy = _post(author, age_hours=2)
+        Post.objects.filter(pk=busy.pk).update(reaction_count=5)
+
+        data = _feed(viewer_client, feed_type='global')
+        assert [p['id'] for p in data['posts']] == [str(busy.id), str(quiet.id)]
+        assert data['next_cursor'] is None
+
+
+@pytest.mark.django_db
+class TestMaintenance:
+    def test_tick_repairs_drift_and_expires_pins(self, author, university):
+        drifted = _post(author, university)
+        Post.objects.filter(pk=drifted.pk).update(reaction_count=3, view_count=100)
+        stale_pin = _post(author, university, is_pinned=True, pin_expires_at=timezone.now() + timedelta(hours=1))
+        old = _post(author, university, age_hours=24 * 30)
+        Post.objects.filter(pk=old.pk).update(reaction_count=9)
+
+        result = trending.tick(now=timezone.now() + timedelta(hours=2))
+
+        assert result == {'rebased': 0, 'scanned': 2, 'repaired': 3, 'unpinned': 1}
+        for entry in _entries(drifted).values():
+            assert entry.weight == pytest.approx(1 + 6 + 1)
+        assert _entries(stale_pin)[('university', str(university.id))].tier == trending.TIER_DEFAULT
+        assert _entries(old)[('global', '')].weight == 1.0  # outside the window
+        assert trending.tick()['repaired'] == 0
+
+    def test_tick_rebuilds_after_half_life_change(self, author, university, settings):
+        older = _post(author, university, age_hours=30)
+        Post.objects.filter(pk=older.pk).update(reaction_count=3)
+        trending.rebuild(post_ids=[older.pk])
+        newer = _post(author, university, age_hours=1)
+        assert _entries(older)[('global', '')].rank > _entries(newer)[('global', '')].rank
+
+        settings.COMMUNITY_TRENDING_HALF_LIFE_HOURS = 2
+        _post(author, university)  # indexed under the new half-life, next to stale anchors
+        result = trending.tick()
+
+        assert result['rebased'] == 9
+        assert set(TrendingEntry.objects.values_list('half_life_hours', flat=True)) == {2.0}
+        assert _entries(newer)[('global', '')].rank > _entries(older)[('global', '')].rank
+        assert trending.tick()['rebased'] == 0
+
+    def test_rebuild_matches_incremental_index(self, author, university):
+        posts = [_post(author, university, is_featured=bool(i % 2)) for i in range(4)]
+        Post.objects.filter(pk=posts[0].pk).update(reaction_count=2)
+        trending.adjust_weight(posts[0].pk, 4.0)
+        incremental = sorted(TrendingEntry.objects.values_list('post_id', 'scope', 'scope_key', 'tier', 'weight', 'rank'))
+
+        call_command('rebuild_trending_index', '--chunk-size', '3')
+
+        rebuilt = sorted(TrendingEntry.objects.values_list('post_id', 'scope', 'scope_key', 'tier', 'weight', 'rank'))
+        assert len(rebuilt) == len(incremental) == 12
+        for a, b in zip(incremental, rebuilt):
+            assert a[:5] == b[:5] and a[5] == pytest.approx(b[5])
@@ -0,0 +1,184 @@
+"""
+Test suite for the curriculum track progress projection.
+
+Covers:
+- module and lesson listings issue a constant number of queries per track
+- projected values match what the per-object serializer code returned
+- progress writes patch the cached projection without a rebuild; lesson changes invalidate it
+"""
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from curriculum.models import (
+    CurriculumModule, CurriculumTrack, Lesson, UserLessonProgress, UserModuleProgress,
+)
+from curriculum.progress_projection import get_track_projection
+
+User = get_user_model()
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    from django.core.cache import cache
+    cache.clear()
+    return cache
+
+
+@pytest.fixture
+def learner(db):
+    return User.objects.create_user(
+        username='projection@test.com', email='projection@test.com', password='testpass123'
+    )
+
+
+@pytest.fixture
+def learner_client(api_client, learner):
+    api_client.force_authenticate(user=learner)
+    return api_client
+
+
+@pytest.fixture
+def track(db):
+    return CurriculumTrack.objects.create(code='PROJ', slug='proj', name='Projection', title='Projection')
+
+
+def _add_modules(track, learner, count, lessons_per_module=3, start=0):
+    modules = []
+    for i in range(start, start + count):
+        module = CurriculumModule.objects.create(
+            track=track, track_key='proj', title=f'Module {i}', order_index=i,
+        )
+        lessons = [
+            Lesson.objects.create(module=module, title=f'Lesson {i}.{j}', order_index=j)
+            for j in range(lessons_per_module)
+        ]
+        UserModuleProgress.objects.create(
+            user=learner, module=module, status='in_progress', completion_percentage=50, lessons_completed=1,
+        )
+        UserLessonProgress.objects.create(user=learner, lesson=lessons[0], status='completed', quiz_score=80)
+        modules.append(module)
+    return modules
+
+
+def _count_queries(callable_):
+    callable_()  # warm per-process lookups so both runs measure the same work
+    with CaptureQueriesContext(connection) as queries:
+        response = callable_()
+    assert response.status_code == 200, response.content
+    return len(queries), response
+
+
+@pytest.mark.django_db
+class TestProjectionQueryCounts:
+    def test_module_list_queries_do_not_grow_with_modules(self, learner_client, learner, track):
+        _add_modules(track, learner, 2)
+        small, _ = _count_queries(lambda: learner_client.get('/api/v1/curriculum/modules/?track=PROJ'))
+
+        _add_modules(track, learner, 6, start=2)
+        large, response = _count_queries(lambda: learner_client.get('/api/v1/curriculum/modules/?track=PROJ'))
+
+        results = response.data['results'] if isinstance(response.data, dict) else response.data
+        assert len(results) == 8
+        assert large == small
+        assert all(m['lesson_count'] == 3 and m['completion_percentage'] == 50.0 for m in results)
+
+    def test_track_detail_queries_do_not_grow_with_modules(self, learner_client, learner, track):
+        _add_modules(track, learner, 2)
+        small, _ = _count_queries(lambda: learner_client.get('/api/v1/curriculum/tracks/proj/'))
+
+        _add_modules(track, learner, 6, start=2)
+        large, response = _count_queries(lambda: learner_client.get('/api/v1/curriculum/tracks/proj/'))
+
+        assert len(response.data['modules']) == 8
+        assert large == small
+
+    def test_lesson_list_reads_projection(self, learner_client, learner, track):
+        module = _add_modules(track, learner, 1, lessons_per_module=2)[0]
+        few, _ = _count_queries(lambda: learner_client.get(f'/api/v1/curriculum/lessons/?module={module.id}'))
+        for j in range(2, 8):
+            Lesson.objects.create(module=module, title=f'Extra {j}', order_index=j)
+        many, response = _count_queries(lambda: learner_client.get(f'/api/v1/curriculum/lessons/?module={module.id}'))
+
+        assert many == few
+        lessons = response.data['results'] if isinstance(response.data, dict) else response.data
+        first = lessons[0]
+        assert first['is_completed'] is True
+        assert first['user_progress'] == {
+            'status': 'completed', 'progress_percentage': 0.0, 'time_spent_minutes': 0, 'quiz_score': 80.0,
+        }
+        assert all(lesson['user_progress'] is None for lesson in lessons[1:])
+
+    def test_module_detail_matches_progress_row(self, learner_client, learner, track):
+        module = _add_modules(track, learner, 1)[0]
+        response = learner_client.get(f'/api/v1/curriculum/modules/{module.id}/')
+        assert response.status_code == 200
+        assert response.data['lesson_count'] == 3
+        assert response.data['user_progress'] == {
+            'status': 'in_progress', 'completion_percentage': 50.0, 'lessons_completed': 1,
+            'missions_completed': 0, 'is_blocked': False, 'time_spent_minutes': 0,
+        }
+
+
+@pytest.mark.django_db
+class TestProjectionMaintenance:
+    def test_lesson_completion_patches_cached_projection(self, locmem_cache, learner_client, learner, track,
+                                                         django_capture_on_commit_callbacks):
+        module = _add_modules(track, learner, 1, lessons_per_module=2)[0]
+        get_track_projection(learner.pk, track.id)
+        lesson = module.lessons.order_by('order_index')[1]
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = learner_client.post(
+                f'/api/v1/curriculum/lessons/{lesson.id}/progress/', {'status': 'completed'}, format='json'
+            )
+        assert response.status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            projection = get_track_projection(learner.pk, track.id)
+        assert len(queries) == 0
+        assert projection.lesson_progress(lesson.id)['status'] == 'completed'
+        assert projection.module_progress(module.id)['lessons_completed'] == 2
+        assert projection.module_progress(module.id)['completion_percentage'] == 100.0
+
+    def test_module_completion_patches_cached_projection(self, locmem_cache, learner_client, learner, track,
+                                                         django_capture_on_commit_callbacks):
+        module = _add_modules(track, learner, 1)[0]
+        get_track_projection(learner.pk, track.id)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = learner_client.post(f'/api/v1/curriculum/modules/{module.id}/complete/')
+        assert response.status_code == 200
+
+        with CaptureQueriesContext(connection) as queries:
+            projection = get_track_projection(learner.pk, track.id)
+        assert len(queries) == 0
+        assert projection.module_progress(module.id)['status'] == 'completed'
+
+    def test_rolled_back_write_does_not_patch(self, locmem_cache, learner, track):
+        module = _add_modules(track, learner, 1)[0]
+        get_track_projection(learner.pk, track.id)
+
+        with transaction.atomic():
+            progress = UserModuleProgress.objects.get(user=learner, module=module)
+            progress.status = 'completed'
+            progress.save()
+            transaction.set_rollback(True)
+
+        assert get_track_projection(learner.pk, track.id).module_progress(module.id)['status'] == 'in_progress'
+
+    def test_new_lesson_invalidates_lesson_counts(self, locmem_cache, learner, track):
+        module = _add_modules(track, learner, 1)[0]
+        assert get_track_projection(learner.pk, track.id).lesson_count(module.id) == 3
+
+        Lesson.objects.create(module=module, title='Late addition', order_index=9)
+        assert get_track_projection(learner.pk, track.id).lesson_count(module.id) == 4
+
+    def test_deleted_progress_invalidates_projection(self, locmem_cache, learner, track):
+        module = _add_modules(track, learner, 1)[0]
+        assert get_track_projection(learner.pk, track.id).module_progress(module.id) is not None
+
+        UserModuleProgress.objects.filter(user=learner, module=module).delete()
+        assert get_track_projection(learner.pk, track.id).module_progress(module.id) is None
@@ -0,0 +1,203 @@
+"""
+Test suite for buffered Foundations progress heartbeats (foundations/heartbeats.py).
+
+Covers:
+- heartbeats merge monotonically (max watch %, summed time) without touching the DB
+- failed flushes are retried; a lasting outage drops progress but never a completion
+- batched flushes to FoundationsModuleProgress with a query count independent of batch size
+- a heartbeat that finishes a video module is written, and completes Foundations, in the request
+- status reads and complete_module see pending heartbeats
+- thousands of concurrent viewers merged through one buffer
+"""
+import threading
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from foundations import heartbeats
+from foundations.heartbeats import HeartbeatBuffer, make_heartbeat
+from foundations.models import FoundationsModule, FoundationsModuleProgress, FoundationsProgress
+
+User = get_user_model()
+
+
+@pytest.fixture
+def buffer(settings, monkeypatch):
+    """Enable buffering with a fresh buffer that only flushes explicitly, on size or on completion."""
+    settings.FOUNDATIONS_HEARTBEAT_BUFFER_ENABLED = True
+    buffer = HeartbeatBuffer(max_size=50, flush_interval=0)
+    monkeypatch.setattr(heartbeats._buffer, 'instance', buffer)
+    return buffer
+
+
+@pytest.fixture
+def video(db):
+    module = FoundationsModule.objects.create(title='Welcome', module_type='video', order=1)
+    heartbeats.active_modules(refresh=True)
+    return module
+
+
+def _user(name):
+    return User.objects.create_user(
+        username=name, email=f'{name}@test.com', password='x', profiling_complete=True,
+    )
+
+
+def _row(user, module):
+    return FoundationsModuleProgress.objects.get(user=user, module=module)
+
+
+@pytest.mark.django_db
+class TestHeartbeatBuffer:
+    def test_heartbeats_merge_monotonically(self, buffer, video, django_assert_num_queries):
+        user = _user('viewer')
+        with django_assert_num_queries(0):
+            for watch in (30, 20, 50):
+                buffer.record(user.id, video.id, make_heartbeat(watch_percentage=watch, time_spent_seconds=25))
+        assert buffer.pending() == 1
+
+        assert buffer.flush() == 1
+        row = _row(user, video)
+        assert (float(row.watch_percentage), row.time_spent_seconds) == (50.0, 75)
+        assert FoundationsProgress.objects.get(user=user).total_time_spent_minutes == 1
+
+        buffer.record(user.id, video.id, make_heartbeat(
+            watch_percentage=40, time_spent_seconds=50, interaction={'type': 'recipe_demo', 'timeSpent': 12},
+        ))
+        buffer.flush()
+        row = _row(user, video)
+        assert (float(row.watch_percentage), row.time_spent_seconds, row.completed) == (50.0, 125, False)
+        progress = FoundationsProgress.objects.get(user=user)
+        assert progress.total_time_spent_minutes == 2
+        assert progress.last_accessed_module_id == video.id
+        assert progress.interactions['recipe_demo']['time_spent_seconds'] == 12
+
+    def test_flush_queries_do_not_grow_with_batch(self, video):
+        def flush(prefix, count):
+            users = [_user(f'{prefix}{i}') for i in range(count)]
+            entries = lambda: {(u.id, video.id): make_heartbeat(watch_percentage=10) for u in users}  # noqa: E731
+            heartbeats.write_heartbeats(entries())  # Creates the rows
+            with CaptureQueriesContext(connection) as queries:
+                heartbeats.write_heartbeats(entries())
+            return len(queries)
+
+        assert flush('small', 3) == flush('large', 30)
+
+    def test_failed_flush_keeps_entries(self, buffer, video, monkeypatch):
+        user = _user('viewer')
+        buffer.record(user.id, video.id, make_heartbeat(watch_percentage=30, time_spent_seconds=10))
+
+        def fail(entries):
+            raise RuntimeError('database unavailable')
+        monkeypatch.setattr(heartbeats, 'write_heartbeats', fail)
+        assert buffer.flush() == 0
+        monkeypatch.undo()
+        monkeypatch.setattr(heartbeats._buffer, 'instance', buffer)
+
+        buffer.record(user.id, video.id, make_heartbeat(watch_percentage=20, time_spent_seconds=10))
+        assert buffer.flush() == 1
+        assert (float(_row(user, video).watch_percentage), _row(user, video).time_spent_seconds) == (30.0, 20)
+
+    def test_outage_drops_progress_but_keeps_completions(self, buffer, video, monkeypatch):
+        watcher, finisher = _user('watcher'), _user('finisher')
+        buffer.record(watcher.id, video.id, make_heartbeat(watch_percentage=30))
+
+        def fail(entries):
+            raise RuntimeError('database unavailable')
+        monkeypatch.setattr(heartbeats, 'write_heartbeats', fail)
+        buffer.record(finisher.id, video.id, make_heartbeat(watch_percentage=100), flush_now=True)
+        for _ in range(heartbeats.MAX_FLUSH_ATTEMPTS):
+            buffer.flush()
+        assert (buffer.pending(watcher.id), buffer.pending(finisher.id)) == (0, 1)
+
+        monkeypatch.undo()
+        monkeypatch.setattr(heartbeats._buffer, 'instance', buffer)
+        assert buffer.flush() == 1
+        assert _row(finisher, video).completed
+
+    def test_thousands_of_concurrent_viewers(self, buffer, video, settings):
+        settings.FOUNDATIONS_HEARTBEAT_COMPLETE_PERCENTAGE = 101
+        buffer.max_size = 10 ** 6
+        viewers = [
+            user.id for user in User.objects.bulk_create(
+                [User(username=f'load{i}', email=f'load{i}@test.com') for i in range(2000)]
+            )
+        ] or list(User.objects.filter(username__startswith='load').values_list('id', flat=True))
+
+        def watch(viewer_ids):
+            for tick in range(1, 6):
+                for user_id in viewer_ids:
+                    buffer.record(user_id, video.id, make_heartbeat(watch_percentage=tick * 20, time_spent_seconds=10))
+
+        workers = [threading.Thread(target=watch, args=(viewers[i::16],)) for i in range(16)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert buffer.pending() == 2000
+        assert buffer.flush() == 2000
+        rows = FoundationsModuleProgress.objects.filter(module=video)
+        assert rows.count() == 2000
+        assert rows.filter(watch_percentage=100, time_spent_seconds=50).count() == 2000
+
+
+@pytest.mark.django_db
+class TestProgressEndpoints:
+    def test_progress_is_buffered_and_status_reads_it(self, api_client, buffer, video):
+        user = _user('viewer')
+        api_client.force_authenticate(user=user)
+
+        for watch in (20, 60, 40):
+            response = api_client.post(f'/api/v1/foundations/modules/{video.id}/progress',
+                                       {'watch_percentage': watch}, format='json')
+            assert response.status_code == 200
+        assert response.data == {'success': True, 'watch_percentage': 60.0, 'completed': False}
+        assert not FoundationsModuleProgress.objects.exists()
+
+        status = api_client.get('/api/v1/foundations/status')
+        assert status.data['modules'][0]['watch_percentage'] == 60.0
+        assert buffer.pending() == 0
+
+    def test_finishing_a_video_completes_in_the_request(self, api_client, buffer, video):
+        user = _user('viewer')
+        api_client.force_authenticate(user=user)
+        url = f'/api/v1/foundations/modules/{video.id}/progress'
+        api_client.post(url, {'watch_percentage': 80, 'time_spent_seconds': 120}, format='json')
+
+        response = api_client.post(url, {'watch_percentage': 100}, format='json')
+
+        assert response.data['completed'] is True
+        assert buffer.pending() == 0
+        assert _row(user, video).completed
+        progress = FoundationsProgress.objects.get(user=user)
+        assert progress.status == 'completed'
+        assert progress.modules_completed[str(video.id)]['completed'] is True
+        assert progress.total_time_spent_minutes == 2
+        user.refresh_from_db()
+        assert user.foundations_complete
+
+    def test_complete_module_writes_pending_heartbeats(self, api_client, buffer, video):
+        user = _user('viewer')
+        api_client.force_authenticate(user=user)
+        api_client.post(f'/api/v1/foundations/modules/{video.id}/progress',
+                        {'watch_percentage': 70, 'time_spent_seconds': 180}, format='json')
+
+        response = api_client.post(f'/api/v1/foundations/modules/{video.id}/complete',
+                                   {'watch_percentage': 90}, format='json')
+
+        assert response.data['total_time_spent_minutes'] == 3
+        assert response.data['is_complete'] is True
+        row = _row(user, video)
+        assert (row.completed, float(row.watch_percentage)) == (True, 90.0)
+
+    def test_unknown_module_and_bad_input(self, api_client, buffer, video):
+        api_client.force_authenticate(user=_user('viewer'))
+        missing = api_client.post('/api/v1/foundations/modules/00000000-0000-0000-0000-000000000000/progress',
+                                  {'watch_percentage': 10}, format='json')
+        invalid = api_client.post(f'/api/v1/foundations/modules/{video.id}/progress',
+                                  {'watch_percentage': 'half'}, format='json')
+
+        assert (missing.status_code, invalid.status_code) == (404, 400)
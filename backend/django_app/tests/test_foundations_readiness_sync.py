@@ -0,0 +1,249 @@
+"""
+Test suite for the cohort Foundations readiness sync (foundations/readiness_sync.py)
+and the cached module-requirements descriptor (foundations/requirements.py).
+
+Covers:
+- the descriptor is built in one query, cached, and dropped when a module changes
+- completion state and missing requirements per member, and the cohort summary
+- chunked runs report progress and use a query count independent of cohort size
+- the endpoint queues one sync per cohort, reports progress, and returns the results a page at a time
+"""
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from foundations import readiness_sync
+from foundations.models import FoundationsModule, FoundationsProgress, FoundationsReadinessMember, FoundationsReadinessSync
+from foundations.requirements import module_requirements
+from programs.models import Cohort, Enrollment, Program, Track
+
+User = get_user_model()
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    from django.core.cache import cache
+    cache.clear()
+    return cache
+
+
+@pytest.fixture
+def modules(db):
+    return {
+        'video': FoundationsModule.objects.create(title='Welcome', module_type='video', order=1),
+        'assessment': FoundationsModule.objects.create(title='Quiz', module_type='assessment', order=2),
+        'reflection': FoundationsModule.objects.create(title='Goals', module_type='reflection', order=3),
+        'optional': FoundationsModule.objects.create(title='Extra', module_type='video', order=4, is_mandatory=False),
+    }
+
+
+@pytest.fixture
+def cohort(db):
+    program = Program.objects.create(
+        name='Enterprise Program', category='technical', description='Test',
+        duration_months=6, default_price=1000, currency='USD', status='active',
+    )
+    track = Track.objects.create(program=program, name='Defender', key='defender', description='Test')
+    return Cohort.objects.create(
+        track=track, name='Acme Cohort', start_date=timezone.now().date(),
+        end_date=(timezone.now() + timedelta(days=180)).date(), mode='virtual',
+        seat_cap=5000, mentor_ratio=0.1, status='active',
+    )
+
+
+@pytest.fixture
+def admin_client(api_client, db):
+    admin = User.objects.create_user(username='admin', email='admin@test.com', password='x', is_staff=True)
+    api_client.force_authenticate(user=admin)
+    return api_client
+
+
+def _student(cohort, name, status='active'):
+    student = User.objects.create_user(username=name, email=f'{name}@test.com', password='x')
+    Enrollment.objects.create(cohort=cohort, user=student, status=status)
+    return student
+
+
+def _completed(*modules):
+    return {str(m.id): {'completed': True} for m in modules}
+
+
+def _url(cohort):
+    return f'/api/v1/foundations/enterprise/{cohort.id}/foundations-readiness'
+
+
+@pytest.mark.django_db
+class TestModuleRequirements:
+    def test_descriptor_is_cached_until_a_module_changes(self, modules, locmem_cache, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            requirements = module_requirements()
+        with django_assert_num_queries(0):
+            assert module_requirements() is not None
+        assert [title for _, title in requirements.mandatory] == ['Welcome', 'Quiz', 'Goals']
+        assert (requirements.requires_assessment, requirements.requires_reflection) == (True, True)
+
+        modules['reflection'].is_active = False
+        modules['reflection'].save()
+        updated = module_requirements()
+        assert [title for _, title in updated.mandatory] == ['Welcome', 'Quiz']
+        assert not updated.requires_reflection
+
+    def test_progress_checks_use_descriptor(self, modules, locmem_cache):
+        student = User.objects.create_user(username='ada', email='ada@test.com', password='x')
+        progress = FoundationsProgress.objects.create(
+            user=student, modules_completed=_completed(modules['video'], modules['assessment'], modules['reflection']),
+            assessment_score=80,
+        )
+        module_requirements()
+
+        with CaptureQueriesContext(connection) as queries:
+            assert float(progress.calculate_completion()) == 100.0
+            assert not progress.is_complete()
+        assert len(queries) == 0
+
+        from foundations.views import _get_missing_requirements
+        assert _get_missing_requirements(progress) == ['Reflection', 'Track Confirmation']
+
+
+@pytest.mark.django_db
+class TestReadinessSync:
+    def _population(self, cohort, modules):
+        done = _student(cohort, 'done')
+        FoundationsProgress.objects.create(
+            user=done, status='completed', assessment_score=90, goals_reflection='Blue team', confirmed_track_key='defender',
+            modules_completed=_completed(modules['video'], modules['assessment'], modules['reflection']),
+        )
+        partial = _student(cohort, 'partial')
+        FoundationsProgress.objects.create(
+            user=partial, status='in_progress', modules_completed=_completed(modules['video'], modules['optional']),
+        )
+        _student(cohort, 'new')
+        _student(cohort, 'gone', status='withdrawn')
+
+    def test_members_and_summary(self, admin_client, cohort, modules):
+        self._population(cohort, modules)
+
+        response = admin_client.post(_url(cohort))
+
+        assert response.status_code == 200
+        data = response.data
+        assert (data['status'], data['total_students'], data['foundations_complete_count']) == ('completed', 3, 1)
+        assert data['status_counts'] == {'completed': 1, 'in_progress': 1, 'not_started': 1}
+        assert data['missing_requirements'] == {
+            'Module: Quiz': 2, 'Module: Goals': 2, 'Assessment': 2, 'Reflection': 2, 'Track Confirmation': 2,
+            'Module: Welcome': 1,
+        }
+        assert data['average_completion'] == 44.44
+        members = {row['email']: row for row in data['readiness_data']}
+        assert set(members) == {'done@test.com', 'partial@test.com', 'new@test.com'}
+        assert members['done@test.com']['foundations_complete'] is True
+        assert members['partial@test.com']['completion_percentage'] == 33.33
+        assert members['new@test.com']['foundations_status'] == 'not_started'
+
+    def test_progress_reported_per_chunk(self, cohort, modules, monkeypatch):
+        for i in range(5):
+            _student(cohort, f's{i}')
+        sync = FoundationsReadinessSync.objects.create(cohort=cohort)
+        seen = []
+        evaluate = readiness_sync.evaluate_member
+
+        def spy(row, requirements):
+            seen.append(FoundationsReadinessSync.objects.values_list('processed', flat=True).get(id=sync.id))
+            return evaluate(row, requirements)
+        monkeypatch.setattr(readiness_sync, 'evaluate_member', spy)
+
+        readiness_sync.run_sync(sync.id, chunk_size=2)
+
+        assert sorted(set(seen)) == [0, 2, 4]
+        sync.refresh_from_db()
+        assert (sync.status, sync.processed, sync.progress_percentage) == ('completed', 5, 100.0)
+
+    def test_queries_do_not_grow_with_cohort(self, cohort, modules, locmem_cache):
+        module_requirements()
+
+        def run(count, prefix):
+            for i in range(count):
+                student = _student(cohort, f'{prefix}{i}')
+                FoundationsProgress.objects.create(user=student, modules_completed=_completed(modules['video']))
+            sync = FoundationsReadinessSync.objects.create(cohort=cohort)
+            with CaptureQueriesContext(connection) as queries:
+                readiness_sync.run_sync(sync.id)
+            return len(queries)
+
+        assert run(2, 'small') == run(20, 'large')
+        assert FoundationsReadinessMember.objects.count() == 22  # The earlier sync's members were replaced
+
+    def test_late_finisher_does_not_replace_newer_sync(self, cohort, modules, monkeypatch):
+        for i in range(3):
+            _student(cohort, f's{i}')
+        stale = FoundationsReadinessSync.objects.create(cohort=cohort)
+        FoundationsReadinessSync.objects.filter(id=stale.id).update(
+            created_at=timezone.now() - readiness_sync.STALE_AFTER - timedelta(minutes=1),
+        )
+        started = []
+        evaluate = readiness_sync.evaluate_member
+
+        def restart_midway(row, requirements):
+            if not started:
+                # The stale sync is presumed dead and a newer one runs to completion
+                started.append(None)
+                started[0] = readiness_sync.start_sync(cohort)
+            return evaluate(row, requirements)
+        monkeypatch.setattr(readiness_sync, 'evaluate_member', restart_midway)
+
+        late = readiness_sync.run_sync(stale.id)
+
+        newer, created = started[0]
+        newer.refresh_from_db()
+        assert created and (newer.status, late.status) == ('completed', 'failed')
+        assert set(FoundationsReadinessMember.objects.values_list('sync_id', flat=True)) == {newer.id}
+
+
+@pytest.mark.django_db
+class TestReadinessEndpoint:
+    def test_background_sync_reports_progress(self, admin_client, cohort, modules, django_capture_on_commit_callbacks):
+        _student(cohort, 'ada')
+        queued = []
+        with mock.patch('foundations.tasks.sync_cohort_readiness_task.delay', queued.append, create=True):
+            with django_capture_on_commit_callbacks(execute=True):
+                first = admin_client.post(_url(cohort))
+            second = admin_client.post(_url(cohort))
+
+        assert (first.status_code, second.status_code) == (202, 202)
+        assert second.data['sync_id'] == first.data['sync_id'] and second.data['created'] is False
+        assert queued == [first.data['sync_id']]
+        pending = admin_client.get(_url(cohort)).data
+        assert (pending['status'], pending['progress_percentage']) == ('queued', 0.0)
+        assert 'readiness_data' not in pending
+
+        readiness_sync.run_sync(queued[0])
+        done = admin_client.get(_url(cohort), {'sync_id': queued[0]}).data
+        assert (done['status'], done['processed'], len(done['readiness_data'])) == ('completed', 1, 1)
+
+    def test_members_are_paginated(self, admin_client, cohort, modules):
+        for name in ('cy', 'ada', 'bob'):
+            _student(cohort, name)
+        sync_id = admin_client.post(_url(cohort)).data['sync_id']
+
+        first = admin_client.get(_url(cohort), {'sync_id': sync_id, 'page_size': 2}).data
+        second = admin_client.get(_url(cohort), {'sync_id': sync_id, 'page_size': 2, 'page': 2}).data
+
+        assert [row['email'] for row in first['readiness_data']] == ['ada@test.com', 'bob@test.com']
+        assert first['members_page'] == {'page': 1, 'page_size': 2, 'total': 3, 'next_page': 2}
+        assert [row['email'] for row in second['readiness_data']] == ['cy@test.com']
+        assert second['members_page']['next_page'] is None
+        assert admin_client.get(_url(cohort), {'page': 'x'}).status_code == 400
+
+    def test_permissions_and_missing_sync(self, api_client, admin_client, cohort):
+        outsider = User.objects.create_user(username='outsider', email='outsider@test.com', password='x')
+        api_client.force_authenticate(user=outsider)
+        assert api_client.post(_url(cohort)).status_code == 403
+
+        admin_client.force_authenticate(user=User.objects.get(username='admin'))
+        assert admin_client.get(_url(cohort)).status_code == 404
@@ -0,0 +1,135 @@
+"""
+Test suite for the habit streak engine.
+
+Covers:
+- coaching.streaks.apply_habit_log incremental updates driven by HabitLog writes
+- fallback rebuild for edited, back-filled and deleted logs
+- coaching.streaks.recompute_habit_streaks gaps-and-islands rebuild
+"""
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from coaching.models import Habit, HabitLog
+from coaching.streaks import recompute_habit_streaks
+
+User = get_user_model()
+
+
+@pytest.fixture
+def habit(db):
+    user = User.objects.create_user(
+        username='streaks@test.com', email='streaks@test.com', password='testpass123'
+    )
+    return Habit.objects.create(user=user, name='Practice', type='core')
+
+
+def _log(habit, day, status='completed'):
+    log, _ = HabitLog.objects.update_or_create(
+        habit=habit, user=habit.user, date=day, defaults={'status': status}
+    )
+    return log
+
+
+def _days_ago(n):
+    return timezone.localdate() - timedelta(days=n)
+
+
+def _state(habit):
+    habit.refresh_from_db()
+    return habit.streak, habit.longest_streak
+
+
+@pytest.mark.django_db
+class TestIncrementalStreaks:
+    def test_consecutive_completions_extend_streak(self, habit):
+        for n in (3, 2, 1, 0):
+            _log(habit, _days_ago(n))
+        assert _state(habit) == (4, 4)
+        assert habit.streak_through == _days_ago(0)
+
+    def test_skipped_day_keeps_run_without_counting(self, habit):
+        _log(habit, _days_ago(2))
+        _log(habit, _days_ago(1), 'skipped')
+        _log(habit, _days_ago(0))
+        assert _state(habit) == (2, 2)
+
+    def test_missed_day_resets_but_keeps_longest(self, habit):
+        _log(habit, _days_ago(3))
+        _log(habit, _days_ago(2))
+        _log(habit, _days_ago(1), 'missed')
+        assert _state(habit) == (0, 2)
+        _log(habit, _days_ago(0))
+        assert _state(habit) == (1, 2)
+
+    def test_gap_restarts_run(self, habit):
+        _log(habit, _days_ago(5))
+        _log(habit, _days_ago(4))
+        _log(habit, _days_ago(1))
+        assert _state(habit) == (1, 2)
+
+    def test_backfilled_gap_rebuilds_habit(self, habit):
+        _log(habit, _days_ago(2))
+        _log(habit, _days_ago(0))
+        assert _state(habit) == (1, 1)
+        _log(habit, _days_ago(1))
+        assert _state(habit) == (3, 3)
+
+    def test_editing_counted_day_rebuilds_habit(self, habit):
+        for n in (2, 1, 0):
+            _log(habit, _days_ago(n))
+        _log(habit, _days_ago(1), 'missed')
+        assert _state(habit) == (1, 3)
+
+    def test_deleting_log_rebuilds_habit(self, habit):
+        _log(habit, _days_ago(1))
+        today_log = _log(habit, _days_ago(0))
+        today_log.delete()
+        assert _state(habit) == (1, 2)
+        assert habit.streak_through == _days_ago(1)
+
+
+@pytest.mark.django_db
+class TestBulkRecompute:
+    def test_matches_incremental_values(self, habit):
+        for n in (9, 8, 7, 5, 4, 3, 2, 1):
+            _log(habit, _days_ago(n), 'skipped' if n == 3 else 'completed')
+        expected = _state(habit)
+        Habit.objects.filter(id=habit.id).update(streak=0, longest_streak=0, streak_through=None)
+
+        assert recompute_habit_streaks() == 1
+        assert _state(habit) == expected == (4, 4)
+        assert habit.streak_through == _days_ago(1)
+
+    def test_lapsed_streak_drops_to_zero(self, habit):
+        for n in (6, 5, 4):
+            _log(habit, _days_ago(n))
+        assert _state(habit) == (3, 3)
+
+        recompute_habit_streaks()
+        assert _state(habit) == (0, 3)
+
+    def test_all_habits_in_one_pass(self, habit):
+        other = Habit.objects.create(user=habit.user, name='Learn', type='core')
+        untouched = Habit.objects.create(user=habit.user, name='Reflect', type='core')
+        for n in (2, 1, 0):
+            HabitLog.objects.bulk_create([
+                HabitLog(habit=habit, user=habit.user, date=_days_ago(n)),
+                HabitLog(habit=other, user=habit.user, date=_days_ago(n), status='missed' if n == 1 else 'completed'),
+            ])
+
+        recompute_habit_streaks()
+        assert _state(habit) == (3, 3)
+        assert _state(other) == (1, 1)
+        assert _state(untouched) == (0, 0)
+        assert untouched.streak_through is None
+
+    def test_scoped_to_habit_ids(self, habit):
+        other = Habit.objects.create(user=habit.user, name='Learn', type='core', streak=7)
+        HabitLog.objects.bulk_create([HabitLog(habit=habit, user=habit.user, date=_days_ago(0))])
+
+        recompute_habit_streaks(habit_ids=[habit.id])
+        assert _state(habit) == (1, 1)
+        assert _state(other) == (7, 0)
@@ -0,0 +1,135 @@
+"""
+Test suite for the shared identity snapshot (roles, tier, entitlements).
+
+Covers:
+- users.utils.identity_snapshot.get_identity_snapshot contents and memoization
+- version bumps from UserRole / UserSubscription / Entitlement signals
+- subscriptions.utils.get_user_tier and require_tier on top of the snapshot
+"""
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from subscriptions.models import SubscriptionPlan, UserSubscription
+from subscriptions.utils import get_user_tier, require_tier
+from users.models import Entitlement, Role, UserRole
+from users.utils.identity_snapshot import get_identity_snapshot, get_user_role_names
+
+User = get_user_model()
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    from django.core.cache import cache
+    cache.clear()
+    return cache
+
+
+@pytest.fixture
+def member(db):
+    return User.objects.create_user(
+        username='identity@test.com', email='identity@test.com', password='testpass123'
+    )
+
+
+@pytest.fixture
+def premium_plan(db):
+    return SubscriptionPlan.objects.create(
+        name='premium', tier='premium', features=['ai_coach', 'mentorship'], ai_coach_daily_limit=None,
+    )
+
+
+def _reload(user):
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.mark.django_db
+class TestIdentitySnapshot:
+    """Test snapshot contents and caching."""
+
+    def test_free_user_defaults(self, member):
+        snapshot = get_identity_snapshot(member)
+        assert snapshot.roles == frozenset()
+        assert snapshot.plan_name == 'free'
+        assert snapshot.tier == 'free'
+        assert snapshot.ai_coach_daily_limit == 5
+        assert not snapshot.has_enhanced_access
+
+    def test_roles_subscription_and_entitlements(self, member, premium_plan):
+        role, _ = Role.objects.get_or_create(name='mentor', defaults={'display_name': 'Mentor'})
+        UserRole.objects.create(user=member, role=role, scope='global', is_active=True)
+        UserSubscription.objects.create(
+            user=member, plan=premium_plan, status='active',
+            enhanced_access_expires_at=timezone.now() + timedelta(days=30),
+        )
+        Entitlement.objects.create(user=member, feature='marketplace_contact')
+        Entitlement.objects.create(user=member, feature='expired_feature',
+                                   expires_at=timezone.now() - timedelta(days=1))
+
+        snapshot = _reload(member).identity
+        assert snapshot.has_role('mentor')
+        assert snapshot.plan_name == 'premium'
+        assert snapshot.ai_coach_daily_limit is None
+        assert snapshot.has_enhanced_access
+        assert snapshot.has_feature('ai_coach') and snapshot.has_feature('marketplace_contact')
+        assert not snapshot.has_feature('expired_feature')
+
+    def test_inactive_subscription_is_free(self, member, premium_plan):
+        UserSubscription.objects.create(user=member, plan=premium_plan, status='past_due')
+        snapshot = get_identity_snapshot(member)
+        assert snapshot.tier == 'free'
+        assert snapshot.subscription_status == 'past_due'
+
+    def test_memoized_per_request(self, member, django_assert_num_queries):
+        get_identity_snapshot(member)
+        with django_assert_num_queries(0):
+            assert get_user_role_names(member) == frozenset()
+            get_identity_snapshot(member)
+
+    def test_cached_across_requests_until_role_change(self, member, locmem_cache, django_assert_num_queries):
+        get_identity_snapshot(member)
+        with django_assert_num_queries(0):
+            get_identity_snapshot(_reload_without_query(member))
+
+        role, _ = Role.objects.get_or_create(name='analyst', defaults={'display_name': 'Analyst'})
+        UserRole.objects.create(user=member, role=role, scope='global', is_active=True)
+        assert 'analyst' in get_user_role_names(_reload(member))
+
+    def test_subscription_change_bumps_version(self, member, premium_plan, locmem_cache):
+        assert get_identity_snapshot(member).tier == 'free'
+        UserSubscription.objects.create(user=member, plan=premium_plan, status='active')
+        assert get_identity_snapshot(_reload(member)).tier == 'premium'
+
+
+def _reload_without_query(user):
+    """A new instance of the same user without memoized state (simulates the next request)."""
+    return User(pk=user.pk)
+
+
+@pytest.mark.django_db
+class TestSubscriptionHelpers:
+    """Test get_user_tier / require_tier on top of the snapshot."""
+
+    def test_get_user_tier_accepts_user_uuid_and_pk(self, member, premium_plan):
+        UserSubscription.objects.create(user=member, plan=premium_plan, status='active')
+        assert get_user_tier(member) == 'premium'
+        assert get_user_tier(member.pk) == 'premium'
+        assert get_user_tier(str(member.uuid_id)) == 'premium'
+        assert get_user_tier('not-a-uuid') == 'free'
+
+    def test_require_tier_uses_request_user(self, member, premium_plan):
+        @require_tier('premium')
+        def view(request):
+            return 'ok'
+
+        request = APIRequestFactory().get('/')
+        request.user = member
+        assert view(request).status_code == 403
+
+        UserSubscription.objects.create(user=member, plan=premium_plan, status='active')
+        request.user = _reload(member)
+        assert view(request) == 'ok'
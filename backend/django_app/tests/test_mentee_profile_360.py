@@ -0,0 +1,181 @@
+"""
+Test suite for materialized mentee 360 profiles (talentscope/mentee360.py).
+
+Covers:
+- the mentor TalentScope view of a mentee reads one profile row, and a versioned
+  cache entry after that
+- skill, behavior, submission, session and readiness writes refresh their sections
+  once committed, including readiness batches from the engine
+- the behavioral trend window moves with the read date
+"""
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from mentorship_coordination.models import MenteeMentorAssignment, MentorSession
+from missions.models import Mission, MissionAssignment, MissionSubmission
+from talentscope import mentee360
+from talentscope.models import BehaviorSignal, MenteeProfile360, ReadinessSnapshot, SkillSignal
+from talentscope.readiness import compute_snapshots
+
+User = get_user_model()
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    from django.core.cache import cache
+    cache.clear()
+    return cache
+
+
+@pytest.fixture
+def mentee(db):
+    return User.objects.create_user(
+        username='mentee@test.com', email='mentee@test.com', password='x', first_name='Mia',
+    )
+
+
+@pytest.fixture
+def mentor(db, mentee):
+    mentor = User.objects.create_user(username='mentor@test.com', email='mentor@test.com', password='x', is_mentor=True)
+    MenteeMentorAssignment.objects.create(mentor=mentor, mentee=mentee, status='active')
+    return mentor
+
+
+def _url(mentor, mentee):
+    return f'/api/v1/mentors/{mentor.id}/mentees/{mentee.id}/talentscope'
+
+
+def _fetch(api_client, mentor, mentee):
+    api_client.force_authenticate(user=mentor)
+    response = api_client.get(_url(mentor, mentee))
+    assert response.status_code == 200, response.content
+    return response.data
+
+
+def _submit(mentee, status='approved', score=None):
+    mission = Mission.objects.create(title='Log Triage', description='d', difficulty=1, estimated_duration_min=30)
+    assignment = MissionAssignment.objects.create(mission=mission, assignment_type='individual', student=mentee)
+    return MissionSubmission.objects.create(
+        assignment=assignment, student=mentee, content='x', status=status, score=score,
+    )
+
+
+def _session(mentor, mentee):
+    start = timezone.now()
+    return MentorSession.objects.create(
+        assignment=MenteeMentorAssignment.objects.get(mentor=mentor, mentee=mentee), mentor=mentor, mentee=mentee,
+        title='Check-in', type='one_on_one', start_time=start, end_time=start + timedelta(hours=1),
+    )
+
+
+@pytest.mark.django_db
+class TestProfileReads:
+    def test_view_reads_the_profile(self, api_client, mentor, mentee, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            SkillSignal.objects.create(mentee=mentee, skill_name='SIEM', skill_category='technical', mastery_level=70)
+            BehaviorSignal.objects.create(mentee=mentee, behavior_type='study_consistency', value=3, source='system')
+            BehaviorSignal.objects.create(mentee=mentee, behavior_type='reflection_frequency', value=1, source='habit_log')
+            _submit(mentee, score=88)
+            _session(mentor, mentee)
+            ReadinessSnapshot.objects.create(
+                mentee=mentee, core_readiness_score=64, career_readiness_stage='emerging',
+                strengths=['SIEM'], job_fit_score=55,
+            )
+
+        data = _fetch(api_client, mentor, mentee)
+
+        assert data['ingested_signals'] == {
+            'mentor_evaluations': 1, 'habit_logs': 1, 'mission_scores': 1,
+            'reflection_sentiment': {'positive': 0, 'neutral': 0, 'negative': 0}, 'community_engagement': 0,
+        }
+        assert data['skills_heatmap'] == {'SIEM': 70.0}
+        assert len(data['behavioral_trends']) == mentee360.TREND_DAYS
+        assert data['behavioral_trends'][-1] == {
+            'date': timezone.localdate().isoformat(), 'missions_completed': 1, 'hours_studied': 3.0,
+            'reflections_count': 1,
+        }
+        assert data['readiness_over_time'] == [{'date': timezone.now().date().isoformat(), 'score': 64.0}]
+        assert (data['core_readiness_score'], data['career_readiness_stage']) == (64.0, 'emerging')
+        assert data['gap_analysis']['strengths'] == ['SIEM']
+        assert data['professional_tier_data']['job_fit_score'] == 55.0
+
+    def test_profile_is_one_query_then_cached(self, api_client, mentor, mentee, locmem_cache):
+        _fetch(api_client, mentor, mentee)
+        locmem_cache.delete(mentee360._profile_key(mentee.id, mentee360._current_version(mentee.id)))
+
+        with CaptureQueriesContext(connection) as ctx:
+            mentee360.get_profile(mentee.id)
+        assert len(ctx.captured_queries) == 1
+        assert '"ts_mentee_profiles"' in ctx.captured_queries[0]['sql']
+
+        with CaptureQueriesContext(connection) as ctx:
+            mentee360.get_profile(mentee.id)
+        assert len(ctx.captured_queries) == 0
+
+    def test_refresh_bumps_the_cached_version(self, mentee, locmem_cache, django_capture_on_commit_callbacks):
+        assert mentee360.get_profile(mentee.id)['habit_logs'] == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            BehaviorSignal.objects.create(mentee=mentee, behavior_type='reflection_frequency', value=1, source='habit_log')
+
+        assert mentee360.get_profile(mentee.id)['habit_logs'] == 1
+
+    def test_trend_window_moves_with_the_read_date(self, mentee, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            BehaviorSignal.objects.create(mentee=mentee, behavior_type='study_consistency', value=2, source='system')
+        profile = mentee360.get_profile(mentee.id)
+
+        later = mentee360.behavioral_trends(profile, timezone.now() + timedelta(days=mentee360.TREND_DAYS))
+
+        assert len(later) == mentee360.TREND_DAYS
+        assert all(day['hours_studied'] == 0.0 for day in later)
+
+
+@pytest.mark.django_db
+class TestWriterRefresh:
+    def test_writes_refresh_their_sections(self, mentor, mentee, django_capture_on_commit_callbacks):
+        mentee360.get_profile(mentee.id)
+        version = MenteeProfile360.objects.get().version
+
+        with django_capture_on_commit_callbacks(execute=True):
+            signal = SkillSignal.objects.create(mentee=mentee, skill_name='SIEM', skill_category='technical', mastery_level=40)
+        with django_capture_on_commit_callbacks(execute=True):
+            submission = _submit(mentee, status='submitted', score=70)
+        with django_capture_on_commit_callbacks(execute=True):
+            session = _session(mentor, mentee)
+
+        profile = MenteeProfile360.objects.get()
+        assert profile.version == version + 3
+        assert profile.skills_heatmap == {'SIEM': 40.0}
+        assert (profile.mission_days, profile.mission_scores) == ({}, 1)
+        assert profile.mentor_sessions == {str(mentor.id): 1}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            submission.status = 'approved'
+            submission.save()
+            signal.delete()
+            session.delete()
+
+        profile = MenteeProfile360.objects.get()
+        assert profile.mission_days == {timezone.now().date().isoformat(): 1}
+        assert profile.skills_heatmap == {}
+        assert profile.mentor_sessions == {}
+
+    def test_readiness_engine_batches_refresh_profiles(self, mentee):
+        other = User.objects.create_user(username='other@test.com', email='other@test.com', password='x')
+        mentee360.get_profile(mentee.id)
+
+        compute_snapshots([mentee.id, other.id])
+
+        profile = MenteeProfile360.objects.get()
+        assert profile.mentee_id == mentee.id
+        assert [point['score'] for point in profile.readiness_history] == [
+            float(ReadinessSnapshot.objects.get(mentee=mentee).core_readiness_score)
+        ]
+        assert profile.readiness['core_readiness_score'] is not None
@@ -0,0 +1,234 @@
+"""
+Test suite for mentor dashboard snapshots (mentors/dashboard_snapshot.py).
+
+Covers:
+- the dashboard is built from real assignments, sessions, submissions, curriculum
+  progress and readiness
+- a dashboard load after the first is one keyed read of the snapshot
+- session, assignment and submission changes refresh only their sections
+- snapshots from an earlier day are rebuilt, on read or by the daily task
+"""
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from curriculum.models import CurriculumTrack, UserTrackProgress
+from mentors import dashboard_snapshot
+from mentors.models import Mentor, MentorDashboardSnapshot, MentorSession, MentorStudentAssignment
+from mentors.tasks import rebuild_dashboard_snapshots_task
+from missions.models import Mission, MissionAssignment, MissionSubmission
+from talentscope.models import ReadinessSnapshot
+from users.models import Role, UserRole
+
+User = get_user_model()
+
+DASHBOARD_URL = '/api/v1/mentors/ada-mentor/dashboard/'
+
+
+@pytest.fixture
+def mentor(db):
+    user = User.objects.create_user(
+        username='ada@test.com', email='ada@test.com', password='x', first_name='Ada', last_name='Mentor',
+    )
+    role, _ = Role.objects.get_or_create(name='mentor', defaults={'description': 'Mentor role'})
+    UserRole.objects.create(user=user, role=role, scope='global')
+    return Mentor.objects.create(user=user, mentor_slug='ada-mentor', expertise_tracks=['defender'])
+
+
+@pytest.fixture
+def client(api_client, mentor):
+    api_client.force_authenticate(user=mentor.user)
+    return api_client
+
+
+@pytest.fixture
+def mission(db):
+    return Mission.objects.create(title='Log Triage', description='d', difficulty=1, estimated_duration_min=30)
+
+
+def _student(mentor, name, track='defender', completion=None, **assignment_fields):
+    student = User.objects.create_user(
+        username=f'{name}@test.com', email=f'{name}@test.com', password='x', first_name=name.title(),
+    )
+    assignment = MentorStudentAssignment.objects.create(
+        mentor=mentor, student=student, track_slug=track, **assignment_fields,
+    )
+    if completion is not None:
+        track_row, _ = CurriculumTrack.objects.get_or_create(
+            code=track.upper(), defaults={'slug': track, 'name': track.title(), 'title': track.title()},
+        )
+        UserTrackProgress.objects.create(user=student, track=track_row, completion_percentage=completion)
+    return student, assignment
+
+
+def _submit(mission, student, status='submitted', **fields):
+    assignment = MissionAssignment.objects.create(mission=mission, assignment_type='individual', student=student)
+    return MissionSubmission.objects.create(
+        assignment=assignment, student=student, content='x', status=status, **fields,
+    )
+
+
+def _dashboard(client):
+    response = client.get(DASHBOARD_URL)
+    assert response.status_code == 200, response.content
+    return response.data
+
+
+def _tables(queries):
+    return {table for table in ('mentor_student_assignments', 'mentor_sessions', 'mission_submissions',
+                                'user_track_progress', 'mentor_dashboard_snapshots')
+            if any(f'"{table}"' in query['sql'] for query in queries)}
+
+
+@pytest.mark.django_db
+class TestDashboardContent:
+    def test_dashboard_from_real_data(self, client, mentor, mission, django_capture_on_commit_callbacks):
+        now = timezone.now()
+        with django_capture_on_commit_callbacks(execute=True):
+            sara, _ = _student(mentor, 'sara', completion=92)
+            james, _ = _student(mentor, 'james', track='grc', completion=30)
+            MentorStudentAssignment.objects.filter(student=james).update(assigned_at=now - timedelta(days=40))
+            UserTrackProgress.objects.filter(user=james).update(last_activity_at=now - timedelta(days=25))
+            _submit(mission, sara, submitted_at=now - timedelta(hours=50))
+            _submit(mission, james, status='needs_revision', submitted_at=now - timedelta(days=20))
+            _submit(mission, james, status='rejected', submitted_at=now - timedelta(days=20))
+            ReadinessSnapshot.objects.create(mentee=james, core_readiness_score=25)
+            MentorSession.objects.create(
+                mentor=mentor, student=sara, track_slug='defender', title='Weekly check-in',
+                scheduled_at=now.replace(hour=23, minute=0, second=0, microsecond=0),
+            )
+
+        data = _dashboard(client)
+
+        assert data['mentor']['assigned_students_count'] == 2
+        assert [(s['name'], s['completion']) for s in data['assigned_students']] == [('James', 30.0), ('Sara', 92.0)]
+        assert [s['title'] for s in data['today_schedule']] == ['Weekly check-in']
+
+        priorities = {p['id']: p for p in data['today_priorities']}
+        assert set(priorities) == {'quiz_reviews', 'at_risk_students', 'today_sessions', 'new_assignments'}
+        assert priorities['quiz_reviews']['total_count'] == 1
+        assert priorities['quiz_reviews']['items'][0]['student_name'] == 'Sara'
+        assert priorities['quiz_reviews']['items'][0]['priority'] == 'high'
+        [at_risk] = priorities['at_risk_students']['items']
+        assert at_risk['student_name'] == 'James' and at_risk['risk_level'] == 'high'
+        assert at_risk['issues'] == ['No activity for 20 days', '2 submissions sent back', 'Readiness 25']
+        assert [item['student_name'] for item in priorities['new_assignments']['items']] == ['Sara']
+
+        analytics = data['cohort_analytics']
+        assert analytics['tracks_distribution'] == {'defender': 1, 'grc': 1}
+        assert analytics['average_completion'] == 61.0
+        assert analytics['completion_distribution'] == {'excellent': 1, 'good': 0, 'needs_attention': 0, 'at_risk': 1}
+        assert analytics['recent_activity']['submissions_last_7_days'] == 1
+        assert analytics['top_performers'] == [{'name': 'Sara', 'completion': 92.0, 'track': 'defender'}]
+        assert analytics['needs_help'] == [{'name': 'James', 'completion': 30.0, 'track': 'grc', 'days_stuck': 20}]
+
+    def test_later_loads_are_one_keyed_read(self, client, mentor, mission):
+        for name in ('amy', 'ben', 'cal'):
+            student, _ = _student(mentor, name, completion=50)
+            _submit(mission, student)
+        _dashboard(client)
+
+        with CaptureQueriesContext(connection) as ctx:
+            data = _dashboard(client)
+
+        assert len(data['assigned_students']) == 3
+        snapshot_reads = [q for q in ctx.captured_queries if '"mentor_dashboard_snapshots"' in q['sql']]
+        assert len(snapshot_reads) == 1
+        assert _tables(ctx.captured_queries) == {'mentor_dashboard_snapshots'}
+
+    def test_other_users_cannot_load_the_dashboard(self, api_client, mentor):
+        other = User.objects.create_user(username='eve@test.com', email='eve@test.com', password='x')
+        UserRole.objects.create(user=other, role=Role.objects.get(name='mentor'), scope='global')
+        Mentor.objects.create(user=other, mentor_slug='eve-mentor')
+        api_client.force_authenticate(user=other)
+
+        assert api_client.get(DASHBOARD_URL).status_code == 404
+        assert not MentorDashboardSnapshot.objects.exists()
+
+
+@pytest.mark.django_db
+class TestIncrementalRefresh:
+    def test_changes_refresh_their_sections(self, client, mentor, mission, django_capture_on_commit_callbacks):
+        sara, _ = _student(mentor, 'sara', completion=40)
+        james, james_assignment = _student(mentor, 'james')
+        _dashboard(client)
+        version = MentorDashboardSnapshot.objects.get().version
+
+        with django_capture_on_commit_callbacks(execute=True):
+            submission = _submit(mission, sara)
+        with django_capture_on_commit_callbacks(execute=True):
+            MentorSession.objects.create(
+                mentor=mentor, student=james, track_slug='defender', title='Kickoff',
+                scheduled_at=timezone.now().replace(hour=23, minute=30, second=0, microsecond=0),
+            )
+        snapshot = MentorDashboardSnapshot.objects.get()
+        assert snapshot.version == version + 2
+        assert snapshot.students[str(sara.id)]['pending_reviews'] == 1
+        assert [item['submission_id'] for item in snapshot.reviews] == [str(submission.id)]
+        assert [session['title'] for session in snapshot.schedule] == ['Kickoff']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            submission.status = 'approved'
+            submission.reviewed_at = timezone.now()
+            submission.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            james_assignment.is_active = False
+            james_assignment.save()
+
+        data = _dashboard(client)
+        assert [s['name'] for s in data['assigned_students']] == ['Sara']
+        assert data['assigned_students'][0]['missions_completed_7d'] == 1
+        assert 'quiz_reviews' not in {p['id'] for p in data['today_priorities']}
+
+    def test_submission_refresh_is_scoped_to_the_student(self, client, mentor, mission,
+                                                         django_capture_on_commit_callbacks):
+        students = [_student(mentor, f'student{i}', completion=10 * i)[0] for i in range(5)]
+        _dashboard(client)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                _submit(mission, students[0])
+
+        student = students[0]
+        scoped = (f'"student_id" = {student.id}', f'"student_id" IN ({student.id})', str(student.uuid_id),
+                  student.uuid_id.hex)
+        roster_reads = [q['sql'] for q in ctx.captured_queries if 'FROM "mentor_student_assignments"' in q['sql']]
+        assert roster_reads and all(any(token in sql for token in scoped) for sql in roster_reads), roster_reads
+        assert MentorDashboardSnapshot.objects.get().students[str(students[0].id)]['pending_reviews'] == 1
+
+
+@pytest.mark.django_db
+class TestDayRollover:
+    def test_stale_snapshot_is_rebuilt(self, client, mentor, django_capture_on_commit_callbacks):
+        _student(mentor, 'sara')
+        _dashboard(client)
+        MentorDashboardSnapshot.objects.update(as_of=timezone.now().date() - timedelta(days=1))
+
+        with django_capture_on_commit_callbacks(execute=True):
+            _student(mentor, 'james')
+        # Incremental refreshes leave earlier-day snapshots to the rebuild
+        assert len(MentorDashboardSnapshot.objects.get().students) == 1
+
+        data = _dashboard(client)
+        assert data['mentor']['assigned_students_count'] == 2
+        assert data['snapshot']['as_of'] == timezone.now().date().isoformat()
+
+    def test_daily_task_rebuilds_every_mentor(self, mentor):
+        _student(mentor, 'sara')
+        other = Mentor.objects.create(
+            user=User.objects.create_user(username='bo@test.com', email='bo@test.com', password='x'),
+            mentor_slug='bo-mentor',
+        )
+
+        result = rebuild_dashboard_snapshots_task()
+
+        assert result == {'status': 'success', 'snapshots': 2}
+        assert {s.mentor_id: len(s.students) for s in MentorDashboardSnapshot.objects.all()} == {
+            mentor.id: 1, other.id: 0,
+        }
+        assert dashboard_snapshot.rebuild_all(chunk_size=1) == 2
+        assert MentorDashboardSnapshot.objects.get(mentor=mentor).version == 2
@@ -0,0 +1,217 @@
+"""
+Test suite for the materialized student mission catalog.
+
+Covers:
+- list_student_missions issues a fixed number of queries, rebuilding or not
+- statuses, AI scores, artifact counts and lock reasons from missions/visibility.py
+- keyset pagination and status filtering over the catalog
+- submission, curriculum-progress, cohort-assignment and mission events keep the catalog fresh,
+  and a mission edit only stales the catalogs it can reach
+"""
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from curriculum.models import CurriculumTrack, UserTrackProgress
+from missions.models import (
+    AIFeedback, Mission, MissionArtifact, MissionAssignment, MissionSubmission, StudentMissionCatalog,
+)
+from programs.models import Cohort, Enrollment, Program, Track
+from subscriptions.models import SubscriptionPlan, UserSubscription
+
+User = get_user_model()
+
+URL = '/api/v1/student/missions/'
+
+
+@pytest.fixture
+def student(db):
+    user = User.objects.create_user(
+        username='missions@test.com', email='missions@test.com', password='testpass123', track_key='defender',
+    )
+    plan = SubscriptionPlan.objects.create(name='premium', tier='premium')
+    UserSubscription.objects.create(user=user, plan=plan, status='active')
+    return user
+
+
+@pytest.fixture
+def student_client(api_client, student):
+    api_client.force_authenticate(user=student)
+    return api_client
+
+
+def _mission(title, **fields):
+    fields.setdefault('track', 'defender')
+    return Mission.objects.create(
+        title=title, description=f'{title} description', difficulty=1, estimated_duration_min=30, **fields
+    )
+
+
+def _submit(student, mission, status='submitted', score=None, artifacts=0):
+    assignment = MissionAssignment.objects.create(mission=mission, assignment_type='individual', student=student)
+    submission = MissionSubmission.objects.create(assignment=assignment, student=student, content='work', status=status)
+    if score is not None:
+        AIFeedback.objects.create(
+            submission=submission, score=score, strengths=['a', 'b', 'c', 'd'], improvements=['x'],
+        )
+    for i in range(artifacts):
+        MissionArtifact.objects.create(submission=submission, file_url=f'https://files.test/{i}', file_name=f'{i}.txt')
+    return submission
+
+
+def _count_queries(callable_):
+    with CaptureQueriesContext(connection) as queries:
+        response = callable_()
+    assert response.status_code == 200, response.content
+    return len(queries), response
+
+
+@pytest.mark.django_db
+class TestMissionListQueryCounts:
+    def test_queries_do_not_grow_with_missions(self, student_client, student):
+        student_client.get(URL)  # create the catalog header and memoize the identity snapshot
+        for i in range(3):
+            _submit(student, _mission(f'Small {i}'), score=70, artifacts=2)
+        small_rebuild, _ = _count_queries(lambda: student_client.get(URL))
+        small, _ = _count_queries(lambda: student_client.get(URL))
+
+        for i in range(9):
+            _submit(student, _mission(f'Large {i}'), score=70, artifacts=2)
+        large_rebuild, _ = _count_queries(lambda: student_client.get(URL))
+        large, response = _count_queries(lambda: student_client.get(URL))
+
+        assert response.data['total'] == 12
+        assert large == small <= 3
+        assert large_rebuild == small_rebuild
+
+
+@pytest.mark.django_db
+class TestMissionCatalogState:
+    def test_submission_state_and_lock_reasons(self, student_client, student):
+        reviewed = _mission('Reviewed')
+        _submit(student, reviewed, status='approved', score=88, artifacts=3)
+        _mission('Needs points', requires_points=True, points_required=50)
+        _mission('Intermediate', tier='intermediate')
+
+        response = student_client.get(URL)
+        missions = {m['title']: m for m in response.data['results']}
+
+        assert missions['Reviewed']['status'] == 'approved'
+        assert missions['Reviewed']['ai_score'] == 88.0
+        assert missions['Reviewed']['ai_feedback'] == {'score': 88.0, 'strengths': ['a', 'b', 'c'], 'gaps': ['x']}
+        assert missions['Reviewed']['artifacts_uploaded'] == 3
+        assert missions['Needs points']['is_locked'] is True
+        assert 'You have 0/50' in missions['Needs points']['lock_reason']
+        assert missions['Intermediate']['lock_reason'] == 'Complete Beginner level in Defender track to unlock.'
+        assert 'ai_score' not in missions['Intermediate']
+
+    def test_keyset_pages_cover_catalog_in_order(self, student_client, student):
+        base = timezone.now()
+        for i in range(5):
+            mission = _mission(f'Paged {i}')
+            Mission.objects.filter(id=mission.id).update(created_at=base - timedelta(minutes=i))
+
+        titles, cursor = [], None
+        while True:
+            params = {'page_size': 2}
+            if cursor:
+                params['cursor'] = cursor
+            data = student_client.get(URL, params).data
+            titles.extend(m['title'] for m in data['results'])
+            cursor = data['next_cursor']
+            if not cursor:
+                break
+        assert titles == [f'Paged {i}' for i in range(5)]
+
+    def test_status_filter_and_bad_cursor(self, student_client, student):
+        _submit(student, _mission('Drafted'), status='draft')
+        _mission('Untouched')
+
+        drafted = student_client.get(URL, {'status': 'draft'}).data
+        assert [m['title'] for m in drafted['results']] == ['Drafted']
+        not_started = student_client.get(URL, {'status': 'not_started'}).data
+        assert [m['title'] for m in not_started['results']] == ['Untouched']
+        assert student_client.get(URL, {'cursor': 'not-a-cursor'}).status_code == 400
+
+
+@pytest.mark.django_db
+class TestMissionCatalogEvents:
+    def test_submission_patches_row_without_rebuild(self, student_client, student):
+        mission = _mission('Live')
+        student_client.get(URL)
+        built = StudentMissionCatalog.objects.get(student=student).built_version
+
+        submission = _submit(student, mission, status='submitted')
+        submission.status = 'approved'
+        submission.save()
+        MissionArtifact.objects.create(submission=submission, file_url='https://files.test/a', file_name='a.txt')
+
+        catalog = StudentMissionCatalog.objects.get(student=student)
+        assert not catalog.is_stale and catalog.built_version == built
+        result = student_client.get(URL).data['results'][0]
+        assert result['status'] == 'approved'
+        assert result['artifacts_uploaded'] == 1
+
+    def test_curriculum_points_unlock_mission(self, student_client, student):
+        _mission('Points gate', requires_points=True, points_required=20)
+        assert student_client.get(URL).data['results'][0]['is_locked'] is True
+
+        track = CurriculumTrack.objects.create(code='DEFENDER', slug='defender', name='Defender', title='Defender')
+        UserTrackProgress.objects.create(user=student, track=track, total_points=25)
+        assert student_client.get(URL).data['results'][0]['is_locked'] is False
+
+    def test_cohort_assignment_adds_mission(self, student_client, student):
+        student.track_key = None
+        student.save()
+        program = Program.objects.create(
+            name='Catalog Program', category='technical', description='Test',
+            duration_months=6, default_price=1000, currency='USD', status='active',
+        )
+        track = Track.objects.create(program=program, name='Catalog Track', key='offensive', description='Test')
+        cohort = Cohort.objects.create(
+            track=track, name='Catalog Cohort', start_date=timezone.now().date(),
+            end_date=(timezone.now() + timedelta(days=180)).date(), mode='virtual',
+            seat_cap=20, mentor_ratio=0.1, status='active',
+        )
+        Enrollment.objects.create(cohort=cohort, user=student, status='active')
+        cohort_mission = _mission('Cohort only', track='grc')
+        assert [m['title'] for m in student_client.get(URL).data['results']] == []
+
+        MissionAssignment.objects.create(mission=cohort_mission, assignment_type='cohort', cohort_id=cohort.id)
+        results = student_client.get(URL).data['results']
+        assert [m['title'] for m in results] == ['Cohort only']
+        assert results[0]['lock_reason'] == 'This mission is for the GRC track.'
+
+    def test_mission_edit_only_stales_reached_catalogs(self, student_client, student):
+        other = User.objects.create_user(
+            username='grc-missions@test.com', email='grc-missions@test.com', password='testpass123', track_key='grc',
+        )
+        UserSubscription.objects.create(user=other, plan=SubscriptionPlan.objects.get(name='premium'), status='active')
+        mission = _mission('Defender only')
+        untracked = _mission('Everyone', track=None)
+        student_client.get(URL)
+        student_client.force_authenticate(user=other)
+        student_client.get(URL)
+
+        def stale():
+            return {catalog.student_id: catalog.is_stale for catalog in StudentMissionCatalog.objects.all()}
+
+        mission.title = 'Defender only, renamed'
+        mission.save()
+        assert stale() == {student.uuid_id: True, other.uuid_id: False}
+
+        student_client.get(URL)
+        mission.track = 'grc'
+        mission.save()
+        assert stale() == {student.uuid_id: True, other.uuid_id: True}
+
+        student_client.force_authenticate(user=student)
+        student_client.get(URL)
+        student_client.force_authenticate(user=other)
+        student_client.get(URL)
+        untracked.save()
+        assert stale() == {student.uuid_id: True, other.uuid_id: True}
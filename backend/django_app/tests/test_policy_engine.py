@@ -0,0 +1,141 @@
+"""
+Test suite for the compiled ABAC policy engine.
+
+Covers:
+- users.utils.policy_engine.check_permission / evaluate_policy decisions
+- per-request attribute memoization (query counts)
+- policy index invalidation on Policy changes
+"""
+import pytest
+from django.contrib.auth import get_user_model
+
+from users.models import ConsentScope, Permission, Role, UserRole
+from users.policy_models import Policy
+from users.utils.policy_compiler import PolicyIndex, UserAttributes, policy_store
+from users.utils.policy_engine import check_permission, evaluate_policy
+
+User = get_user_model()
+
+
+@pytest.fixture
+def mentor(db):
+    user = User.objects.create_user(
+        username='policy-mentor@test.com',
+        email='policy-mentor@test.com',
+        password='testpass123',
+        cohort_id='cohort-1',
+    )
+    role, _ = Role.objects.get_or_create(name='mentor', defaults={'display_name': 'Mentor'})
+    permission, _ = Permission.objects.get_or_create(
+        resource_type='portfolio', action='read', defaults={'name': 'read_portfolio'}
+    )
+    role.permissions.add(permission)
+    UserRole.objects.create(user=user, role=role, scope='global', is_active=True)
+    return User.objects.get(pk=user.pk)
+
+
+@pytest.fixture(autouse=True)
+def fresh_policy_index():
+    policy_store.invalidate()
+    yield
+    policy_store.invalidate()
+
+
+@pytest.mark.django_db
+class TestCheckPermission:
+    """Test RBAC + ABAC decisions through check_permission."""
+
+    def test_no_policy_allows_when_rbac_grants(self, mentor):
+        assert check_permission(mentor, 'portfolio', 'read') == (True, "No policy; access allowed by RBAC")
+
+    def test_missing_rbac_permission_denies(self, mentor):
+        allowed, _ = check_permission(mentor, 'portfolio', 'delete')
+        assert allowed is False
+
+    def test_consent_condition(self, mentor):
+        Policy.objects.create(
+            name='mentor-needs-consent',
+            effect='allow',
+            resource='portfolio',
+            actions=['read'],
+            condition={'user.role': 'mentor', 'consent_scopes.includes': 'share_with_mentor'},
+        )
+        assert check_permission(mentor, 'portfolio', 'read')[0] is False
+
+        ConsentScope.objects.create(user=mentor, scope_type='share_with_mentor', granted=True)
+        mentor = User.objects.get(pk=mentor.pk)
+        assert check_permission(mentor, 'portfolio', 'read') == (True, "Policy 'mentor-needs-consent' allows access")
+
+    def test_cohort_condition_uses_context(self, mentor):
+        Policy.objects.create(
+            name='same-cohort-only',
+            effect='allow',
+            resource='portfolio',
+            actions=['read'],
+            condition={'user.cohort_id': 'request.cohort_id'},
+        )
+        assert evaluate_policy(mentor, 'portfolio', 'read', {'cohort_id': 'cohort-1'})[0] is True
+        assert evaluate_policy(mentor, 'portfolio', 'read', {'cohort_id': 'cohort-2'})[0] is False
+
+    def test_repeated_checks_reuse_snapshot(self, mentor, django_assert_max_num_queries):
+        policy_store.get_index()
+        check_permission(mentor, 'portfolio', 'read')
+        with django_assert_max_num_queries(0):
+            for _ in range(10):
+                check_permission(mentor, 'portfolio', 'read')
+                check_permission(mentor, 'cohort', 'list')
+
+
+@pytest.mark.django_db
+class TestPolicyIndexInvalidation:
+    """Test that policy edits recompile the index."""
+
+    def test_policy_save_and_delete_rebuild_index(self, mentor, django_capture_on_commit_callbacks):
+        first = policy_store.get_index()
+        assert check_permission(mentor, 'portfolio', 'read')[0] is True
+
+        with django_capture_on_commit_callbacks(execute=True):
+            policy = Policy.objects.create(
+                name='deny-mentors', effect='deny', resource='portfolio', actions=['read'],
+                condition={'user.role': 'mentor'},
+            )
+            # Not bumped until the edit commits
+            assert policy_store.get_index() is first
+        assert policy_store.get_index() is not first
+        assert evaluate_policy(mentor, 'portfolio', 'read') == (False, "Policy 'deny-mentors' denies access")
+        assert check_permission(mentor, 'portfolio', 'read')[0] is False
+
+        with django_capture_on_commit_callbacks(execute=True):
+            policy.delete()
+        assert check_permission(mentor, 'portfolio', 'read')[0] is True
+
+    def test_inactive_policies_are_not_compiled(self, mentor):
+        Policy.objects.create(
+            name='inactive-deny', effect='deny', resource='portfolio', actions=['read'], active=False,
+        )
+        assert ('portfolio', 'read') not in policy_store.get_index().rules
+
+
+class TestPolicyIndex:
+    """Test compiled decisions without the database."""
+
+    def test_first_matching_policy_wins(self):
+        index = PolicyIndex.build([
+            Policy(name='a-deny-students', effect='deny', resource='profiling', actions=['read'],
+                   condition={'user.role': 'student'}),
+            Policy(name='b-allow-all', effect='allow', resource='profiling', actions=['read', 'list'],
+                   condition={}),
+        ])
+        student = UserAttributes(user_id=1, roles=frozenset({'student'}))
+        mentor = UserAttributes(user_id=2, roles=frozenset({'mentor'}))
+        assert index.decide(student, 'profiling', 'read', {})[0] is False
+        assert index.decide(mentor, 'profiling', 'read', {})[0] is True
+        assert index.decide(student, 'profiling', 'list', {})[0] is True
+
+    def test_org_condition_without_org_denies(self):
+        index = PolicyIndex.build([
+            Policy(name='org-only', effect='allow', resource='organization', actions=['read'],
+                   condition={'user.org_id': 'request.org_id'}),
+        ])
+        assert index.decide(UserAttributes(user_id=1), 'organization', 'read', {'org_id': 5})[0] is False
+        assert index.decide(UserAttributes(user_id=1, org_id='5'), 'organization', 'read', {'org_id': 5})[0] is True
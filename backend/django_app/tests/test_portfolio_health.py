@@ -0,0 +1,182 @@
+"""
+Test suite for portfolio health summaries (dashboard/portfolio_health.py) and the
+cohort peer directory.
+
+Covers:
+- summaries follow portfolio item creates, status/tag updates and deletes
+- the latest readiness score lands on the summary
+- incremental summaries match a rebuild from scratch
+- the health endpoint reads the summary
+- the peer listing is paginated and its query count does not grow with the cohort
+"""
+import json
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from dashboard.models import PortfolioHealthSummary, PortfolioItem, ReadinessScore
+from dashboard.portfolio_health import rebuild_summary
+from programs.models import Cohort, Enrollment, Program, Track
+
+User = get_user_model()
+
+PEERS_URL = '/api/v1/student/dashboard/portfolio/cohort-peers'
+
+SUMMARY_FIELDS = [
+    'total_items', 'approved_items', 'pending_items', 'in_review_items',
+    'skill_counts', 'top_skills', 'health_score', 'readiness_score', 'readiness_trend',
+]
+
+
+def _user(name):
+    return User.objects.create_user(
+        username=name, email=f'{name}@test.com', password='x', first_name=name.title(), last_name='Test',
+    )
+
+
+def _item(user, status='draft', skills=()):
+    return PortfolioItem.objects.create(user=user, title='Item', status=status, skill_tags=json.dumps(list(skills)))
+
+
+def _summary(user):
+    summary = PortfolioHealthSummary.objects.get(user=user)
+    return {field: getattr(summary, field) for field in SUMMARY_FIELDS}
+
+
+@pytest.fixture
+def student(db):
+    return _user('ada')
+
+
+@pytest.mark.django_db
+class TestSummaryMaintenance:
+    def test_item_lifecycle_updates_summary(self, student):
+        first = _item(student, 'approved', ['Python', 'SIEM'])
+        second = _item(student, 'draft', ['Python'])
+        summary = _summary(student)
+        assert (summary['total_items'], summary['approved_items'], summary['pending_items']) == (2, 1, 1)
+        assert summary['health_score'] == 50.0
+        assert summary['top_skills'][0] == {'skill': 'Python', 'count': 2, 'score': 10}
+
+        second.status = 'in_review'
+        second.skill_tags = json.dumps(['Forensics'])
+        second.save()
+        summary = _summary(student)
+        assert (summary['pending_items'], summary['in_review_items']) == (0, 1)
+        assert summary['skill_counts'] == {'Python': 1, 'SIEM': 1, 'Forensics': 1}
+
+        first.delete()
+        summary = _summary(student)
+        assert (summary['total_items'], summary['approved_items'], summary['health_score']) == (1, 0, 0.0)
+        assert summary['skill_counts'] == {'Forensics': 1}
+
+    def test_latest_readiness_lands_on_summary(self, student):
+        ReadinessScore.objects.create(user=student, score=40, trend=1.5)
+        assert _summary(student)['readiness_score'] == 40
+        latest = ReadinessScore.objects.create(user=student, score=72, trend=3.0)
+        assert (_summary(student)['readiness_score'], _summary(student)['readiness_trend']) == (72, 3.0)
+        latest.delete()
+        assert _summary(student)['readiness_score'] == 40
+
+    def test_incremental_matches_rebuild(self, student):
+        items = [_item(student, status, skills) for status, skills in [
+            ('approved', ['Python']), ('submitted', ['Python', 'Cloud']), ('rejected', []), ('in_review', ['Cloud']),
+        ]]
+        items[1].status = 'approved'
+        items[1].save()
+        items[2].delete()
+        ReadinessScore.objects.create(user=student, score=55)
+
+        incremental = _summary(student)
+        rebuild_summary(student.id)
+        assert _summary(student) == incremental
+
+
+@pytest.mark.django_db
+def test_health_endpoint_reads_summary(api_client, student):
+    api_client.force_authenticate(user=student)
+    _item(student, 'approved', ['Python'])
+    ReadinessScore.objects.create(user=student, score=64, trend=2.0)
+
+    response = api_client.get(f'/api/v1/student/dashboard/portfolio/{student.id}/health')
+
+    assert response.status_code == 200
+    assert response.data['totalItems'] == 1
+    assert response.data['healthScore'] == 100.0
+    assert response.data['topSkills'] == [{'skill': 'Python', 'count': 1, 'score': 10}]
+    assert (response.data['readinessScore'], response.data['readinessTrend']) == (64, 2.0)
+
+
+@pytest.mark.django_db
+class TestCohortPeers:
+    @pytest.fixture
+    def cohort(self):
+        program = Program.objects.create(
+            name='Peer Program', category='technical', description='Test',
+            duration_months=6, default_price=1000, currency='USD', status='active',
+        )
+        track = Track.objects.create(program=program, name='Defender', key='defender', description='Test')
+        return Cohort.objects.create(
+            track=track, name='Defender Cohort', start_date=timezone.now().date(),
+            end_date=(timezone.now() + timedelta(days=180)).date(), mode='virtual',
+            seat_cap=50, mentor_ratio=0.1, status='active',
+        )
+
+    @pytest.fixture
+    def peer_client(self, api_client, student, cohort):
+        Enrollment.objects.create(cohort=cohort, user=student, status='active')
+        api_client.force_authenticate(user=student)
+        return api_client
+
+    def _peer(self, cohort, name, readiness, items=()):
+        peer = _user(name)
+        Enrollment.objects.create(cohort=cohort, user=peer, status='active')
+        ReadinessScore.objects.create(user=peer, score=readiness)
+        for status in items:
+            _item(peer, status)
+        return peer
+
+    def test_peers_listed_by_readiness(self, peer_client, cohort):
+        self._peer(cohort, 'bob', 85, ['approved', 'draft'])
+        self._peer(cohort, 'cy', 30)
+        _user('outsider')
+
+        data = peer_client.get(PEERS_URL).data
+
+        assert data['cohortName'] == 'Defender Cohort'
+        assert [p['handle'] for p in data['peers']] == ['bob', 'cy']
+        assert data['peers'][0] == {
+            'id': str(User.objects.get(username='bob').uuid_id), 'name': 'Bob Test', 'handle': 'bob',
+            'track': 'defender', 'readiness': 85, 'health': 5.0, 'items': 2, 'status': 'job_ready',
+        }
+        assert data['peers'][1]['status'] == 'building'
+        assert (data['averageReadiness'], data['totalOutcomes'], data['count']) == (58, 2, 2)
+
+    def test_peers_are_paginated(self, peer_client, cohort):
+        for i in range(5):
+            self._peer(cohort, f'p{i}', 10 * i)
+
+        first = peer_client.get(PEERS_URL, {'page_size': 2}).data
+        last = peer_client.get(PEERS_URL, {'page_size': 2, 'page': 3}).data
+
+        assert [p['handle'] for p in first['peers']] == ['p4', 'p3']
+        assert first['count'] == 5 and first['next'] is not None
+        assert [p['handle'] for p in last['peers']] == ['p0']
+        assert last['averageReadiness'] == 20
+
+    def test_peer_queries_do_not_grow_with_cohort(self, peer_client, cohort):
+        def count():
+            with CaptureQueriesContext(connection) as queries:
+                assert peer_client.get(PEERS_URL).status_code == 200
+            return len(queries)
+
+        self._peer(cohort, 'first', 50, ['approved'])
+        count()
+        small = count()
+        for i in range(10):
+            self._peer(cohort, f'more{i}', i, ['draft'])
+        assert count() == small
@@ -0,0 +1,129 @@
+"""
+Test suite for the ORM query profiler (core/query_profiler.py), its management
+command and the query budget pytest plugin (core/pytest_query_budget.py).
+
+Covers:
+- SQL fingerprints collapse literals and IN-lists
+- per-row queries from one call site are flagged as N+1 with their origin
+- the opt-in middleware profiles requests, logs them and reports per endpoint
+- query budgets pass and fail as declared
+"""
+import json
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from core import pytest_query_budget
+from core.query_profiler import QueryProfile, RecordedQuery, add_listener, fingerprint, record_queries, remove_listener
+from dashboard.models import PortfolioItem
+
+User = get_user_model()
+
+PROFILER = 'core.query_profiler.QueryProfilerMiddleware'
+
+
+@pytest.fixture
+def student(db):
+    return User.objects.create_user(username='ada', email='ada@test.com', password='x')
+
+
+@pytest.fixture
+def profiled(settings, tmp_path):
+    settings.QUERY_PROFILER_ENABLED = True
+    settings.QUERY_PROFILER_LOG = str(tmp_path / 'queries.jsonl')
+    settings.MIDDLEWARE = [PROFILER, *settings.MIDDLEWARE]
+    profiles = []
+    add_listener(profiles.append)
+    yield profiles
+    remove_listener(profiles.append)
+
+
+def test_fingerprint_collapses_literals():
+    assert fingerprint("SELECT * FROM t WHERE a = 'x' AND b = 42") == 'SELECT * FROM t WHERE a = ? AND b = ?'
+    assert fingerprint('SELECT * FROM t WHERE id IN (%s, %s, %s)') == fingerprint('SELECT * FROM t WHERE id IN (%s)')
+
+
+@pytest.mark.django_db
+class TestRecording:
+    def test_loop_queries_flagged_as_n_plus_one(self, student):
+        for i in range(6):
+            PortfolioItem.objects.create(user=student, title=f'Item {i}')
+
+        with record_queries(n_plus_one_threshold=5) as profile:
+            for item in PortfolioItem.objects.all():
+                User.objects.get(uuid_id=item.user_id)
+
+        assert profile.count == 7
+        [suspect] = profile.n_plus_one()
+        assert suspect['count'] == 6
+        assert suspect['origin'].startswith('tests/test_query_profiler.py:')
+        assert 'users' in suspect['fingerprint']
+
+    def test_exact_duplicates_counted(self, student):
+        with record_queries() as profile:
+            User.objects.filter(id=student.id).exists()
+            User.objects.filter(id=student.id).exists()
+        assert list(profile.duplicates().values()) == [2]
+
+
+@pytest.mark.django_db
+class TestMiddleware:
+    def test_request_is_profiled_and_reported(self, api_client, student, profiled, settings, tmp_path):
+        api_client.force_authenticate(user=student)
+        url = f'/api/v1/student/dashboard/portfolio/{student.id}/health'
+
+        response = api_client.get(url)
+        api_client.get(url)
+
+        assert int(response['X-Query-Count']) == profiled[0].count > 0
+        assert profiled[0].endpoint == 'GET api/v1/student/dashboard/portfolio/<str:user_id>/health'
+        assert profiled[0].path == url
+
+        report = tmp_path / 'report.json'
+        call_command('query_profile', json_path=str(report), stdout=open(tmp_path / 'out.txt', 'w'))
+        stats = json.loads(report.read_text())['endpoints'][profiled[0].endpoint]
+        assert stats['requests'] == 2
+        assert stats['queries_max'] == max(p.count for p in profiled)
+
+    def test_disabled_by_default(self, api_client, student):
+        api_client.force_authenticate(user=student)
+        response = api_client.get(f'/api/v1/student/dashboard/portfolio/{student.id}/health')
+        assert 'X-Query-Count' not in response
+
+
+@pytest.mark.django_db
+class TestQueryBudget:
+    @pytest.mark.query_budget(20, path='/api/v1/student/dashboard/')
+    def test_marked_request_within_budget(self, api_client, student):
+        api_client.force_authenticate(user=student)
+        assert api_client.get(f'/api/v1/student/dashboard/portfolio/{student.id}/health').status_code == 200
+
+    def test_fixture_fails_when_budget_exceeded(self, query_budget, student):
+        with query_budget(2):
+            User.objects.count()
+        with pytest.raises(pytest.fail.Exception, match='Query budget 1 exceeded'):
+            with query_budget(1):
+                User.objects.count()
+                User.objects.count()
+
+    def test_budget_applies_to_matching_paths(self):
+        def profile(path, count):
+            queries = [RecordedQuery('SELECT 1', '()', 'SELECT ?', 0.1, 'x.py:1 in f', 'default')] * count
+            return QueryProfile(endpoint=f'GET {path}', path=path, queries=queries)
+
+        marks = [
+            SimpleNamespace(args=(10,), kwargs={}),
+            SimpleNamespace(args=(2,), kwargs={'path': '/api/v1/community/'}),
+        ]
+        item = SimpleNamespace(
+            iter_markers=lambda name: marks,
+            _query_profiles=[profile('/api/v1/community/feed', 3), profile('/api/v1/other', 3), profile('/x', 11)],
+        )
+
+        failures = pytest_query_budget._over_budget(item)
+
+        assert len(failures) == 2
+        assert failures[0].startswith('budget 2 exceeded by GET /api/v1/community/feed')
+        assert failures[1].startswith('budget 10 exceeded by GET /x')
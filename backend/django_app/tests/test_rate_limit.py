@@ -0,0 +1,138 @@
+"""
+Test suite for the token-bucket rate limiter.
+
+Covers:
+- core.rate_limit.RateLimiter in-process and Redis (fakeredis) buckets under concurrency
+- AI Coach daily limits from the subscription plan, Retry-After and refunds
+- FeatureRateThrottle on the one-shot AI generation endpoints, sized by the plan by default
+"""
+import threading
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.rate_limit import FeatureRateThrottle, bucket_key, rate_limiter
+from subscriptions.models import SubscriptionPlan, UserSubscription
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def fresh_buckets():
+    rate_limiter.local.clear()
+    yield
+    rate_limiter.local.clear()
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    fakeredis = pytest.importorskip('fakeredis')
+    pytest.importorskip('lupa')
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr('core.redis_utils.get_redis_client', lambda: client)
+    monkeypatch.setattr(rate_limiter, '_scripts', {})
+    return client
+
+
+def _hammer(key, capacity, attempts=60, workers=12):
+    results = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(workers)
+
+    def worker():
+        barrier.wait()
+        for _ in range(attempts // workers):
+            decision = rate_limiter.hit(key, capacity, period=24 * 60 * 60)
+            with lock:
+                results.append(decision.allowed)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestRateLimiter:
+    def test_concurrent_hits_never_overshoot_in_process(self):
+        results = _hammer(bucket_key('test', 1), capacity=7)
+        assert results.count(True) == 7
+        assert len(results) == 60
+
+    def test_concurrent_hits_never_overshoot_redis(self, fake_redis):
+        results = _hammer(bucket_key('test', 2), capacity=7)
+        assert results.count(True) == 7
+        assert fake_redis.exists(bucket_key('test', 2))
+
+    def test_denied_decision_carries_retry_after(self):
+        key = bucket_key('test', 3)
+        rate_limiter.hit(key, 1, period=60)
+        decision = rate_limiter.hit(key, 1, period=60)
+        assert not decision
+        headers = decision.headers()
+        assert 1 <= int(headers['Retry-After']) <= 60
+        assert headers['X-RateLimit-Remaining'] == '0'
+
+    def test_unlimited_and_refund(self, fake_redis):
+        assert rate_limiter.hit(bucket_key('test', 4), None, period=60).unlimited
+        key = bucket_key('test', 5)
+        assert rate_limiter.hit(key, 1, period=3600)
+        rate_limiter.refund(key, 1)
+        assert rate_limiter.hit(key, 1, period=3600)
+        assert not rate_limiter.hit(key, 1, period=3600)
+
+
+@pytest.mark.django_db
+class TestAICoachLimits:
+    @pytest.fixture
+    def student_user(self, db):
+        return User.objects.create_user(
+            username='ratelimit@test.com', email='ratelimit@test.com', password='testpass123'
+        )
+
+    @pytest.fixture
+    def starter_client(self, api_client, student_user):
+        plan = SubscriptionPlan.objects.create(name='starter_normal', tier='starter', ai_coach_daily_limit=2)
+        UserSubscription.objects.create(user=student_user, plan=plan, status='active')
+        api_client.force_authenticate(user=student_user)
+        return api_client
+
+    def test_generation_throttle_uses_plan_limit(self, starter_client):
+        for _ in range(2):
+            response = starter_client.post('/api/v1/coaching/ai-coach/welcome', {}, format='json')
+            assert response.status_code == 200
+        response = starter_client.post('/api/v1/coaching/ai-coach/welcome', {}, format='json')
+        assert response.status_code == 429
+        assert int(response['Retry-After']) > 0
+
+    def test_failed_chat_is_refunded(self, starter_client, monkeypatch):
+        monkeypatch.delenv('CHAT_GPT_API_KEY', raising=False)
+        monkeypatch.delenv('OPENAI_API_KEY', raising=False)
+        monkeypatch.delenv('CHATGPT_API_KEY', raising=False)
+        for _ in range(4):
+            response = starter_client.post('/api/v1/coaching/ai-coach/chat', {'message': 'hi'}, format='json')
+            assert response.status_code == 500
+
+    def test_chat_limit_returns_retry_after(self, starter_client, student_user):
+        from coaching.services import check_ai_coach_rate_limit
+        check_ai_coach_rate_limit(student_user)
+        check_ai_coach_rate_limit(student_user)
+        response = starter_client.post('/api/v1/coaching/ai-coach/chat', {'message': 'hi'}, format='json')
+        assert response.status_code == 429
+        assert 'Retry-After' in response
+        assert response['X-RateLimit-Limit'] == '2'
+
+    def test_throttle_defaults_to_plan_limit(self, student_user, starter_client):
+        request = Request(APIRequestFactory().post('/'))
+        request.user = student_user
+
+        class Throttle(FeatureRateThrottle):
+            feature = 'test_default'
+
+        throttle = Throttle()
+        assert throttle.get_limit(request) == 2
+        assert [throttle.allow_request(request, None) for _ in range(3)] == [True, True, False]
+        assert throttle.decision.limit == 2
@@ -0,0 +1,189 @@
+"""
+Test suite for the incremental readiness engine (talentscope/readiness.py).
+
+Covers:
+- scoring of skill, mission, curriculum and behavior inputs into a snapshot
+- only mentees whose inputs changed since the last run are recomputed
+- deletes mark mentees dirty; the watermark sweep catches bulk inserts
+- idle mentees are re-marked once their latest snapshot is a day old, so readiness decays
+- learning velocity is measured over at least a week
+- snapshots past retention are pruned, keeping each mentee's latest
+- snapshots are written in batches with a query count independent of batch size
+- readiness reads (readiness window, director aggregates) use the snapshots
+"""
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from curriculum.models import CurriculumTrack, UserTrackProgress
+from missions.models import Mission, MissionAssignment, MissionSubmission
+from talentscope import readiness
+from talentscope.models import (
+    BehaviorDailyRollup, BehaviorSignal, ReadinessDirtyMentee, ReadinessSnapshot, SkillSignal,
+)
+from talentscope.readiness import ReadinessInputs, run_readiness_engine, score_inputs
+
+User = get_user_model()
+
+
+@pytest.fixture(autouse=True)
+def no_watermark_lag(settings):
+    settings.READINESS_WATERMARK_LAG = 0
+
+
+def _mentee(name):
+    return User.objects.create_user(username=name, email=f'{name}@test.com', password='x')
+
+
+def _snapshots(mentee):
+    return list(ReadinessSnapshot.objects.filter(mentee=mentee).order_by('snapshot_date'))
+
+
+def test_score_inputs():
+    now = timezone.now()
+    inputs = ReadinessInputs(
+        skills=[('SIEM', 'technical', 90.0), ('Python', 'technical', 70.0), ('Cloud', 'technical', 20.0)],
+        scored_missions=2, mission_score_avg=80.0, approved_missions=5,
+        active_days=15, curriculum_completion=40.0, assigned_skills={'SIEM', 'Forensics'},
+        previous_score=50.0, previous_at=now - timedelta(days=30),
+    )
+
+    fields = score_inputs(inputs, now)
+
+    assert fields['breakdown'] == {'technical': 60.0, 'practical': 86.0, 'curriculum': 40.0, 'behavioral': 50.0}
+    assert float(fields['core_readiness_score']) == 62.3
+    assert fields['career_readiness_stage'] == 'emerging'
+    assert float(fields['learning_velocity']) == 12.3
+    assert fields['estimated_readiness_window'] == '1-3 months'
+    assert [s['skill'] for s in fields['strengths']] == ['SIEM']
+    assert fields['weaknesses'] == [{'skill': 'Cloud', 'category': 'technical', 'mastery': 20.0, 'priority': 'high'}]
+    assert fields['missing_skills'] == [{'skill': 'Forensics', 'priority': 'high'}]
+    assert [step['area'] for step in fields['improvement_plan']] == ['curriculum', 'behavioral']
+
+
+def test_velocity_needs_a_week_of_history():
+    now = timezone.now()
+    recent = ReadinessInputs(active_days=30, previous_score=0.0, previous_at=now - timedelta(minutes=10),
+                             previous_velocity=2.0)
+
+    assert float(score_inputs(recent, now)['learning_velocity']) == 2.0
+    assert score_inputs(ReadinessInputs(active_days=30), now)['learning_velocity'] is None
+
+
+@pytest.mark.django_db
+class TestEngine:
+    def test_first_run_scores_every_mentee_with_inputs(self):
+        ada, bob = _mentee('ada'), _mentee('bob')
+        _mentee('idle')
+        SkillSignal.objects.create(mentee=ada, skill_name='SIEM', skill_category='technical', mastery_level=80)
+        BehaviorSignal.objects.create(mentee=bob, behavior_type='study_consistency', value=1)
+        track = CurriculumTrack.objects.create(code='DEF', slug='def', name='Defender', title='Defender')
+        UserTrackProgress.objects.create(user=bob, track=track, completion_percentage=50)
+        mission = Mission.objects.create(title='M', description='d', difficulty=1, estimated_duration_min=30,
+                                         skills_tags=['Forensics'])
+        assignment = MissionAssignment.objects.create(mission=mission, assignment_type='individual', student=bob)
+        MissionSubmission.objects.create(assignment=assignment, student=bob, content='x', status='approved', score=90)
+
+        assert run_readiness_engine() == {'marked': 2, 'stale': 0, 'computed': 2, 'batches': 1}
+
+        [ada_snapshot] = _snapshots(ada)
+        assert ada_snapshot.breakdown['technical'] == 80.0
+        [bob_snapshot] = _snapshots(bob)
+        assert bob_snapshot.breakdown == {'technical': 0.0, 'practical': 69.0, 'curriculum': 50.0, 'behavioral': 3.33}
+        assert bob_snapshot.missing_skills == [{'skill': 'Forensics', 'priority': 'high'}]
+        assert not ReadinessDirtyMentee.objects.exists()
+
+    def test_only_changed_mentees_recomputed(self):
+        ada, bob = _mentee('ada'), _mentee('bob')
+        for mentee in (ada, bob):
+            SkillSignal.objects.create(mentee=mentee, skill_name='SIEM', skill_category='technical', mastery_level=40)
+        run_readiness_engine()
+
+        assert run_readiness_engine()['computed'] == 0
+
+        SkillSignal.objects.create(mentee=ada, skill_name='Python', skill_category='technical', mastery_level=90)
+        assert run_readiness_engine()['computed'] == 1
+        assert [float(s.core_readiness_score) for s in _snapshots(ada)] == [14.0, 22.75]
+        assert len(_snapshots(bob)) == 1
+
+    def test_deletes_and_bulk_inserts_are_picked_up(self):
+        ada, bob = _mentee('ada'), _mentee('bob')
+        signal = SkillSignal.objects.create(mentee=ada, skill_name='SIEM', skill_category='technical', mastery_level=40)
+        run_readiness_engine()
+
+        signal.delete()
+        BehaviorSignal.objects.bulk_create([BehaviorSignal(mentee=bob, behavior_type='collaboration', value=1)])
+
+        assert run_readiness_engine()['computed'] == 2
+        assert float(_snapshots(ada)[-1].core_readiness_score) == 0.0
+
+    def test_idle_mentee_decays(self):
+        ada = _mentee('ada')
+        BehaviorSignal.objects.create(mentee=ada, behavior_type='study_consistency', value=1)
+        run_readiness_engine()
+        assert run_readiness_engine()['computed'] == 0
+
+        BehaviorDailyRollup.objects.filter(mentee=ada).update(day=timezone.localdate() - timedelta(days=40))
+        ReadinessSnapshot.objects.filter(mentee=ada).update(snapshot_date=timezone.now() - timedelta(days=2))
+
+        stats = run_readiness_engine()
+
+        assert (stats['stale'], stats['computed']) == (1, 1)
+        assert [s.breakdown['behavioral'] for s in _snapshots(ada)] == [3.33, 0.0]
+
+    def test_batches_use_constant_queries(self):
+        def run(count, prefix):
+            mentees = [_mentee(f'{prefix}{i}') for i in range(count)]
+            readiness.mark_dirty([m.id for m in mentees])
+            with CaptureQueriesContext(connection) as queries:
+                stats = run_readiness_engine(batch_size=count)
+            assert stats['computed'] == count
+            return len(queries)
+
+        run_readiness_engine()  # Creates the watermarks
+        assert run(2, 'small') == run(8, 'large')
+        stats = run_readiness_engine(batch_size=2)
+        assert stats['batches'] == 0
+
+
+@pytest.mark.django_db
+class TestReads:
+    def test_readiness_window_uses_engine_snapshot(self, api_client):
+        ada = _mentee('ada')
+        api_client.force_authenticate(user=ada)
+        for skill in ('SIEM', 'Python', 'Cloud'):
+            SkillSignal.objects.create(mentee=ada, skill_name=skill, skill_category='technical', mastery_level=100)
+        run_readiness_engine()
+
+        response = api_client.get(f'/api/v1/talentscope/mentees/{ada.id}/readiness-window')
+
+        assert response.status_code == 200
+        assert response.data['category'] == 'exploring'
+
+    def test_prune_keeps_recent_and_latest_snapshots(self, settings):
+        settings.READINESS_SNAPSHOT_RETENTION_DAYS = 30
+        ada, bob = _mentee('ada'), _mentee('bob')
+        now = timezone.now()
+        for days in (90, 60, 10):
+            ReadinessSnapshot.objects.create(mentee=ada, core_readiness_score=days,
+                                             snapshot_date=now - timedelta(days=days))
+        ReadinessSnapshot.objects.create(mentee=bob, core_readiness_score=50, snapshot_date=now - timedelta(days=90))
+
+        assert readiness.prune_snapshots(now, batch_size=1) == 2
+        assert [float(s.core_readiness_score) for s in _snapshots(ada)] == [10.0]
+        assert len(_snapshots(bob)) == 1
+
+    def test_average_readiness_reads_latest_snapshots(self):
+        ada, bob = _mentee('ada'), _mentee('bob')
+        _mentee('new')
+        ReadinessSnapshot.objects.create(mentee=ada, core_readiness_score=20,
+                                         snapshot_date=timezone.now() - timedelta(days=1))
+        ReadinessSnapshot.objects.create(mentee=ada, core_readiness_score=60)
+        ReadinessSnapshot.objects.create(mentee=bob, core_readiness_score=80)
+
+        assert readiness.average_readiness(User.objects.all(), outer_ref='pk') == 70.0
+        assert readiness.average_readiness(User.objects.filter(username='new'), outer_ref='pk') is None
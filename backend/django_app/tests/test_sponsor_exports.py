@@ -0,0 +1,198 @@
+"""
+Test suite for sponsor report exports (sponsors/export_service.py).
+
+Covers:
+- CSV exports stream real track performance, top talent and the full roster
+- CSV query counts do not grow with cohort size once the cohort's scores are snapshotted
+- only users with access to the sponsor can export its roster
+- PDF/PPTX artifacts are rendered once per cohort version and then served from storage;
+  a newer version's render deletes the superseded artifact
+"""
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from organizations.models import Organization, OrganizationMember
+from sponsors import export_service
+from sponsors.models import RevenueShareTracking, Sponsor, SponsorCohort, SponsorStudentCohort
+
+User = get_user_model()
+
+URL = '/api/v1/sponsors/acme/export/'
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@pytest.fixture
+def sponsor_user(db):
+    return User.objects.create_user(username='sponsor@test.com', email='sponsor@test.com', password='x')
+
+
+@pytest.fixture
+def sponsor_client(api_client, sponsor_user):
+    api_client.force_authenticate(user=sponsor_user)
+    return api_client
+
+
+@pytest.fixture
+def cohorts(sponsor_user):
+    Sponsor.objects.create(slug='acme', name='Acme University', contact_email='acme@test.com')
+    org = Organization.objects.create(name='Acme University', slug='acme', org_type='sponsor', owner=sponsor_user)
+    OrganizationMember.objects.create(organization=org, user=sponsor_user)
+    defender = SponsorCohort.objects.create(
+        organization=org, name='Defender 2026', track_slug='defender', start_date=timezone.now().date(),
+    )
+    grc = SponsorCohort.objects.create(organization=org, name='GRC 2026', track_slug='grc')
+    return defender, grc
+
+
+def _enroll(cohort, name, completion, **fields):
+    student = User.objects.create_user(
+        username=f'{name}@test.com', email=f'{name}@test.com', password='x', first_name=name.title(), last_name='Test',
+    )
+    return SponsorStudentCohort.objects.create(
+        sponsor_cohort=cohort, student=student, completion_percentage=Decimal(completion), **fields
+    )
+
+
+def _csv(response):
+    assert isinstance(response, StreamingHttpResponse)
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestCsvExport:
+    def test_csv_uses_real_cohort_data(self, sponsor_client, cohorts):
+        defender, grc = cohorts
+        now = timezone.now()
+        _enroll(defender, 'ada', 90, last_activity_at=now)
+        _enroll(defender, 'bob', 40)
+        done = _enroll(grc, 'cy', 100, enrollment_status='completed')
+        SponsorStudentCohort.objects.filter(id=done.id).update(
+            joined_at=now - timedelta(days=40), completed_at=now,
+        )
+        RevenueShareTracking.objects.create(
+            sponsor=Sponsor.objects.get(slug='acme'), cohort=grc, student=done.student,
+            employer_name='Safaricom', role_title='Analyst', first_year_salary_kes=Decimal('1200000'),
+        )
+
+        response = sponsor_client.get(URL, {'format': 'csv'})
+        body = _csv(response)
+
+        assert response.status_code == 200
+        assert 'Defender,2,65.0%,,0,' in body
+        assert 'Grc,1,100.0%,40,1,"KES 1,200,000"' in body
+        # Ada: 90 + 10 (active this week) + 5 consistency; Bob: 40 + 5
+        assert '1,Ada Test,ada@test.com,100.0,90.0%' in body
+        assert '2,Bob Test,bob@test.com,45.0,40.0%' in body
+        assert 'bob@test.com,enrolled,40.00%' in body
+
+    def test_export_requires_sponsor_access(self, api_client, cohorts):
+        _enroll(cohorts[0], 'ada', 90)
+        outsider = User.objects.create_user(username='out@test.com', email='out@test.com', password='x')
+        other = Organization.objects.create(name='Other', slug='other', org_type='sponsor', owner=outsider)
+
+        api_client.force_authenticate(user=outsider)
+        assert api_client.get(URL, {'format': 'csv'}).status_code == 403
+
+        OrganizationMember.objects.create(organization=other, user=outsider)
+        assert api_client.get(URL, {'format': 'csv'}).status_code == 403
+
+    def test_csv_queries_do_not_grow_with_roster(self, sponsor_client, cohorts):
+        defender, _ = cohorts
+
+        def count():
+            with CaptureQueriesContext(connection) as queries:
+                _csv(sponsor_client.get(URL, {'format': 'csv'}))
+            return len(queries)
+
+        _enroll(defender, 'first', 10)
+        count()
+        small = count()
+        for i in range(15):
+            _enroll(defender, f'more{i}', i)
+        count()  # Rescores the cohort into a new snapshot
+        assert count() == small
+
+
+@pytest.mark.django_db
+class TestRenderedArtifacts:
+    @pytest.fixture(autouse=True)
+    def fake_renderer(self, settings, tmp_path, locmem_cache):
+        settings.MEDIA_ROOT = str(tmp_path)
+        calls = []
+
+        def render(sponsor, cohort, report):
+            calls.append(cohort.id)
+            return f"{sponsor.name}|{len(report['top_talent'])}".encode()
+
+        def delay(*args):
+            from sponsors.tasks import render_sponsor_export_task
+            return render_sponsor_export_task(*args)
+
+        with mock.patch.dict(export_service.RENDERERS, {'pdf': render}), \
+                mock.patch('sponsors.tasks.render_sponsor_export_task.delay', delay, create=True):
+            yield calls
+
+    def test_artifact_rendered_once_per_cohort_version(self, sponsor_client, cohorts, fake_renderer, tmp_path):
+        defender, _ = cohorts
+        _enroll(defender, 'ada', 90)
+
+        first = sponsor_client.get(URL, {'format': 'pdf'})
+        assert first.status_code == 202
+
+        second = sponsor_client.get(URL, {'format': 'pdf'})
+        assert second.status_code == 200
+        assert b''.join(second.streaming_content) == b'Acme University|1'
+        assert second['Content-Type'] == 'application/pdf'
+        assert sponsor_client.get(URL, {'format': 'pdf'}).status_code == 200
+        assert len(fake_renderer) == 1
+
+        _enroll(defender, 'bob', 40)
+        assert sponsor_client.get(URL, {'format': 'pdf'}).status_code == 202
+        assert b''.join(sponsor_client.get(URL, {'format': 'pdf'}).streaming_content) == b'Acme University|2'
+        assert len(fake_renderer) == 2
+        # The superseded render was deleted
+        assert len(list((tmp_path / export_service.ARTIFACT_DIR / str(defender.id)).glob('*.pdf'))) == 1
+
+    def test_failed_render_releases_lock(self, sponsor_client, cohorts, fake_renderer):
+        defender, _ = cohorts
+        _enroll(defender, 'ada', 90)
+
+        def crash(sponsor, cohort, report):
+            raise RuntimeError('renderer crashed')
+
+        with mock.patch.dict(export_service.RENDERERS, {'pdf': crash}):
+            assert sponsor_client.get(URL, {'format': 'pdf'}).status_code == 202
+
+        # The lock was released, so the next request queues another render instead of waiting it out
+        assert sponsor_client.get(URL, {'format': 'pdf'}).status_code == 202
+        assert len(fake_renderer) == 1
+        assert sponsor_client.get(URL, {'format': 'pdf'}).status_code == 200
+
+    def test_rendered_in_request_without_celery(self, sponsor_client, cohorts, fake_renderer):
+        from sponsors.tasks import render_sponsor_export_task
+        _enroll(cohorts[0], 'ada', 90)
+
+        with mock.patch('sponsors.tasks.render_sponsor_export_task', lambda *args: render_sponsor_export_task(*args)):
+            response = sponsor_client.get(URL, {'format': 'pdf'})
+
+        assert response.status_code == 200
+        assert b''.join(response.streaming_content) == b'Acme University|1'
+
+    def test_missing_renderer_falls_back_to_csv(self, sponsor_client, cohorts):
+        with mock.patch.dict(export_service.RENDERERS, {'pptx': None}):
+            response = sponsor_client.get(URL, {'format': 'pptx'})
+        assert response.status_code == 200
+        assert response['Content-Type'] == 'text/csv'
+        assert sponsor_client.get(URL, {'format': 'docx'}).status_code == 400
@@ -0,0 +1,220 @@
+"""
+Test suite for the sponsor cohort scoring engine (sponsors/services/scoring_service.py).
+
+Covers:
+- readiness, rank and dropout-risk bands computed in one pass
+- completion attribution counts completions by targeted students
+- snapshots are reused while the cohort's data is unchanged and re-versioned when it changes
+- student activity alone does not trigger a rescore, nor does the date for a dormant cohort
+- stale reads queue a background rescore and serve the latest snapshot meanwhile
+- a scoring lock held by another worker is left alone
+- scoring query counts do not grow with cohort size
+- dashboard AI insights are served from the snapshot
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from organizations.models import Organization
+from sponsors.models import SponsorCohort, SponsorCohortScoreSnapshot, SponsorIntervention, SponsorStudentCohort
+from sponsors import tasks
+from sponsors.services import CohortScoringService, SponsorAIService
+from sponsors.services.scoring_service import scoring_lock_key
+
+User = get_user_model()
+
+
+@pytest.fixture
+def locmem_cache(settings):
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def cohort(db):
+    owner = User.objects.create_user(username='owner@test.com', email='owner@test.com', password='x')
+    org = Organization.objects.create(name='Acme University', slug='acme', org_type='sponsor', owner=owner)
+    return SponsorCohort.objects.create(organization=org, name='Defender 2026', track_slug='defender')
+
+
+def _enroll(cohort, name, completion, days_inactive=None, **fields):
+    student = User.objects.create_user(
+        username=f'{name}@test.com', email=f'{name}@test.com', password='x', first_name=name.title(), last_name='Test',
+    )
+    enrollment = SponsorStudentCohort.objects.create(
+        sponsor_cohort=cohort, student=student, completion_percentage=Decimal(completion), **fields
+    )
+    if days_inactive is not None:
+        SponsorStudentCohort.objects.filter(id=enrollment.id).update(
+            last_activity_at=timezone.now() - timedelta(days=days_inactive),
+        )
+    return enrollment
+
+
+def _scores(snapshot):
+    return {
+        s.student.email.split('@')[0]: s
+        for s in snapshot.student_scores.select_related('student')
+    }
+
+
+@pytest.mark.django_db
+class TestScoring:
+    def test_readiness_rank_and_bands(self, cohort):
+        _enroll(cohort, 'ada', 90, days_inactive=1)
+        _enroll(cohort, 'bob', 60, days_inactive=20)
+        _enroll(cohort, 'cy', 10, days_inactive=45)
+        _enroll(cohort, 'dee', 80, days_inactive=2, is_active=False)
+
+        snapshot = CohortScoringService.compute_snapshot(cohort)
+        scores = _scores(snapshot)
+
+        assert [scores[n].readiness_score for n in ('ada', 'bob', 'cy')] == [100.0, 70.0, 15.0]
+        assert [scores[n].cohort_rank for n in ('ada', 'bob', 'cy', 'dee')] == [1, 2, 3, None]
+        # 0.6 * min(days / 30, 1) + 0.4 * (1 - completion / 100)
+        assert scores['bob'].risk_score == pytest.approx(0.56)
+        assert [scores[n].risk_band for n in ('ada', 'bob', 'cy', 'dee')] == ['low', 'medium', 'high', 'low']
+
+        risk = snapshot.summary['dropout_risk']
+        assert (risk['total_students'], risk['at_risk_students']) == (3, 1)
+        assert risk['risk_bands'] == {'low': 1, 'medium': 1, 'high': 1}
+
+    def test_attribution_counts_targeted_completions(self, cohort):
+        done = _enroll(cohort, 'ada', 100, enrollment_status='completed')
+        _enroll(cohort, 'bob', 100, enrollment_status='completed')
+        nudge = SponsorIntervention.objects.create(
+            sponsor_cohort=cohort, intervention_type='recipe_nudge', title='Nudge', description='-',
+            expected_roi=Decimal('2.5'),
+        )
+        nudge.target_students.add(done.student)
+
+        attribution = CohortScoringService.compute_snapshot(cohort).summary['completion_attribution']
+
+        assert (attribution['total_completions'], attribution['attributed_to_interventions']) == (2, 1)
+        assert attribution['top_interventions'] == [
+            {'intervention_type': 'recipe_nudge', 'completions_attributed': 1},
+        ]
+        assert attribution['roi_by_intervention_type'] == {'recipe_nudge': 2.5}
+
+
+@pytest.mark.django_db
+class TestSnapshots:
+    def test_unchanged_cohort_reuses_snapshot(self, cohort):
+        _enroll(cohort, 'ada', 50)
+        first = CohortScoringService.current_snapshot(cohort)
+        assert CohortScoringService.current_snapshot(cohort).id == first.id
+        assert SponsorCohortScoreSnapshot.objects.count() == 1
+
+    def test_data_changes_produce_new_versions(self, cohort):
+        ada = _enroll(cohort, 'ada', 50)
+        first = CohortScoringService.current_snapshot(cohort)
+
+        _enroll(cohort, 'bob', 20)
+        second = CohortScoringService.current_snapshot(cohort)
+        SponsorIntervention.objects.create(
+            sponsor_cohort=cohort, intervention_type='mentor_1on1', title='1:1', description='-',
+        ).target_students.add(ada.student)
+        third = CohortScoringService.current_snapshot(cohort)
+
+        assert [first.version, second.version, third.version] == [1, 2, 3]
+        assert second.student_count == 2
+
+    def test_old_snapshots_are_pruned(self, cohort):
+        for i in range(5):
+            _enroll(cohort, f's{i}', i)
+            CohortScoringService.current_snapshot(cohort)
+        assert list(cohort.score_snapshots.values_list('version', flat=True)) == [5, 4, 3]
+
+    def test_activity_alone_does_not_rescore(self, cohort):
+        ada = _enroll(cohort, 'ada', 50, days_inactive=3)
+        first = CohortScoringService.current_snapshot(cohort)
+
+        SponsorStudentCohort.objects.filter(id=ada.id).update(last_activity_at=timezone.now())
+
+        assert CohortScoringService.current_snapshot(cohort).id == first.id
+
+    def test_date_only_rescores_while_time_can_change_scores(self, cohort, monkeypatch):
+        from sponsors.services import scoring_service
+        _enroll(cohort, 'ada', 50, days_inactive=60)
+        bob = _enroll(cohort, 'bob', 50, days_inactive=60)
+        dormant = scoring_service.cohort_fingerprint(cohort)
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        monkeypatch.setattr(scoring_service.timezone, 'localdate', lambda: tomorrow)
+        assert scoring_service.cohort_fingerprint(cohort) == dormant
+
+        SponsorStudentCohort.objects.filter(id=bob.id).update(last_activity_at=timezone.now() - timedelta(days=3))
+        recent = scoring_service.cohort_fingerprint(cohort)
+        monkeypatch.undo()
+        assert scoring_service.cohort_fingerprint(cohort) != recent
+
+    def test_stale_read_queues_rescore_and_serves_latest(self, locmem_cache, cohort, monkeypatch,
+                                                         django_capture_on_commit_callbacks):
+        queued = []
+
+        class QueuedTask:
+            def __call__(self, *args):
+                raise AssertionError('rescored in the request')
+
+            def delay(self, *args):
+                queued.append(args)
+
+        _enroll(cohort, 'ada', 50)
+        first = CohortScoringService.current_snapshot(cohort)
+        _enroll(cohort, 'bob', 20)
+        monkeypatch.setattr(tasks, 'score_sponsor_cohort_task', QueuedTask())
+
+        with django_capture_on_commit_callbacks(execute=True):
+            served = CohortScoringService.current_snapshot(cohort)
+            again = CohortScoringService.current_snapshot(cohort)
+
+        assert served.id == again.id == first.id
+        assert queued == [(str(cohort.id), scoring_lock_key(cohort.id))]
+
+        monkeypatch.undo()
+        tasks.score_sponsor_cohort_task(*queued[0])
+        assert CohortScoringService.current_snapshot(cohort).version == 2
+        assert cache.get(scoring_lock_key(cohort.id)) is None
+
+    def test_lock_held_elsewhere_is_not_released(self, locmem_cache, cohort):
+        _enroll(cohort, 'ada', 50)
+        first = CohortScoringService.current_snapshot(cohort)
+        _enroll(cohort, 'bob', 20)
+        cache.set(scoring_lock_key(cohort.id), 'other-worker', 60)
+
+        assert CohortScoringService.current_snapshot(cohort).id == first.id
+        assert CohortScoringService.refresh(cohort).id == first.id
+        assert cache.get(scoring_lock_key(cohort.id)) == 'other-worker'
+
+    def test_scoring_queries_do_not_grow_with_cohort(self, cohort):
+        def count():
+            with CaptureQueriesContext(connection) as queries:
+                CohortScoringService.compute_snapshot(cohort)
+            return len(queries)
+
+        _enroll(cohort, 'first', 10)
+        small = count()
+        for i in range(20):
+            _enroll(cohort, f'more{i}', i)
+        assert count() == small
+
+
+@pytest.mark.django_db
+def test_dashboard_insights_read_snapshot(cohort):
+    _enroll(cohort, 'ada', 90, days_inactive=1)
+    _enroll(cohort, 'cy', 10, days_inactive=45)
+
+    insights = SponsorAIService.get_dashboard_ai_insights(cohort)
+
+    assert insights['snapshot_version'] == 1
+    assert [s['student_name'] for s in insights['readiness_scores']] == ['Ada Test', 'Cy Test']
+    assert insights['dropout_risk']['at_risk_students'] == 1
+    assert insights['ai_alerts'][0]['type'] == 'dropout_risk'
+    assert SponsorAIService.get_dashboard_ai_insights(cohort)['snapshot_version'] == 1
@@ -0,0 +1,136 @@
+"""
+Test suite for the synthetic data generator and load scenarios
+(core/synthetic_data.py, core/load_scenarios.py).
+
+Covers:
+- a seed and anchor always produce the same rows; another seed does not
+- requested volumes are written, with the counters, rollups and trending index
+  that signals would have maintained
+- a seed's data is not generated twice into one database
+- the command refuses to run with DEBUG off unless told this is not production,
+  and synthetic users cannot log in unless a password is given
+- the load scenarios report latency percentiles and query counts per endpoint
+"""
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from community.models import Post, Reaction, TrendingEntry, University
+from core import load_scenarios
+from core.synthetic_data import SyntheticDataGenerator, resolve_counts
+from missions.models import MissionSubmission
+from programs.models import Enrollment
+from talentscope.models import BehaviorDailyRollup, BehaviorSignal, SkillMastery
+from users.models import User
+
+ANCHOR = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+COUNTS = resolve_counts('tiny', users=30, posts=40, reactions=300, submissions=30, behavior_signals=80,
+                        skill_signals=40)
+
+
+def _generate(seed, **overrides):
+    return SyntheticDataGenerator({**COUNTS, **overrides}, seed=seed, anchor=ANCHOR, batch_size=25).run()
+
+
+def _fingerprint(seed):
+    """Generate `seed` in a savepoint and return its rows, rolled back afterwards."""
+    with transaction.atomic():
+        _generate(seed)
+        prefix = f'synth{seed}-'
+        rows = {
+            'posts': list(Post.objects.filter(author__username__startswith=prefix).order_by('id').values_list(
+                'id', 'author__username', 'reaction_count', 'created_at')),
+            'reactions': list(Reaction.objects.filter(user__username__startswith=prefix).order_by('id').values_list(
+                'id', 'user__username', 'post_id', 'reaction_type')),
+            'submissions': list(MissionSubmission.objects.filter(student__username__startswith=prefix).order_by(
+                'id').values_list('id', 'status', 'score', 'created_at')),
+            'enrollments': list(Enrollment.objects.filter(user__username__startswith=prefix).order_by(
+                'id').values_list('id', 'user__username', 'cohort__name')),
+        }
+        transaction.set_rollback(True)
+    return rows
+
+
+@pytest.mark.django_db
+class TestGenerator:
+    def test_same_seed_same_rows(self):
+        first, again, other = _fingerprint(1), _fingerprint(1), _fingerprint(2)
+
+        assert first == again
+        assert len(first['reactions']) == 300
+        assert [row[0] for row in first['posts']] != [row[0] for row in other['posts']]
+
+    def test_volumes_and_derived_state(self):
+        written = _generate(3)
+
+        assert {name: written[name] for name in ('users', 'posts', 'reactions', 'submissions', 'behavior_signals')} == {
+            'users': 30, 'posts': 40, 'reactions': 300, 'submissions': 30, 'behavior_signals': 80,
+        }
+        students = 30 - 1 - COUNTS['mentors']
+        assert Enrollment.objects.count() == students
+
+        posts = Post.objects.annotate(actual=Count('reactions'))
+        assert all(post.reaction_count == post.actual for post in posts)
+        assert sum(University.objects.values_list('post_count', flat=True)) == Post.objects.exclude(
+            university=None).count()
+        assert BehaviorDailyRollup.objects.aggregate(n=Sum('signal_count'))['n'] == BehaviorSignal.objects.count()
+        assert SkillMastery.objects.exists()
+        assert TrendingEntry.objects.filter(scope='global').count() == Post.objects.filter(visibility='global').count()
+
+    def test_seed_is_not_generated_twice(self):
+        call_command('generate_synthetic_data', '--scale', 'tiny', '--seed', '4', '--users', '20', '--posts', '10',
+                     '--no-trending', '--i-know-this-is-not-prod', stdout=StringIO())
+
+        with pytest.raises(CommandError, match='already exists'):
+            call_command('generate_synthetic_data', '--scale', 'tiny', '--seed', '4', '--i-know-this-is-not-prod',
+                         stdout=StringIO())
+
+    def test_refuses_without_debug(self, settings):
+        settings.DEBUG = False
+
+        with pytest.raises(CommandError, match='DEBUG off'):
+            call_command('generate_synthetic_data', '--scale', 'tiny', '--seed', '7', stdout=StringIO())
+        assert not User.objects.filter(username__startswith='synth7-').exists()
+
+    def test_passwords_unusable_unless_given(self, settings):
+        settings.DEBUG = True
+        _generate(8, users=10)
+        call_command('generate_synthetic_data', '--scale', 'tiny', '--seed', '9', '--users', '10', '--posts', '5',
+                     '--no-trending', '--password', 'scratch-pw', stdout=StringIO())
+
+        assert not any(user.has_usable_password() for user in User.objects.filter(username__startswith='synth8-'))
+        assert all(user.check_password('scratch-pw') for user in User.objects.filter(username__startswith='synth9-'))
+
+
+@pytest.mark.django_db
+class TestLoadScenarios:
+    def test_reports_latency_and_queries(self):
+        _generate(5)
+
+        reports = {report['scenario']: report for report in load_scenarios.run(5, requests=4, warmup=1)}
+
+        assert set(reports) == {scenario.name for scenario in load_scenarios.SCENARIOS}
+        for report in reports.values():
+            assert (report['requests'], report['errors']) == (4, 0), report
+            assert 0 < report['p50_ms'] <= report['p95_ms'] <= report['p99_ms'] <= report['max_ms']
+            assert report['queries_max'] >= report['queries_p50'] > 0
+
+    def test_command_writes_json(self, tmp_path):
+        _generate(6)
+        path = tmp_path / 'report.json'
+        out = StringIO()
+
+        call_command('run_load_scenarios', '--seed', '6', '--requests', '2', '--scenario', 'recipes_list',
+                     '--json', str(path), stdout=out)
+
+        assert 'recipes_list' in out.getvalue()
+        assert path.read_text().count('"p99_ms"') == 1
+
+    def test_unknown_seed(self):
+        with pytest.raises(CommandError, match='No synthetic data'):
+            call_command('run_load_scenarios', '--seed', '99', stdout=StringIO())
@@ -0,0 +1,182 @@
+"""
+Test suite for TalentScope signal rollups (talentscope/rollups.py).
+
+Covers:
+- behavior daily rollups follow signal creates, updates, deletes and bulk ingest
+- skill mastery keeps the latest mastery per skill plus running totals
+- incremental rollups match a rebuild from the raw signals
+- the TalentScope and mentor analytics endpoints read the rollups, with a query
+  count that does not grow with the mentee's signal history
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from mentorship_coordination.models import MenteeMentorAssignment
+from talentscope import rollups
+from talentscope.models import BehaviorDailyRollup, BehaviorSignal, SkillMastery, SkillSignal
+
+User = get_user_model()
+
+
+def _rollups(mentee):
+    return {
+        (r.behavior_type, r.source, r.day): (r.signal_count, r.value_total)
+        for r in BehaviorDailyRollup.objects.filter(mentee=mentee)
+    }
+
+
+def _masteries(mentee):
+    return {
+        m.skill_name: (m.skill_category, m.mastery_level, m.mastery_total, m.hours_practiced, m.signal_count)
+        for m in SkillMastery.objects.filter(mentee=mentee)
+    }
+
+
+def _behavior(mentee, behavior_type, value, days_ago=0, source='system'):
+    return BehaviorSignal.objects.create(
+        mentee=mentee, behavior_type=behavior_type, value=value, source=source,
+        recorded_at=timezone.now() - timedelta(days=days_ago),
+    )
+
+
+def _skill(mentee, name, mastery, hours=1, category='technical'):
+    return SkillSignal.objects.create(
+        mentee=mentee, skill_name=name, skill_category=category, mastery_level=mastery, hours_practiced=hours,
+    )
+
+
+@pytest.fixture
+def mentee(db):
+    return User.objects.create_user(username='mentee', email='mentee@test.com', password='x')
+
+
+@pytest.mark.django_db
+class TestBehaviorRollups:
+    def test_signals_roll_up_per_type_source_and_day(self, mentee):
+        today = timezone.localdate()
+        _behavior(mentee, 'study_consistency', 1.5)
+        _behavior(mentee, 'study_consistency', 2)
+        moved = _behavior(mentee, 'study_consistency', 3, days_ago=1)
+        _behavior(mentee, 'reflection_frequency', 1, source='reflection')
+
+        assert _rollups(mentee) == {
+            ('study_consistency', 'system', today): (2, Decimal('3.50')),
+            ('study_consistency', 'system', today - timedelta(days=1)): (1, Decimal('3.00')),
+            ('reflection_frequency', 'reflection', today): (1, Decimal('1.00')),
+        }
+
+        moved.recorded_at = timezone.now()
+        moved.value = 4
+        moved.save()
+        assert _rollups(mentee)[('study_consistency', 'system', today)] == (3, Decimal('7.50'))
+        assert ('study_consistency', 'system', today - timedelta(days=1)) not in _rollups(mentee)
+
+        moved.delete()
+        assert _rollups(mentee)[('study_consistency', 'system', today)] == (2, Decimal('3.50'))
+
+    def test_bulk_ingest_and_rebuild_match(self, mentee):
+        _behavior(mentee, 'collaboration', 1, days_ago=3)
+        signals = BehaviorSignal.objects.bulk_create([
+            BehaviorSignal(mentee=mentee, behavior_type='study_consistency', value=i, source='habit_log',
+                           recorded_at=timezone.now() - timedelta(days=i % 3))
+            for i in range(9)
+        ])
+        rollups.apply_behavior_signals(signals)
+
+        incremental = _rollups(mentee)
+        rollups.rebuild_mentee(mentee.id)
+        assert _rollups(mentee) == incremental
+        assert rollups.signal_counts(mentee.id) == {'habit_logs': 9, 'community_engagement': 1}
+
+
+@pytest.mark.django_db
+class TestSkillMastery:
+    def test_latest_mastery_and_totals(self, mentee):
+        _skill(mentee, 'SIEM', 40, hours=2)
+        latest = _skill(mentee, 'SIEM', 70, hours=3, category='blue-team')
+        _skill(mentee, 'Python', 55)
+
+        assert _masteries(mentee)['SIEM'] == ('blue-team', Decimal('70'), Decimal('110'), Decimal('5'), 2)
+        assert SkillMastery.objects.get(mentee=mentee, skill_name='SIEM').average_mastery == 55
+
+        latest.mastery_level = 90
+        latest.save()
+        assert _masteries(mentee)['SIEM'][1:3] == (Decimal('90'), Decimal('130'))
+
+        latest.delete()
+        assert _masteries(mentee)['SIEM'] == ('technical', Decimal('40.00'), Decimal('40.00'), Decimal('2.00'), 1)
+
+    def test_update_or_create_and_rename_match_rebuild(self, mentee):
+        SkillSignal.objects.update_or_create(
+            mentee=mentee, skill_name='Cloud', defaults={'mastery_level': 50, 'skill_category': 'technical'},
+        )
+        SkillSignal.objects.update_or_create(
+            mentee=mentee, skill_name='Cloud', defaults={'mastery_level': 85, 'skill_category': 'technical'},
+        )
+        renamed = _skill(mentee, 'Forensic', 30)
+        renamed.skill_name = 'Forensics'
+        renamed.save()
+
+        incremental = _masteries(mentee)
+        assert set(incremental) == {'Cloud', 'Forensics'}
+        assert incremental['Cloud'][1] == Decimal('85')
+        rollups.rebuild_mentee(mentee.id)
+        assert _masteries(mentee) == incremental
+
+
+@pytest.mark.django_db
+class TestEndpoints:
+    def _history(self, mentee, days):
+        for day in range(days):
+            _behavior(mentee, 'study_consistency', 1, days_ago=day)
+            _behavior(mentee, 'reflection_frequency', 1, days_ago=day, source='habit_log')
+            _skill(mentee, f'skill-{day % 5}', 10 + day)
+
+    def test_trends_and_heatmap_read_rollups(self, api_client, mentee):
+        api_client.force_authenticate(user=mentee)
+        _behavior(mentee, 'study_consistency', 2)
+        _behavior(mentee, 'mission_completion', 1)
+        _skill(mentee, 'SIEM', 40)
+        _skill(mentee, 'SIEM', 80)
+
+        trends = api_client.get(f'/api/v1/talentscope/mentees/{mentee.id}/behavioral-trends').data
+        heatmap = api_client.get(f'/api/v1/talentscope/mentees/{mentee.id}/skills-heatmap').data
+        skills = api_client.get(f'/api/v1/talentscope/mentees/{mentee.id}/skills').data
+
+        assert trends == [{
+            'date': timezone.localdate().isoformat(), 'missions_completed': 1, 'hours_studied': 2.0,
+            'reflections_count': 0,
+        }]
+        assert [(s['skill_name'], s['mastery_level']) for s in heatmap] == [('SIEM', 80.0)]
+        assert (skills[0]['mastery_percentage'], skills[0]['hours_practiced']) == (60.0, 2.0)
+
+    def test_mentor_view_queries_do_not_grow_with_history(self, api_client, mentee, django_capture_on_commit_callbacks):
+        mentor = User.objects.create_user(username='mentor', email='mentor@test.com', password='x', is_mentor=True)
+        MenteeMentorAssignment.objects.create(mentor=mentor, mentee=mentee, status='active')
+        api_client.force_authenticate(user=mentor)
+        url = f'/api/v1/mentors/{mentor.id}/mentees/{mentee.id}/talentscope'
+
+        def fetch():
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.get(url)
+            assert response.status_code == 200
+            return response.data, len(queries)
+
+        self._history(mentee, 3)
+        fetch()
+        _, small = fetch()
+        with django_capture_on_commit_callbacks(execute=True):
+            self._history(mentee, 40)
+        data, large = fetch()
+
+        assert large == small
+        assert data['ingested_signals']['habit_logs'] == 43
+        assert data['behavioral_trends'][-1]['hours_studied'] == 2.0
+        assert data['behavioral_trends'][-1]['reflections_count'] == 2
+        assert len(data['skills_heatmap']) == 5
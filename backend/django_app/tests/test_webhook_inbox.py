@@ -0,0 +1,218 @@
+"""
+Test suite for payment-webhook ingestion (subscriptions/webhooks.py).
+
+A local fake gateway generates a subscription's event history and replays it as a
+burst with duplicated and shuffled deliveries.
+
+Covers:
+- the inbox drops redelivered events by event id
+- out-of-order bursts converge on the same state as in-order delivery
+- customer-level events route through the customer -> subscription mapping
+- a bare charge recovers past-due and trial subscriptions but never reactivates a canceled one
+- events that arrive before their mapping wait in the inbox
+- one coalesced dashboard update per student per drain
+- the signed webhook endpoint stores events without a user session
+"""
+import hashlib
+import hmac
+import json
+import random
+import time
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+
+from student_dashboard.models import DashboardUpdateQueue
+from subscriptions.models import SubscriptionPlan, UserSubscription, WebhookEvent
+from subscriptions.webhooks import drain_inbox, ingest_event
+
+User = get_user_model()
+
+
+class FakeGateway:
+    """Emits Stripe-shaped events with increasing creation times."""
+
+    def __init__(self, seed=7):
+        self.rng = random.Random(seed)
+        self.clock = 1_700_000_000
+        self.sequence = 0
+
+    def event(self, event_type, obj):
+        self.clock += 60
+        self.sequence += 1
+        return {
+            'id': f'evt_{self.sequence:06d}',
+            'type': event_type,
+            'created': self.clock,
+            'data': {'object': obj},
+        }
+
+    def lifecycle(self, user, customer, subscription):
+        """Checkout, a failed then recovered payment, a renewal and a final update."""
+        period = self.clock + 30 * 86400
+        return [
+            self.event('checkout.session.completed', {
+                'customer': customer, 'subscription': subscription, 'client_reference_id': str(user.id),
+            }),
+            self.event('invoice.payment_failed', {'customer': customer, 'subscription': subscription}),
+            self.event('customer.subscription.updated', {
+                'id': subscription, 'customer': customer, 'status': 'past_due',
+            }),
+            self.event('invoice.paid', {'customer': customer, 'subscription': subscription}),
+            self.event('charge.succeeded', {'customer': customer}),
+            self.event('customer.subscription.updated', {
+                'id': subscription, 'customer': customer, 'status': 'active',
+                'current_period_start': self.clock, 'current_period_end': period,
+            }),
+        ]
+
+    def burst(self, events, duplicates=0.5):
+        """Deliver every event at least once, some twice, in shuffled order."""
+        delivered = list(events) + [e for e in events if self.rng.random() < duplicates]
+        self.rng.shuffle(delivered)
+        return delivered
+
+
+@pytest.fixture
+def plan(db):
+    return SubscriptionPlan.objects.create(name='starter_3', tier='starter', price_monthly=3)
+
+
+def _subscriber(plan, name, **fields):
+    user = User.objects.create_user(username=f'{name}@test.com', email=f'{name}@test.com', password='x')
+    return user, UserSubscription.objects.create(user=user, plan=plan, status='trial', **fields)
+
+
+def _deliver(events):
+    for event in events:
+        ingest_event(event)
+    return drain_inbox(batch_size=4)
+
+
+def _state(sub):
+    sub.refresh_from_db()
+    return sub.status, sub.stripe_customer_id, sub.stripe_subscription_id, sub.current_period_end
+
+
+@pytest.mark.django_db
+class TestWebhookInbox:
+    def test_redelivered_event_is_dropped(self, plan):
+        gateway = FakeGateway()
+        user, _ = _subscriber(plan, 'dup')
+        event = gateway.lifecycle(user, 'cus_dup', 'sub_dup')[0]
+
+        assert ingest_event(event)[1] is True
+        assert ingest_event(dict(event))[1] is False
+        assert WebhookEvent.objects.count() == 1
+
+    def test_shuffled_burst_matches_in_order_delivery(self, plan):
+        gateway = FakeGateway()
+        ordered_user, ordered_sub = _subscriber(plan, 'ordered')
+        shuffled_user, shuffled_sub = _subscriber(plan, 'shuffled')
+
+        _deliver(gateway.lifecycle(ordered_user, 'cus_a', 'sub_a'))
+        gateway.clock = 1_700_000_000  # Replay the same timeline for the second subscriber
+        burst = gateway.burst(gateway.lifecycle(shuffled_user, 'cus_b', 'sub_b'))
+        for start in range(0, len(burst), 3):
+            _deliver(burst[start:start + 3])
+        drain_inbox()
+
+        ordered, shuffled = _state(ordered_sub), _state(shuffled_sub)
+        assert ordered[0] == 'active' and ordered[3] is not None
+        assert (shuffled[0], shuffled[3]) == (ordered[0], ordered[3])
+        assert shuffled[1:3] == ('cus_b', 'sub_b')
+        assert not WebhookEvent.objects.filter(status='pending').exists()
+
+    def test_stale_event_does_not_roll_back_state(self, plan):
+        gateway = FakeGateway()
+        user, sub = _subscriber(plan, 'stale', stripe_subscription_id='sub_s', stripe_customer_id='cus_s')
+        failed = gateway.event('invoice.payment_failed', {'customer': 'cus_s', 'subscription': 'sub_s'})
+        paid = gateway.event('invoice.paid', {'customer': 'cus_s', 'subscription': 'sub_s'})
+
+        _deliver([paid])
+        _deliver([failed])
+
+        assert _state(sub)[0] == 'active'
+        assert WebhookEvent.objects.get(event_id=failed['id']).status == 'stale'
+
+    def test_charge_routes_by_customer_only(self, plan):
+        gateway = FakeGateway()
+        _, target = _subscriber(plan, 'target', stripe_subscription_id='sub_t', stripe_customer_id='cus_t')
+        _, other = _subscriber(plan, 'other', stripe_subscription_id='sub_o', stripe_customer_id='cus_o')
+
+        _deliver([gateway.event('charge.succeeded', {'customer': 'cus_t'})])
+
+        assert _state(target)[0] == 'active'
+        assert _state(other)[0] == 'trial'
+
+    def test_charge_does_not_reactivate_canceled_subscription(self, plan):
+        gateway = FakeGateway()
+        _, canceled = _subscriber(plan, 'canceled', stripe_customer_id='cus_c')
+        _, overdue = _subscriber(plan, 'overdue', stripe_customer_id='cus_p')
+        UserSubscription.objects.filter(pk=canceled.pk).update(status='canceled')
+        UserSubscription.objects.filter(pk=overdue.pk).update(status='past_due')
+
+        _deliver([
+            gateway.event('charge.succeeded', {'customer': 'cus_c'}),
+            gateway.event('charge.succeeded', {'customer': 'cus_p'}),
+        ])
+
+        assert _state(canceled)[0] == 'canceled'
+        assert _state(overdue)[0] == 'active'
+        assert set(WebhookEvent.objects.values_list('status', flat=True)) == {'processed'}
+
+    def test_event_waits_for_its_mapping(self, plan):
+        gateway = FakeGateway()
+        user, sub = _subscriber(plan, 'early')
+        checkout, failed = gateway.lifecycle(user, 'cus_e', 'sub_e')[:2]
+
+        _deliver([failed])
+        assert WebhookEvent.objects.get(event_id=failed['id']).status == 'pending'
+
+        _deliver([checkout])
+        assert _state(sub)[0] == 'past_due'
+        assert set(WebhookEvent.objects.values_list('status', flat=True)) == {'processed'}
+
+    def test_dashboard_updates_are_coalesced(self, plan):
+        gateway = FakeGateway()
+        users = [_subscriber(plan, f'fan{i}')[0] for i in range(3)]
+        events = []
+        for i, user in enumerate(users):
+            events.extend(gateway.lifecycle(user, f'cus_f{i}', f'sub_f{i}'))
+
+        for event in gateway.burst(events):
+            ingest_event(event)
+        drain_inbox(batch_size=100)
+
+        assert DashboardUpdateQueue.objects.count() == 3
+        assert set(DashboardUpdateQueue.objects.values_list('user_id', flat=True)) == {u.id for u in users}
+
+
+@pytest.mark.django_db
+class TestStripeWebhookEndpoint:
+    URL = '/api/v1/subscription/webhooks/stripe'
+
+    def _post(self, api_client, event, secret):
+        payload = json.dumps(event)
+        timestamp = int(time.time())
+        signature = hmac.new(secret.encode(), f'{timestamp}.{payload}'.encode(), hashlib.sha256).hexdigest()
+        return api_client.post(
+            self.URL, data=payload, content_type='application/json',
+            HTTP_STRIPE_SIGNATURE=f't={timestamp},v1={signature}',
+        )
+
+    def test_signed_event_is_stored_once(self, api_client, plan, monkeypatch):
+        monkeypatch.setenv('STRIPE_SECRET_KEY', 'sk_test_x')
+        monkeypatch.setenv('STRIPE_WEBHOOK_SECRET', 'whsec_test')
+        event = FakeGateway().event('charge.succeeded', {'customer': 'cus_x', 'object': 'charge'})
+        event['object'] = 'event'
+
+        with mock.patch('subscriptions.tasks.process_webhook_inbox_task'):
+            first = self._post(api_client, event, 'whsec_test')
+            second = self._post(api_client, event, 'whsec_test')
+
+        assert (first.status_code, second.status_code) == (200, 200)
+        assert WebhookEvent.objects.filter(event_id=event['id']).count() == 1
+        assert WebhookEvent.objects.get(event_id=event['id']).payload == event
+        assert self._post(api_client, event, 'wrong').status_code == 400
@@ -0,0 +1,58 @@
+"""
+Management command for audit log upkeep.
+
+Flushes the buffered audit writer, creates upcoming monthly partitions and drops
+partitions older than AUDIT_LOG_RETENTION_MONTHS. Intended to run daily from cron
+or Celery beat.
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.utils.audit_buffer import get_audit_buffer
+from users.utils.audit_partitions import (
+    drop_expired_audit_partitions,
+    ensure_audit_partitions,
+    is_partitioned,
+)
+
+
+class Command(BaseCommand):
+    help = 'Flush buffered audit logs, create upcoming partitions and drop expired ones'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead',
+            type=int,
+            default=3,
+            help='Number of future monthly partitions to keep ready (default: 3)',
+        )
+        parser.add_argument(
+            '--retention-months',
+            type=int,
+            default=None,
+            help='Override AUDIT_LOG_RETENTION_MONTHS',
+        )
+        parser.add_argument(
+            '--skip-retention',
+            action='store_true',
+            help='Only flush and create partitions; never drop data',
+        )
+
+    def handle(self, *args, **options):
+        flushed = get_audit_buffer().flush()
+        self.stdout.write(f'Flushed {flushed} buffered audit entries')
+
+        if is_partitioned():
+            created = ensure_audit_partitions(months_ahead=options['months_ahead'])
+            self.stdout.write(f'Created partitions: {", ".join(created) or "none"}')
+        else:
+            self.stdout.write(self.style.WARNING('audit_logs is not partitioned on this database'))
+
+        if options['skip_retention']:
+            return
+
+        retention = options['retention_months'] or settings.AUDIT_LOG_RETENTION_MONTHS
+        dropped = drop_expired_audit_partitions(retention)
+        self.stdout.write(self.style.SUCCESS(
+            f'Retention {retention} months applied; dropped partitions: {", ".join(dropped) or "none"}'
+        ))
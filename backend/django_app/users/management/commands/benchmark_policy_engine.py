@@ -0,0 +1,77 @@
+"""
+Micro-benchmark for the compiled ABAC policy index.
+
+Builds a synthetic policy set in memory (no database access) and reports how many
+decisions per second PolicyIndex.decide sustains for a representative user snapshot.
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.policy_models import Policy
+from users.utils.policy_compiler import PolicyIndex, UserAttributes
+
+RESOURCES = ['portfolio', 'profiling', 'mentorship', 'cohort', 'track', 'analytics', 'user', 'organization']
+ACTIONS = ['read', 'list', 'create', 'update', 'delete', 'manage']
+ROLES = ['student', 'mentor', 'program_director', 'sponsor_admin', 'analyst']
+CONSENTS = ['share_with_mentor', 'share_with_sponsor', 'analytics', 'public_portfolio']
+
+
+class Command(BaseCommand):
+    help = 'Measure compiled ABAC policy decisions per second'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policies', type=int, default=200, help='Synthetic policies to compile')
+        parser.add_argument('--decisions', type=int, default=200000, help='Decisions to evaluate')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+
+        policies = []
+        for i in range(options['policies']):
+            condition = {}
+            if rng.random() < 0.7:
+                condition['user.role'] = rng.choice(ROLES)
+            if rng.random() < 0.4:
+                condition['consent_scopes.includes'] = rng.choice(CONSENTS)
+            if rng.random() < 0.2:
+                condition['user.cohort_id'] = 'request.cohort_id'
+            policies.append(Policy(
+                name=f'bench-{i}',
+                effect=rng.choice(['allow', 'allow', 'deny']),
+                resource=rng.choice(RESOURCES),
+                actions=rng.sample(ACTIONS, k=rng.randint(1, 3)),
+                condition=condition,
+            ))
+
+        started = time.perf_counter()
+        index = PolicyIndex.build(policies)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        attributes = UserAttributes(
+            user_id=1,
+            roles=frozenset({'mentor'}),
+            permissions=frozenset((r, a) for r in RESOURCES for a in ACTIONS),
+            consents=frozenset({'share_with_mentor'}),
+            cohort_id='cohort-1',
+            track_key='defender',
+        )
+        requests = [
+            (rng.choice(RESOURCES), rng.choice(ACTIONS), {'cohort_id': rng.choice(['cohort-1', 'cohort-2'])})
+            for _ in range(1000)
+        ]
+
+        total = options['decisions']
+        allowed = 0
+        started = time.perf_counter()
+        for i in range(total):
+            resource, action, context = requests[i % 1000]
+            if index.decide(attributes, resource, action, context)[0]:
+                allowed += 1
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f'Compiled {len(policies)} policies into {len(index.rules)} rules in {compile_ms:.2f} ms')
+        self.stdout.write(f'{total} decisions in {elapsed:.3f} s ({allowed} allowed)')
+        self.stdout.write(self.style.SUCCESS(f'{total / elapsed:,.0f} decisions/sec'))
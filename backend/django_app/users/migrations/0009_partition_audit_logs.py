@@ -0,0 +1,130 @@
+# Convert audit_logs into a table range-partitioned by month on "timestamp" (PostgreSQL only).
+# The model is unchanged; the primary key becomes (id, timestamp) because PostgreSQL requires
+# the partition key in every unique constraint of a partitioned table.
+
+from datetime import date, datetime, time, timezone as dt_timezone
+
+from django.db import migrations
+
+MONTHS_AHEAD = 3
+
+
+# Frozen copies of the users.utils.audit_partitions helpers as of this migration.
+
+def month_start(value):
+    if isinstance(value, datetime):
+        value = value.astimezone(dt_timezone.utc).date() if value.tzinfo else value.date()
+    return value.replace(day=1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"audit_logs_y{month.year}m{month.month:02d}"
+
+
+def _bound(month):
+    return datetime.combine(month, time.min, tzinfo=dt_timezone.utc).isoformat()
+
+
+def create_month_partition(cursor, month):
+    """Create and attach one month's partition, moving its rows out of the default partition."""
+    name = partition_name(month)
+    cursor.execute("SELECT to_regclass(%s)", [name])
+    if cursor.fetchone()[0] is not None:
+        return
+
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    cursor.execute(f'CREATE TABLE "{name}" (LIKE "audit_logs" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    cursor.execute(
+        f"""
+        WITH moved AS (
+            DELETE FROM "audit_logs_default"
+            WHERE "timestamp" >= %s AND "timestamp" < %s
+            RETURNING *
+        )
+        INSERT INTO "{name}" SELECT * FROM moved
+        """,
+        [lower, upper],
+    )
+    cursor.execute(f"""ALTER TABLE "audit_logs" ATTACH PARTITION "{name}" FOR VALUES FROM ('{lower}') TO ('{upper}')""")
+
+
+def partition_audit_logs(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('audit_logs')")
+        if cursor.fetchone() is not None:
+            return
+
+        cursor.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy;")
+        cursor.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey;")
+
+        # Capture secondary indexes and foreign keys so they can be recreated on the new parent.
+        cursor.execute("""
+            SELECT indexname, indexdef FROM pg_indexes
+            WHERE tablename = 'audit_logs_legacy' AND indexname <> 'audit_logs_legacy_pkey';
+        """)
+        indexes = cursor.fetchall()
+        cursor.execute("""
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = 'audit_logs_legacy'::regclass AND contype = 'f';
+        """)
+        foreign_keys = cursor.fetchall()
+
+        cursor.execute("""
+            CREATE TABLE audit_logs (LIKE audit_logs_legacy INCLUDING DEFAULTS INCLUDING IDENTITY)
+            PARTITION BY RANGE ("timestamp");
+        """)
+        cursor.execute('ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_pkey PRIMARY KEY (id, "timestamp");')
+        cursor.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;")
+
+        # Serial columns keep pointing at the legacy sequence; hand it over before the drop.
+        cursor.execute("SELECT pg_get_serial_sequence('audit_logs_legacy', 'id');")
+        legacy_sequence = cursor.fetchone()[0]
+        cursor.execute("SELECT attidentity FROM pg_attribute WHERE attrelid = 'audit_logs_legacy'::regclass AND attname = 'id';")
+        legacy_is_identity = cursor.fetchone()[0] in ('a', 'd')
+        if legacy_sequence and not legacy_is_identity:
+            cursor.execute(f"ALTER SEQUENCE {legacy_sequence} OWNED BY audit_logs.id;")
+
+        cursor.execute("SELECT min(\"timestamp\") FROM audit_logs_legacy;")
+        oldest = cursor.fetchone()[0]
+        current = month_start(date.today())
+        month = month_start(oldest) if oldest else current
+        while month <= add_months(current, MONTHS_AHEAD):
+            create_month_partition(cursor, month)
+            month = add_months(month, 1)
+
+        cursor.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_legacy;")
+        cursor.execute("DROP TABLE audit_logs_legacy;")
+
+        for name, definition in indexes:
+            definition = definition.replace(" ON public.audit_logs_legacy ", " ON public.audit_logs ")
+            definition = definition.replace(" ON audit_logs_legacy ", " ON audit_logs ")
+            if definition.startswith("CREATE UNIQUE"):
+                continue
+            cursor.execute(definition)
+        for name, definition in foreign_keys:
+            cursor.execute(f'ALTER TABLE audit_logs ADD CONSTRAINT "{name}" {definition};')
+
+        if legacy_is_identity:
+            cursor.execute("""
+                SELECT setval(pg_get_serial_sequence('audit_logs', 'id'),
+                              COALESCE((SELECT max(id) FROM audit_logs), 0) + 1, false);
+            """)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_fix_mfa_codes_user_id_uuid'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_audit_logs, migrations.RunPython.noop),
+    ]
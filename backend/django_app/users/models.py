@@ -205,6 +205,12 @@ class User(AbstractUser):
     def __str__(self):
         return self.email
     
+    @property
+    def identity(self):
+        """Cached roles/tier/entitlements snapshot (see users.utils.identity_snapshot)."""
+        from users.utils.identity_snapshot import get_identity_snapshot
+        return get_identity_snapshot(self)
+    
     def get_profiling_session_id_safe(self):
         """Safely get profiling_session_id, handling invalid UUID values."""
         try:
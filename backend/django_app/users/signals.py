@@ -0,0 +1,36 @@
+"""
+Users app signals.
+"""
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import Entitlement, UserRole
+from users.policy_models import Policy
+from users.utils.identity_snapshot import bump_identity_version
+from users.utils.policy_compiler import bump_policy_version
+
+
+@receiver(post_save, sender=Policy)
+@receiver(post_delete, sender=Policy)
+def on_policy_changed(sender, instance, **kwargs):
+    """Recompile ABAC policies in every worker once the policy edit commits."""
+    transaction.on_commit(bump_policy_version)
+
+
+@receiver(post_save, sender=UserRole)
+@receiver(post_delete, sender=UserRole)
+@receiver(post_save, sender=Entitlement)
+@receiver(post_delete, sender=Entitlement)
+@receiver(post_save, sender='subscriptions.UserSubscription')
+@receiver(post_delete, sender='subscriptions.UserSubscription')
+def on_identity_changed(sender, instance, **kwargs):
+    """
+    Invalidate the user's identity snapshot.
+
+    Bumped now and again after commit, so a snapshot rebuilt from pre-commit data by a
+    concurrent request cannot outlive the transaction.
+    """
+    user_id = instance.user_id
+    bump_identity_version(user_id)
+    transaction.on_commit(lambda: bump_identity_version(user_id))
@@ -0,0 +1,166 @@
+"""
+Buffered audit log writer.
+
+log_audit_event() hands AuditLog rows to this buffer instead of issuing one INSERT
+on the request path. Rows are written with a single bulk_create when the buffer
+reaches AUDIT_BUFFER_MAX_SIZE entries or every AUDIT_BUFFER_FLUSH_INTERVAL seconds,
+and once more at interpreter shutdown.
+
+Two queues are available:
+- 'memory' (default): per-process deque, flushed by a daemon thread.
+- 'redis': a shared Redis list, so rows survive a worker restart between flushes
+  and any worker (or the audit_log_maintenance command) can drain them.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from collections import deque
+from typing import List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_datetime
+
+from core.buffered_flush import BufferedFlusher, ProcessSingleton
+from users.audit_models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+REDIS_QUEUE_KEY = 'audit:buffer'
+
+
+def _serialize(entry: AuditLog) -> str:
+    data = {
+        field.attname: getattr(entry, field.attname)
+        for field in AuditLog._meta.concrete_fields
+        if not field.primary_key
+    }
+    return json.dumps(data, cls=DjangoJSONEncoder)
+
+
+def _deserialize(raw) -> AuditLog:
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    data = json.loads(raw)
+    if data.get('timestamp'):
+        data['timestamp'] = parse_datetime(data['timestamp'])
+    return AuditLog(**data)
+
+
+class AuditLogBuffer(BufferedFlusher):
+    """Queue of unsaved AuditLog rows with size/time based bulk flushing."""
+
+    thread_name = 'audit-log-flusher'
+
+    def __init__(self, max_size: int = 200, flush_interval: float = 2.0, redis_client=None):
+        super().__init__(flush_interval)
+        self.max_size = max(1, int(max_size))
+        self.redis = redis_client
+        self._queue = deque()
+
+    # ------------------------------------------------------------------ queue
+
+    def write(self, entry: AuditLog) -> None:
+        """Enqueue an entry; wakes the flusher once the size threshold is hit."""
+        if self.redis is not None:
+            try:
+                pending = self.redis.rpush(REDIS_QUEUE_KEY, _serialize(entry))
+            except Exception as e:
+                logger.warning(f"Audit buffer Redis push failed, writing directly: {e}")
+                self._save([entry])
+                return
+        else:
+            with self._lock:
+                self._queue.append(entry)
+                pending = len(self._queue)
+
+        if pending >= self.max_size:
+            self._wake_or_flush()
+        else:
+            self._ensure_flusher()
+
+    def pending(self) -> int:
+        if self.redis is not None:
+            try:
+                return int(self.redis.llen(REDIS_QUEUE_KEY))
+            except Exception:
+                return 0
+        with self._lock:
+            return len(self._queue)
+
+    def _drain(self, limit: int) -> List[AuditLog]:
+        if self.redis is not None:
+            # LRANGE + LTRIM in one MULTI so concurrent flushers never take the same rows.
+            pipe = self.redis.pipeline()
+            pipe.lrange(REDIS_QUEUE_KEY, 0, limit - 1)
+            pipe.ltrim(REDIS_QUEUE_KEY, limit, -1)
+            raw_items, _ = pipe.execute()
+            return [_deserialize(raw) for raw in raw_items]
+
+        with self._lock:
+            batch = []
+            while self._queue and len(batch) < limit:
+                batch.append(self._queue.popleft())
+            return batch
+
+    # ------------------------------------------------------------------ flush
+
+    def flush(self) -> int:
+        """Write every queued entry; returns the number of rows written."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                try:
+                    batch = self._drain(self.max_size)
+                except Exception as e:
+                    logger.warning(f"Audit buffer drain failed: {e}")
+                    break
+                if not batch:
+                    break
+                written += self._save(batch)
+        return written
+
+    def _save(self, batch: List[AuditLog]) -> int:
+        try:
+            AuditLog.objects.bulk_create(batch, batch_size=self.max_size)
+            return len(batch)
+        except Exception as e:
+            # Audit logging is best-effort: a failed flush must never surface in a request.
+            logger.warning(f"Audit buffer flush dropped {len(batch)} entries: {e}")
+            return 0
+
+
+def _build_buffer() -> AuditLogBuffer:
+    redis_client = None
+    if getattr(settings, 'AUDIT_BUFFER_BACKEND', 'memory') == 'redis':
+        from core.redis_utils import get_redis_client
+        redis_client = get_redis_client()
+    return AuditLogBuffer(
+        max_size=getattr(settings, 'AUDIT_BUFFER_MAX_SIZE', 200),
+        flush_interval=getattr(settings, 'AUDIT_BUFFER_FLUSH_INTERVAL', 2.0),
+        redis_client=redis_client,
+    )
+
+
+_buffer = ProcessSingleton(_build_buffer)
+
+
+def get_audit_buffer() -> AuditLogBuffer:
+    """Return the process-wide buffer, creating it from settings on first use."""
+    return _buffer.get()
+
+
+def write_audit_entry(entry: AuditLog, *, sync: bool = False) -> Optional[AuditLog]:
+    """
+    Persist an AuditLog row, buffered unless AUDIT_BUFFER_ENABLED is off or sync=True.
+
+    Use sync=True for entries that are read back immediately (e.g. login failures
+    counted by risk_utils.calculate_risk_score).
+    """
+    if sync or not getattr(settings, 'AUDIT_BUFFER_ENABLED', True):
+        entry.save()
+        return entry
+    get_audit_buffer().write(entry)
+    return entry
@@ -0,0 +1,177 @@
+"""
+Monthly range partitions for the audit_logs table (PostgreSQL).
+
+Migration 0009 turns audit_logs into a table partitioned by RANGE ("timestamp") with
+one child per calendar month (audit_logs_y2026m01, ...) plus audit_logs_default as a
+catch-all. The audit_log_maintenance command keeps partitions created ahead of time
+and drops whole months once they fall outside AUDIT_LOG_RETENTION_MONTHS.
+
+On other databases (SQLite in tests/local dev) the same entry points fall back to
+plain row deletes so callers don't need to care which backend is active.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from datetime import date, datetime, time, timezone as dt_timezone
+from typing import List, Optional
+
+from django.db import connection, transaction
+
+from users.audit_models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = 'audit_logs'
+DEFAULT_PARTITION = 'audit_logs_default'
+_PARTITION_RE = re.compile(r'^audit_logs_y(\d{4})m(\d{2})$')
+
+
+def month_start(value) -> date:
+    """First day of the month containing a date/datetime."""
+    if isinstance(value, datetime):
+        value = value.astimezone(dt_timezone.utc).date() if value.tzinfo else value.date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f'audit_logs_y{month.year}m{month.month:02d}'
+
+
+def _bound(month: date) -> str:
+    return datetime.combine(month, time.min, tzinfo=dt_timezone.utc).isoformat()
+
+
+def is_partitioned() -> bool:
+    """True when audit_logs is a partitioned table on this connection."""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+            [PARENT_TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def existing_partitions() -> List[date]:
+    """Months that currently have their own partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [PARENT_TABLE],
+        )
+        months = []
+        for (name,) in cursor.fetchall():
+            match = _PARTITION_RE.match(name)
+            if match:
+                months.append(date(int(match.group(1)), int(match.group(2)), 1))
+    return sorted(months)
+
+
+def create_month_partition(cursor, month: date) -> bool:
+    """
+    Create the partition for one month, moving any rows that already landed in the
+    default partition for that range. Returns False if it already existed.
+    """
+    name = partition_name(month)
+    cursor.execute("SELECT to_regclass(%s)", [name])
+    if cursor.fetchone()[0] is not None:
+        return False
+
+    lower, upper = _bound(month), _bound(add_months(month, 1))
+    cursor.execute(
+        f'CREATE TABLE "{name}" (LIKE "{PARENT_TABLE}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+    )
+    cursor.execute("SELECT to_regclass(%s)", [DEFAULT_PARTITION])
+    if cursor.fetchone()[0] is not None:
+        cursor.execute(
+            f'''
+            WITH moved AS (
+                DELETE FROM "{DEFAULT_PARTITION}"
+                WHERE "timestamp" >= %s AND "timestamp" < %s
+                RETURNING *
+            )
+            INSERT INTO "{name}" SELECT * FROM moved
+            ''',
+            [lower, upper],
+        )
+    cursor.execute(
+        f'ALTER TABLE "{PARENT_TABLE}" ATTACH PARTITION "{name}" '
+        f"FOR VALUES FROM ('{lower}') TO ('{upper}')"
+    )
+    return True
+
+
+def ensure_audit_partitions(months_ahead: int = 3, today: Optional[date] = None) -> List[str]:
+    """Create partitions for the current month and the next `months_ahead` months."""
+    if not is_partitioned():
+        return []
+    current = month_start(today or date.today())
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if create_month_partition(cursor, month):
+                created.append(partition_name(month))
+    if created:
+        logger.info(f"Created audit log partitions: {', '.join(created)}")
+    return created
+
+
+def drop_expired_audit_partitions(retention_months: int, today: Optional[date] = None) -> List[str]:
+    """
+    Drop every monthly partition older than the retention window.
+
+    Without partitioning this deletes the expired rows instead and returns an empty list.
+    """
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+
+    if not is_partitioned():
+        cutoff_dt = datetime.combine(cutoff, time.min, tzinfo=dt_timezone.utc)
+        deleted, _ = AuditLog.objects.filter(timestamp__lt=cutoff_dt).delete()
+        logger.info(f"Deleted {deleted} audit log rows older than {cutoff}")
+        return []
+
+    dropped = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for month in existing_partitions():
+            if add_months(month, 1) <= cutoff:
+                name = partition_name(month)
+                cursor.execute(f'ALTER TABLE "{PARENT_TABLE}" DETACH PARTITION "{name}"')
+                cursor.execute(f'DROP TABLE "{name}"')
+                dropped.append(name)
+        cursor.execute(
+            f'DELETE FROM "{DEFAULT_PARTITION}" WHERE "timestamp" < %s',
+            [_bound(cutoff)],
+        )
+    if dropped:
+        logger.info(f"Dropped expired audit log partitions: {', '.join(dropped)}")
+    return dropped
+
+
+def audit_logs_between(start: datetime, end: Optional[datetime] = None, queryset=None):
+    """
+    AuditLog queryset (or a narrowing of `queryset`) restricted to [start, end).
+
+    Both bounds are literal comparisons on the partition key, so PostgreSQL only
+    scans the partitions that overlap the range. Always go through this (rather than
+    an unbounded AuditLog.objects.all()) for date-scoped audit queries.
+    """
+    if queryset is None:
+        queryset = AuditLog.objects.all()
+    queryset = queryset.filter(timestamp__gte=start)
+    if end is not None:
+        queryset = queryset.filter(timestamp__lt=end)
+    return queryset
@@ -11,6 +11,7 @@ from typing import Any, Dict, Optional
 from django.utils import timezone
 
 from users.audit_models import AuditLog
+from users.utils.audit_buffer import write_audit_entry
 
 
 def _get_client_ip(request) -> Optional[str]:
@@ -35,6 +36,7 @@ def log_audit_event(
     metadata: Optional[Dict[str, Any]] = None,
     changes: Optional[Dict[str, Any]] = None,
     error_message: Optional[str] = None,
+    sync: bool = False,
 ) -> Optional[AuditLog]:
     """
     Create an AuditLog entry.
@@ -42,13 +44,15 @@ def log_audit_event(
     Notes:
     - We intentionally keep this lightweight and best-effort: failures to log should never
       break the main business action.
+    - Entries go through the buffered writer (users.utils.audit_buffer) and are bulk
+      inserted shortly after; pass sync=True when the row must be readable immediately.
     """
     actor_identifier = None
     if user is not None:
         actor_identifier = getattr(user, "email", None) or getattr(user, "username", None) or str(getattr(user, "id", "unknown"))
 
     try:
-        return AuditLog.objects.create(
+        entry = AuditLog(
             user=user if user is not None else None,
             api_key=None,
             actor_type="user" if user is not None else "system",
@@ -65,6 +69,7 @@ def log_audit_event(
             error_message=error_message,
             timestamp=timezone.now(),
         )
+        return write_audit_entry(entry, sync=sync)
     except Exception:
         # Never block core flows due to audit logging.
         return None
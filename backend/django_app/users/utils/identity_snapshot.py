@@ -0,0 +1,143 @@
+"""
+Per-user identity snapshot: active role names, subscription tier, enhanced-access
+expiry and feature entitlements, computed once and shared by every app.
+
+Snapshots are cached under a per-user version key (identity:ver:<user_id>). Signals on
+UserRole, UserSubscription and Entitlement bump that version (users/signals.py), so a
+change is visible on the next read without deleting anything. Within a request the
+snapshot is also memoized on the user instance; use `request.user.identity` or
+get_identity_snapshot(user).
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import FrozenSet, Optional
+
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from core.versioned_cache import ENTRY_TTL, bump_version, current_version
+
+logger = logging.getLogger(__name__)
+
+_MEMO_ATTR = '_identity_snapshot'
+
+
+@dataclass(frozen=True)
+class IdentitySnapshot:
+    user_id: int
+    roles: FrozenSet[str] = frozenset()
+    plan_name: str = 'free'
+    tier: str = 'free'
+    subscription_status: Optional[str] = None
+    enhanced_access_expires_at: Optional[datetime] = None
+    ai_coach_daily_limit: Optional[int] = None
+    features: FrozenSet[str] = field(default_factory=frozenset)
+    version: int = 0
+
+    def has_role(self, *names: str) -> bool:
+        return any(name in self.roles for name in names)
+
+    @property
+    def has_enhanced_access(self) -> bool:
+        return bool(self.enhanced_access_expires_at and self.enhanced_access_expires_at > timezone.now())
+
+    def has_feature(self, feature: str) -> bool:
+        return feature in self.features
+
+
+def _version_key(user_id) -> str:
+    return f'identity:ver:{user_id}'
+
+
+def _snapshot_key(user_id, version) -> str:
+    return f'identity:{user_id}:v{version}'
+
+
+def bump_identity_version(user_id) -> None:
+    """Invalidate every cached snapshot for a user."""
+    bump_version(_version_key(user_id))
+
+
+def bump_identity_versions(user_ids) -> None:
+    """bump_identity_version for each user (bulk subscription changes)."""
+    for user_id in user_ids:
+        bump_identity_version(user_id)
+
+
+def _build_snapshot(user_id, version: int) -> IdentitySnapshot:
+    from subscriptions.models import UserSubscription
+    from users.models import Entitlement, UserRole
+
+    roles = frozenset(
+        UserRole.objects.filter(user_id=user_id, is_active=True).values_list('role__name', flat=True)
+    )
+
+    subscription = UserSubscription.objects.filter(user_id=user_id).select_related('plan').first()
+    features = set()
+    plan_name, tier, status, enhanced_until, ai_limit = 'free', 'free', None, None, 5
+    if subscription is not None:
+        status = subscription.status
+        if subscription.status == 'active' and subscription.plan:
+            plan_name = subscription.plan.name
+            tier = subscription.plan.tier
+            enhanced_until = subscription.enhanced_access_expires_at
+            ai_limit = subscription.plan.ai_coach_daily_limit
+            features.update(subscription.plan.features or [])
+
+    now = timezone.now()
+    features.update(
+        Entitlement.objects.filter(user_id=user_id, granted=True)
+        .filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+        .values_list('feature', flat=True)
+    )
+
+    return IdentitySnapshot(
+        user_id=user_id,
+        roles=roles,
+        plan_name=plan_name,
+        tier=tier,
+        subscription_status=status,
+        enhanced_access_expires_at=enhanced_until,
+        ai_coach_daily_limit=ai_limit,
+        features=frozenset(features),
+        version=version,
+    )
+
+
+def get_identity_snapshot(user) -> IdentitySnapshot:
+    """Return the identity snapshot for a user, from memo, cache or a fresh build."""
+    memo = getattr(user, _MEMO_ATTR, None)
+    if memo is not None:
+        return memo
+
+    user_id = user.pk
+    version = current_version(_version_key(user_id))
+    key = _snapshot_key(user_id, version)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = _build_snapshot(user_id, version)
+        cache.set(key, snapshot, ENTRY_TTL)
+
+    try:
+        setattr(user, _MEMO_ATTR, snapshot)
+    except AttributeError:
+        pass
+    return snapshot
+
+
+def get_user_role_names(user) -> FrozenSet[str]:
+    """Active role names for a user (replacement for the per-view user_roles list comprehension)."""
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return frozenset()
+    return get_identity_snapshot(user).roles
+
+
+def forget_identity_snapshot(user) -> None:
+    """Drop the per-request memo so the next read sees a just-committed change."""
+    if hasattr(user, _MEMO_ATTR):
+        delattr(user, _MEMO_ATTR)
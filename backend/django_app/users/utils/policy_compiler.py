@@ -0,0 +1,258 @@
+"""
+Policy compiler for the ABAC engine.
+
+Active Policy rows are compiled once per worker into a PolicyIndex keyed by
+(resource, action); each condition becomes a closure over a UserAttributes snapshot,
+so a decision is a dict lookup plus a few set-membership checks instead of a policy
+query and per-condition UserRole/ConsentScope queries.
+
+The index is versioned. Saving or deleting a Policy bumps the version once the
+transaction commits: locally, and across workers through a Redis pub/sub message
+(see bump_policy_version). Every worker also rebuilds after POLICY_INDEX_TTL
+seconds, which is the only refresh without Redis and bounds a missed message with it.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+POLICY_VERSION_KEY = 'policy:version'
+POLICY_CHANNEL = 'policy:invalidate'
+
+Predicate = Callable[['UserAttributes', dict], bool]
+
+
+@dataclass(frozen=True)
+class UserAttributes:
+    """Everything policy conditions and RBAC checks need to know about a user."""
+    user_id: Optional[int]
+    roles: FrozenSet[str] = frozenset()
+    permissions: FrozenSet[Tuple[str, str]] = frozenset()
+    consents: FrozenSet[str] = frozenset()
+    cohort_id: Optional[str] = None
+    track_key: Optional[str] = None
+    org_id: Optional[str] = None
+
+
+def get_user_attributes(user) -> UserAttributes:
+    """
+    Build (or reuse) the attribute snapshot for a user.
+
+    Memoized on the user instance, which DRF creates per request, so one request pays
+    for it once no matter how many checks it makes. Roles come from the shared
+    identity snapshot.
+    """
+    cached = getattr(user, '_policy_attributes', None)
+    if cached is not None:
+        return cached
+
+    from users.models import ConsentScope, Permission
+    from users.utils.identity_snapshot import get_identity_snapshot
+
+    roles = get_identity_snapshot(user).roles
+    permissions = frozenset(
+        Permission.objects.filter(
+            roles__user_roles__user=user,
+            roles__user_roles__is_active=True,
+        ).values_list('resource_type', 'action')
+    )
+    consents = frozenset(
+        ConsentScope.objects.filter(
+            user=user,
+            granted=True,
+            expires_at__isnull=True,
+        ).values_list('scope_type', flat=True)
+    )
+    org_id = getattr(user, 'org_id_id', None)
+    attributes = UserAttributes(
+        user_id=user.pk,
+        roles=roles,
+        permissions=permissions,
+        consents=consents,
+        cohort_id=getattr(user, 'cohort_id', None),
+        track_key=getattr(user, 'track_key', None),
+        org_id=str(org_id) if org_id is not None else None,
+    )
+    try:
+        user._policy_attributes = attributes
+    except AttributeError:
+        pass
+    return attributes
+
+
+def compile_condition(condition: Optional[dict]) -> Predicate:
+    """
+    Turn a policy condition dict into a predicate(attributes, context).
+
+    Supported keys mirror the original interpreter: user.role, consent_scopes.includes,
+    user.cohort_id, user.track_key, user.org_id. match_exists is accepted but not enforced.
+    """
+    if not condition:
+        return lambda attributes, context: True
+
+    checks: List[Predicate] = []
+
+    if 'user.role' in condition:
+        role = condition['user.role']
+        checks.append(lambda a, c: role in a.roles)
+
+    if 'consent_scopes.includes' in condition:
+        scope = condition['consent_scopes.includes']
+        checks.append(lambda a, c: scope in a.consents)
+
+    if 'user.cohort_id' in condition:
+        checks.append(lambda a, c: a.cohort_id == c.get('cohort_id'))
+
+    if 'user.track_key' in condition:
+        checks.append(lambda a, c: a.track_key == c.get('track_key'))
+
+    if 'user.org_id' in condition:
+        checks.append(lambda a, c: a.org_id is not None and a.org_id == str(c.get('org_id')))
+
+    if not checks:
+        return lambda attributes, context: True
+    if len(checks) == 1:
+        return checks[0]
+    return lambda a, c: all(check(a, c) for check in checks)
+
+
+@dataclass(frozen=True)
+class CompiledPolicy:
+    name: str
+    effect: str
+    predicate: Predicate
+
+
+@dataclass
+class PolicyIndex:
+    """Active policies grouped by (resource, action), in Policy.Meta.ordering order."""
+    version: int
+    rules: Dict[Tuple[str, str], Tuple[CompiledPolicy, ...]] = field(default_factory=dict)
+    built_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(cls, policies, version: int = 0) -> 'PolicyIndex':
+        rules: Dict[Tuple[str, str], List[CompiledPolicy]] = {}
+        for policy in policies:
+            compiled = CompiledPolicy(
+                name=policy.name,
+                effect=policy.effect,
+                predicate=compile_condition(policy.condition),
+            )
+            for action in policy.actions or []:
+                rules.setdefault((policy.resource, action), []).append(compiled)
+        return cls(version=version, rules={key: tuple(value) for key, value in rules.items()})
+
+    def decide(self, attributes: UserAttributes, resource: str, action: str, context: dict) -> Tuple[bool, str]:
+        policies = self.rules.get((resource, action))
+        if not policies:
+            # No policies = allow (RBAC already granted; ABAC has no extra restrictions)
+            return True, "No policy; access allowed by RBAC"
+        for policy in policies:
+            if policy.predicate(attributes, context):
+                if policy.effect == 'allow':
+                    return True, f"Policy '{policy.name}' allows access"
+                return False, f"Policy '{policy.name}' denies access"
+        # Default deny if no policy matches
+        return False, "No matching policy found"
+
+
+class PolicyStore:
+    """Per-worker holder of the compiled index, rebuilt when the version moves."""
+
+    def __init__(self):
+        self._index: Optional[PolicyIndex] = None
+        self._stale = True
+        self._local_version = 0
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def get_index(self) -> PolicyIndex:
+        redis_client = _redis()
+        if redis_client is not None:
+            self._ensure_listener(redis_client)
+
+        index = self._index
+        ttl = getattr(settings, 'POLICY_INDEX_TTL', 30)
+        expired = index is not None and time.monotonic() - index.built_at > ttl
+        if index is not None and not self._stale and not expired:
+            return index
+
+        with self._lock:
+            if self._index is not None and not self._stale and not expired:
+                return self._index
+            # Clear the flag before reading so a bump that lands mid-build forces another rebuild.
+            self._stale = False
+            from users.policy_models import Policy
+            version = self._current_version(redis_client)
+            self._index = PolicyIndex.build(Policy.objects.filter(active=True), version=version)
+            return self._index
+
+    def _current_version(self, redis_client) -> int:
+        if redis_client is not None:
+            try:
+                return int(redis_client.get(POLICY_VERSION_KEY) or 0)
+            except Exception:
+                pass
+        return self._local_version
+
+    def bump(self) -> int:
+        self._stale = True
+        self._local_version += 1
+        redis_client = _redis()
+        if redis_client is None:
+            return self._local_version
+        try:
+            version = int(redis_client.incr(POLICY_VERSION_KEY))
+            redis_client.publish(POLICY_CHANNEL, version)
+            return version
+        except Exception as e:
+            logger.warning(f"Policy version bump not published: {e}")
+            return self._local_version
+
+    def _ensure_listener(self, redis_client) -> None:
+        if self._listener is not None and self._listener.is_alive():
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            # Anything published while no listener was running is unknown; rebuild once.
+            self._stale = True
+            self._listener = threading.Thread(
+                target=self._listen, args=(redis_client,), name='policy-invalidation', daemon=True
+            )
+            self._listener.start()
+
+    def _listen(self, redis_client) -> None:
+        try:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(POLICY_CHANNEL)
+            while True:
+                if pubsub.get_message(timeout=5.0):
+                    self.invalidate()
+        except Exception as e:
+            logger.warning(f"Policy invalidation listener stopped: {e}")
+
+
+def _redis():
+    from core.redis_utils import get_redis_client
+    return get_redis_client()
+
+
+policy_store = PolicyStore()
+
+
+def bump_policy_version() -> int:
+    """Invalidate compiled policies in this and every other worker."""
+    return policy_store.bump()
@@ -6,9 +6,10 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.exceptions import PermissionDenied
 from django.utils import timezone
-from django.db.models import Q
+from django.db.models import Count, Q
 from users.audit_models import AuditLog
 from users.serializers import AuditLogSerializer
+from users.utils.audit_partitions import audit_logs_between
 from users.models import Role, UserRole
 
 
@@ -64,30 +65,27 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
                 Q(resource_id__icontains=entity)
             )
         
-        # Filter by date range (support 'range' parameter for common ranges)
+        # Filter by date range (support 'range' parameter for common ranges).
+        # Bounds go through audit_logs_between so PostgreSQL prunes to the matching monthly partitions.
         range_param = self.request.query_params.get('range')
         if range_param:
             from datetime import timedelta
             now = timezone.now()
-            if range_param == 'today':
-                start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                queryset = queryset.filter(timestamp__gte=start_date)
-            elif range_param == 'week':
-                start_date = now - timedelta(days=7)
-                queryset = queryset.filter(timestamp__gte=start_date)
-            elif range_param == 'month':
-                start_date = now - timedelta(days=30)
-                queryset = queryset.filter(timestamp__gte=start_date)
-            elif range_param == 'year':
-                start_date = now - timedelta(days=365)
-                queryset = queryset.filter(timestamp__gte=start_date)
+            range_starts = {
+                'today': now.replace(hour=0, minute=0, second=0, microsecond=0),
+                'week': now - timedelta(days=7),
+                'month': now - timedelta(days=30),
+                'year': now - timedelta(days=365),
+            }
+            if range_param in range_starts:
+                queryset = audit_logs_between(range_starts[range_param], queryset=queryset)
         
         # Also support explicit date range
         start_date = self.request.query_params.get('start_date')
         end_date = self.request.query_params.get('end_date')
         
         if start_date:
-            queryset = queryset.filter(timestamp__gte=start_date)
+            queryset = audit_logs_between(start_date, queryset=queryset)
         if end_date:
             queryset = queryset.filter(timestamp__lte=end_date)
         
@@ -125,10 +123,10 @@ class AuditLogViewSet(viewsets.ReadOnlyModelViewSet):
         failure = queryset.filter(result='failure').count()
         
         # Group by action
-        action_counts = {}
-        for log in queryset.values('action').distinct():
-            action = log['action']
-            action_counts[action] = queryset.filter(action=action).count()
+        action_counts = {
+            row['action']: row['count']
+            for row in queryset.order_by().values('action').annotate(count=Count('id'))
+        }
         
         return Response({
             'total': total,
@@ -49,6 +49,7 @@ from users.utils.auth_utils import (
     generate_totp_backup_codes,
 )
 from users.utils.risk_utils import calculate_risk_score, requires_mfa
+from users.utils.audit_buffer import write_audit_entry
 from users.utils.consent_utils import (
     get_user_consent_scopes,
     grant_consent,
@@ -140,16 +141,19 @@ def _assign_default_student_role(user):
 
 
 def _log_audit_event(user, action, resource_type, result='success', metadata=None):
-    """Log audit event."""
-    AuditLog.objects.create(
-        user=user,
-        actor_type='user',
-        actor_identifier=user.email if user else 'anonymous',
-        action=action,
-        resource_type=resource_type,
-        result=result,
-        metadata=metadata or {},
-        timestamp=timezone.now(),
+    """Log audit event (buffered; login failures are written immediately for risk scoring)."""
+    write_audit_entry(
+        AuditLog(
+            user=user,
+            actor_type='user',
+            actor_identifier=user.email if user else 'anonymous',
+            action=action,
+            resource_type=resource_type,
+            result=result,
+            metadata=metadata or {},
+            timestamp=timezone.now(),
+        ),
+        sync=(action == 'login' and result == 'failure'),
     )
 
 
@@ -1915,7 +1919,7 @@ def change_password(request):
     user.save()
 
     # Log the password change
-    AuditLog.objects.create(
+    write_audit_entry(AuditLog(
         user=user,
         actor_type='user',
         actor_identifier=user.email,
@@ -1926,7 +1930,7 @@ def change_password(request):
         user_agent=request.META.get('HTTP_USER_AGENT', ''),
         metadata={'timestamp': timezone.now().isoformat()},
         result='success'
-    )
+    ))
 
     return Response(
         {'detail': 'Password changed successfully'},
@@ -2063,7 +2067,7 @@ def setup_password(request):
         user.save()
 
         # Log the password setup
-        AuditLog.objects.create(
+        write_audit_entry(AuditLog(
             user=user,
             actor_type='user',
             actor_identifier=user.email,
@@ -2074,7 +2078,7 @@ def setup_password(request):
             user_agent=request.META.get('HTTP_USER_AGENT', ''),
             metadata={'timestamp': timezone.now().isoformat()},
             result='success'
-        )
+        ))
 
         return Response({
             'message': 'Password set successfully. You can now log in with your password.',
@@ -9,6 +9,7 @@ from django.utils import timezone
 from users.serializers import PasswordResetRequestSerializer, PasswordResetConfirmSerializer
 from users.utils.auth_utils import create_mfa_code
 from users.audit_models import AuditLog
+from users.utils.audit_buffer import write_audit_entry
 from users.auth_models import MFACode
 
 User = get_user_model()
@@ -47,7 +48,7 @@ class PasswordResetRequestView(APIView):
         reset_url = f"{frontend_url}/auth/reset-password?token={code}&email={email}"
         send_password_reset_email(user, reset_url)
         
-        AuditLog.objects.create(
+        write_audit_entry(AuditLog(
             user=user,
             actor_type='user',
             actor_identifier=user.email,
@@ -55,7 +56,7 @@ class PasswordResetRequestView(APIView):
             resource_type='user',
             result='success',
             timestamp=timezone.now(),
-        )
+        ))
         
         return Response(
             {'detail': 'Password reset link sent to your email'},
@@ -103,7 +104,7 @@ class PasswordResetConfirmView(APIView):
         mfa_code.used_at = timezone.now()
         mfa_code.save()
         
-        AuditLog.objects.create(
+        write_audit_entry(AuditLog(
             user=user,
             actor_type='user',
             actor_identifier=user.email,
@@ -111,7 +112,7 @@ class PasswordResetConfirmView(APIView):
             resource_type='user',
             result='success',
             timestamp=timezone.now(),
-        )
+        ))
         
         return Response(
             {'detail': 'Password reset successfully'},
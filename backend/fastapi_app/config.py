@@ -60,6 +60,25 @@ class Settings(BaseSettings):
     # Django API Communication
     DJANGO_API_URL: str = "http://localhost:8000"
     DJANGO_API_TIMEOUT: int = 30
+    DJANGO_API_CONNECT_TIMEOUT: float = 2.0
+    DJANGO_API_MAX_CONNECTIONS: int = 100
+    DJANGO_API_MAX_KEEPALIVE: int = 100
+    DJANGO_API_KEEPALIVE_EXPIRY: float = 30.0
+    DJANGO_API_CIRCUIT_FAILURES: int = 5
+    DJANGO_API_CIRCUIT_RESET: float = 30.0
+
+    # Per-user micro-cache of proxied GETs (utils/upstream.py); 0 disables it
+    DJANGO_PROXY_CACHE_TTL: float = 2.0
+    DJANGO_PROXY_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Redis (shared with Django for rate limiting; empty = in-process limits)
+    REDIS_URL: str = os.getenv('REDIS_URL', '')
+
+    # AI rate limits (requests per day per user). Buckets are sized by the user's plan
+    # (SubscriptionPlan.ai_coach_daily_limit); this applies to users without an active plan.
+    PROFILER_AI_DAILY_LIMIT: int = 3
+    # Seconds a user's plan, read from Django, is reused for rate limiting
+    PLAN_LIMIT_CACHE_TTL: float = 60.0
     
     # Embedding Model
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
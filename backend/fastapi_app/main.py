@@ -1,11 +1,31 @@
 """
 FastAPI application entry point for AI and vector processing services.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from routers.v1 import recommendations, embeddings, personality, missions, curriculum, coaching, dashboard, profiling
 from config import settings
+from utils.upstream import upstream
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Print configuration on startup for debugging; hold the Django API pool open while serving."""
+    print("="*50)
+    print("FastAPI JWT Configuration:")
+    print(f"JWT_SECRET_KEY length: {len(settings.JWT_SECRET_KEY)}")
+    print(f"JWT_SECRET_KEY starts with: {settings.JWT_SECRET_KEY[:20]}...")
+    print(f"JWT_ALGORITHM: {settings.JWT_ALGORITHM}")
+    print("="*50)
+    await upstream.start()
+    try:
+        yield
+    finally:
+        await upstream.close()
+
 
 app = FastAPI(
     title="Ongoza CyberHub AI API",
@@ -14,18 +34,9 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    lifespan=lifespan,
 )
 
-@app.on_event("startup")
-async def startup_event():
-    """Print configuration on startup for debugging."""
-    print("="*50)
-    print("FastAPI JWT Configuration:")
-    print(f"JWT_SECRET_KEY length: {len(settings.JWT_SECRET_KEY)}")
-    print(f"JWT_SECRET_KEY starts with: {settings.JWT_SECRET_KEY[:20]}...")
-    print(f"JWT_ALGORITHM: {settings.JWT_ALGORITHM}")
-    print("="*50)
-
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -1,13 +1,12 @@
 """
 FastAPI router for student coaching endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends
 from typing import Optional, List
 from pydantic import BaseModel
 from datetime import datetime, date
 from uuid import UUID
-import httpx
-from config import settings
+from utils.upstream import proxy_json
 
 router = APIRouter(prefix="/api/student/coaching", tags=["student-coaching"])
 
@@ -84,37 +83,13 @@ async def get_current_user_id() -> UUID:
 @router.get("/overview", response_model=CoachingOverviewResponse)
 async def get_coaching_overview(user_id: UUID = Depends(get_current_user_id)):
     """Get coaching overview: habits, streaks, active goals, today's reflection status."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/overview",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("GET", "/api/v1/student/coaching/overview", user_id=user_id)
 
 
 @router.post("/habits/core/ensure")
 async def ensure_core_habits(user_id: UUID = Depends(get_current_user_id)):
     """Create Learn/Practice/Reflect core habits if missing."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/habits/core/ensure",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("POST", "/api/v1/student/coaching/habits/core/ensure", user_id=user_id)
 
 
 @router.post("/habits/{habit_id}/log")
@@ -124,38 +99,17 @@ async def log_habit(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Log habit completion for a date."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/habits/{habit_id}/log",
-                json=request.dict(),
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "POST", f"/api/v1/student/coaching/habits/{habit_id}/log",
+        user_id=user_id,
+        json=request.dict(),
+    )
 
 
 @router.get("/goals", response_model=List[GoalResponse])
 async def list_goals(user_id: UUID = Depends(get_current_user_id)):
     """List user goals."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/goals",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("GET", "/api/v1/student/coaching/goals", user_id=user_id)
 
 
 @router.post("/goals", response_model=GoalResponse)
@@ -164,20 +118,7 @@ async def create_goal(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Create a new goal."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/goals",
-                json=request.dict(),
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("POST", "/api/v1/student/coaching/goals", user_id=user_id, json=request.dict())
 
 
 @router.patch("/goals/{goal_id}", response_model=GoalResponse)
@@ -187,20 +128,11 @@ async def update_goal(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Update a goal."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.patch(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/goals/{goal_id}",
-                json=request.dict(),
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "PATCH", f"/api/v1/student/coaching/goals/{goal_id}",
+        user_id=user_id,
+        json=request.dict(),
+    )
 
 
 @router.post("/reflections", response_model=ReflectionResponse)
@@ -209,54 +141,21 @@ async def create_reflection(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Create reflection and trigger AI analysis."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/reflections",
-                json=request.dict(),
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "POST", "/api/v1/student/coaching/reflections",
+        user_id=user_id,
+        json=request.dict(),
+    )
 
 
 @router.get("/reflections/recent", response_model=List[ReflectionResponse])
 async def get_recent_reflections(user_id: UUID = Depends(get_current_user_id)):
     """Get recent reflections."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/reflections/recent",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("GET", "/api/v1/student/coaching/reflections/recent", user_id=user_id)
 
 
 @router.post("/ai-coach", response_model=AICoachResponse)
 async def get_ai_coach_plan(user_id: UUID = Depends(get_current_user_id)):
     """Get AI coach weekly plan based on reflections, habits, and missions."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/coaching/ai-coach",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("POST", "/api/v1/student/coaching/ai-coach", user_id=user_id)
 
@@ -1,13 +1,14 @@
 """
 FastAPI router for student dashboard endpoints.
 """
+import asyncio
 from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Optional, List
-from pydantic import BaseModel
+from typing import Dict, Optional, List
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from datetime import datetime, date
 from uuid import UUID
 import httpx
-from config import settings
+from utils.upstream import CircuitOpenError, upstream
 
 router = APIRouter(prefix="/api/student/dashboard", tags=["student-dashboard"])
 
@@ -154,6 +155,18 @@ class HabitStatus(BaseModel):
     today_logged: bool
 
 
+class DashboardResponse(BaseModel):
+    overview: Optional[DashboardOverviewResponse] = None
+    metrics: Optional[DashboardMetricsResponse] = None
+    next_actions: Optional[List[ActionItem]] = None
+    events: Optional[List[EventItem]] = None
+    track_overview: Optional[TrackOverview] = None
+    community_feed: Optional[List[CommunityActivity]] = None
+    leaderboard: Optional[List[LeaderboardEntry]] = None
+    habits: Optional[List[HabitStatus]] = None
+    errors: Dict[str, str] = {}  # panel -> error, for panels left empty
+
+
 class AICoachNudge(BaseModel):
     id: str
     message: str
@@ -163,33 +176,73 @@ class AICoachNudge(BaseModel):
     dismissible: bool
 
 
-@router.get("/overview", response_model=DashboardOverviewResponse)
-async def get_dashboard_overview(user_id: UUID = Depends(get_current_user_id)):
-    """
-    Get dashboard overview: readiness, cohort progress, subscription, quick stats.
-    """
+DASHBOARD_PANELS = (
+    "overview", "metrics", "next-actions", "events", "track-overview", "community-feed", "leaderboard", "habits",
+)
+
+# Each panel is validated on its own, so one malformed panel is reported in `errors`
+# instead of failing the whole DashboardResponse
+PANEL_ADAPTERS = {
+    "overview": TypeAdapter(DashboardOverviewResponse),
+    "metrics": TypeAdapter(DashboardMetricsResponse),
+    "next-actions": TypeAdapter(List[ActionItem]),
+    "events": TypeAdapter(List[EventItem]),
+    "track-overview": TypeAdapter(TrackOverview),
+    "community-feed": TypeAdapter(List[CommunityActivity]),
+    "leaderboard": TypeAdapter(List[LeaderboardEntry]),
+    "habits": TypeAdapter(List[HabitStatus]),
+}
+
+
+async def _proxy(method: str, panel: str, user_id: UUID):
+    """Proxy one dashboard endpoint; upstream errors keep their status, an unreachable Django is 503."""
     try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/overview"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
+        result = await upstream.request(
+            method, f"/api/v1/student/dashboard/{panel}", user_id=user_id, timeout=10.0,
+        )
+    except (httpx.RequestError, CircuitOpenError) as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Django service unavailable: {str(e)}"
         )
+    if result.status_code != 200:
+        raise HTTPException(status_code=result.status_code, detail=result.text)
+    return result.data
+
+
+@router.get("", response_model=DashboardResponse)
+async def get_dashboard(user_id: UUID = Depends(get_current_user_id)):
+    """
+    Get every dashboard panel in one call.
+
+    Panels are fetched concurrently over the shared upstream pool and share the
+    per-user micro-cache with the single-panel endpoints. A panel that fails upstream
+    or does not match its schema is left empty and reported in `errors` instead of
+    failing the page.
+    """
+    results = await asyncio.gather(
+        *(_proxy("GET", panel, user_id) for panel in DASHBOARD_PANELS), return_exceptions=True,
+    )
+    dashboard = {"errors": {}}
+    for panel, result in zip(DASHBOARD_PANELS, results):
+        if isinstance(result, HTTPException):
+            dashboard["errors"][panel] = str(result.detail)
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            try:
+                dashboard[panel.replace("-", "_")] = PANEL_ADAPTERS[panel].validate_python(result)
+            except ValidationError as e:
+                dashboard["errors"][panel] = f"Malformed {panel} panel: {e.error_count()} invalid fields"
+    return dashboard
+
+
+@router.get("/overview", response_model=DashboardOverviewResponse)
+async def get_dashboard_overview(user_id: UUID = Depends(get_current_user_id)):
+    """
+    Get dashboard overview: readiness, cohort progress, subscription, quick stats.
+    """
+    return await _proxy("GET", "overview", user_id)
 
 
 @router.get("/metrics", response_model=DashboardMetricsResponse)
@@ -197,28 +250,7 @@ async def get_dashboard_metrics(user_id: UUID = Depends(get_current_user_id)):
     """
     Get dashboard metrics: learning %, portfolio, mentorship, gamification.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/metrics"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("GET", "metrics", user_id)
 
 
 @router.get("/next-actions", response_model=List[ActionItem])
@@ -226,28 +258,7 @@ async def get_next_actions(user_id: UUID = Depends(get_current_user_id)):
     """
     Get prioritized next actions for the student.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/next-actions"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("GET", "next-actions", user_id)
 
 
 @router.get("/events", response_model=List[EventItem])
@@ -255,28 +266,7 @@ async def get_dashboard_events(user_id: UUID = Depends(get_current_user_id)):
     """
     Get upcoming events timeline with RSVP status.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/events"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("GET", "events", user_id)
 
 
 @router.get("/track-overview", response_model=TrackOverview)
@@ -284,28 +274,7 @@ async def get_track_overview(user_id: UUID = Depends(get_current_user_id)):
     """
     Get track progress with milestone completion.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/track-overview"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("GET", "track-overview", user_id)
 
 
 @router.get("/community-feed", response_model=List[CommunityActivity])
@@ -313,28 +282,7 @@ async def get_community_feed(user_id: UUID = Depends(get_current_user_id)):
     """
     Get latest community activities.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/community-feed"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("GET", "community-feed", user_id)
 
 
 @router.get("/leaderboard", response_model=List[LeaderboardEntry])
@@ -342,28 +290,7 @@ async def get_leaderboard(user_id: UUID = Depends(get_current_user_id)):
     """
     Get cohort top performers.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/leaderboard"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("GET", "leaderboard", user_id)
 
 
 @router.get("/habits", response_model=List[HabitStatus])
@@ -371,28 +298,7 @@ async def get_dashboard_habits(user_id: UUID = Depends(get_current_user_id)):
     """
     Get daily habit tracking status.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/habits"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("GET", "habits", user_id)
 
 
 @router.post("/ai-coach-nudge", response_model=AICoachNudge)
@@ -400,26 +306,5 @@ async def get_ai_coach_nudge(user_id: UUID = Depends(get_current_user_id)):
     """
     Get personalized AI recommendations.
     """
-    try:
-        django_url = f"{settings.DJANGO_API_URL}/api/v1/student/dashboard/ai-coach-nudge"
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                django_url,
-                headers={"X-User-ID": user_id},
-                timeout=10.0
-            )
-            
-            if response.status_code == 200:
-                return response.json()
-            else:
-                raise HTTPException(
-                    status_code=response.status_code,
-                    detail=response.text
-                )
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Django service unavailable: {str(e)}"
-        )
+    return await _proxy("POST", "ai-coach-nudge", user_id)
 
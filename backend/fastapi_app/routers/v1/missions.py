@@ -1,13 +1,12 @@
 """
 FastAPI router for student missions endpoints.
 """
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Query
 from typing import Optional, List
 from pydantic import BaseModel, Field
 from datetime import datetime
 from uuid import UUID
-import httpx
-from config import settings
+from utils.upstream import proxy_json
 
 router = APIRouter(prefix="/api/student/missions", tags=["student-missions"])
 
@@ -95,19 +94,7 @@ async def get_current_user_id() -> UUID:
 @router.get("/funnel", response_model=MissionFunnelResponse)
 async def get_mission_funnel(user_id: UUID = Depends(get_current_user_id)):
     """Get mission funnel with aggregated counts and priority missions."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{settings.DJANGO_API_URL}/api/v1/student/missions/funnel",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("GET", "/api/v1/student/missions/funnel", user_id=user_id)
 
 
 @router.get("", response_model=List[MissionResponse])
@@ -118,28 +105,14 @@ async def list_missions(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """List missions with optional filters."""
-    async with httpx.AsyncClient() as client:
-        try:
-            params = {}
-            if status:
-                params["status"] = status
-            if difficulty:
-                params["difficulty"] = difficulty
-            if track_key:
-                params["track_key"] = track_key
-            
-            response = await client.get(
-                f"{settings.DJANGO_API_URL}/api/v1/student/missions",
-                params=params,
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    params = {}
+    if status:
+        params["status"] = status
+    if difficulty:
+        params["difficulty"] = difficulty
+    if track_key:
+        params["track_key"] = track_key
+    return await proxy_json("GET", "/api/v1/student/missions", user_id=user_id, params=params)
 
 
 @router.get("/{mission_id}", response_model=MissionResponse)
@@ -148,19 +121,7 @@ async def get_mission_detail(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Get mission detail with submission, artifacts, and AI feedback."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(
-                f"{settings.DJANGO_API_URL}/api/v1/student/missions/{mission_id}",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json("GET", f"/api/v1/student/missions/{mission_id}", user_id=user_id)
 
 
 @router.post("/{mission_id}/submission", response_model=MissionSubmissionResponse)
@@ -170,20 +131,11 @@ async def create_or_resume_submission(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Create or resume a mission submission."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/missions/{mission_id}/submission",
-                json=request.dict(),
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "POST", f"/api/v1/student/missions/{mission_id}/submission",
+        user_id=user_id,
+        json=request.dict(),
+    )
 
 
 @router.patch("/submissions/{submission_id}", response_model=MissionSubmissionResponse)
@@ -193,20 +145,11 @@ async def update_submission(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Update submission notes or status."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.patch(
-                f"{settings.DJANGO_API_URL}/api/v1/student/submissions/{submission_id}",
-                json=request.dict(),
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "PATCH", f"/api/v1/student/submissions/{submission_id}",
+        user_id=user_id,
+        json=request.dict(),
+    )
 
 
 @router.post("/submissions/{submission_id}/artifacts", response_model=List[MissionArtifactResponse])
@@ -216,20 +159,11 @@ async def create_artifact(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Add artifact to submission."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/submissions/{submission_id}/artifacts",
-                json=request.dict(),
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "POST", f"/api/v1/student/submissions/{submission_id}/artifacts",
+        user_id=user_id,
+        json=request.dict(),
+    )
 
 
 @router.post("/submissions/{submission_id}/submit-ai", response_model=MissionSubmissionResponse)
@@ -238,19 +172,10 @@ async def submit_for_ai_review(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Submit mission for AI review."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/missions/submissions/{submission_id}/submit-ai",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "POST", f"/api/v1/student/missions/submissions/{submission_id}/submit-ai",
+        user_id=user_id,
+    )
 
 
 @router.post("/submissions/{submission_id}/submit-mentor", response_model=MissionSubmissionResponse)
@@ -259,17 +184,8 @@ async def submit_for_mentor_review(
     user_id: UUID = Depends(get_current_user_id)
 ):
     """Submit mission for mentor review (tier 7 only)."""
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(
-                f"{settings.DJANGO_API_URL}/api/v1/student/missions/submissions/{submission_id}/submit-mentor",
-                headers={"X-User-ID": str(user_id)}
-            )
-            response.raise_for_status()
-            return response.json()
-        except httpx.HTTPError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Django API error: {str(e)}"
-            )
+    return await proxy_json(
+        "POST", f"/api/v1/student/missions/submissions/{submission_id}/submit-mentor",
+        user_id=user_id,
+    )
 
@@ -15,6 +15,8 @@ from schemas.profiling import (
 from schemas.profiling_tracks import OCH_TRACKS
 from services.profiling_service_enhanced import enhanced_profiling_service
 from utils.auth import verify_token
+from utils.rate_limit import RateLimitDecision, rate_limit
+from config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -658,7 +660,8 @@ async def verify_difficulty_selection(
 @router.post("/enhanced/session/{session_id}/complete", response_model=ProfilingResult)
 async def complete_enhanced_profiling_session(
     session_id: str,
-    user_id: int = Depends(get_current_user_id)
+    user_id: int = Depends(get_current_user_id),
+    _rate_limit: RateLimitDecision = Depends(rate_limit("ai_profiler", settings.PROFILER_AI_DAILY_LIMIT))
 ):
     """
     Complete an enhanced profiling session and generate comprehensive results.
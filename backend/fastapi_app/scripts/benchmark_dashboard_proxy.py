@@ -0,0 +1,262 @@
+"""
+Benchmark the Django API proxy layer (utils/upstream.py) against a local stub upstream.
+
+A stub Django process serves the eight student dashboard panels on 127.0.0.1 after
+`--latency` ms, counting requests and TCP connections. `--users` concurrent users
+each load the dashboard `--loads` times, `--think` ms apart, in three ways:
+
+  1. legacy: eight concurrent panel requests per page, each opening its own
+     httpx.AsyncClient, as the routers did before the shared pool;
+  2. pooled: the same eight panel requests through the dashboard router on the
+     shared keep-alive pool, with the micro-cache off;
+  3. composite: one GET /api/student/dashboard per page, panels fetched
+     concurrently upstream, plus `--widgets` panels requested on their own at the
+     same time (coalesced with the composite's calls), micro-cache off;
+  4. as 3 with the micro-cache on, so reloads within `--cache-ttl` stay local.
+
+The FastAPI side runs in-process over httpx.ASGITransport, so the numbers are the
+proxy's own cost plus the upstream round trips.
+
+    cd backend/fastapi_app && python scripts/benchmark_dashboard_proxy.py --users 20 --loads 4
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from fastapi import FastAPI, Request  # noqa: E402
+
+from routers.v1 import dashboard  # noqa: E402
+from utils.upstream import upstream  # noqa: E402
+
+PANEL_PAYLOADS = {
+    "overview": {
+        "readiness": {"score": 72, "trend": 4.5, "trend_direction": "up", "countdown_days": 30,
+                      "countdown_label": "to cohort end"},
+        "cohort_progress": {"percentage": 41.0, "current_module": "Network Defense", "total_modules": 12,
+                            "completed_modules": 5, "estimated_time_remaining": 40},
+        "subscription": {"tier": "professional"},
+        "quick_stats": {"points": 1200, "streak": 6, "badges": 4, "mentor_rating": 4.8},
+    },
+    "metrics": {
+        "learning_percentage": 41.0,
+        "portfolio": {"total": 6, "approved": 3, "pending": 2, "rejected": 1, "percentage": 50.0},
+        "mentorship": {"next_session_date": "2026-11-02", "next_session_time": "14:00", "mentor_name": "Mentor",
+                       "session_type": "1:1", "status": "scheduled"},
+        "gamification": {"points": 1200, "streak": 6, "badges": 4, "rank": "12", "level": "3"},
+    },
+    "next-actions": [
+        {"id": str(i), "title": f"Action {i}", "type": "mission", "urgency": "high", "action_url": "/missions"}
+        for i in range(5)
+    ],
+    "events": [
+        {"id": str(i), "title": f"Event {i}", "date": "2026-11-02", "type": "workshop", "urgency": "normal",
+         "rsvp_required": False}
+        for i in range(5)
+    ],
+    "track-overview": {
+        "track_name": "Defender", "track_key": "defender", "completed_milestones": 2, "total_milestones": 4,
+        "milestones": [
+            {"id": str(i), "code": f"M{i}", "title": f"Milestone {i}", "progress": 50.0, "status": "in_progress"}
+            for i in range(4)
+        ],
+    },
+    "community-feed": [
+        {"id": str(i), "user": "peer", "action": "posted", "timestamp": "2026-10-19T10:00:00Z", "likes": 3,
+         "type": "post"}
+        for i in range(10)
+    ],
+    "leaderboard": [
+        {"rank": i + 1, "user_id": str(i), "user_name": f"User {i}", "points": 1000 - i, "is_current_user": False}
+        for i in range(10)
+    ],
+    "habits": [
+        {"id": str(i), "name": f"Habit {i}", "category": "learn", "completed": False, "streak": 2,
+         "today_logged": False}
+        for i in range(3)
+    ],
+}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def _serve_stub(port: int, latency: float) -> None:
+    """Stub Django process: the dashboard panels plus request/connection counters."""
+    stub = FastAPI()
+    counters = {"requests": 0, "connections": set()}
+
+    @stub.get("/api/v1/student/dashboard/{panel}")
+    async def panel(panel: str, request: Request):
+        counters["requests"] += 1
+        counters["connections"].add(tuple(request.client))
+        await asyncio.sleep(latency)
+        return PANEL_PAYLOADS[panel]
+
+    @stub.post("/_stats")
+    async def stats():
+        counts = {"requests": counters["requests"], "connections": len(counters["connections"])}
+        counters.update(requests=0, connections=set())
+        return counts
+
+    uvicorn.run(stub, host="127.0.0.1", port=port, log_level="error", access_log=False, timeout_keep_alive=60)
+
+
+class StubUpstream:
+    """Runs the stub in its own process so it does not share the GIL with the proxy under test."""
+
+    def __init__(self, latency: float):
+        with socket.socket() as probe:
+            probe.bind(("127.0.0.1", 0))
+            self.port = probe.getsockname()[1]
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process = multiprocessing.Process(target=_serve_stub, args=(self.port, latency), daemon=True)
+
+    def start(self) -> None:
+        self.process.start()
+        for _ in range(500):
+            try:
+                httpx.post(f"{self.url}/_stats")
+                return
+            except httpx.TransportError:
+                time.sleep(0.02)
+        raise RuntimeError("stub upstream did not start")
+
+    def stop(self) -> None:
+        self.process.terminate()
+        self.process.join()
+
+    async def collect(self) -> dict:
+        """Requests and distinct connections since the previous call."""
+        async with httpx.AsyncClient() as client:
+            return (await client.post(f"{self.url}/_stats")).json()
+
+
+async def _legacy_page(base_url, user_id):
+    async def fetch(panel):
+        async with httpx.AsyncClient() as client:
+            response = await client.get(
+                f"{base_url}/api/v1/student/dashboard/{panel}", headers={"X-User-ID": user_id}, timeout=10.0,
+            )
+            response.raise_for_status()
+            return response.json()
+    await asyncio.gather(*(fetch(panel) for panel in dashboard.DASHBOARD_PANELS))
+
+
+async def _panel_page(bff, user_id, widgets=()):
+    responses = await asyncio.gather(*(
+        bff.get(f"/api/student/dashboard/{panel}", headers={"X-User-ID": user_id})
+        for panel in dashboard.DASHBOARD_PANELS
+    ))
+    for response in responses:
+        response.raise_for_status()
+
+
+async def _composite_page(bff, user_id, widgets=()):
+    # Widgets that fetch their own panel alongside the page, as the header and sidebar do
+    headers = {"X-User-ID": user_id}
+    response, *widget_responses = await asyncio.gather(
+        bff.get("/api/student/dashboard", headers=headers),
+        *(bff.get(f"/api/student/dashboard/{panel}", headers=headers) for panel in widgets),
+    )
+    for r in [response, *widget_responses]:
+        r.raise_for_status()
+    if response.json()["errors"]:
+        raise RuntimeError(response.json()["errors"])
+
+
+async def _run(name, load_page, stub, options):
+    latencies, errors = [], []
+
+    async def user_session():
+        user_id = str(uuid.uuid4())
+        for _ in range(options.loads):
+            started = time.perf_counter()
+            try:
+                await load_page(user_id)
+            except Exception as e:
+                errors.append(e)
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(options.think / 1000.0)
+
+    await stub.collect()
+    started = time.perf_counter()
+    await asyncio.gather(*(user_session() for _ in range(options.users)))
+    elapsed = time.perf_counter() - started
+    counts = await stub.collect()
+    pages = max(len(latencies), 1)
+    print(f"\n{name} ({options.users} users x {options.loads} page loads)")
+    print(f"  wall time {elapsed:7.2f} s   {pages / elapsed:8.1f} pages/s")
+    print(
+        f"  page latency p50 {_percentile(latencies, 50):7.1f} ms   p95 {_percentile(latencies, 95):7.1f} ms   "
+        f"p99 {_percentile(latencies, 99):7.1f} ms"
+    )
+    print(
+        f"  upstream: {counts['requests']} requests ({counts['requests'] / pages:.2f} per page), "
+        f"{counts['connections']} TCP connections"
+    )
+    if errors:
+        print(f"  {len(errors)} failed page loads, e.g. {errors[0]!r}")
+    return _percentile(latencies, 50)
+
+
+async def main(options):
+    stub = StubUpstream(options.latency / 1000.0)
+    stub.start()
+    app = FastAPI()
+    app.include_router(dashboard.router)
+
+    # The routers use a placeholder user id, so every user would share one cache and
+    # flight key; key the upstream by the benchmark's header instead.
+    async def user_from_header(request: Request):
+        return uuid.UUID(request.headers["X-User-ID"])
+    app.dependency_overrides[dashboard.get_current_user_id] = user_from_header
+
+    widgets = dashboard.DASHBOARD_PANELS[:options.widgets]
+    results = {}
+    try:
+        results["legacy"] = await _run(
+            "1. legacy: eight panel requests, client per request", lambda u: _legacy_page(stub.url, u), stub, options,
+        )
+
+        upstream.base_url = stub.url
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bff") as bff:
+            scenarios = (
+                ("pooled", "2. pooled: eight panel requests, shared pool", _panel_page, 0),
+                ("composite", f"3. composite + {len(widgets)} widget panels, single-flight", _composite_page, 0),
+                ("cached", f"4. as 3, with the {options.cache_ttl:g}s micro-cache", _composite_page, options.cache_ttl),
+            )
+            for key, name, page, cache_ttl in scenarios:
+                upstream.cache_ttl = cache_ttl
+                upstream.stats = dict.fromkeys(upstream.stats, 0)
+                await upstream.start()
+                results[key] = await _run(name, lambda u, page=page: page(bff, u, widgets), stub, options)
+                print(f"  proxy outcomes: {upstream.stats}")
+                await upstream.close()
+    finally:
+        stub.stop()
+
+    legacy = results.pop("legacy")
+    print("\np50 speedup vs legacy: " + ", ".join(f"{key} {legacy / p50:.1f}x" for key, p50 in results.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20, help="Concurrent users")
+    parser.add_argument("--loads", type=int, default=4, help="Dashboard loads per user")
+    parser.add_argument("--latency", type=float, default=20.0, help="Stub upstream latency per request (ms)")
+    parser.add_argument("--think", type=float, default=500.0, help="Pause between a user's page loads (ms)")
+    parser.add_argument("--cache-ttl", type=float, default=2.0, help="Micro-cache TTL for run 4 (s)")
+    parser.add_argument("--widgets", type=int, default=2, help="Panels also fetched on their own with the composite")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,30 @@
+"""
+Shared fixtures for the FastAPI service tests.
+
+Run from backend/fastapi_app: python -m pytest tests
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import upstream as upstream_module  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for the `time` module in utils.upstream so TTLs and timeouts advance on demand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(upstream_module, "time", fake)
+    return fake
@@ -0,0 +1,104 @@
+"""
+Tests for the composite student dashboard endpoint (routers/v1/dashboard.py).
+
+Covers:
+- every panel is returned when the upstream answers them all
+- a panel that fails upstream, or whose payload does not match its schema, is left
+  empty and reported in `errors` while the other panels are still served
+"""
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routers.v1 import dashboard
+from utils.upstream import CircuitBreaker, build_upstream
+
+PANELS = {
+    "overview": {
+        "readiness": {"score": 72, "trend": 4.5, "trend_direction": "up", "countdown_days": 30,
+                      "countdown_label": "to cohort end"},
+        "cohort_progress": {"percentage": 41.0, "current_module": "Network Defense", "total_modules": 12,
+                            "completed_modules": 5, "estimated_time_remaining": 40},
+        "subscription": {"tier": "professional"},
+        "quick_stats": {"points": 1200, "streak": 6, "badges": 4, "mentor_rating": 4.8},
+    },
+    "metrics": {
+        "learning_percentage": 41.0,
+        "portfolio": {"total": 6, "approved": 3, "pending": 2, "rejected": 1, "percentage": 50.0},
+        "mentorship": {"next_session_date": "2026-11-02", "next_session_time": "14:00", "mentor_name": "Mentor",
+                       "session_type": "1:1", "status": "scheduled"},
+        "gamification": {"points": 1200, "streak": 6, "badges": 4, "rank": "12", "level": "3"},
+    },
+    "next-actions": [
+        {"id": "1", "title": "Submit mission", "type": "mission", "urgency": "high", "action_url": "/missions"},
+    ],
+    "events": [
+        {"id": "1", "title": "Workshop", "date": "2026-11-02", "type": "workshop", "urgency": "normal",
+         "rsvp_required": False},
+    ],
+    "track-overview": {
+        "track_name": "Defender", "track_key": "defender", "completed_milestones": 1, "total_milestones": 1,
+        "milestones": [{"id": "1", "code": "M1", "title": "Milestone", "progress": 100.0, "status": "completed"}],
+    },
+    "community-feed": [
+        {"id": "1", "user": "peer", "action": "posted", "timestamp": "2026-10-19T10:00:00Z", "likes": 3,
+         "type": "post"},
+    ],
+    "leaderboard": [
+        {"rank": 1, "user_id": "1", "user_name": "Ada", "points": 1000, "is_current_user": True},
+    ],
+    "habits": [
+        {"id": "1", "name": "Read", "category": "learn", "completed": False, "streak": 2, "today_logged": False},
+    ],
+}
+
+
+@pytest.fixture
+def responses():
+    """Panel -> (status, body) served by the fake Django API; tests overwrite entries."""
+    return {panel: (200, body) for panel, body in PANELS.items()}
+
+
+@pytest.fixture
+def client(monkeypatch, responses):
+    def handler(request):
+        code, body = responses[request.url.path.rsplit("/", 1)[-1]]
+        return httpx.Response(code, json=body)
+
+    upstream = build_upstream(
+        transport=httpx.MockTransport(handler),
+        breaker=CircuitBreaker(failure_threshold=100, reset_timeout=30.0),
+        cache_ttl=0,
+    )
+    monkeypatch.setattr(dashboard, "upstream", upstream)
+    app = FastAPI()
+    app.include_router(dashboard.router)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_all_panels_in_one_response(client):
+    response = client.get("/api/student/dashboard")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["errors"] == {}
+    assert data["overview"]["readiness"]["score"] == 72
+    assert [habit["name"] for habit in data["habits"]] == ["Read"]
+
+
+def test_failed_and_malformed_panels_are_reported(client, responses):
+    responses["events"] = (500, {"detail": "boom"})
+    responses["leaderboard"] = (200, [{"rank": "first"}])
+    responses["overview"] = (200, {"readiness": None})
+
+    response = client.get("/api/student/dashboard")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert set(data["errors"]) == {"events", "leaderboard", "overview"}
+    assert data["errors"]["leaderboard"].startswith("Malformed leaderboard panel")
+    assert (data["events"], data["leaderboard"], data["overview"]) == (None, None, None)
+    assert data["metrics"]["portfolio"]["approved"] == 3
+    assert data["track_overview"]["track_name"] == "Defender"
@@ -0,0 +1,88 @@
+"""
+Tests for the FastAPI token-bucket limiter (utils/rate_limit.py).
+
+Covers:
+- buckets are keyed by user, plan tier and feature and sized by the plan's daily AI limit
+- users without an active plan, or whose plan cannot be read, get the default limit
+- an unlimited plan is not limited
+"""
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from utils import rate_limit as rate_limit_module
+from utils.auth import verify_token
+from utils.rate_limit import RateLimiter, bucket_key, rate_limit
+from utils.upstream import CircuitBreaker, build_upstream
+
+STARTER = {"status": "active", "tier": "starter", "plan_tier": "starter", "ai_coach_daily_limit": 2}
+
+
+@pytest.fixture
+def plan():
+    """(status, body) served by the fake subscription status endpoint; tests overwrite it."""
+    return {"response": (200, STARTER)}
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter("")
+    monkeypatch.setattr(rate_limit_module, "rate_limiter", limiter)
+    return limiter
+
+
+@pytest.fixture
+def client(monkeypatch, plan, limiter):
+    def handler(request):
+        code, body = plan["response"]
+        return httpx.Response(code, json=body)
+
+    upstream = build_upstream(
+        transport=httpx.MockTransport(handler),
+        breaker=CircuitBreaker(failure_threshold=100, reset_timeout=30.0),
+        cache_ttl=0,
+    )
+    monkeypatch.setattr(rate_limit_module, "upstream", upstream)
+    app = FastAPI()
+
+    @app.post("/limited")
+    async def limited(_=Depends(rate_limit("ai_test", 1))):
+        return {"ok": True}
+
+    app.dependency_overrides[verify_token] = lambda: 7
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def test_bucket_sized_and_keyed_by_plan(client, limiter):
+    first = client.post("/limited")
+    assert (first.status_code, first.headers["X-RateLimit-Limit"]) == (200, "2")
+    assert client.post("/limited").status_code == 200
+
+    denied = client.post("/limited")
+    assert denied.status_code == 429
+    assert int(denied.headers["Retry-After"]) > 0
+    assert set(limiter._buckets) == {bucket_key("ai_test", 7, "starter")}
+
+
+@pytest.mark.parametrize("response", [
+    (200, {"tier": "free", "status": "active", "ai_coach_daily_limit": 0}),  # no subscription
+    (200, {**STARTER, "status": "canceled"}),
+    (503, {"detail": "down"}),
+])
+def test_default_limit_without_active_plan(client, plan, limiter, response):
+    plan["response"] = response
+
+    assert client.post("/limited").headers["X-RateLimit-Limit"] == "1"
+    assert client.post("/limited").status_code == 429
+    assert set(limiter._buckets) == {bucket_key("ai_test", 7, "free")}
+
+
+def test_unlimited_plan(client, plan, limiter):
+    plan["response"] = (200, {**STARTER, "plan_tier": "premium", "ai_coach_daily_limit": None})
+
+    responses = [client.post("/limited") for _ in range(5)]
+
+    assert all(r.status_code == 200 and "X-RateLimit-Limit" not in r.headers for r in responses)
+    assert limiter._buckets == {}
@@ -0,0 +1,184 @@
+"""
+Tests for the pooled Django API client (utils/upstream.py).
+
+Covers:
+- the circuit breaker opens after consecutive failures, lets one trial call through
+  once half open, and closes or re-opens on its outcome
+- micro-cache entries expire after their TTL and writes drop the user's entries
+- identical concurrent GETs from one user share a single upstream call
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from utils.upstream import CircuitBreaker, CircuitOpenError, MicroCache, UpstreamResponse, build_upstream
+
+KEY = ("/api/v1/student/dashboard/overview", ())
+
+
+def _upstream(handler, **overrides):
+    options = dict(
+        transport=httpx.MockTransport(handler),
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout=30.0),
+        cache_ttl=0,
+    )
+    options.update(overrides)
+    return build_upstream(**options)
+
+
+def _run(upstream, scenario):
+    async def main():
+        try:
+            return await scenario()
+        finally:
+            await upstream.close()
+    return asyncio.run(main())
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, clock):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30.0)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == "closed"
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_half_open_lets_one_trial_through(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        breaker.record_failure()
+        clock.now += 30
+
+        assert breaker.state == "half_open"
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == "closed"
+
+    def test_failed_trial_reopens(self, clock):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+        breaker.record_failure()
+        clock.now += 30
+        breaker.before_call()
+
+        breaker.record_failure()
+
+        assert breaker.state == "open"
+        clock.now += 29
+        assert breaker.state == "open"
+
+    def test_server_errors_open_the_circuit(self, clock):
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, json={"detail": "down"})
+        upstream = _upstream(handler)
+
+        async def scenario():
+            for _ in range(2):
+                assert (await upstream.get("/x")).status_code == 503
+            with pytest.raises(CircuitOpenError):
+                await upstream.get("/x")
+            clock.now += 30
+            return await upstream.get("/x")
+
+        assert _run(upstream, scenario).status_code == 503
+        assert len(calls) == 3
+        assert upstream.stats["circuit_open"] == 1
+
+
+class TestMicroCache:
+    def test_entries_expire_after_ttl(self, clock):
+        cache = MicroCache(max_entries=10)
+        response = UpstreamResponse(200, "{}", {})
+        cache.set("ada", KEY, response, ttl=2.0, generation=0)
+
+        clock.now += 1
+        assert cache.get("ada", KEY) is response
+        clock.now += 1
+        assert cache.get("ada", KEY) is None
+
+    def test_response_from_before_a_write_is_not_cached(self, clock):
+        cache = MicroCache(max_entries=10)
+        generation = cache.generation("ada")
+        cache.invalidate_user("ada")
+
+        cache.set("ada", KEY, UpstreamResponse(200, "{}", {}), ttl=2.0, generation=generation)
+
+        assert cache.get("ada", KEY) is None
+
+    def test_gets_are_cached_until_the_user_writes(self, clock):
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            return httpx.Response(200, json={"n": len(calls)})
+        upstream = _upstream(handler, cache_ttl=2.0)
+
+        async def scenario():
+            first = await upstream.get("/x", user_id="ada")
+            cached = await upstream.get("/x", user_id="ada")
+            other_user = await upstream.get("/x", user_id="bob")
+            await upstream.post("/x", user_id="ada", json={})
+            after_write = await upstream.get("/x", user_id="ada")
+            clock.now += 2.0
+            expired = await upstream.get("/x", user_id="bob")
+            return [r.data["n"] for r in (first, cached, other_user, after_write, expired)]
+
+        assert _run(upstream, scenario) == [1, 1, 2, 4, 5]
+        assert calls == ["GET", "GET", "POST", "GET", "GET"]
+        assert upstream.stats["cache_hit"] == 1
+
+
+class TestSingleFlight:
+    def test_identical_gets_share_one_call(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request.headers["X-User-ID"])
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"ok": True})
+        upstream = _upstream(handler)
+
+        async def scenario():
+            return await asyncio.gather(
+                *(upstream.get("/x", user_id="ada") for _ in range(5)),
+                upstream.get("/x", user_id="bob"),
+            )
+
+        results = _run(upstream, scenario)
+
+        assert all(result.data == {"ok": True} for result in results)
+        assert sorted(calls) == ["ada", "bob"]
+        assert upstream.stats["coalesced"] == 4
+
+    def test_failure_is_shared_and_not_remembered(self):
+        calls = []
+
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.01)
+            if len(calls) == 1:
+                raise httpx.ConnectError("refused", request=request)
+            return httpx.Response(200, json={"ok": True})
+        upstream = _upstream(handler)
+
+        async def scenario():
+            failed = await asyncio.gather(*(upstream.get("/x", user_id="ada") for _ in range(3)),
+                                          return_exceptions=True)
+            return failed, await upstream.get("/x", user_id="ada")
+
+        failed, retried = _run(upstream, scenario)
+
+        assert all(isinstance(result, httpx.ConnectError) for result in failed)
+        assert retried.data == {"ok": True}
+        assert len(calls) == 2
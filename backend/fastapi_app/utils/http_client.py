@@ -1,14 +1,15 @@
 """
 HTTP client utilities for communicating with Django API.
 """
-import httpx
 from typing import Optional, Dict, Any
 from config import settings
+from utils.upstream import upstream
 
 
 class DjangoAPIClient:
     """
-    Client for making requests to Django API.
+    Client for making requests to Django API, over the shared connection pool
+    (utils/upstream.py).
     """
     
     def __init__(self):
@@ -25,15 +26,14 @@ class DjangoAPIClient:
         Make GET request to Django API.
         """
         url = f"{self.base_url}{endpoint}"
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                params=params,
-                headers=headers,
-                timeout=self.timeout,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.client.get(
+            url,
+            params=params,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
     
     async def post(
         self,
@@ -45,14 +45,13 @@ class DjangoAPIClient:
         Make POST request to Django API.
         """
         url = f"{self.base_url}{endpoint}"
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                json=data,
-                headers=headers,
-                timeout=self.timeout,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await upstream.client.post(
+            url,
+            json=data,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
 
 
@@ -36,6 +36,12 @@ embedding_requests_total = Counter(
     ['model']
 )
 
+django_proxy_requests_total = Counter(
+    'fastapi_django_proxy_requests_total',
+    'Django API proxy requests by outcome (upstream, cache_hit, coalesced, circuit_open)',
+    ['outcome']
+)
+
 
 async def metrics_endpoint():
     """Prometheus metrics endpoint."""
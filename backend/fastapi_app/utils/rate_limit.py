@@ -0,0 +1,159 @@
+"""
+Token-bucket rate limiting for FastAPI endpoints.
+
+Loads the same Lua script as the Django limiter (backend/shared/token_bucket.lua) and
+uses its key layout (ratelimit:<feature>:<tier>:<user_id>), so a feature limited in
+both services draws from one bucket when REDIS_URL points at Django's Redis. Without
+Redis, or if it is unreachable, buckets are kept in-process.
+
+Buckets are sized by the caller's plan: the tier and SubscriptionPlan.ai_coach_daily_limit
+come from Django's subscription status endpoint (through the upstream micro-cache for
+PLAN_LIMIT_CACHE_TTL seconds). Users without an active plan, or whose plan cannot be
+read, get `default_limit` on the free tier.
+
+Usage:
+    @router.post("/expensive")
+    async def expensive(user_id: int = Depends(get_current_user_id),
+                        _: RateLimitDecision = Depends(rate_limit("ai_profiler", settings.PROFILER_AI_DAILY_LIMIT))):
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import httpx
+from fastapi import Depends, HTTPException, Response, status
+
+from config import settings
+from utils.auth import verify_token
+from utils.upstream import CircuitOpenError, upstream
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "ratelimit"
+
+# backend/shared locally, /shared in the images (next to the /app code directory)
+TOKEN_BUCKET_SCRIPT_PATH = Path(__file__).resolve().parents[1].parent / "shared" / "token_bucket.lua"
+TOKEN_BUCKET_SCRIPT = TOKEN_BUCKET_SCRIPT_PATH.read_text()
+SUBSCRIPTION_STATUS_PATH = "/api/v1/subscription/status"
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    remaining: int
+    retry_after: float = 0.0
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(self.retry_after)))
+        return headers
+
+
+@dataclass(frozen=True)
+class PlanLimit:
+    tier: str
+    limit: Optional[int]  # None = unlimited
+
+
+def bucket_key(feature: str, user_id, tier: str = "any") -> str:
+    return f"{KEY_PREFIX}:{feature}:{tier}:{user_id}"
+
+
+async def resolve_plan_limit(user_id, default_limit: Optional[int]) -> PlanLimit:
+    """The caller's plan tier and daily AI limit; the free tier with `default_limit` without an active plan."""
+    fallback = PlanLimit("free", default_limit)
+    try:
+        result = await upstream.get(
+            SUBSCRIPTION_STATUS_PATH, user_id=user_id, cache_ttl=settings.PLAN_LIMIT_CACHE_TTL,
+        )
+    except (CircuitOpenError, httpx.HTTPError) as e:
+        logger.warning(f"Could not read plan for user {user_id}, using the default limit: {e}")
+        return fallback
+    data = result.data if result.ok and isinstance(result.data, dict) else {}
+    if data.get("status") != "active" or "plan_tier" not in data:
+        return fallback
+    return PlanLimit(data["plan_tier"], data.get("ai_coach_daily_limit"))
+
+
+class RateLimiter:
+    """Async token-bucket limiter; Redis when configured, in-process otherwise."""
+
+    def __init__(self, redis_url: str = ""):
+        self._redis_url = redis_url
+        self._redis = None
+        self._script = None
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = asyncio.Lock()
+
+    def _client(self):
+        if not self._redis_url:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError:
+                logger.warning("redis package not installed; using in-process rate limits")
+                self._redis_url = ""
+                return None
+            self._redis = redis_asyncio.from_url(self._redis_url)
+            self._script = self._redis.register_script(TOKEN_BUCKET_SCRIPT)
+        return self._redis
+
+    async def hit(self, key: str, capacity: int, period: float, cost: int = 1) -> RateLimitDecision:
+        if capacity <= 0:
+            return RateLimitDecision(allowed=False, limit=0, remaining=0, retry_after=period)
+        rate = capacity / period
+
+        if self._client() is not None:
+            try:
+                allowed, tokens, retry_after = await self._script(keys=[key], args=[capacity, rate, cost])
+                return RateLimitDecision(bool(int(allowed)), capacity, int(float(tokens)), float(retry_after))
+            except Exception as e:
+                logger.warning(f"Redis rate limiter unavailable, using in-process buckets: {e}")
+
+        async with self._lock:
+            now = time.monotonic()
+            tokens, ts = self._buckets.get(key, (float(capacity), now))
+            tokens = min(capacity, tokens + max(0.0, now - ts) * rate)
+            if tokens >= cost:
+                self._buckets[key] = (tokens - cost, now)
+                return RateLimitDecision(True, capacity, int(tokens - cost))
+            self._buckets[key] = (tokens, now)
+            return RateLimitDecision(False, capacity, int(tokens), (cost - tokens) / rate)
+
+
+rate_limiter = RateLimiter(settings.REDIS_URL)
+
+
+def rate_limit(feature: str, default_limit: Optional[int], period: float = 24 * 60 * 60) -> Callable:
+    """
+    Dependency factory: take one token per request from the caller's (user, tier, feature)
+    bucket, sized by their plan's daily AI limit (`default_limit` without an active plan).
+    Raises 429 with Retry-After when empty; sets X-RateLimit-* headers otherwise.
+    An unlimited plan skips the check.
+    """
+    async def dependency(response: Response, user_id: int = Depends(verify_token)) -> Optional[RateLimitDecision]:
+        plan = await resolve_plan_limit(user_id, default_limit)
+        if plan.limit is None:
+            return None
+        decision = await rate_limiter.hit(bucket_key(feature, user_id, plan.tier), plan.limit, period)
+        if not decision.allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded. Please try again later.",
+                headers=decision.headers(),
+            )
+        for name, value in decision.headers().items():
+            response.headers[name] = value
+        return decision
+
+    return dependency
@@ -0,0 +1,312 @@
+"""
+Pooled, coalescing client for proxying requests to the Django API.
+
+Router handlers used to open an httpx.AsyncClient per request, so every proxied call
+paid connection setup. DjangoUpstream keeps one client per process, opened and closed
+by the application lifespan (main.py), and adds:
+
+  - a keep-alive connection pool with connect/read timeouts (DJANGO_API_*);
+  - a circuit breaker: after DJANGO_API_CIRCUIT_FAILURES consecutive transport errors
+    or 5xx responses, calls fail fast with CircuitOpenError for
+    DJANGO_API_CIRCUIT_RESET seconds, then one trial call decides whether it closes;
+  - single-flight GETs: identical requests from the same user that arrive while one is
+    in flight share its upstream call;
+  - a per-user micro-cache of successful GETs for DJANGO_PROXY_CACHE_TTL seconds. Any
+    write proxied for a user drops that user's entries, so they read their own writes.
+
+Usage:
+    result = await upstream.get("/api/v1/student/dashboard/overview", user_id=user_id)  # UpstreamResponse
+    return await proxy_json("POST", "/api/v1/student/coaching/goals", user_id=user_id, json=body)
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from fastapi import HTTPException, status
+
+from config import settings
+from utils.metrics import django_proxy_requests_total
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """The Django API circuit is open; the request was not sent."""
+
+
+@dataclass(frozen=True)
+class UpstreamResponse:
+    status_code: int
+    text: str
+    data: Any = None  # parsed JSON body, None if the body is not JSON
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half_open (one trial call) -> closed/open."""
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def before_call(self) -> None:
+        state = self.state
+        if state == "open" or (state == "half_open" and self._trial_in_flight):
+            raise CircuitOpenError("Django API circuit is open")
+        if state == "half_open":
+            self._trial_in_flight = True
+
+    def abandon(self) -> None:
+        """The call was cancelled before it finished; it says nothing about the upstream."""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning(f"Django API circuit opened after {self.failures} consecutive failures")
+            self.opened_at = time.monotonic()
+
+
+class MicroCache:
+    """Short-lived per-user response cache, bounded by evicting the least recently written users."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._users: "OrderedDict[str, Dict[Tuple, Tuple[float, UpstreamResponse]]]" = OrderedDict()
+        self._size = 0
+        self._generations: Dict[str, int] = {}
+
+    def generation(self, user: str) -> int:
+        return self._generations.get(user, 0)
+
+    def get(self, user: str, key: Tuple) -> Optional[UpstreamResponse]:
+        entry = self._users.get(user, {}).get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.monotonic():
+            del self._users[user][key]
+            self._size -= 1
+            return None
+        return response
+
+    def set(self, user: str, key: Tuple, response: UpstreamResponse, ttl: float, generation: int) -> None:
+        if ttl <= 0 or generation != self.generation(user):
+            return  # the user wrote something while this response was in flight
+        entries = self._users.setdefault(user, {})
+        self._users.move_to_end(user)
+        self._size += key not in entries
+        entries[key] = (time.monotonic() + ttl, response)
+        while self._size > self.max_entries and len(self._users) > 1:
+            _, evicted = self._users.popitem(last=False)
+            self._size -= len(evicted)
+
+    def invalidate_user(self, user: str) -> None:
+        self._generations[user] = self.generation(user) + 1
+        self._size -= len(self._users.pop(user, {}))
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._size = 0
+
+
+class DjangoUpstream:
+    """Process-wide Django API client; see the module docstring."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: httpx.Timeout,
+        limits: httpx.Limits,
+        breaker: CircuitBreaker,
+        cache_ttl: float,
+        cache_max_entries: int,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url
+        self.timeout = timeout
+        self.limits = limits
+        self.breaker = breaker
+        self.cache_ttl = cache_ttl
+        self.cache = MicroCache(cache_max_entries)
+        self.transport = transport
+        self.stats = {"upstream": 0, "cache_hit": 0, "coalesced": 0, "circuit_open": 0}
+        self._client: Optional[httpx.AsyncClient] = None
+        self._in_flight: Dict[Tuple, asyncio.Future] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Opened by the lifespan; created on first use for scripts that run without one
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url, timeout=self.timeout, limits=self.limits, transport=self.transport,
+            )
+        return self._client
+
+    async def start(self) -> None:
+        self.client  # noqa: B018 - opens the pool
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self.cache.clear()
+
+    async def get(self, path: str, **kwargs) -> UpstreamResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> UpstreamResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def patch(self, path: str, **kwargs) -> UpstreamResponse:
+        return await self.request("PATCH", path, **kwargs)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        user_id: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        timeout: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+    ) -> UpstreamResponse:
+        """
+        Proxy one request. Raises httpx.RequestError on transport failures and
+        CircuitOpenError while the circuit is open; any HTTP status is returned.
+        """
+        method = method.upper()
+        user = "" if user_id is None else str(user_id)
+        headers = {"X-User-ID": user} if user_id is not None else {}
+        if method != "GET":
+            self.cache.invalidate_user(user)
+            return await self._send(method, path, headers, params, json, timeout)
+
+        key = (path, tuple(sorted((params or {}).items())))
+        ttl = self.cache_ttl if cache_ttl is None else cache_ttl
+        cached = self.cache.get(user, key) if ttl > 0 else None
+        if cached is not None:
+            self._count("cache_hit")
+            return cached
+
+        generation = self.cache.generation(user)
+        flight_key = (user, generation) + key
+        future = self._in_flight.get(flight_key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(user, key, headers, params, timeout, ttl, generation))
+            self._in_flight[flight_key] = future
+            future.add_done_callback(partial(self._landed, flight_key))
+        else:
+            self._count("coalesced")
+        # A caller that disconnects must not cancel the call the others are waiting on
+        return await asyncio.shield(future)
+
+    async def _fetch(self, user, key, headers, params, timeout, ttl, generation) -> UpstreamResponse:
+        response = await self._send("GET", key[0], headers, params, None, timeout)
+        if response.status_code == 200:
+            self.cache.set(user, key, response, ttl, generation)
+        return response
+
+    def _landed(self, flight_key: Tuple, future: asyncio.Future) -> None:
+        self._in_flight.pop(flight_key, None)
+        if not future.cancelled():
+            future.exception()  # retrieved here so an error nobody awaited is not logged as lost
+
+    async def _send(self, method, path, headers, params, json, timeout) -> UpstreamResponse:
+        try:
+            self.breaker.before_call()
+        except CircuitOpenError:
+            self._count("circuit_open")
+            raise
+        self._count("upstream")
+        try:
+            response = await self.client.request(
+                method, path, params=params, json=json, headers=headers,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            )
+        except httpx.RequestError:
+            self.breaker.record_failure()
+            raise
+        except BaseException:
+            self.breaker.abandon()
+            raise
+        if response.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+        return UpstreamResponse(response.status_code, response.text, data)
+
+    def _count(self, outcome: str) -> None:
+        self.stats[outcome] += 1
+        django_proxy_requests_total.labels(outcome=outcome).inc()
+
+
+def build_upstream(**overrides) -> DjangoUpstream:
+    """DjangoUpstream configured from settings; keyword arguments override constructor values."""
+    options = dict(
+        base_url=settings.DJANGO_API_URL,
+        timeout=httpx.Timeout(settings.DJANGO_API_TIMEOUT, connect=settings.DJANGO_API_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.DJANGO_API_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.DJANGO_API_MAX_KEEPALIVE,
+            keepalive_expiry=settings.DJANGO_API_KEEPALIVE_EXPIRY,
+        ),
+        breaker=CircuitBreaker(settings.DJANGO_API_CIRCUIT_FAILURES, settings.DJANGO_API_CIRCUIT_RESET),
+        cache_ttl=settings.DJANGO_PROXY_CACHE_TTL,
+        cache_max_entries=settings.DJANGO_PROXY_CACHE_MAX_ENTRIES,
+    )
+    options.update(overrides)
+    return DjangoUpstream(**options)
+
+
+upstream = build_upstream()
+
+
+async def proxy_json(method: str, path: str, *, user_id: Any, **kwargs) -> Any:
+    """
+    Proxy through the shared upstream and return the JSON body. Transport errors and
+    non-2xx responses become 502, an open circuit 503.
+    """
+    try:
+        result = await upstream.request(method, path, user_id=user_id, **kwargs)
+    except CircuitOpenError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Django API unavailable: {e}")
+    except httpx.HTTPError as e:
+        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"Django API error: {str(e)}")
+    if not result.ok:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Django API error: {result.status_code} from {path}: {result.text[:500]}",
+        )
+    return result.data
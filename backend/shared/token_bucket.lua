@@ -0,0 +1,34 @@
+-- Token bucket shared by the Django (core/rate_limit.py) and FastAPI
+-- (utils/rate_limit.py) rate limiters; both load this file, so they always agree.
+--
+-- KEYS[1] bucket; ARGV: capacity, refill per second, cost.
+-- Returns {allowed (0/1), tokens left, seconds until `cost` tokens are available}.
+-- Time comes from the Redis server clock, so workers' clocks do not matter.
+
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return {allowed, tostring(tokens), tostring(retry_after)}